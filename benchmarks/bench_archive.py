@@ -0,0 +1,129 @@
+"""
+Benchmarks: Archivblöcke (Kodierung, Dekodierung, Abfragen über versiegelte Tage)
+
+Speicherbedarf roh/versiegelt (1 Tag, 1 Hz, 3 Sensoren, auf ein Jahr hochgerechnet):
+
+    python benchmarks/bench_archive.py
+"""
+
+import random
+import shutil
+import sys
+import tempfile
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from harness import benchmark
+from utils.data_logger import DataLogger
+from utils.sample_archive import decode_block, encode_block, timestamp_ms
+
+# Ein Tag mit 1 Hz
+DAY_SECONDS = 86400
+
+SENSORS = (('temperature', '°C', 22.0, 0.1), ('humidity', '%', 87.0, 0.1), ('co2', 'ppm', 850.0, 1.0))
+
+
+def _series(seconds: int, base: float, resolution: float, ema: bool):
+    """
+    Messwerte wie von den Sensoren: Auflösung des Sensors, optional EMA-geglättet
+    (volle Gleitkommazahlen, ungünstigster Fall für die XOR-Kodierung)
+    """
+    rng = random.Random(42)
+    value = smoothed = base
+    for _ in range(seconds):
+        value += rng.gauss(0.0, resolution)
+        raw = round(value / resolution) * resolution
+        smoothed = 0.3 * raw + 0.7 * smoothed if ema else raw
+        yield smoothed
+
+
+def _rows(seconds: int, ema: bool, start: datetime):
+    # Zeitstempel mit Millisekunden-Jitter wie im Messzyklus
+    rng = random.Random(7)
+    columns = [list(_series(seconds, base, resolution, ema)) for _, _, base, resolution in SENSORS]
+    rows = []
+    for i in range(seconds):
+        timestamp = (start + timedelta(seconds=i, milliseconds=rng.randint(0, 3))).isoformat()
+        for (name, unit, _, _), values in zip(SENSORS, columns):
+            rows.append((timestamp, name, values[i], unit, 'default'))
+    return rows
+
+
+class _Columns:
+    def __init__(self, ema: bool):
+        rows = [row for row in _rows(DAY_SECONDS, ema, datetime(2025, 1, 1)) if row[1] == 'temperature']
+        self.ids = list(range(1, len(rows) + 1))
+        self.timestamps = [timestamp_ms(row[0]) for row in rows]
+        self.values = [row[2] for row in rows]
+        self.block = encode_block(self.ids, self.timestamps, self.values)
+
+
+class _SealedLogger:
+    """
+    DataLogger mit einem versiegelten Tag (1 Hz, 3 Sensoren) und einer Stunde Rohdaten
+    """
+    
+    def __init__(self):
+        self.directory = tempfile.mkdtemp(prefix='mgb_bench_')
+        self.logger = DataLogger(str(Path(self.directory) / 'bench.db'), partition='month')
+        self.day = datetime.combine(date.today() - timedelta(days=3), time())
+        self.logger._write_sample_rows(_rows(DAY_SECONDS, True, self.day))
+        self.logger.seal_archive(48)
+        now = datetime.now().replace(microsecond=0)
+        self.logger._write_sample_rows(_rows(3600, True, now - timedelta(hours=1)))
+    
+    def close(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+@benchmark('archive.encode[86400]', setup=lambda: _Columns(ema=True), group='archive',
+           params={'points': DAY_SECONDS})
+def encode(columns):
+    encode_block(columns.ids, columns.timestamps, columns.values)
+
+
+@benchmark('archive.decode[86400]', setup=lambda: _Columns(ema=True), group='archive',
+           params={'points': DAY_SECONDS})
+def decode(columns):
+    decode_block(columns.block)
+
+
+@benchmark('archive.get_sensor_data[raw,limit=1000]', setup=_SealedLogger, group='archive',
+           params={'limit': 1000})
+def get_sensor_data_raw(sealed):
+    sealed.logger.get_sensor_data('temperature', limit=1000)
+
+
+@benchmark('archive.get_sensor_data[sealed,limit=1000]', setup=_SealedLogger, group='archive',
+           params={'limit': 1000})
+def get_sensor_data_sealed(sealed):
+    # Zeitraum nur im versiegelten Tag: ein Block wird vollständig dekodiert
+    sealed.logger.get_sensor_data('temperature', limit=1000, end=sealed.day + timedelta(hours=12))
+
+
+def report_sizes():
+    """
+    Vergleicht den Speicherbedarf eines Tages roh und versiegelt
+    """
+    start = datetime.combine(date.today() - timedelta(days=10), time())
+    for label, ema in (('Sensorauflösung', False), ('EMA-geglättet', True)):
+        directory = tempfile.mkdtemp(prefix='mgb_bench_')
+        try:
+            logger = DataLogger(str(Path(directory) / 'bench.db'), partition='day')
+            rows = _rows(DAY_SECONDS, ema, start)
+            logger._write_sample_rows(rows)
+            raw = logger.db_size()
+            logger.seal_archive(48)
+            sealed = logger.db_size()
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        print(f"{label:16s} {len(rows)} Zeilen: roh {raw / 1e6:6.1f} MB, versiegelt {sealed / 1e6:5.2f} MB "
+              f"({sealed / len(rows):4.1f} B/Zeile, Faktor {raw / sealed:4.1f}); "
+              f"Jahr: {raw * 365 / 1e9:5.2f} GB -> {sealed * 365 / 1e9:5.3f} GB")
+
+
+if __name__ == '__main__':
+    report_sizes()
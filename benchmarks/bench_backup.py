@@ -0,0 +1,94 @@
+"""
+Benchmarks: Online-Sicherung der Datenbank (Backup-API, tar.gz-Datenstrom)
+
+Schreiblatenz des Loggers während einer Sicherung:
+
+    python benchmarks/bench_backup.py
+"""
+
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from harness import benchmark
+from utils.data_logger import DataLogger
+from utils.db_backup import DatabaseBackup
+from utils.records import Sample
+
+ROWS = 10 ** 6
+
+_CYCLE = [Sample('temperature', 22.0, '°C'), Sample('humidity', 87.0, '%'), Sample('co2', 850.0, 'ppm')]
+
+
+class _TempBackup:
+    """
+    DataLogger mit ``rows`` Messwerten und Sicherung in ein temporäres Verzeichnis
+    """
+    
+    def __init__(self, rows: int = ROWS, pause: float = 0.0):
+        self.directory = tempfile.mkdtemp(prefix='mgb_bench_')
+        self.logger = DataLogger(str(Path(self.directory) / 'bench.db'), partition='month')
+        start = datetime.now() - timedelta(days=30)
+        self.logger.log_rows([
+            ((start + timedelta(seconds=i)).isoformat(), sample.sensor, sample.value + (i % 100) * 0.01,
+             sample.unit, 'default')
+            for i, sample in ((i, _CYCLE[i % 3]) for i in range(rows))
+        ])
+        self.backup = DatabaseBackup(self.logger, directory=str(Path(self.directory) / 'backups'), pause=pause)
+    
+    def close(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+@benchmark(f'backup.stream[rows={ROWS}]', setup=_TempBackup, group='backup', params={'rows': ROWS})
+def stream(temp):
+    for _ in temp.backup.stream():
+        pass
+
+
+def report_write_latency(seconds: float = 5.0, pause: float = 0.01):
+    """
+    Schreiblatenz eines Zyklus (alle 10 ms) mit und ohne laufende Sicherungen
+    """
+    for label, backups in (('ohne Sicherung', False), ('mit Sicherung', True)):
+        temp = _TempBackup(pause=pause)
+        try:
+            stop = threading.Event()
+            count = [0]
+            
+            def run_backups():
+                while not stop.is_set():
+                    temp.backup.create()
+                    count[0] += 1
+            
+            thread = threading.Thread(target=run_backups) if backups else None
+            if thread:
+                thread.start()
+            latencies = []
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                begin = time.perf_counter()
+                temp.logger.log_samples(_CYCLE)
+                latencies.append(time.perf_counter() - begin)
+                time.sleep(0.01)
+            stop.set()
+            if thread:
+                thread.join()
+        finally:
+            temp.close()
+        latencies.sort()
+        total = len(latencies)
+        print(f"{label:15s} {total} Schreibvorgänge: p50 {latencies[total // 2] * 1e3:.2f} ms, "
+              f"p99 {latencies[int(total * 0.99)] * 1e3:.2f} ms, max {latencies[-1] * 1e3:.1f} ms"
+              + (f"; {count[0]} Sicherungen" if backups else ''))
+
+
+if __name__ == '__main__':
+    report_write_latency()
@@ -0,0 +1,128 @@
+"""
+Benchmarks: Mehrkammerbetrieb (Monitoring-Zyklus über N Kammern, Aufwand je Kammer)
+
+Simulierte Sensoren (ohne Hardware-Wartezeit), ein gemeinsamer DataLogger und
+Scheduler wie in main.py. Der Speicherbedarf je Kammer wird direkt gemessen:
+
+    python benchmarks/bench_chambers.py
+"""
+
+import itertools
+import shutil
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from harness import benchmark
+from controllers.chamber import Chamber, run_cycle
+from sensors.base_sensor import BaseSensor
+from utils.data_logger import DataLogger
+from utils.scheduler import DeadlineScheduler
+
+CHAMBER_COUNTS = (1, 4, 8)
+
+SENSORS = (('temperature', '°C', 22.0), ('humidity', '%', 85.0), ('co2', 'ppm', 800.0))
+
+CONFIG = {
+    'sensors': {
+        name: {'target_value': base, 'min_value': base * 0.5, 'max_value': base * 1.5}
+        for name, _, base in SENSORS
+    },
+    'actuators': {},
+    'pid': {
+        'adaptive': True,
+        'temperature': {'kp': 2.0, 'ki': 0.5, 'kd': 1.0},
+        'humidity': {'kp': 1.5, 'ki': 0.3, 'kd': 0.5},
+        'co2': {'kp': 1.0, 'ki': 0.2, 'kd': 0.3}
+    },
+    'alarms': {},
+    'measurement': {'interval': 60, 'history_hours': 24}
+}
+
+
+class _SimulatedSensor(BaseSensor):
+    """
+    Sensor mit periodischen Werten um den Sollwert, liest bei jedem Aufruf neu
+    """
+    
+    def __init__(self, name: str, unit: str, base: float):
+        super().__init__(name, unit, min_interval=0.0, max_age=0.0)
+        self.values = itertools.cycle([base + 0.1 * (i % 11) - 0.5 for i in range(97)])
+        self.is_available = True
+    
+    def read(self):
+        return next(self.values)
+    
+    def initialize(self) -> bool:
+        return True
+
+
+class _Plant:
+    """
+    N Kammern mit je drei Sensoren auf einem gemeinsamen DataLogger und Scheduler
+    """
+    
+    def __init__(self, count: int):
+        self.directory = tempfile.mkdtemp(prefix='mgb_bench_')
+        self.data_logger = DataLogger(str(Path(self.directory) / 'bench.db'), partition='month')
+        self.scheduler = DeadlineScheduler()
+        self.chambers = {
+            f"c{i}": build_chamber(f"c{i}", self.data_logger, self.scheduler)
+            for i in range(count)
+        }
+    
+    def close(self):
+        self.scheduler.stop()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def build_chamber(chamber_id: str, data_logger: DataLogger, scheduler: DeadlineScheduler) -> Chamber:
+    sensors = {name: _SimulatedSensor(name, unit, base) for name, unit, base in SENSORS}
+    return Chamber(chamber_id, dict(CONFIG, name=chamber_id), data_logger, scheduler, sensors=sensors)
+
+
+def _register_cycles(count: int):
+    @benchmark(f'chambers.cycle[n={count}]', setup=lambda: _Plant(count), group='chambers',
+               params={'chambers': count, 'sensors': count * len(SENSORS)})
+    def cycle(plant):
+        # Lesen, eine Transaktion für alle Kammern, Verlauf, Alarme, PID
+        run_cycle(plant.chambers, plant.data_logger)
+
+
+for _count in CHAMBER_COUNTS:
+    _register_cycles(_count)
+
+
+def measure_memory(count: int = 8) -> float:
+    """
+    Zusätzlicher Speicher je Kammer in Bytes (tracemalloc, inkl. 24-h-Verlaufspuffer)
+    """
+    plant = _Plant(0)
+    try:
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        chambers = [build_chamber(f"m{i}", plant.data_logger, plant.scheduler) for i in range(count)]
+        for chamber in chambers:
+            run_cycle({chamber.id: chamber}, plant.data_logger)
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        growth = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+        return growth / count
+    finally:
+        plant.close()
+
+
+if __name__ == '__main__':
+    import harness
+    
+    per_chamber = measure_memory()
+    print(f"Speicher je Kammer: {per_chamber / 1024:.1f} KiB")
+    results = harness.run([f'chambers.cycle[n={count}]' for count in CHAMBER_COUNTS])['results']
+    single = results['chambers.cycle[n=1]']['median']
+    for count in CHAMBER_COUNTS[1:]:
+        median = results[f'chambers.cycle[n={count}]']['median']
+        print(f"{count} Kammern: {harness.format_time(median)} je Zyklus, "
+              f"{harness.format_time((median - single) / (count - 1))} je weitere Kammer")
@@ -0,0 +1,241 @@
+"""
+Benchmarks: DataLogger (Einzel- und Sammel-Inserts, Abfragen auf großen Tabellen)
+
+Die Datenbanken für die Abfragen werden einmalig erzeugt und unter
+``MGB_BENCH_DATA`` (Standard: benchmarks/.data) wiederverwendet.
+
+``datalogger.aggregate[...,sql]`` fasst in SQLite zusammen, ``[...,python]``
+liest dieselben Messwerte über ``get_sensor_data`` und rechnet in Python
+(bisheriger Weg, Vergleich).
+
+Schreiblatenz bei gleichzeitigen Abfragen (wie Weboberfläche und
+Monitoring-Loop):
+
+    python benchmarks/bench_data_logger.py
+"""
+
+import math
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from harness import benchmark
+from utils.data_logger import DataLogger
+from utils.records import Sample
+
+DATA_DIR = Path(os.environ.get('MGB_BENCH_DATA', Path(__file__).parent / '.data'))
+
+# Tabellengrößen; große Tabellen nur mit --full (Erzeugung dauert auf dem Pi lange)
+ROW_COUNTS = (10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7)
+SLOW_ROWS = 10 ** 6
+
+SENSORS = (('temperature', '°C', 22.0), ('humidity', '%', 87.0), ('co2', 'ppm', 850.0))
+
+# Tageswerte über den ganzen Bestand
+AGGREGATE = dict(start=datetime(2025, 1, 1), end=datetime(2100, 1, 1), bucket=86400,
+                 funcs=('min', 'max', 'avg', 'stddev', 'p95'))
+
+
+class _TempLogger:
+    """
+    DataLogger auf einer frischen Datenbank, die nach der Messung gelöscht wird
+    """
+    
+    def __init__(self):
+        self.directory = tempfile.mkdtemp(prefix='mgb_bench_')
+        self.logger = DataLogger(str(Path(self.directory) / 'bench.db'), partition='month')
+    
+    def close(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def _rows(count: int):
+    start = datetime(2025, 1, 1)
+    step = timedelta(seconds=60 / len(SENSORS))
+    for i in range(count):
+        name, unit, base = SENSORS[i % len(SENSORS)]
+        yield ((start + step * i).isoformat(), name, base + (i % 100) * 0.01, unit)
+
+
+def populated_logger(rows: int) -> DataLogger:
+    """
+    Liefert einen DataLogger mit ``rows`` Messwerten (wird zwischengespeichert)
+    """
+    path = DATA_DIR / f"sensor_data_{rows}.db"
+    logger = DataLogger(str(path))
+    with sqlite3.connect(path) as conn:
+        existing = conn.execute('SELECT COUNT(*) FROM sensor_data').fetchone()[0]
+        if existing != rows:
+            print(f"  erzeuge {rows} Zeilen in {path} ...")
+            conn.execute('DELETE FROM sensor_data')
+            conn.executemany(
+                'INSERT INTO sensor_data (timestamp, sensor_name, value, unit) VALUES (?, ?, ?, ?)',
+                _rows(rows)
+            )
+            conn.commit()
+    # Schema-Änderungen des DataLoggers (z.B. Indizes) auf bestehende Dateien anwenden
+    return DataLogger(str(path))
+
+
+def aggregate_python(logger: DataLogger, sensor_name: str, start: datetime, end: datetime,
+                     bucket: int, funcs: tuple) -> dict:
+    """
+    Gleiche Kennzahlen wie ``DataLogger.aggregate``, aus den Rohzeilen in Python berechnet
+    """
+    epoch = datetime(1970, 1, 1)
+    buckets = {}
+    for row in logger.get_sensor_data(sensor_name, limit=2 ** 31, start=start, end=end):
+        seconds = (datetime.fromisoformat(row['timestamp']) - epoch) // timedelta(seconds=1)
+        buckets.setdefault(seconds // bucket, []).append(row['value'])
+    result = {'timestamps': [], 'count': []}
+    result.update((func, []) for func in funcs)
+    for key in sorted(buckets):
+        values = sorted(buckets[key])
+        count = len(values)
+        mean = sum(values) / count
+        result['timestamps'].append((epoch + timedelta(seconds=key * bucket)).isoformat())
+        result['count'].append(count)
+        for func in funcs:
+            if func == 'min':
+                result[func].append(values[0])
+            elif func == 'max':
+                result[func].append(values[-1])
+            elif func == 'avg':
+                result[func].append(mean)
+            elif func == 'stddev':
+                result[func].append(math.sqrt(sum((value - mean) ** 2 for value in values) / count))
+            else:
+                rank = max(1, math.ceil(float(func[1:]) * count / 100))
+                result[func].append(values[rank - 1])
+    return result
+
+
+def _samples(count: int):
+    return [Sample(name, base, unit) for name, unit, base in
+            (SENSORS[i % len(SENSORS)] for i in range(count))]
+
+
+_SINGLE = _samples(1)[0]
+_CYCLE = _samples(3)
+_BULK = _samples(100)
+
+
+@benchmark('datalogger.log_sample', setup=_TempLogger, group='datalogger')
+def log_sample(temp):
+    temp.logger.log_sample(_SINGLE)
+
+
+@benchmark('datalogger.log_sensor_data', setup=_TempLogger, group='datalogger')
+def log_sensor_data(temp):
+    temp.logger.log_sensor_data('temperature', 22.0, '°C')
+
+
+@benchmark('datalogger.log_samples[3]', setup=_TempLogger, group='datalogger',
+           params={'batch': 3})
+def log_samples_cycle(temp):
+    temp.logger.log_samples(_CYCLE)
+
+
+@benchmark('datalogger.log_samples[100]', setup=_TempLogger, group='datalogger',
+           params={'batch': 100})
+def log_samples_bulk(temp):
+    temp.logger.log_samples(_BULK)
+
+
+def _register_queries(rows: int):
+    tags = ('slow',) if rows >= SLOW_ROWS else ()
+    
+    @benchmark(f'datalogger.get_sensor_data[rows={rows},limit=100]',
+               setup=lambda: populated_logger(rows), group='datalogger',
+               params={'rows': rows, 'limit': 100}, tags=tags)
+    def get_sensor_data(logger):
+        logger.get_sensor_data('temperature', limit=100)
+    
+    @benchmark(f'datalogger.get_sensor_data[rows={rows},limit=1000]',
+               setup=lambda: populated_logger(rows), group='datalogger',
+               params={'rows': rows, 'limit': 1000}, tags=tags)
+    def get_sensor_data_large(logger):
+        logger.get_sensor_data('temperature', limit=1000)
+    
+    @benchmark(f'datalogger.get_sensor_rows[rows={rows},limit=1000]',
+               setup=lambda: populated_logger(rows), group='datalogger',
+               params={'rows': rows, 'limit': 1000}, tags=tags)
+    def get_sensor_rows_large(logger):
+        logger.get_sensor_rows('temperature', limit=1000)
+    
+    @benchmark(f'datalogger.get_sensor_data[rows={rows},all]',
+               setup=lambda: populated_logger(rows), group='datalogger',
+               params={'rows': rows, 'limit': 100}, tags=tags)
+    def get_sensor_data_all(logger):
+        logger.get_sensor_data(limit=100)
+    
+    @benchmark(f'datalogger.aggregate[rows={rows},sql]',
+               setup=lambda: populated_logger(rows), group='datalogger',
+               params={'rows': rows, 'bucket': AGGREGATE['bucket']}, tags=tags)
+    def aggregate_sql(logger):
+        logger.aggregate('temperature', **AGGREGATE)
+    
+    @benchmark(f'datalogger.aggregate[rows={rows},python]',
+               setup=lambda: populated_logger(rows), group='datalogger',
+               params={'rows': rows, 'bucket': AGGREGATE['bucket']}, tags=tags)
+    def aggregate_in_python(logger):
+        aggregate_python(logger, 'temperature', **AGGREGATE)
+
+
+for _rows_count in ROW_COUNTS:
+    _register_queries(_rows_count)
+
+
+def report_contention(readers: int = 2, seconds: float = 5.0, pause: float = 0.01):
+    """
+    Misst die Schreiblatenz eines Zyklus, während ``readers`` Threads laufend
+    die neuesten 1000 Messwerte abfragen (gleiche Partition)
+    """
+    temp = _TempLogger()
+    try:
+        start = datetime.now() - timedelta(days=2)
+        temp.logger.log_rows([
+            ((start + timedelta(seconds=i)).isoformat(), name, value, unit, 'default')
+            for i, (_, name, value, unit) in enumerate(_rows(10 ** 5))
+        ])
+        stop = threading.Event()
+        reads = [0] * readers
+        
+        def read(index: int):
+            while not stop.is_set():
+                temp.logger.get_sensor_data('temperature', limit=1000)
+                reads[index] += 1
+        
+        threads = [threading.Thread(target=read, args=(i,)) for i in range(readers)]
+        for thread in threads:
+            thread.start()
+        latencies = []
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            begin = time.perf_counter()
+            temp.logger.log_samples(_CYCLE)
+            latencies.append(time.perf_counter() - begin)
+            time.sleep(pause)
+        stop.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        temp.close()
+    
+    latencies.sort()
+    count = len(latencies)
+    print(f"{count} Schreibvorgänge: p50 {latencies[count // 2] * 1e3:.2f} ms, "
+          f"p99 {latencies[int(count * 0.99)] * 1e3:.2f} ms, max {latencies[-1] * 1e3:.1f} ms; "
+          f"{sum(reads) / seconds:.0f} Abfragen/s")
+
+
+if __name__ == '__main__':
+    report_contention()
@@ -0,0 +1,66 @@
+"""
+Benchmarks: Messwert-Journal (Anhängen statt Commit, Übernahme in die Datenbank)
+
+Vergleich: ``datalogger.log_samples[3]`` (ein Commit je Zyklus)
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from harness import benchmark
+from utils.data_logger import DataLogger
+from utils.records import Sample
+from utils.sample_journal import SampleJournal
+
+SENSORS = (('temperature', '°C', 22.0), ('humidity', '%', 87.0), ('co2', 'ppm', 850.0))
+
+_CYCLE = [('default', [Sample(name, base, unit) for name, unit, base in SENSORS])]
+
+
+class _TempJournal:
+    """
+    DataLogger mit Journal (ohne Hintergrund-Thread) auf frischen Dateien
+    """
+    
+    def __init__(self, capacity: int = 1 << 20):
+        self.directory = tempfile.mkdtemp(prefix='mgb_bench_')
+        self.logger = DataLogger(str(Path(self.directory) / 'bench.db'), partition='month')
+        self.journal = SampleJournal(str(Path(self.directory) / 'journal.bin'), self.logger.log_rows,
+                                     capacity=capacity)
+        self.journal.open()
+        self.logger.journal = self.journal
+    
+    def close(self):
+        self.logger.journal = None
+        self.journal._close_map()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+@benchmark('journal.log_samples[3]', setup=_TempJournal, group='journal', params={'batch': 3})
+def log_samples(temp):
+    temp.logger.log_chamber_samples(_CYCLE)
+    if temp.journal.pending() > temp.journal.capacity - 3:
+        temp.journal.compact()
+
+
+@benchmark('journal.sync', setup=_TempJournal, group='journal')
+def sync(temp):
+    temp.logger.log_chamber_samples(_CYCLE)
+    temp.journal.sync()
+
+
+def _filled_journal():
+    temp = _TempJournal(capacity=20000)
+    for _ in range(20000 // len(SENSORS)):
+        temp.journal.append(_CYCLE)
+    return temp
+
+
+@benchmark('journal.append+compact[19998]', setup=_filled_journal, group='journal', params={'rows': 19998})
+def compact(temp):
+    # Je Wiederholung füllen und übernehmen (Übernahme leert das Journal)
+    if not temp.journal.pending():
+        for _ in range(20000 // len(SENSORS)):
+            temp.journal.append(_CYCLE)
+    temp.journal.compact()
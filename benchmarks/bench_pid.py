@@ -0,0 +1,57 @@
+"""
+Benchmarks: PID-Regler (update und adaptive Parameteranpassung)
+"""
+
+import itertools
+from datetime import datetime, timedelta
+
+from harness import benchmark
+from controllers.pid_controller import PIDController
+
+# Messwerte um den Sollwert, damit alle Zweige der Anpassung vorkommen
+_VALUES = [22.0 + 0.1 * (i % 17) - 0.8 for i in range(1000)]
+
+
+class _Loop:
+    """
+    Regler mit fortlaufender, simulierter Zeit (60 s Messintervall)
+    """
+    
+    def __init__(self, adaptive: bool):
+        self.pid = PIDController(kp=2.0, ki=0.5, kd=1.0, setpoint=22.0, adaptive=adaptive)
+        self.values = itertools.cycle(_VALUES)
+        self.now = datetime(2025, 1, 1)
+        self.step = timedelta(seconds=60)
+
+
+def _update(loop: _Loop):
+    loop.now += loop.step
+    loop.pid.update(next(loop.values), loop.now)
+
+
+@benchmark('pid.update', setup=lambda: _Loop(adaptive=False), group='pid')
+def pid_update(loop):
+    _update(loop)
+
+
+@benchmark('pid.update[adaptive]', setup=lambda: _Loop(adaptive=True), group='pid')
+def pid_update_adaptive(loop):
+    _update(loop)
+
+
+@benchmark('pid.update[now]', setup=lambda: _Loop(adaptive=True), group='pid')
+def pid_update_now(loop):
+    # Wie im Monitoring-Loop: Zeitstempel über datetime.now()
+    loop.pid.update(next(loop.values))
+
+
+def _filled_history() -> PIDController:
+    loop = _Loop(adaptive=False)
+    for _ in range(20):
+        _update(loop)
+    return loop.pid
+
+
+@benchmark('pid._adapt_parameters', setup=_filled_history, group='pid')
+def pid_adapt_parameters(pid):
+    pid._adapt_parameters()
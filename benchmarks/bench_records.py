@@ -0,0 +1,84 @@
+"""
+Benchmark: Speicher- und Zeitbedarf pro Messzyklus mit Dictionaries vs. Sample-Datensätzen
+
+Aufruf:
+    python benchmarks/bench_records.py
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+from utils.records import Sample
+
+SENSORS = [('temperature', '°C', 22.5), ('humidity', '%', 87.3), ('co2', 'ppm', 850.0)]
+CYCLES = 10000
+
+
+def cycle_dicts():
+    """
+    Bisheriger Weg: lose Werte, datetime und neue Dictionaries pro Schicht
+    """
+    readings = []
+    for name, unit, value in SENSORS:
+        now = datetime.now()
+        status = {
+            'name': name,
+            'unit': unit,
+            'available': True,
+            'last_value': value,
+            'last_read_time': now.isoformat()
+        }
+        row = (now.isoformat(), name, value, unit)
+        readings.append((status, row))
+    payload = json.dumps({name: {'value': value, 'unit': unit, 'timestamp': datetime.now().isoformat()}
+                          for name, unit, value in SENSORS})
+    return readings, payload
+
+
+def cycle_samples():
+    """
+    Neuer Weg: ein Sample pro Messwert, durch alle Schichten weitergereicht
+    """
+    samples = [Sample(name, value, unit) for name, unit, value in SENSORS]
+    rows = [(sample.isoformat(), sample.sensor, sample.value, sample.unit) for sample in samples]
+    payload = '{"samples":[' + ','.join(sample.to_json() for sample in samples) + ']}'
+    return samples, rows, payload
+
+
+def measure(func):
+    """
+    Misst Laufzeit und allokierte Bytes pro Zyklus
+    
+    Returns:
+        (Mikrosekunden pro Zyklus, gehaltene Bytes pro Zyklus)
+    """
+    func()  # Aufwärmen (Caches füllen)
+    
+    start = time.perf_counter()
+    for _ in range(CYCLES):
+        func()
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    results = [func() for _ in range(1000)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    
+    return elapsed / CYCLES * 1e6, current / 1000
+
+
+def main():
+    print(f"{'Variante':<12} {'µs/Zyklus':>10} {'Bytes/Zyklus':>14}")
+    for label, func in (('dict', cycle_dicts), ('Sample', cycle_samples)):
+        micros, bytes_per_cycle = measure(func)
+        print(f"{label:<12} {micros:>10.1f} {bytes_per_cycle:>14.0f}")
+
+
+if __name__ == '__main__':
+    main()
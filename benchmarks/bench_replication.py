@@ -0,0 +1,107 @@
+"""
+Benchmarks: Replikation an einen lokalen Empfänger (Aufholen, Begrenzung der Rate)
+
+Übertragungsrate beim Aufholen mit und ohne ``max_rate``:
+
+    python benchmarks/bench_replication.py
+"""
+
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from werkzeug.serving import make_server
+
+from harness import benchmark
+from replica import create_app
+from utils.data_logger import DataLogger
+from utils.metrics import metrics
+from utils.records import Sample
+from utils.replica_store import ReplicaStore
+from utils.replication import TABLES, ReplicationAgent
+
+ROWS = 10 ** 5
+
+_CYCLE = [Sample('temperature', 22.0, '°C'), Sample('humidity', 87.0, '%'), Sample('co2', 850.0, 'ppm')]
+
+
+class _LocalReplica:
+    """
+    DataLogger mit ``rows`` Messwerten, Agent und Empfänger auf 127.0.0.1 (temporäre Dateien)
+    """
+    
+    def __init__(self, rows: int = ROWS, max_rate: float = 0.0):
+        self.directory = Path(tempfile.mkdtemp(prefix='mgb_bench_'))
+        self.logger = DataLogger(str(self.directory / 'bench.db'), partition='month')
+        start = datetime.now() - timedelta(days=2)
+        self.logger.log_rows([
+            ((start + timedelta(seconds=i)).isoformat(), sample.sensor, sample.value + (i % 100) * 0.01,
+             sample.unit, 'default')
+            for i, sample in ((i, _CYCLE[i % 3]) for i in range(rows))
+        ])
+        self.store = ReplicaStore(str(self.directory / 'replicas'))
+        self.server = make_server('127.0.0.1', 0, create_app(self.store, {}), threaded=True)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.max_rate = max_rate
+        self.agent = None
+        self.reset()
+    
+    def reset(self):
+        """
+        Neuer Agent ab Cursor 0 (Empfänger überschreibt vorhandene Zeilen)
+        """
+        (self.directory / 'cursor.json').unlink(missing_ok=True)
+        self.agent = ReplicationAgent(
+            self.logger, f"http://127.0.0.1:{self.server.server_port}", 'bench',
+            cursor_path=str(self.directory / 'cursor.json'), max_rate=self.max_rate
+        )
+        self.agent.cursors = dict.fromkeys(TABLES, 0)
+    
+    def close(self):
+        self.agent.stop()
+        self.server.shutdown()
+        self.store.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+@benchmark(f'replication.catch_up[rows={ROWS}]', setup=_LocalReplica, group='replication',
+           params={'rows': ROWS})
+def catch_up(replica):
+    replica.reset()
+    while replica.agent.replicate_once()[0]:
+        pass
+
+
+def report_catch_up(max_rates=(0.0, 65536.0, 16384.0), seconds: float = 30.0):
+    """
+    Aufholen eines Rückstands über den Hintergrund-Thread: Zeilen und Bytes je Sekunde
+    """
+    for max_rate in max_rates:
+        replica = _LocalReplica(max_rate=max_rate)
+        try:
+            sent_bytes = metrics.get('mgb_replication_bytes_total').value
+            begin = time.monotonic()
+            replica.agent.start()
+            while replica.agent.lag().get('sensor_data') and time.monotonic() - begin < seconds:
+                time.sleep(0.05)
+            replica.agent.stop()
+            elapsed = time.monotonic() - begin
+            rows = replica.agent.cursors['sensor_data']
+            sent_bytes = metrics.get('mgb_replication_bytes_total').value - sent_bytes
+        finally:
+            replica.close()
+        label = f"max_rate {max_rate / 1024:.0f} KiB/s" if max_rate else 'unbegrenzt'
+        print(f"{label:22s} {rows} Zeilen in {elapsed:.1f} s ({rows / elapsed:,.0f} Zeilen/s, "
+              f"{sent_bytes / elapsed / 1024:.1f} KiB/s komprimiert)")
+
+
+if __name__ == '__main__':
+    report_catch_up()
@@ -0,0 +1,26 @@
+"""
+Benchmarks: Übersetzungen
+"""
+
+from harness import benchmark
+from utils.translations import get_translations, get_available_languages
+
+
+@benchmark('translations.get[de]', group='translations')
+def translations_de():
+    get_translations('de')
+
+
+@benchmark('translations.get[en]', group='translations')
+def translations_en():
+    get_translations('en')
+
+
+@benchmark('translations.get[fallback]', group='translations')
+def translations_fallback():
+    get_translations('xx')
+
+
+@benchmark('translations.available', group='translations')
+def translations_available():
+    get_available_languages()
@@ -0,0 +1,108 @@
+"""
+Benchmarks: Flask-Routen über den Test-Client (ohne Netzwerk)
+"""
+
+import logging
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from harness import benchmark
+import web.app as web_app
+from utils.data_logger import DataLogger
+
+# Anfrage-Logging würde die Messung dominieren
+logging.getLogger('web.app').setLevel(logging.WARNING)
+logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
+_client = web_app.app.test_client()
+
+GET_ROUTES = (
+    '/',
+    '/settings',
+    '/api/status',
+    '/api/config',
+    '/api/pid/status',
+    '/api/history/temperature',
+    '/api/chart/bootstrap',
+    '/api/translations/de',
+    '/api/languages',
+    '/metrics',
+)
+
+
+def _register_get(route: str):
+    @benchmark(f'web.GET {route}', group='web', params={'route': route})
+    def get_route():
+        response = _client.get(route)
+        response.close()
+
+
+for _route in GET_ROUTES:
+    _register_get(_route)
+
+
+class _TempConfig:
+    """
+    Leitet das Speichern der Einstellungen auf eine Kopie der Konfiguration um
+    """
+    
+    def __init__(self):
+        self.directory = tempfile.mkdtemp(prefix='mgb_bench_')
+        self.original = web_app.config_path
+        web_app.config_path = Path(self.directory) / 'config.yaml'
+        shutil.copy(self.original, web_app.config_path)
+        self.payload = {
+            'sensors': {
+                name: {
+                    'target_value': web_app.config['sensors'][name]['target_value'],
+                    'tolerance': web_app.config['sensors'][name]['tolerance']
+                }
+                for name in ('temperature', 'humidity', 'co2')
+            },
+            'pid': {'adaptive': web_app.config['pid'].get('adaptive', True)}
+        }
+    
+    def close(self):
+        web_app.config_path = self.original
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+@benchmark('web.POST /api/settings', setup=_TempConfig, group='web')
+def post_settings(temp):
+    response = _client.post('/api/settings', json=temp.payload)
+    response.close()
+
+
+class _DayHistory:
+    """
+    Ein Tag Temperatur mit 1 Hz als Datenquelle der Verlaufs-API
+    """
+    
+    def __init__(self):
+        self.directory = tempfile.mkdtemp(prefix='mgb_bench_')
+        self.original = web_app.sample_reader
+        logger = DataLogger(str(Path(self.directory) / 'bench.db'), partition='month')
+        now = datetime.now().replace(microsecond=0)
+        logger.log_rows([
+            ((now - timedelta(seconds=86400 - i)).isoformat(), 'temperature', 22.0 + (i % 600) / 100, '°C', 'default')
+            for i in range(86400)
+        ])
+        web_app.sample_reader = logger
+    
+    def close(self):
+        web_app.sample_reader = self.original
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def _register_history(query: str):
+    @benchmark(f'web.GET /api/history/temperature?{query}[86400]', setup=_DayHistory, group='web',
+               params={'rows': 86400, 'query': query})
+    def get_history(_):
+        response = _client.get(f'/api/history/temperature?{query}')
+        response.close()
+
+
+for _query in ('points=300', 'points=1000', 'limit=1000'):
+    _register_history(_query)
@@ -0,0 +1,204 @@
+"""
+Messrahmen für die Benchmark-Suite: Registrierung, Zeitmessung, JSON-Ergebnisse
+und Vergleich mit einer Baseline
+"""
+
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+# Alle registrierten Benchmarks: Name -> Benchmark
+BENCHMARKS: Dict[str, 'Benchmark'] = {}
+
+
+class Benchmark:
+    """
+    Ein registrierter Benchmark
+    
+    ``setup`` wird einmal vor der Messung aufgerufen und liefert das
+    Argument für die gemessene Funktion (z.B. eine vorbereitete Datenbank).
+    """
+    
+    def __init__(self, name: str, func: Callable, setup: Optional[Callable] = None,
+                 group: str = '', params: Optional[Dict[str, Any]] = None,
+                 tags: tuple = ()):
+        self.name = name
+        self.func = func
+        self.setup = setup
+        self.group = group
+        self.params = params or {}
+        self.tags = tags
+
+
+def benchmark(name: str, setup: Optional[Callable] = None, group: str = '',
+              params: Optional[Dict[str, Any]] = None, tags: tuple = ()):
+    """
+    Dekorator zum Registrieren einer gemessenen Funktion
+    
+    Args:
+        name: Eindeutiger Name (wird als Schlüssel in der Baseline verwendet)
+        setup: Vorbereitung, deren Rückgabewert an die Funktion übergeben wird (optional)
+        group: Gruppe für die Ausgabe
+        params: Parameter, die mit dem Ergebnis gespeichert werden (optional)
+        tags: Markierungen, z.B. 'slow' für Benchmarks, die nur mit --full laufen
+    """
+    def decorator(func):
+        if name in BENCHMARKS:
+            raise ValueError(f"Benchmark '{name}' ist bereits registriert")
+        BENCHMARKS[name] = Benchmark(name, func, setup, group, params, tags)
+        return func
+    return decorator
+
+
+def measure(func: Callable[[], Any], min_time: float = 0.2, repeats: int = 5) -> Dict[str, Any]:
+    """
+    Misst eine Funktion wie ``timeit``: die Anzahl Aufrufe je Durchgang wird
+    so gewählt, dass ein Durchgang mindestens ``min_time`` Sekunden dauert
+    
+    Returns:
+        Kennzahlen in Sekunden pro Aufruf (Median, Minimum, Streuung)
+    """
+    func()  # Aufwärmen
+    
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+    
+    timings = [elapsed / number]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    
+    return {
+        'median': statistics.median(timings),
+        'min': min(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'number': number,
+        'repeats': repeats
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """
+    Beschreibt die Messumgebung (wird mit den Ergebnissen gespeichert)
+    """
+    info = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'system': platform.system(),
+        'node': platform.node(),
+        'cpu_count': os.cpu_count()
+    }
+    try:
+        with open('/proc/device-tree/model', 'r') as f:
+            info['model'] = f.read().strip('\x00\n')
+    except OSError:
+        pass
+    try:
+        import sqlite3
+        info['sqlite'] = sqlite3.sqlite_version
+    except ImportError:
+        pass
+    return info
+
+
+def run(names: List[str], min_time: float = 0.2, repeats: int = 5,
+        progress: Callable[[str], None] = print) -> Dict[str, Any]:
+    """
+    Führt die angegebenen Benchmarks aus
+    
+    Returns:
+        Ergebnisdokument (JSON-serialisierbar)
+    """
+    results = {}
+    for name in names:
+        bench = BENCHMARKS[name]
+        argument = bench.setup() if bench.setup else None
+        func = (lambda: bench.func(argument)) if bench.setup else bench.func
+        try:
+            result = measure(func, min_time, repeats)
+        finally:
+            cleanup = getattr(argument, 'close', None)
+            if callable(cleanup):
+                cleanup()
+        result.update({'group': bench.group, 'params': bench.params})
+        results[name] = result
+        progress(f"{name:<52} {format_time(result['median']):>10}  (±{format_time(result['stdev'])})")
+    
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment(),
+        'results': results
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any],
+            threshold: float = 10.0) -> List[Dict[str, Any]]:
+    """
+    Vergleicht zwei Ergebnisdokumente
+    
+    Als Regression gilt ein Median, der um mehr als ``threshold`` Prozent
+    und um mehr als die doppelte Streuung der Baseline über dem Baseline-Wert
+    liegt.
+    
+    Returns:
+        Zeilen mit Name, beiden Werten, Änderung in Prozent und Status
+    """
+    rows = []
+    base_results = baseline.get('results', {})
+    for name, result in sorted(current.get('results', {}).items()):
+        base = base_results.get(name)
+        if base is None:
+            rows.append({'name': name, 'baseline': None, 'current': result['median'],
+                         'change': None, 'status': 'neu'})
+            continue
+        change = (result['median'] / base['median'] - 1.0) * 100.0 if base['median'] else 0.0
+        noise = 2 * base.get('stdev', 0.0)
+        if change > threshold and result['median'] - base['median'] > noise:
+            status = 'REGRESSION'
+        elif change < -threshold and base['median'] - result['median'] > noise:
+            status = 'schneller'
+        else:
+            status = 'ok'
+        rows.append({'name': name, 'baseline': base['median'], 'current': result['median'],
+                     'change': change, 'status': status})
+    return rows
+
+
+def format_time(seconds: float) -> str:
+    """
+    Formatiert eine Laufzeit mit passender Einheit
+    """
+    for unit, factor in (('s', 1.0), ('ms', 1e-3), ('µs', 1e-6)):
+        if seconds >= factor:
+            return f"{seconds / factor:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def load(path: Path) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save(document: Dict[str, Any], path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2, ensure_ascii=False)
+        f.write('\n')
@@ -0,0 +1,451 @@
+"""
+Lasttest: simuliert N Browser-Clients gegen eine laufende Weboberfläche
+
+Jeder Client verhält sich wie ``index.html``/``main.js``: Seite und
+statische Dateien laden, Übersetzungen und Diagramm-Verlauf holen,
+Socket.IO-Verbindung aufbauen (``sensor_update``/``alarm`` empfangen) und
+alle 5 s ``/api/status`` abfragen. Nur mit ``--settings-interval`` speichert
+jeder Client in festen Abständen die Einstellungen (mit den aktuellen Werten;
+``config.yaml`` wird dabei neu geschrieben und verliert ihre Kommentare). Die Clientzahl wird stufenweise erhöht; je Stufe
+werden Durchsatz, Latenzen (p50/p95/p99), Fehlerquote sowie CPU und RSS
+des Servers (über ``/metrics`` oder ``/proc/<pid>``) ausgegeben.
+
+Aufruf:
+    python benchmarks/loadtest.py --url http://127.0.0.1:5000 --clients 1,5,10,25 --duration 60
+
+Socket.IO wird über Engine.IO-Long-Polling angesprochen (nur Standardbibliothek).
+Das entspricht Browsern, die nicht auf WebSocket umschalten, und ist für den
+Server der aufwendigere Fall.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+class Stats:
+    """
+    Latenzen und Fehler je Anfragetyp (thread-sicher)
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.events: Dict[str, int] = defaultdict(int)
+    
+    def record(self, kind: str, latency: float, ok: bool):
+        with self._lock:
+            self.latencies[kind].append(latency)
+            if not ok:
+                self.errors[kind] += 1
+    
+    def event(self, name: str):
+        with self._lock:
+            self.events[name] += 1
+    
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        with self._lock:
+            kinds = {kind: list(values) for kind, values in self.latencies.items()}
+            errors = dict(self.errors)
+            events = dict(self.events)
+        
+        result = {'kinds': {}, 'events': events}
+        all_latencies = []
+        for kind, values in sorted(kinds.items()):
+            all_latencies.extend(values)
+            result['kinds'][kind] = _describe(values, errors.get(kind, 0), elapsed)
+        result['total'] = _describe(all_latencies, sum(errors.values()), elapsed)
+        return result
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(percent / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def _describe(values: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    ordered = sorted(values)
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'error_rate': errors / len(ordered) if ordered else 0.0,
+        'throughput': len(ordered) / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': _percentile(ordered, 50) * 1000,
+        'p95_ms': _percentile(ordered, 95) * 1000,
+        'p99_ms': _percentile(ordered, 99) * 1000,
+        'max_ms': (ordered[-1] * 1000) if ordered else 0.0
+    }
+
+
+class HttpSession:
+    """
+    Eine Keep-Alive-Verbindung wie ein Browser-Tab
+    """
+    
+    def __init__(self, host: str, port: int, timeout: float = 30.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._conn: Optional[http.client.HTTPConnection] = None
+    
+    def request(self, method: str, path: str, body: Optional[bytes] = None,
+                headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        for attempt in range(2):
+            if self._conn is None:
+                self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self._conn.request(method, path, body=body, headers=headers or {})
+                response = self._conn.getresponse()
+                data = response.read()
+                if response.getheader('Connection', '').lower() == 'close':
+                    self.close()
+                return response.status, data
+            except (http.client.HTTPException, OSError):
+                self.close()
+                if attempt:
+                    raise
+        raise RuntimeError("unreachable")
+    
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class PollingSocket(threading.Thread):
+    """
+    Minimaler Socket.IO-Client (Engine.IO 4, Long-Polling)
+    """
+    
+    def __init__(self, host: str, port: int, stats: Stats, stop_event: threading.Event):
+        super().__init__(daemon=True)
+        self.session = HttpSession(host, port, timeout=60.0)
+        self.sender = HttpSession(host, port)
+        self.stats = stats
+        self.stop_event = stop_event
+        self.sid: Optional[str] = None
+    
+    def _path(self) -> str:
+        path = f"/socket.io/?EIO=4&transport=polling&t={time.time_ns()}"
+        return f"{path}&sid={self.sid}" if self.sid else path
+    
+    def _send(self, packet: str):
+        start = time.perf_counter()
+        try:
+            status, _ = self.sender.request('POST', self._path(), body=packet.encode('utf-8'),
+                                            headers={'Content-Type': 'text/plain;charset=UTF-8'})
+            ok = status == 200
+        except OSError:
+            ok = False
+        self.stats.record('socketio_send', time.perf_counter() - start, ok)
+    
+    def connect(self) -> bool:
+        start = time.perf_counter()
+        try:
+            status, data = self.session.request('GET', self._path())
+            ok = status == 200 and data.startswith(b'0')
+            if ok:
+                self.sid = json.loads(data[1:].decode('utf-8'))['sid']
+        except (OSError, ValueError, KeyError):
+            ok = False
+        self.stats.record('socketio_connect', time.perf_counter() - start, ok)
+        if ok:
+            self._send('40')
+        return ok
+    
+    def run(self):
+        while not self.stop_event.is_set():
+            start = time.perf_counter()
+            try:
+                status, data = self.session.request('GET', self._path())
+            except OSError:
+                self.stats.record('socketio_poll', time.perf_counter() - start, False)
+                return
+            if status != 200:
+                self.stats.record('socketio_poll', time.perf_counter() - start, False)
+                return
+            
+            for packet in data.decode('utf-8').split('\x1e'):
+                if packet == '2':
+                    self._send('3')  # Pong
+                elif packet.startswith('42'):
+                    try:
+                        name = json.loads(packet[2:])[0]
+                    except (ValueError, IndexError):
+                        name = 'invalid'
+                    self.stats.event(name)
+                elif packet.startswith('40'):
+                    self.stats.event('connect')
+                elif packet == '1':
+                    return
+    
+    def close(self):
+        if self.sid:
+            try:
+                self.sender.request('POST', self._path(), body=b'1',
+                                    headers={'Content-Type': 'text/plain;charset=UTF-8'})
+            except OSError:
+                pass
+        self.sender.close()
+        self.session.close()
+
+
+_ASSET_PATTERN = re.compile(r'(?:src|href)="(/static/[^"]+)"')
+
+
+class SimulatedClient(threading.Thread):
+    """
+    Ein Browser mit geöffnetem Dashboard
+    """
+    
+    def __init__(self, host: str, port: int, stats: Stats, stop_event: threading.Event,
+                 poll_interval: float, settings_interval: float, socketio: bool,
+                 start_delay: float):
+        super().__init__(daemon=True)
+        self.host = host
+        self.port = port
+        self.http = HttpSession(host, port)
+        self.stats = stats
+        self.stop_event = stop_event
+        self.poll_interval = poll_interval
+        self.settings_interval = settings_interval
+        self.use_socketio = socketio
+        self.start_delay = start_delay
+        self.socket: Optional[PollingSocket] = None
+    
+    def _get(self, kind: str, path: str) -> Optional[bytes]:
+        start = time.perf_counter()
+        try:
+            status, data = self.http.request('GET', path)
+            ok = status < 400
+        except OSError:
+            status, data, ok = 0, b'', False
+        self.stats.record(kind, time.perf_counter() - start, ok)
+        return data if ok else None
+    
+    def _post_json(self, kind: str, path: str, payload: Dict[str, Any]):
+        start = time.perf_counter()
+        try:
+            status, _ = self.http.request('POST', path, body=json.dumps(payload).encode('utf-8'),
+                                          headers={'Content-Type': 'application/json'})
+            ok = status < 400
+        except OSError:
+            ok = False
+        self.stats.record(kind, time.perf_counter() - start, ok)
+    
+    def load_page(self):
+        html = self._get('page', '/')
+        if html:
+            for asset in sorted(set(_ASSET_PATTERN.findall(html.decode('utf-8', 'replace')))):
+                self._get('static', asset)
+        self._get('api', '/api/languages')
+        self._get('api', '/api/translations/de')
+        self._get('api', '/api/chart/bootstrap?limit=50')
+    
+    def save_settings(self):
+        data = self._get('api', '/api/config')
+        if not data:
+            return
+        config = json.loads(data)
+        payload = {
+            'sensors': {
+                name: {
+                    'target_value': config['sensors'][name]['target_value'],
+                    'tolerance': config['sensors'][name]['tolerance']
+                }
+                for name in ('temperature', 'humidity', 'co2') if name in config.get('sensors', {})
+            },
+            'pid': {'adaptive': config.get('pid', {}).get('adaptive', True)}
+        }
+        self._post_json('settings', '/api/settings', payload)
+    
+    def run(self):
+        if self.stop_event.wait(self.start_delay):
+            return
+        self.load_page()
+        
+        if self.use_socketio:
+            self.socket = PollingSocket(self.host, self.port, self.stats, self.stop_event)
+            if self.socket.connect():
+                self.socket.start()
+        
+        next_poll = time.monotonic()
+        next_settings = time.monotonic() + random.uniform(0, self.settings_interval) if self.settings_interval else None
+        while not self.stop_event.is_set():
+            now = time.monotonic()
+            if now >= next_poll:
+                self._get('status', '/api/status')
+                next_poll += self.poll_interval
+            if next_settings is not None and now >= next_settings:
+                self.save_settings()
+                next_settings += self.settings_interval
+            wake = next_poll if next_settings is None else min(next_poll, next_settings)
+            self.stop_event.wait(max(0.0, wake - time.monotonic()))
+        
+        if self.socket is not None:
+            self.socket.close()
+        self.http.close()
+
+
+class ServerProbe(threading.Thread):
+    """
+    Misst CPU-Zeit und RSS des Servers während einer Stufe
+    """
+    
+    _METRIC_PATTERN = re.compile(r'^(process_cpu_seconds_total|process_resident_memory_bytes) (\S+)$', re.M)
+    
+    def __init__(self, host: str, port: int, pid: Optional[int], interval: float = 2.0):
+        super().__init__(daemon=True)
+        self.http = HttpSession(host, port)
+        self.pid = pid
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.samples: List[Tuple[float, float, float]] = []  # (Zeit, CPU-Sekunden, RSS)
+    
+    def _read(self) -> Optional[Tuple[float, float]]:
+        if self.pid:
+            try:
+                with open(f'/proc/{self.pid}/stat', 'r') as f:
+                    fields = f.read().rsplit(')', 1)[1].split()
+                with open(f'/proc/{self.pid}/statm', 'r') as f:
+                    rss_pages = int(f.read().split()[1])
+                ticks = os.sysconf('SC_CLK_TCK')
+                return (int(fields[11]) + int(fields[12])) / ticks, rss_pages * os.sysconf('SC_PAGE_SIZE')
+            except (OSError, IndexError, ValueError):
+                return None
+        try:
+            status, data = self.http.request('GET', '/metrics')
+        except OSError:
+            return None
+        if status != 200:
+            return None
+        values = dict(self._METRIC_PATTERN.findall(data.decode('utf-8', 'replace')))
+        if len(values) < 2:
+            return None
+        return float(values['process_cpu_seconds_total']), float(values['process_resident_memory_bytes'])
+    
+    def run(self):
+        while True:
+            reading = self._read()
+            if reading:
+                self.samples.append((time.monotonic(), *reading))
+            if self.stop_event.wait(self.interval):
+                reading = self._read()
+                if reading:
+                    self.samples.append((time.monotonic(), *reading))
+                return
+    
+    def summary(self) -> Dict[str, Any]:
+        if len(self.samples) < 2:
+            return {'cpu_percent': None, 'rss_mb_max': None}
+        (t0, cpu0, _), (t1, cpu1, _) = self.samples[0], self.samples[-1]
+        return {
+            'cpu_percent': (cpu1 - cpu0) / (t1 - t0) * 100 if t1 > t0 else None,
+            'rss_mb_max': max(rss for _, _, rss in self.samples) / 1024 / 1024,
+            'rss_mb_end': self.samples[-1][2] / 1024 / 1024
+        }
+
+
+def run_step(args, host: str, port: int, clients: int) -> Dict[str, Any]:
+    """
+    Führt eine Laststufe mit ``clients`` gleichzeitigen Clients aus
+    """
+    stats = Stats()
+    stop_event = threading.Event()
+    probe = ServerProbe(host, port, args.pid)
+    
+    # Start über ein Abfrageintervall verteilen, wie bei nacheinander geöffneten Tabs
+    workers = [
+        SimulatedClient(host, port, stats, stop_event, args.poll_interval, args.settings_interval,
+                        not args.no_socketio, start_delay=i * args.poll_interval / clients)
+        for i in range(clients)
+    ]
+    
+    probe.start()
+    start = time.monotonic()
+    for worker in workers:
+        worker.start()
+    stop_event.wait(args.duration)
+    stop_event.set()
+    elapsed = time.monotonic() - start
+    for worker in workers:
+        worker.join(timeout=10)
+    probe.stop_event.set()
+    probe.join(timeout=10)
+    
+    result = stats.summary(elapsed)
+    result.update({'clients': clients, 'duration': elapsed, 'server': probe.summary()})
+    return result
+
+
+def print_step(result: Dict[str, Any]):
+    total = result['total']
+    server = result['server']
+    cpu = f"{server['cpu_percent']:.1f}%" if server.get('cpu_percent') is not None else '-'
+    rss = f"{server['rss_mb_max']:.1f} MB" if server.get('rss_mb_max') is not None else '-'
+    print(f"\n== {result['clients']} Clients, {result['duration']:.0f} s: "
+          f"{total['throughput']:.1f} Anfragen/s, Fehler {total['error_rate'] * 100:.2f}%, "
+          f"Server-CPU {cpu}, RSS max {rss}")
+    print(f"   {'Typ':<18} {'Anzahl':>7} {'/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'Fehler':>7}")
+    for kind, row in result['kinds'].items():
+        print(f"   {kind:<18} {row['requests']:>7} {row['throughput']:>7.2f} {row['p50_ms']:>8.1f} "
+              f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['errors']:>7}")
+    if result['events']:
+        print("   Socket.IO-Ereignisse: " + ', '.join(f"{name}={count}" for name, count in sorted(result['events'].items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lasttest für die Weboberfläche der MGB")
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help="Adresse des laufenden Servers")
+    parser.add_argument('--clients', default='1,5,10,25', help="Clientzahlen je Stufe, kommagetrennt")
+    parser.add_argument('--duration', type=float, default=60.0, help="Dauer je Stufe in Sekunden")
+    parser.add_argument('--poll-interval', type=float, default=5.0, help="Abfrageintervall von /api/status (main.js)")
+    parser.add_argument('--settings-interval', type=float, default=0.0,
+                        help="Einstellungen je Client alle N Sekunden speichern (Standard 0 = nie; "
+                             "schreibt config.yaml ohne Kommentare neu)")
+    parser.add_argument('--no-socketio', action='store_true', help="Keine Socket.IO-Verbindungen aufbauen")
+    parser.add_argument('--pid', type=int, help="Server-Prozess für CPU/RSS (sonst über /metrics)")
+    parser.add_argument('--pause', type=float, default=5.0, help="Pause zwischen den Stufen in Sekunden")
+    parser.add_argument('-o', '--output', help="Ergebnisse als JSON speichern")
+    args = parser.parse_args()
+    
+    url = urlsplit(args.url)
+    host, port = url.hostname or '127.0.0.1', url.port or 80
+    steps = [int(value) for value in args.clients.split(',') if value.strip()]
+    
+    results = []
+    for index, clients in enumerate(steps):
+        if index:
+            time.sleep(args.pause)
+        result = run_step(args, host, port, clients)
+        print_step(result)
+        results.append(result)
+    
+    if args.output:
+        document = {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'url': args.url,
+            'settings': {key: value for key, value in vars(args).items() if key != 'output'},
+            'steps': results
+        }
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+        print(f"\nErgebnisse gespeichert: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""
+Benchmark-Suite für die MGB - Mushroom Grow Box
+
+Aufruf:
+    python benchmarks/run.py list
+    python benchmarks/run.py run [-k pid] [--full] [-o ergebnis.json] [--save-baseline]
+    python benchmarks/run.py compare [BASELINE] [ERGEBNIS] [--threshold 10]
+
+Ohne ERGEBNIS misst ``compare`` neu und vergleicht mit der Baseline
+(Standard: benchmarks/baselines/<Rechnername>.json). Der Exit-Code ist 1,
+wenn eine Regression gefunden wurde.
+"""
+
+import argparse
+import fnmatch
+import importlib
+import platform
+import sys
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).parent
+sys.path.insert(0, str(BENCH_DIR))
+
+import harness
+
+BASELINE_DIR = BENCH_DIR / 'baselines'
+
+
+def discover():
+    """
+    Importiert alle bench_*.py-Module (fehlende Abhängigkeiten werden gemeldet)
+    """
+    for path in sorted(BENCH_DIR.glob('bench_*.py')):
+        try:
+            importlib.import_module(path.stem)
+        except ImportError as e:
+            print(f"Übersprungen: {path.name} ({e})", file=sys.stderr)
+
+
+def select(patterns, full: bool):
+    """
+    Wählt Benchmarks nach Namensmustern aus
+    """
+    names = []
+    for name, bench in harness.BENCHMARKS.items():
+        if 'slow' in bench.tags and not full:
+            continue
+        if patterns and not any(fnmatch.fnmatch(name, f"*{pattern}*") for pattern in patterns):
+            continue
+        names.append(name)
+    return names
+
+
+def default_baseline() -> Path:
+    return BASELINE_DIR / f"{platform.node() or 'default'}.json"
+
+
+def run_selected(args):
+    names = select(args.k, args.full)
+    if not names:
+        print("Keine Benchmarks ausgewählt", file=sys.stderr)
+        sys.exit(2)
+    return harness.run(names, min_time=args.min_time, repeats=args.repeats)
+
+
+def cmd_list(args):
+    for name in select(args.k, True):
+        bench = harness.BENCHMARKS[name]
+        suffix = '  [--full]' if 'slow' in bench.tags else ''
+        print(f"{name}{suffix}")
+
+
+def cmd_run(args):
+    document = run_selected(args)
+    if args.output:
+        harness.save(document, Path(args.output))
+        print(f"Ergebnisse gespeichert: {args.output}")
+    if args.save_baseline:
+        path = Path(args.save_baseline) if args.save_baseline is not True else default_baseline()
+        if path.exists():
+            # Bestehende Einträge behalten, nur die gemessenen ersetzen
+            previous = harness.load(path)
+            previous['results'].update(document['results'])
+            previous.update({'created': document['created'], 'environment': document['environment']})
+            document = previous
+        harness.save(document, path)
+        print(f"Baseline gespeichert: {path}")
+
+
+def cmd_compare(args):
+    baseline_path = Path(args.baseline) if args.baseline else default_baseline()
+    if not baseline_path.exists():
+        print(f"Baseline nicht gefunden: {baseline_path}", file=sys.stderr)
+        sys.exit(2)
+    baseline = harness.load(baseline_path)
+    
+    if args.current:
+        current = harness.load(Path(args.current))
+    else:
+        names = select(args.k, args.full)
+        if not args.k:
+            # Ohne Auswahl genau das messen, was die Baseline enthält
+            names = [name for name in select(None, True) if name in baseline.get('results', {})]
+        current = harness.run(names, min_time=args.min_time, repeats=args.repeats)
+    
+    if baseline.get('environment', {}).get('machine') != current.get('environment', {}).get('machine'):
+        print("Warnung: Baseline wurde auf einer anderen Hardware gemessen", file=sys.stderr)
+    
+    rows = harness.compare(baseline, current, args.threshold)
+    print(f"\n{'Benchmark':<52} {'Baseline':>10} {'Aktuell':>10} {'Änderung':>9}  Status")
+    for row in rows:
+        base = harness.format_time(row['baseline']) if row['baseline'] is not None else '-'
+        change = f"{row['change']:+.1f}%" if row['change'] is not None else '-'
+        print(f"{row['name']:<52} {base:>10} {harness.format_time(row['current']):>10} {change:>9}  {row['status']}")
+    
+    regressions = [row for row in rows if row['status'] == 'REGRESSION']
+    if regressions:
+        print(f"\n{len(regressions)} Regression(en) über {args.threshold:.0f}%")
+        sys.exit(1)
+    print("\nKeine Regressionen")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark-Suite der MGB")
+    sub = parser.add_subparsers(dest='command')
+    
+    def add_selection(p):
+        p.add_argument('-k', action='append', help="Nur Benchmarks, deren Name das Muster enthält")
+        p.add_argument('--full', action='store_true', help="Auch langsame Benchmarks (10^6/10^7 Zeilen)")
+        p.add_argument('--min-time', type=float, default=0.2, help="Mindestdauer je Durchgang in Sekunden")
+        p.add_argument('--repeats', type=int, default=5, help="Anzahl Durchgänge")
+    
+    p_list = sub.add_parser('list', help="Verfügbare Benchmarks anzeigen")
+    p_list.add_argument('-k', action='append')
+    
+    p_run = sub.add_parser('run', help="Benchmarks ausführen")
+    add_selection(p_run)
+    p_run.add_argument('-o', '--output', help="Ergebnisse als JSON speichern")
+    p_run.add_argument('--save-baseline', nargs='?', const=True,
+                       help="Ergebnisse als Baseline speichern (Standard: baselines/<Rechnername>.json)")
+    
+    p_compare = sub.add_parser('compare', help="Mit einer Baseline vergleichen")
+    p_compare.add_argument('baseline', nargs='?', help="Baseline-Datei")
+    p_compare.add_argument('current', nargs='?', help="Ergebnis-Datei (ohne: neu messen)")
+    p_compare.add_argument('--threshold', type=float, default=10.0,
+                           help="Schwelle für Regressionen in Prozent")
+    add_selection(p_compare)
+    
+    args = parser.parse_args()
+    discover()
+    
+    if args.command == 'list':
+        cmd_list(args)
+    elif args.command == 'compare':
+        cmd_compare(args)
+    else:
+        if args.command is None:
+            args = parser.parse_args(['run'])
+        cmd_run(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,5 +3,6 @@ Aktormodule für die MGB - Mushroom Grow Box
 """
 
 from .base_actuator import BaseActuator
+from .relay_actuator import RelayActuator
 
-__all__ = ['BaseActuator']
+__all__ = ['BaseActuator', 'RelayActuator']
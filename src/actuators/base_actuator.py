@@ -2,10 +2,15 @@
 Basis-Klasse für alle Aktoren
 """
 
+import sys
 from abc import ABC, abstractmethod
 from datetime import datetime
+from pathlib import Path
 from typing import Optional, Dict, Any
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.records import ActuatorEvent
+
 
 class BaseActuator(ABC):
     """
@@ -24,7 +29,29 @@ class BaseActuator(ABC):
         self.actuator_type = actuator_type
         self.is_active: bool = False
         self.is_available: bool = False
-        self.last_state_change: Optional[datetime] = None
+        self.last_event: Optional[ActuatorEvent] = None
+    
+    @property
+    def last_state_change(self) -> Optional[datetime]:
+        """
+        Zeitpunkt der letzten Zustandsänderung
+        """
+        return datetime.fromtimestamp(self.last_event.timestamp) if self.last_event else None
+    
+    def _record_state(self, state: bool) -> ActuatorEvent:
+        """
+        Übernimmt einen neuen Zustand (von turn_on/turn_off aufzurufen)
+        
+        Args:
+            state: Neuer Zustand (True=Ein, False=Aus)
+            
+        Returns:
+            ActuatorEvent der Zustandsänderung
+        """
+        event = ActuatorEvent(self.name, state)
+        self.is_active = event.state
+        self.last_event = event
+        return event
     
     @abstractmethod
     def turn_on(self) -> bool:
@@ -63,10 +90,11 @@ class BaseActuator(ABC):
         Returns:
             Dictionary mit Statusinformationen
         """
+        event = self.last_event
         return {
             'name': self.name,
             'type': self.actuator_type,
             'active': self.is_active,
             'available': self.is_available,
-            'last_state_change': self.last_state_change.isoformat() if self.last_state_change else None
+            'last_state_change': event.isoformat() if event else None
         }
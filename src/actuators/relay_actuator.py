@@ -0,0 +1,81 @@
+"""
+Ein/Aus-Aktor an einem GPIO-Pin (Relais bzw. MOSFET)
+"""
+
+import logging
+from typing import Any, Dict
+
+from .base_actuator import BaseActuator
+
+try:
+    import RPi.GPIO as GPIO
+except (ImportError, RuntimeError):  # Kein Raspberry Pi: Zustand nur simulieren
+    GPIO = None
+
+logger = logging.getLogger(__name__)
+
+
+class RelayActuator(BaseActuator):
+    """
+    Schaltet einen GPIO-Pin (BCM-Nummerierung) ein und aus
+    
+    Ohne RPi.GPIO (Entwicklungsrechner) wird der Zustand nur übernommen,
+    aber an keinen Pin ausgegeben.
+    """
+    
+    def __init__(self, name: str, actuator_type: str, pin: int, active_low: bool = False):
+        """
+        Args:
+            name: Name des Aktors
+            actuator_type: Typ des Aktors (z.B. "pump", "heater", "fan")
+            pin: GPIO-Pin (BCM)
+            active_low: Relaismodul schaltet bei LOW ein
+        """
+        super().__init__(name, actuator_type)
+        self.pin = pin
+        self.active_low = active_low
+    
+    @classmethod
+    def from_config(cls, name: str, actuator_config: Dict[str, Any]) -> 'RelayActuator':
+        """
+        Erstellt den Aktor aus seinem Abschnitt unter 'actuators' der Konfiguration
+        """
+        return cls(name, actuator_config.get('type', name), actuator_config['pin'],
+                   active_low=actuator_config.get('active_low', False))
+    
+    def _level(self, state: bool) -> bool:
+        return state != self.active_low
+    
+    def initialize(self) -> bool:
+        if GPIO is None:
+            logger.info(f"RPi.GPIO nicht verfügbar - simuliere Aktor '{self.name}' (Pin {self.pin})")
+            self.is_available = True
+            return True
+        
+        try:
+            GPIO.setmode(GPIO.BCM)
+            GPIO.setup(self.pin, GPIO.OUT, initial=self._level(False))
+        except Exception as e:
+            logger.error(f"Aktor '{self.name}' (Pin {self.pin}) nicht initialisierbar: {e}")
+            self.is_available = False
+            return False
+        self.is_available = True
+        return True
+    
+    def _write(self, state: bool) -> bool:
+        if not self.is_available:
+            return False
+        if GPIO is not None:
+            try:
+                GPIO.output(self.pin, self._level(state))
+            except Exception as e:
+                logger.error(f"Fehler beim Schalten von '{self.name}' (Pin {self.pin}): {e}")
+                return False
+        self._record_state(state)
+        return True
+    
+    def turn_on(self) -> bool:
+        return self._write(True)
+    
+    def turn_off(self) -> bool:
+        return self._write(False)
@@ -3,5 +3,11 @@ Controller-Module für die Regelung der MGB - Mushroom Grow Box
 """
 
 from .pid_controller import PIDController
+from .actuator_controller import ActuatorController, GuardedActuator
+from .output_scheduler import OutputScheduler, TimeProportionalOutput
+from .alarm_engine import AlarmEngine
+from .chamber import Chamber, build_chambers
 
-__all__ = ['PIDController']
+__all__ = ['PIDController', 'ActuatorController', 'GuardedActuator',
+           'OutputScheduler', 'TimeProportionalOutput', 'AlarmEngine',
+           'Chamber', 'build_chambers']
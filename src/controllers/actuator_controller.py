@@ -0,0 +1,322 @@
+"""
+Befehlsschicht für Aktoren mit Unterdrückung redundanter Schaltbefehle
+und Laufzeitschutz (Mindest-/Maximallaufzeit, Abkühlzeit)
+"""
+
+import sys
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from actuators.base_actuator import BaseActuator
+from utils.data_logger import DataLogger
+from utils.scheduler import DeadlineScheduler, ScheduledCall
+
+logger = logging.getLogger(__name__)
+
+
+class GuardedActuator:
+    """
+    Schaltet einen Aktor nur bei Zustandswechsel und hält die
+    konfigurierten Laufzeitgrenzen ein
+    
+    Befehle werden pro Gerät serialisiert. Es zählt immer der zuletzt
+    angeforderte Zustand: Kann er wegen Mindestlaufzeit oder Abkühlzeit
+    noch nicht gesetzt werden, wird ein Aufruf im gemeinsamen Scheduler auf
+    den frühestmöglichen Zeitpunkt gelegt. Ein neuerer Befehl ersetzt den
+    wartenden. Schlägt das Schalten fehl, wird es mit wachsendem Abstand
+    wiederholt; solange der Aktor läuft, bleibt die Maximallaufzeit dabei
+    immer eingeplant.
+    """
+    
+    def __init__(self, actuator: BaseActuator,
+                 scheduler: DeadlineScheduler,
+                 data_logger: Optional[DataLogger] = None,
+                 min_runtime: float = 0.0,
+                 max_runtime: Optional[float] = None,
+                 cooldown: float = 0.0,
+                 retry_backoff: float = 1.0,
+                 retry_max: float = 60.0):
+        """
+        Initialisiert den geschützten Aktor
+        
+        Args:
+            actuator: Zu steuernder Aktor
+            scheduler: Gemeinsamer Scheduler für verzögerte Schaltbefehle
+            data_logger: DataLogger für Zustandsänderungen (optional)
+            min_runtime: Mindestlaufzeit nach dem Einschalten in Sekunden
+            max_runtime: Maximale Laufzeit in Sekunden (optional)
+            cooldown: Mindestpause zwischen Aus- und erneutem Einschalten in Sekunden
+            retry_backoff: Wartezeit vor der ersten Wiederholung eines fehlgeschlagenen
+                Schaltbefehls in Sekunden (verdoppelt sich)
+            retry_max: Längste Wartezeit zwischen zwei Wiederholungen in Sekunden
+        """
+        self.actuator = actuator
+        self.scheduler = scheduler
+        self.data_logger = data_logger
+        self.min_runtime = min_runtime
+        self.max_runtime = max_runtime
+        self.cooldown = cooldown
+        self.retry_backoff = retry_backoff
+        self.retry_max = retry_max
+        
+        self._lock = threading.RLock()
+        self._desired: Optional[bool] = None
+        self._timer: Optional[ScheduledCall] = None
+        self._timer_generation = 0
+        self._on_since: Optional[float] = None
+        self._off_since: Optional[float] = None
+        self._failures = 0
+        
+        # Statistik
+        self.commands = 0
+        self.writes = 0
+        self.suppressed = 0
+        self.failures = 0
+    
+    @property
+    def name(self) -> str:
+        return self.actuator.name
+    
+    @property
+    def pending(self) -> bool:
+        """
+        True, wenn ein verzögerter Schaltbefehl wartet
+        """
+        return self._timer is not None
+    
+    def request(self, state: bool) -> bool:
+        """
+        Fordert einen Zustand an
+        
+        Args:
+            state: Gewünschter Zustand (True=Ein, False=Aus)
+        
+        Returns:
+            True, wenn der Zustand jetzt anliegt, False bei Verzögerung oder Fehler
+        """
+        with self._lock:
+            self.commands += 1
+            self._desired = bool(state)
+            return self._apply()
+    
+    def force_off(self) -> bool:
+        """
+        Schaltet sofort aus, ohne Mindestlaufzeit (z.B. beim Herunterfahren)
+        
+        Returns:
+            True bei Erfolg
+        """
+        with self._lock:
+            self._desired = False
+            self._cancel_timer()
+            if not self.actuator.is_active:
+                return True
+            if not self._switch(False, time.monotonic()):
+                self._schedule_retry(self._on_timer)
+                return False
+            return True
+    
+    def _apply(self) -> bool:
+        """
+        Setzt den gewünschten Zustand unter Beachtung der Laufzeitgrenzen
+        (Aufruf nur mit gehaltenem Lock)
+        """
+        self._cancel_timer()
+        desired = self._desired
+        now = time.monotonic()
+        
+        if desired == self.actuator.is_active:
+            self.suppressed += 1
+            if desired:
+                self._schedule_max_runtime(now)
+            return True
+        
+        if desired:
+            if self._off_since is not None and now - self._off_since < self.cooldown:
+                self._schedule(self._off_since + self.cooldown - now, self._on_timer)
+                return False
+        else:
+            if self._on_since is not None and now - self._on_since < self.min_runtime:
+                self._schedule(self._on_since + self.min_runtime - now, self._on_timer)
+                return False
+        
+        if not self._switch(desired, now):
+            # Gewünschten Zustand behalten und erneut versuchen
+            self._schedule_retry(self._on_timer)
+            return False
+        
+        if desired:
+            self._schedule_max_runtime(now)
+        return True
+    
+    def _switch(self, state: bool, now: float) -> bool:
+        """
+        Schreibt den Zustand auf die Hardware und protokolliert ihn
+        """
+        try:
+            ok = self.actuator.turn_on() if state else self.actuator.turn_off()
+        except Exception as e:
+            logger.error(f"Fehler beim Schalten von '{self.name}': {e}")
+            ok = False
+        
+        if not ok:
+            self._failures += 1
+            self.failures += 1
+            logger.warning(f"Aktor '{self.name}' konnte nicht geschaltet werden ({self._failures}. Versuch)")
+            return False
+        
+        self._failures = 0
+        self.writes += 1
+        event = self.actuator.last_event
+        if self.actuator.is_active != state or event is None or event.state != state:
+            # Aktor-Implementierung hat den Zustand nicht selbst übernommen
+            event = self.actuator._record_state(state)
+        
+        if state:
+            self._on_since = now
+        else:
+            self._off_since = now
+            self._on_since = None
+        
+        if self.data_logger is not None:
+            self.data_logger.queue_actuator_event(event)
+        return True
+    
+    def _schedule_max_runtime(self, now: float):
+        if self.max_runtime and self._on_since is not None:
+            remaining = self._on_since + self.max_runtime - now
+            self._schedule(max(0.0, remaining), self._on_max_runtime)
+    
+    def _schedule_retry(self, callback):
+        delay = min(self.retry_backoff * 2 ** (self._failures - 1), self.retry_max)
+        self._schedule(delay, callback)
+    
+    def _schedule(self, delay: float, callback):
+        # Es gibt nur einen Timer: läuft der Aktor, darf er die Maximallaufzeit nicht überspringen
+        if self.max_runtime and self._on_since is not None and self.actuator.is_active:
+            remaining = self._on_since + self.max_runtime - time.monotonic()
+            if 0 < remaining < delay:
+                delay, callback = remaining, self._on_max_runtime
+        self._cancel_timer()
+        generation = self._timer_generation
+        self._timer = self.scheduler.call_later(delay, lambda: callback(generation))
+    
+    def _cancel_timer(self):
+        # Eine neue Generation macht bereits gestartete Callbacks wirkungslos
+        self._timer_generation += 1
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+    
+    def _on_timer(self, generation: int):
+        with self._lock:
+            if generation != self._timer_generation:
+                return
+            self._timer = None
+            self._apply()
+    
+    def _on_max_runtime(self, generation: int):
+        with self._lock:
+            if generation != self._timer_generation:
+                return
+            self._timer = None
+            if self.actuator.is_active:
+                logger.info(f"Maximale Laufzeit von '{self.name}' erreicht - schalte aus")
+                self._desired = False
+                if not self._switch(False, time.monotonic()):
+                    # Ohne Mindestlaufzeit erneut versuchen, bis der Aktor aus ist
+                    self._schedule_retry(self._on_max_runtime)
+    
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Gibt den Status inkl. Schutzfunktionen zurück
+        """
+        status = self.actuator.get_status()
+        status.update({
+            'desired': self._desired,
+            'pending': self.pending,
+            'commands': self.commands,
+            'writes': self.writes,
+            'suppressed': self.suppressed,
+            'failures': self.failures
+        })
+        return status
+
+
+class ActuatorController:
+    """
+    Verwaltet alle Aktoren über die geschützte Befehlsschicht
+    """
+    
+    def __init__(self, data_logger: Optional[DataLogger] = None,
+                 scheduler: Optional[DeadlineScheduler] = None):
+        """
+        Initialisiert den Controller
+        
+        Args:
+            data_logger: DataLogger für Zustandsänderungen (optional)
+            scheduler: Gemeinsamer Scheduler (optional, sonst eigener)
+        """
+        self.data_logger = data_logger
+        self.scheduler = scheduler or DeadlineScheduler()
+        self.scheduler.start()
+        self.actuators: Dict[str, GuardedActuator] = {}
+    
+    def add(self, actuator: BaseActuator, actuator_config: Optional[Dict[str, Any]] = None) -> GuardedActuator:
+        """
+        Registriert einen Aktor
+        
+        Args:
+            actuator: Aktor-Instanz
+            actuator_config: Abschnitt des Aktors aus config.yaml (optional)
+        
+        Returns:
+            GuardedActuator des Aktors
+        """
+        actuator_config = actuator_config or {}
+        guarded = GuardedActuator(
+            actuator,
+            self.scheduler,
+            data_logger=self.data_logger,
+            min_runtime=actuator_config.get('min_runtime', 0.0),
+            max_runtime=actuator_config.get('max_runtime'),
+            cooldown=actuator_config.get('cooldown', 0.0),
+            retry_backoff=actuator_config.get('retry_backoff', 1.0),
+            retry_max=actuator_config.get('retry_max', 60.0)
+        )
+        self.actuators[actuator.name] = guarded
+        return guarded
+    
+    def set_state(self, name: str, state: bool) -> bool:
+        """
+        Fordert einen Zustand für einen Aktor an
+        
+        Args:
+            name: Name des Aktors
+            state: Gewünschter Zustand
+        
+        Returns:
+            True, wenn der Zustand jetzt anliegt
+        """
+        if name not in self.actuators:
+            raise KeyError(f"Unbekannter Aktor: {name}")
+        return self.actuators[name].request(state)
+    
+    def all_off(self):
+        """
+        Schaltet alle Aktoren sofort aus
+        """
+        for guarded in self.actuators.values():
+            guarded.force_off()
+        if self.data_logger is not None:
+            self.data_logger.flush()
+    
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Gibt den Status aller Aktoren zurück
+        """
+        return {name: guarded.get_status() for name, guarded in self.actuators.items()}
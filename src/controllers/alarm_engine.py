@@ -0,0 +1,162 @@
+"""
+Inkrementelle Alarmauswertung mit Hysterese, Verzögerung und Deduplizierung
+"""
+
+import sys
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.records import Sample, AlarmEvent
+from utils.data_logger import DataLogger
+
+logger = logging.getLogger(__name__)
+
+
+class _Limit:
+    """
+    Einzelne Grenze eines Sensors mit ihrem Auswertungszustand
+    """
+    
+    __slots__ = ('alarm_type', 'sensor', 'kind', 'threshold', 'severity',
+                 'hysteresis', 'violating_since', 'active')
+    
+    def __init__(self, sensor: str, kind: str, threshold: float, severity: str, hysteresis: float):
+        self.sensor = sensor
+        self.kind = kind  # 'min' oder 'max'
+        self.threshold = float(threshold)
+        self.severity = severity
+        self.hysteresis = hysteresis
+        suffix = 'critical_' if severity == 'critical' else ''
+        self.alarm_type = f"{sensor}_{suffix}{kind}"
+        self.violating_since: Optional[float] = None
+        self.active: Optional[AlarmEvent] = None
+    
+    def is_violated(self, value: float) -> bool:
+        if self.kind == 'max':
+            return value > self.threshold
+        return value < self.threshold
+    
+    def is_cleared(self, value: float) -> bool:
+        if self.kind == 'max':
+            return value <= self.threshold - self.hysteresis
+        return value >= self.threshold + self.hysteresis
+
+
+class AlarmEngine:
+    """
+    Prüft jeden neuen Messwert gegen die kritischen Grenzen (``alarms``)
+    und die Sensorgrenzen (``sensors.<name>.min_value/max_value``)
+    
+    Die Grenzen werden beim Start je Sensor vorberechnet, die Auswertung
+    eines Messwerts kostet damit konstant wenige Vergleiche. Ein Alarm wird
+    erst ausgelöst, wenn die Grenzverletzung ``hold_off`` Sekunden ansteht,
+    und erst aufgehoben, wenn der Wert um die Hysterese in den zulässigen
+    Bereich zurückgekehrt ist. Solange ein Alarm aktiv ist, entstehen keine
+    weiteren Datenbankzeilen oder Socket.IO-Nachrichten.
+    """
+    
+    def __init__(self, config: dict,
+                 data_logger: Optional[DataLogger] = None,
+                 on_alarm: Optional[Callable[[AlarmEvent], None]] = None):
+        """
+        Initialisiert die Alarmauswertung
+        
+        Args:
+            config: Konfiguration
+            data_logger: DataLogger für Alarme (optional)
+            on_alarm: Callback für neu ausgelöste Alarme (optional)
+        """
+        self.data_logger = data_logger
+        self.on_alarm = on_alarm
+        self._lock = threading.Lock()
+        self._active: Dict[str, AlarmEvent] = {}
+        
+        alarm_config = config.get('alarms', {})
+        self.hold_off = alarm_config.get('hold_off', 0.0)
+        hysteresis = alarm_config.get('hysteresis', {})
+        
+        self._limits: Dict[str, List[_Limit]] = {}
+        for sensor, sensor_config in config.get('sensors', {}).items():
+            sensor_hysteresis = hysteresis.get(sensor, 0.0)
+            limits = []
+            for kind in ('min', 'max'):
+                critical = alarm_config.get(f"{sensor}_critical_{kind}")
+                if critical is not None:
+                    limits.append(_Limit(sensor, kind, critical, 'critical', sensor_hysteresis))
+                warning = sensor_config.get(f"{kind}_value")
+                if warning is not None:
+                    limits.append(_Limit(sensor, kind, warning, 'warning', sensor_hysteresis))
+            if limits:
+                self._limits[sensor] = limits
+    
+    def evaluate(self, sample: Sample) -> List[AlarmEvent]:
+        """
+        Prüft einen Messwert gegen alle Grenzen seines Sensors
+        
+        Args:
+            sample: Neuer Messwert
+        
+        Returns:
+            Liste der neu ausgelösten Alarme
+        """
+        limits = self._limits.get(sample.sensor)
+        if not limits:
+            return []
+        
+        raised = []
+        value = sample.value
+        now = sample.monotonic
+        
+        with self._lock:
+            for limit in limits:
+                if limit.active is not None:
+                    if limit.is_cleared(value):
+                        logger.info(f"Alarm aufgehoben: {limit.alarm_type} ({value:.1f} {sample.unit})")
+                        limit.active = None
+                        limit.violating_since = None
+                        self._active.pop(limit.alarm_type, None)
+                    continue
+                
+                if not limit.is_violated(value):
+                    limit.violating_since = None
+                    continue
+                
+                if limit.violating_since is None:
+                    limit.violating_since = now
+                if now - limit.violating_since < self.hold_off:
+                    continue
+                
+                direction = 'über Maximum' if limit.kind == 'max' else 'unter Minimum'
+                event = AlarmEvent(
+                    limit.alarm_type,
+                    f"{sample.sensor} {direction}: {value:.1f} {sample.unit} "
+                    f"(Grenze {limit.threshold:g} {sample.unit})",
+                    severity=limit.severity,
+                    value=value,
+                    timestamp=sample.timestamp,
+                    monotonic=now
+                )
+                limit.active = event
+                self._active[limit.alarm_type] = event
+                raised.append(event)
+        
+        for event in raised:
+            logger.warning(f"Alarm: {event.message}")
+            if self.data_logger is not None:
+                self.data_logger.queue_alarm_event(event)
+            if self.on_alarm is not None:
+                self.on_alarm(event)
+        
+        return raised
+    
+    def active_alarms(self) -> List[Dict[str, Any]]:
+        """
+        Gibt alle aktiven Alarme zurück (kritische zuerst)
+        """
+        with self._lock:
+            events = list(self._active.values())
+        events.sort(key=lambda event: (event.severity != 'critical', -event.timestamp))
+        return [event.to_dict() for event in events]
@@ -0,0 +1,301 @@
+"""
+Mehrkammerbetrieb: Sensoren, Regler, Aktoren und Alarme je Kammer
+
+Alle Kammern teilen sich einen Prozess, einen DeadlineScheduler, einen
+DataLogger (Schreiber) und den Webserver. Ohne ``chambers`` in config.yaml
+gibt es genau eine Kammer ``default`` mit den Abschnitten der obersten Ebene.
+"""
+
+import sys
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from controllers.pid_controller import PIDController
+from controllers.actuator_controller import ActuatorController
+from controllers.output_scheduler import OutputScheduler
+from controllers.alarm_engine import AlarmEngine
+from actuators.base_actuator import BaseActuator
+from actuators.relay_actuator import RelayActuator
+from sensors.base_sensor import BaseSensor
+from utils.data_logger import DataLogger, DEFAULT_CHAMBER
+from utils.recent_history import RecentHistory, recent_history
+from utils.records import Sample
+from utils.scheduler import DeadlineScheduler
+
+logger = logging.getLogger(__name__)
+
+# Abschnitte, die eine Kammer aus config.yaml überschreiben kann
+CHAMBER_SECTIONS = ('sensors', 'actuators', 'pid', 'alarms', 'schedule')
+
+
+def chamber_configs(config: dict) -> Dict[str, dict]:
+    """
+    Liefert die Konfiguration jeder Kammer
+    
+    Eine Kammer übernimmt die Abschnitte der obersten Ebene und ersetzt die in
+    ``chambers.<id>`` angegebenen (sensors, actuators, pid, alarms, schedule).
+    
+    Args:
+        config: Gesamte Konfiguration
+    
+    Returns:
+        Konfiguration nach Kennung der Kammer (Reihenfolge wie in config.yaml)
+    """
+    chambers = config.get('chambers')
+    if not chambers:
+        return {DEFAULT_CHAMBER: config}
+    
+    result = {}
+    for chamber_id, chamber_config in chambers.items():
+        merged = dict(config)
+        merged.pop('chambers', None)
+        chamber_config = chamber_config or {}
+        for section in CHAMBER_SECTIONS:
+            if section in chamber_config:
+                merged[section] = chamber_config[section]
+        merged['name'] = chamber_config.get('name', str(chamber_id))
+        result[str(chamber_id)] = merged
+    return result
+
+
+def build_pid_controllers(config: dict, sensors: Dict[str, BaseSensor]) -> Dict[str, PIDController]:
+    """
+    Erstellt je Sensor mit PID-Konfiguration einen PID-Regler
+    
+    Args:
+        config: Konfiguration (der Kammer)
+        sensors: Sensoren nach Name
+    
+    Returns:
+        PID-Regler nach Sensorname
+    """
+    pid_config = config.get('pid', {})
+    pids = {}
+    for name in sensors:
+        params = pid_config.get(name)
+        if not params:
+            continue
+        pids[name] = PIDController(
+            kp=params['kp'],
+            ki=params['ki'],
+            kd=params['kd'],
+            setpoint=config['sensors'][name]['target_value'],
+            adaptive=pid_config.get('adaptive', True),
+            learning_rate=pid_config.get('learning_rate', 0.01)
+        )
+    return pids
+
+
+def build_actuators(config: dict) -> Dict[str, BaseActuator]:
+    """
+    Erstellt die aktivierten Aktoren (``enabled``) aus dem Abschnitt ``actuators``
+    
+    Nicht initialisierbare Aktoren werden trotzdem geliefert (Status
+    ``available: False``), damit sie in der Weboberfläche sichtbar bleiben.
+    
+    Args:
+        config: Konfiguration (der Kammer)
+    
+    Returns:
+        Aktoren nach Name
+    """
+    actuators = {}
+    for name, actuator_config in (config.get('actuators') or {}).items():
+        actuator_config = actuator_config or {}
+        if not actuator_config.get('enabled', True):
+            continue
+        actuator = RelayActuator.from_config(name, actuator_config)
+        if not actuator.initialize():
+            logger.warning(f"Aktor '{name}' nicht verfügbar")
+        actuators[name] = actuator
+    return actuators
+
+
+class Chamber:
+    """
+    Eine Kammer mit eigenen Sensoren, PID-Reglern, Aktoren und Alarmgrenzen
+    """
+    
+    def __init__(self, chamber_id: str, config: dict, data_logger: DataLogger,
+                 scheduler: DeadlineScheduler,
+                 sensors: Optional[Dict[str, BaseSensor]] = None,
+                 actuators: Optional[Dict[str, BaseActuator]] = None,
+                 history: Optional[RecentHistory] = None):
+        """
+        Args:
+            chamber_id: Kennung der Kammer (für Datenbank, API und Socket.IO-Räume)
+            config: Konfiguration der Kammer (siehe chamber_configs)
+            data_logger: Gemeinsamer DataLogger
+            scheduler: Gemeinsamer Scheduler
+            sensors: Sensoren nach Name (optional)
+            actuators: Aktoren nach Name (optional, sonst aus ``actuators`` der Konfiguration)
+            history: Verlaufspuffer für die Diagramme (optional, sonst eigener)
+        """
+        self.id = chamber_id
+        self.name = config.get('name', chamber_id)
+        self.config = config
+        # Die Einzelkammer schreibt ohne Umweg über die Kammer-Sicht
+        self.data_logger = data_logger if chamber_id == DEFAULT_CHAMBER else data_logger.for_chamber(chamber_id)
+        self.sensors: Dict[str, BaseSensor] = sensors or {}
+        # Leseparameter und Filter je Sensor (min_interval, max_age, filters, ...)
+        for name, sensor in self.sensors.items():
+            sensor.configure(config['sensors'].get(name) or {})
+        
+        measurement_config = config['measurement']
+        self.history = history if history is not None else RecentHistory()
+        self.history.configure(
+            window=measurement_config.get('history_hours', 24) * 3600,
+            interval=measurement_config['interval']
+        )
+        
+        # Aktoren mit Laufzeitschutz (min_runtime, max_runtime, cooldown)
+        self.actuator_controller = ActuatorController(self.data_logger, scheduler)
+        if actuators is None:
+            actuators = build_actuators(config)
+        for name, actuator in actuators.items():
+            self.actuator_controller.add(actuator, config['actuators'].get(name))
+        self.output_scheduler = OutputScheduler(scheduler)
+        for name, guarded in self.actuator_controller.actuators.items():
+            actuator_config = config['actuators'].get(name, {})
+            if 'cycle_length' in actuator_config:
+                self.output_scheduler.add(guarded, actuator_config)
+        
+        self.pids = build_pid_controllers(config, self.sensors)
+        self.alarm_engine = AlarmEngine(config, self.data_logger)
+        self._last_logged: Dict[str, Sample] = {}
+    
+    def read_samples(self) -> List[Sample]:
+        """
+        Liest alle Sensoren und liefert die seit dem letzten Zyklus neuen Messwerte
+        """
+        samples = []
+        for name, sensor in self.sensors.items():
+            sample = sensor.get_sample(max_age=0)
+            if sample is not None and sample is not self._last_logged.get(name):
+                samples.append(sample)
+                self._last_logged[name] = sample
+        return samples
+    
+    def process(self, samples: List[Sample]):
+        """
+        Verlauf, Alarmauswertung und Regelung für neue Messwerte
+        
+        Args:
+            samples: Neue Messwerte (bereits gespeichert)
+        """
+        for sample in samples:
+            self.history.append(sample.sensor, sample.value, sample.timestamp)
+            self.alarm_engine.evaluate(sample)
+        
+        # Regelung durchführen und Stellgrößen an die Aktoren geben
+        pid_config = self.config.get('pid', {})
+        for sample in samples:
+            pid = self.pids.get(sample.sensor)
+            if pid is None:
+                continue
+            output = pid.update(sample.value)
+            actuator_name = pid_config[sample.sensor].get('actuator')
+            if actuator_name in self.output_scheduler.outputs:
+                self.output_scheduler.set_output(actuator_name, output)
+    
+    def apply_settings(self, config: dict):
+        """
+        Übernimmt geänderte Sollwerte und den Modus der PID-Regler
+        
+        Args:
+            config: Neue Konfiguration der Kammer
+        """
+        adaptive = config.get('pid', {}).get('adaptive', True)
+        for name, pid in self.pids.items():
+            target = config['sensors'][name]['target_value']
+            if pid.setpoint != target:
+                pid.set_setpoint(target)
+            if pid.adaptive != adaptive:
+                pid.set_adaptive(adaptive)
+        self.config = config
+    
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Aktueller Zustand der Kammer für die Weboberfläche
+        """
+        sensors = {}
+        for name in self.history.sensors():
+            series = self.history.get_series(name, limit=1)
+            if series['values']:
+                sensors[name] = {
+                    'value': series['values'][-1],
+                    'timestamp': series['timestamps'][-1],
+                    'target': self.config['sensors'].get(name, {}).get('target_value')
+                }
+        return {
+            'id': self.id,
+            'name': self.name,
+            'sensors': sensors,
+            'actuators': self.actuator_controller.get_status(),
+            'alarms': self.alarm_engine.active_alarms()
+        }
+    
+    def stop(self):
+        """
+        Zieht geplante Schaltzeitpunkte zurück und schaltet alle Aktoren aus
+        """
+        self.output_scheduler.stop()
+        self.actuator_controller.all_off()
+
+
+def build_chambers(config: dict, data_logger: DataLogger,
+                   scheduler: DeadlineScheduler) -> Dict[str, Chamber]:
+    """
+    Erstellt alle Kammern aus der Konfiguration
+    
+    Die erste Kammer nutzt den prozessweiten Verlaufspuffer ``recent_history``
+    (Diagramme der Hauptseite, /api/chart/bootstrap).
+    
+    Args:
+        config: Gesamte Konfiguration
+        data_logger: Gemeinsamer DataLogger
+        scheduler: Gemeinsamer Scheduler
+    
+    Returns:
+        Kammern nach Kennung
+    """
+    chambers = {}
+    for chamber_id, chamber_config in chamber_configs(config).items():
+        history = recent_history if not chambers else None
+        # TODO: Sensoren initialisieren
+        chambers[chamber_id] = Chamber(chamber_id, chamber_config, data_logger, scheduler, history=history)
+        logger.info(f"Kammer '{chamber_id}' eingerichtet")
+    return chambers
+
+
+def run_cycle(chambers: Dict[str, Chamber], data_logger: DataLogger,
+              publish: Optional[Callable[[List[Sample], str], None]] = None) -> int:
+    """
+    Ein Monitoring-Zyklus über alle Kammern
+    
+    Die Messwerte aller Kammern werden in einer gemeinsamen Transaktion
+    gespeichert, gepufferte Aktor-Ereignisse und Alarme am Ende gebündelt.
+    
+    Args:
+        chambers: Kammern nach Kennung
+        data_logger: Gemeinsamer DataLogger
+        publish: Callback (Samples, Kammer) zum Senden an die Weboberfläche (optional)
+    
+    Returns:
+        Anzahl neuer Messwerte
+    """
+    batches = [(chamber, chamber.read_samples()) for chamber in chambers.values()]
+    batches = [(chamber, samples) for chamber, samples in batches if samples]
+    if batches:
+        data_logger.log_chamber_samples((chamber.id, samples) for chamber, samples in batches)
+    
+    for chamber, samples in batches:
+        chamber.process(samples)
+        if publish:
+            publish(samples, chamber.id)
+    
+    # Gepufferte Aktor-Ereignisse und Alarme gebündelt schreiben
+    data_logger.flush()
+    return sum(len(samples) for _, samples in batches)
@@ -0,0 +1,163 @@
+"""
+Zeitproportionale Ansteuerung von Ein/Aus-Aktoren aus PID-Stellgrößen
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.scheduler import DeadlineScheduler, ScheduledCall
+from controllers.actuator_controller import GuardedActuator
+
+
+class TimeProportionalOutput:
+    """
+    Wandelt eine Stellgröße von 0-100 % in Ein-Zeiten je Schaltzyklus um
+    
+    Beispiel: 25 % bei 60 s Zykluslänge = 15 s Ein, 45 s Aus. Ein-/Aus-Zeiten
+    unter ``min_pulse`` werden auf 0 bzw. die volle Zykluslänge gerundet,
+    um das Relais zu schonen. Eine neue Stellgröße gilt ab dem nächsten Zyklus.
+    """
+    
+    def __init__(self, guarded: GuardedActuator, cycle_length: float = 60.0,
+                 min_pulse: float = 2.0):
+        """
+        Args:
+            guarded: Geschützter Aktor
+            cycle_length: Länge eines Schaltzyklus in Sekunden
+            min_pulse: Kürzeste Ein- bzw. Aus-Zeit in Sekunden
+        """
+        self.guarded = guarded
+        self.cycle_length = cycle_length
+        self.min_pulse = min_pulse
+        self.duty = 0.0
+        
+        self._cycle_start: Optional[float] = None
+        self._calls: List[ScheduledCall] = []
+        
+        # Maximale Verspätung eines Schaltzeitpunkts (Sekunden)
+        self.max_latency = 0.0
+    
+    def on_time(self) -> float:
+        """
+        Ein-Zeit des aktuellen Zyklus in Sekunden
+        """
+        on_time = self.cycle_length * max(0.0, min(100.0, self.duty)) / 100.0
+        if on_time < self.min_pulse:
+            return 0.0
+        if self.cycle_length - on_time < self.min_pulse:
+            return self.cycle_length
+        return on_time
+    
+    def _track_latency(self, deadline: float):
+        latency = time.monotonic() - deadline
+        if latency > self.max_latency:
+            self.max_latency = latency
+
+
+class OutputScheduler:
+    """
+    Zeitproportionale Ausgänge für beliebig viele Aktoren auf einem
+    gemeinsamen DeadlineScheduler (ein Thread, ein Heap)
+    """
+    
+    def __init__(self, scheduler: DeadlineScheduler):
+        """
+        Args:
+            scheduler: Gemeinsamer Scheduler
+        """
+        self.scheduler = scheduler
+        self.scheduler.start()
+        self.outputs: Dict[str, TimeProportionalOutput] = {}
+        self._lock = threading.Lock()
+    
+    def add(self, guarded: GuardedActuator, output_config: Optional[Dict[str, Any]] = None) -> TimeProportionalOutput:
+        """
+        Registriert einen Aktor für die zeitproportionale Ansteuerung
+        
+        Args:
+            guarded: Geschützter Aktor
+            output_config: Abschnitt des Aktors aus config.yaml (optional)
+        
+        Returns:
+            TimeProportionalOutput des Aktors
+        """
+        output_config = output_config or {}
+        output = TimeProportionalOutput(
+            guarded,
+            cycle_length=output_config.get('cycle_length', 60.0),
+            min_pulse=output_config.get('min_pulse', 2.0)
+        )
+        with self._lock:
+            self.outputs[guarded.name] = output
+        return output
+    
+    def set_output(self, name: str, percent: float):
+        """
+        Setzt die Stellgröße eines Aktors
+        
+        Args:
+            name: Name des Aktors
+            percent: Stellgröße in Prozent (0-100)
+        """
+        output = self.outputs[name]
+        output.duty = percent
+        with self._lock:
+            if output._cycle_start is None:
+                self._start_cycle(output, time.monotonic())
+    
+    def stop(self):
+        """
+        Zieht alle geplanten Schaltzeitpunkte zurück
+        """
+        with self._lock:
+            for output in self.outputs.values():
+                for call in output._calls:
+                    call.cancel()
+                output._calls = []
+                output._cycle_start = None
+    
+    def _start_cycle(self, output: TimeProportionalOutput, start: float):
+        """
+        Beginnt einen Schaltzyklus (Aufruf nur mit gehaltenem Lock)
+        """
+        output._cycle_start = start
+        on_time = output.on_time()
+        output.guarded.request(on_time > 0)
+        
+        calls = []
+        if 0 < on_time < output.cycle_length:
+            off_at = start + on_time
+            calls.append(self.scheduler.call_at(off_at, lambda: self._switch_off(output, off_at)))
+        
+        # Nächster Zyklus auf dem festen Raster, ohne Drift durch Verspätungen
+        next_start = start + output.cycle_length
+        calls.append(self.scheduler.call_at(next_start, lambda: self._next_cycle(output, next_start)))
+        output._calls = calls
+    
+    def _switch_off(self, output: TimeProportionalOutput, deadline: float):
+        output._track_latency(deadline)
+        output.guarded.request(False)
+    
+    def _next_cycle(self, output: TimeProportionalOutput, deadline: float):
+        output._track_latency(deadline)
+        with self._lock:
+            if output._cycle_start is not None:
+                self._start_cycle(output, deadline)
+    
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Gibt Stellgröße und Zeitverhalten aller Ausgänge zurück
+        """
+        return {
+            name: {
+                'duty': output.duty,
+                'on_time': output.on_time(),
+                'cycle_length': output.cycle_length,
+                'max_latency_ms': round(output.max_latency * 1000, 2)
+            }
+            for name, output in self.outputs.items()
+        }
@@ -0,0 +1,100 @@
+"""
+Flotten-Hub für mehrere MGB - Mushroom Grow Boxen
+
+Nimmt die Messwerte der Boxen entgegen (``fleet.uploader`` in deren
+config.yaml) und stellt Flottenübersicht und boxübergreifenden Verlauf
+bereit. Für Tests genügt ein lokaler Hub:
+
+    python src/hub.py --port 5100 --db /tmp/fleet_hub.db
+"""
+
+import argparse
+import logging
+import signal
+import sys
+from pathlib import Path
+from threading import Thread
+
+import yaml
+from flask import Flask, Response
+
+# Lokale Imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.logger import setup_logger
+from utils.fleet_store import HubStore
+from utils.metrics import metrics, CONTENT_TYPE
+from web.fleet import fleet_bp, init_hub
+from web.server import WebServer
+
+logging.basicConfig(level=logging.INFO)
+logger = setup_logger('mgb_fleet_hub')
+
+
+def create_app(store: HubStore, hub_config: dict) -> Flask:
+    """
+    Erstellt die Flask-App des Hubs (nur HTTP, ohne Socket.IO)
+    
+    Args:
+        store: Hub-Datenbank
+        hub_config: Abschnitt 'fleet.hub' der Konfiguration
+    """
+    app = Flask(__name__)
+    app.register_blueprint(fleet_bp)
+    init_hub(store, hub_config)
+    
+    @app.route('/metrics')
+    def get_metrics():
+        """
+        Laufzeitmetriken des Hubs im Prometheus-Textformat
+        """
+        return Response(metrics.render(), content_type=CONTENT_TYPE)
+    
+    return app
+
+
+def main():
+    """
+    Hauptfunktion des Hubs
+    """
+    parser = argparse.ArgumentParser(description='Flotten-Hub der MGB - Mushroom Grow Box')
+    parser.add_argument('--config', default='config/config.yaml', help='Konfigurationsdatei')
+    parser.add_argument('--host', help='Adresse (Standard: fleet.hub.host)')
+    parser.add_argument('--port', type=int, help='Port (Standard: fleet.hub.port)')
+    parser.add_argument('--db', help='Datenbank (Standard: fleet.hub.db_path)')
+    args = parser.parse_args()
+    
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    hub_config = dict(config.get('fleet', {}).get('hub', {}))
+    if args.db:
+        hub_config['db_path'] = args.db
+    
+    store = HubStore.from_config(hub_config)
+    app = create_app(store, hub_config)
+    
+    # Webserver-Einstellungen wie bei der Box, Adresse und Port des Hubs
+    web_config = dict(config.get('web', {}))
+    web_config['host'] = args.host or hub_config.get('host', '0.0.0.0')
+    web_config['port'] = args.port or hub_config.get('port', 5100)
+    server = WebServer.from_config(app, None, web_config)
+    
+    def shutdown(signum, frame):
+        logger.info("Beendigungssignal empfangen")
+        # stop() wartet auf serve_forever, daher nicht im Signal-Handler selbst
+        Thread(target=server.stop, daemon=True).start()
+    
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+    
+    logger.info(f"Flotten-Hub startet (Datenbank: {store.db_path})")
+    try:
+        server.serve_forever()
+    finally:
+        # Angenommene Uploads noch schreiben
+        store.stop()
+        logger.info("Flotten-Hub beendet")
+
+
+if __name__ == '__main__':
+    main()
@@ -9,12 +9,27 @@ import signal
 from pathlib import Path
 from threading import Thread, Event
 from datetime import datetime
+from functools import partial
+from typing import Callable, Dict, List, Optional
 
 # Lokale Imports
 sys.path.insert(0, str(Path(__file__).parent))
 
 from utils.logger import setup_logger
 from utils.data_logger import DataLogger
+from utils.log_filter import RateLimitFilter
+from utils.records import Sample
+from utils.metrics import metrics
+from utils.profiler import profiler
+from utils.memory_monitor import MemoryMonitor
+from utils.fleet_uploader import FleetUploader
+from utils.replication import ReplicationAgent
+from utils.sample_archive import ArchiveSealer
+from utils.sample_journal import SampleJournal
+from utils.db_backup import DatabaseBackup
+from controllers.chamber import Chamber, build_chambers, chamber_configs, run_cycle
+from utils.scheduler import DeadlineScheduler
+from web.process import WebProcess
 
 # Logger einrichten
 logger = setup_logger('mgb_mushroom_grow_box')
@@ -22,6 +37,10 @@ logger = setup_logger('mgb_mushroom_grow_box')
 # Stop-Event für sauberes Beenden
 stop_event = Event()
 
+# Laufzeit eines Monitoring-Zyklus (ohne Wartezeit)
+loop_cycle_seconds = metrics.histogram(
+    'mgb_loop_cycle_seconds', 'Dauer eines Monitoring-Zyklus ohne Wartezeit')
+
 
 def load_config(config_path: str = 'config/config.yaml') -> dict:
     """
@@ -29,7 +48,7 @@ def load_config(config_path: str = 'config/config.yaml') -> dict:
     
     Args:
         config_path: Pfad zur Konfigurationsdatei
-        
+    
     Returns:
         Konfiguration als Dictionary
     """
@@ -53,50 +72,105 @@ def signal_handler(signum, frame):
     stop_event.set()
 
 
-def monitoring_loop(config: dict, data_logger: DataLogger):
+def profile_signal_handler(duration: float, signum, frame):
     """
-    Hauptschleife für Überwachung und Regelung
+    Handler für SIGUSR1: startet einen Profiling-Durchgang
+    """
+    try:
+        profiler.start(duration=duration)
+    except RuntimeError as e:
+        logger.warning(f"SIGUSR1 ignoriert: {e}")
+
+
+def monitoring_loop(config: dict, data_logger: DataLogger,
+                    chambers: Dict[str, Chamber],
+                    publish: Optional[Callable[[List[Sample], str], None]] = None):
+    """
+    Hauptschleife für Überwachung und Regelung aller Kammern
     
     Args:
         config: Konfiguration
-        data_logger: DataLogger-Instanz
+        data_logger: Gemeinsamer DataLogger
+        chambers: Kammern nach Kennung
+        publish: Callback (Samples, Kammer) zum Senden neuer Messwerte an die Weboberfläche (optional)
     """
     interval = config['measurement']['interval']
-    logger.info(f"Starte Monitoring-Loop (Intervall: {interval}s)")
+    retention_days = config.get('logging', {}).get('data_retention_days')
+    next_retention = 0.0
+    logger.info(f"Starte Monitoring-Loop (Intervall: {interval}s, Kammern: {len(chambers)})")
     
     while not stop_event.is_set():
+        cycle_start = time.perf_counter()
         try:
-            # TODO: Sensoren auslesen
-            # TODO: Regelung durchführen
-            # TODO: Aktoren steuern
-            # TODO: Daten loggen
+            # Sensoren auslesen, loggen, senden und regeln (Hardware höchstens alle min_interval Sekunden)
+            run_cycle(chambers, data_logger, publish)
             
-            # Platzhalter für Entwicklung
+            # Abgelaufene Partitionen stündlich als ganze Dateien löschen
+            if retention_days and time.monotonic() >= next_retention:
+                next_retention = time.monotonic() + 3600
+                data_logger.apply_retention(retention_days)
+            
+            loop_cycle_seconds.observe(time.perf_counter() - cycle_start)
             logger.debug("Monitoring-Zyklus durchgeführt")
             
             # Auf nächsten Zyklus warten
             stop_event.wait(interval)
-            
+        
         except Exception as e:
             logger.error(f"Fehler im Monitoring-Loop: {e}", exc_info=True)
             time.sleep(5)  # Kurze Pause bei Fehler
 
 
+def register_runtime_metrics(data_logger: DataLogger, scheduler: DeadlineScheduler):
+    """
+    Registriert Messgrößen, die erst beim Abruf von /metrics ermittelt werden
+    
+    Args:
+        data_logger: DataLogger-Instanz
+        scheduler: Gemeinsamer Scheduler
+    """
+    queue_depth = metrics.gauge('mgb_queue_depth', 'Anzahl wartender Einträge je Warteschlange', ('queue',))
+    queue_depth.labels('scheduler').set_function(scheduler.pending)
+    queue_depth.labels('db_events').set_function(data_logger.pending_events)
+    metrics.gauge('mgb_db_size_bytes', 'Größe der Datenbank in Bytes').set_function(data_logger.db_size)
+
+
+def apply_settings(chambers: Dict[str, Chamber]):
+    """
+    Übernimmt von der Weboberfläche gespeicherte Einstellungen in die PID-Regler
+    
+    Args:
+        chambers: Kammern nach Kennung
+    """
+    config = load_config()
+    for chamber_id, chamber_config in chamber_configs(config).items():
+        chamber = chambers.get(chamber_id)
+        if chamber is not None:
+            chamber.apply_settings(chamber_config)
+
+
+def _emit_alarm_event(emit_alarm: Callable[[dict, Optional[str]], None], chamber_id: str, event):
+    emit_alarm(event.to_dict(), chamber_id)
+
+
 def start_web_server(config: dict):
     """
     Startet den Webserver in einem separaten Thread
     
     Args:
         config: Konfiguration
-    """
-    from web.app import app, socketio
     
-    host = config['web']['host']
-    port = config['web']['port']
-    debug = config['web']['debug']
+    Returns:
+        Tuple (WebServer, Thread)
+    """
+    from web.app import app, socketio, init_web_server
+    from web.server import WebServer
     
-    logger.info(f"Starte Webserver auf {host}:{port}")
-    socketio.run(app, host=host, port=port, debug=debug, allow_unsafe_werkzeug=True)
+    web_server = WebServer.from_config(app, socketio, config['web'])
+    init_web_server(web_server)
+    web_thread = Thread(target=web_server.serve_forever, name='mgb-web', daemon=True)
+    web_thread.start()
+    return web_server, web_thread
 
 
 def main():
@@ -114,6 +188,19 @@ def main():
     # Konfiguration laden
     config = load_config()
     
+    # Profiling auf Anforderung (API oder kill -USR1 <pid>)
+    profiler_config = config.get('diagnostics', {}).get('profiler', {})
+    profiler.configure(profiler_config)
+    if hasattr(signal, 'SIGUSR1'):
+        signal.signal(signal.SIGUSR1, partial(profile_signal_handler,
+                                              profiler_config.get('default_duration', 30)))
+    
+    # Häufige Meldungen zusammenfassen und begrenzen (schont SD-Karte)
+    log_filter = RateLimitFilter.from_config(config.get('logging', {}).get('rate_limit', {}))
+    if log_filter:
+        log_filter.install_configured(logger)
+        log_filter.start()
+    
     # WiFi-Manager initialisieren und prüfen
     logger.info("Prüfe WiFi-Verbindung...")
     from utils.wifi_manager import WiFiManager
@@ -138,26 +225,109 @@ def main():
         logger.info("=" * 60)
     
     # DataLogger initialisieren
-    data_logger = DataLogger()
+    data_logger = DataLogger.from_config(config)
     logger.info("DataLogger initialisiert")
     
-    # TODO: Sensoren initialisieren
-    # TODO: Aktoren initialisieren
+    # Journal vor der Datenbank (optional): spielt nach einem Absturz zuerst nach
+    sample_journal = SampleJournal.from_config(config.get('database', {}).get('journal', {}), data_logger)
+    if sample_journal:
+        sample_journal.start()
     
-    # Webserver in separatem Thread starten
-    web_thread = Thread(target=start_web_server, args=(config,), daemon=True)
-    web_thread.start()
-    logger.info("Webserver-Thread gestartet")
+    # Kammern mit Sensoren, Reglern und Aktoren (ein gemeinsamer Scheduler und Schreiber)
+    scheduler = DeadlineScheduler()
+    chambers = build_chambers(config, data_logger, scheduler)
+    main_chamber = next(iter(chambers.values()))
+    register_runtime_metrics(data_logger, scheduler)
+    
+    memory_monitor = MemoryMonitor.from_config(config.get('diagnostics', {}).get('memory', {}))
+    
+    # Upload an den Flotten-Hub (optional)
+    fleet_uploader = FleetUploader.from_config(config.get('fleet', {}).get('uploader', {}), data_logger)
+    if fleet_uploader:
+        fleet_uploader.start()
+    
+    # Replikation an einen Empfänger (optional)
+    replication_agent = ReplicationAgent.from_config(config.get('replication', {}).get('agent', {}), data_logger)
+    if replication_agent:
+        replication_agent.start()
+    
+    # Archivierung alter Messwerte (optional)
+    archive_sealer = ArchiveSealer.from_config(config.get('database', {}).get('archive', {}), data_logger)
+    if archive_sealer:
+        archive_sealer.start()
+    
+    # Periodische Datenbanksicherung (optional)
+    database_backup = DatabaseBackup.from_config(config.get('database', {}).get('backup', {}), data_logger)
+    if database_backup:
+        database_backup.start()
+    
+    # Weboberfläche als eigener Prozess (web.process) oder als Thread
+    web_process = WebProcess.from_config(
+        config['web'], chambers=chambers, on_settings=partial(apply_settings, chambers)
+    )
+    web_server = web_thread = None
+    if web_process:
+        for chamber in chambers.values():
+            chamber.alarm_engine.on_alarm = partial(web_process.publish_alarm, chamber=chamber.id)
+        publish = web_process.publish_samples
+        web_process.start()
+    else:
+        from web.app import (emit_samples, emit_alarm, init_actuator_controller, init_alarm_engine,
+                             init_sample_reader, init_settings_listener, socketio_session_count)
+        from web.chambers import init_chambers
+        from web.diagnostics import init_memory_monitor
+        for chamber in chambers.values():
+            chamber.alarm_engine.on_alarm = partial(_emit_alarm_event, emit_alarm, chamber.id)
+        publish = emit_samples
+        init_actuator_controller(main_chamber.actuator_controller)
+        init_alarm_engine(main_chamber.alarm_engine)
+        init_sample_reader(main_chamber.data_logger)
+        init_chambers(chambers)
+        init_settings_listener(partial(apply_settings, chambers))
+        if memory_monitor:
+            memory_monitor.add_probe('socketio_sessions', socketio_session_count)
+            init_memory_monitor(memory_monitor)
+        web_server, web_thread = start_web_server(config)
+        logger.info("Webserver-Thread gestartet")
+    
+    # Speicherdiagnose (optional)
+    if memory_monitor:
+        memory_monitor.add_probe('recent_history_bytes', lambda: sum(
+            chamber.history.memory_usage()['bytes'] for chamber in chambers.values()))
+        memory_monitor.start()
     
     # Monitoring-Loop starten
     try:
-        monitoring_loop(config, data_logger)
+        monitoring_loop(config, data_logger, chambers, publish=publish)
     except Exception as e:
         logger.error(f"Kritischer Fehler: {e}", exc_info=True)
     finally:
         # Aufräumen
         logger.info("Fahre System herunter...")
-        # TODO: Alle Aktoren ausschalten
+        # Zuerst keine neuen Anfragen/Befehle mehr annehmen
+        if web_process:
+            web_process.stop()
+        else:
+            web_server.stop()
+            web_thread.join(timeout=web_server.shutdown_timeout)
+        for chamber in chambers.values():
+            chamber.stop()
+        scheduler.stop()
+        if sample_journal:
+            sample_journal.stop()
+        data_logger.flush()
+        if memory_monitor:
+            memory_monitor.stop()
+        if fleet_uploader:
+            fleet_uploader.stop()
+        if replication_agent:
+            replication_agent.stop()
+        if archive_sealer:
+            archive_sealer.stop()
+        if database_backup:
+            database_backup.stop()
+        if log_filter:
+            log_filter.stop()
         # TODO: Verbindungen schließen
         logger.info("System beendet")
 
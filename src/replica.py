@@ -0,0 +1,100 @@
+"""
+Replikationsempfänger für MGB - Mushroom Grow Boxen
+
+Nimmt den Änderungsstrom der Boxen entgegen (``replication.agent`` in
+deren config.yaml) und führt je Box eine SQLite-Kopie von
+``sensor_data``, ``actuator_status`` und ``alarms``. Für Tests genügt ein
+lokaler Empfänger:
+
+    python src/replica.py --port 5200 --directory /tmp/replicas
+"""
+
+import argparse
+import logging
+import signal
+import sys
+from pathlib import Path
+from threading import Thread
+
+import yaml
+from flask import Flask, Response
+
+# Lokale Imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.logger import setup_logger
+from utils.metrics import metrics, CONTENT_TYPE
+from utils.replica_store import ReplicaStore
+from web.replication import replication_bp, init_receiver
+from web.server import WebServer
+
+logging.basicConfig(level=logging.INFO)
+logger = setup_logger('mgb_replica')
+
+
+def create_app(store: ReplicaStore, receiver_config: dict) -> Flask:
+    """
+    Erstellt die Flask-App des Empfängers (nur HTTP, ohne Socket.IO)
+    
+    Args:
+        store: Kopien der Boxen
+        receiver_config: Abschnitt 'replication.receiver' der Konfiguration
+    """
+    app = Flask(__name__)
+    app.register_blueprint(replication_bp)
+    init_receiver(store, receiver_config)
+    
+    @app.route('/metrics')
+    def get_metrics():
+        """
+        Laufzeitmetriken des Empfängers im Prometheus-Textformat
+        """
+        return Response(metrics.render(), content_type=CONTENT_TYPE)
+    
+    return app
+
+
+def main():
+    """
+    Hauptfunktion des Empfängers
+    """
+    parser = argparse.ArgumentParser(description='Replikationsempfänger der MGB - Mushroom Grow Box')
+    parser.add_argument('--config', default='config/config.yaml', help='Konfigurationsdatei')
+    parser.add_argument('--host', help='Adresse (Standard: replication.receiver.host)')
+    parser.add_argument('--port', type=int, help='Port (Standard: replication.receiver.port)')
+    parser.add_argument('--directory', help='Verzeichnis der Kopien (Standard: replication.receiver.directory)')
+    args = parser.parse_args()
+    
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    receiver_config = dict(config.get('replication', {}).get('receiver', {}))
+    if args.directory:
+        receiver_config['directory'] = args.directory
+    
+    store = ReplicaStore.from_config(receiver_config)
+    app = create_app(store, receiver_config)
+    
+    # Webserver-Einstellungen wie bei der Box, Adresse und Port des Empfängers
+    web_config = dict(config.get('web', {}))
+    web_config['host'] = args.host or receiver_config.get('host', '0.0.0.0')
+    web_config['port'] = args.port or receiver_config.get('port', 5200)
+    server = WebServer.from_config(app, None, web_config)
+    
+    def shutdown(signum, frame):
+        logger.info("Beendigungssignal empfangen")
+        # stop() wartet auf serve_forever, daher nicht im Signal-Handler selbst
+        Thread(target=server.stop, daemon=True).start()
+    
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+    
+    logger.info(f"Replikationsempfänger startet (Verzeichnis: {store.directory})")
+    try:
+        server.serve_forever()
+    finally:
+        store.close()
+        logger.info("Replikationsempfänger beendet")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,5 +3,6 @@ Sensormodule für die MGB - Mushroom Grow Box
 """
 
 from .base_sensor import BaseSensor
+from .filters import FilterPipeline, apply_filters
 
-__all__ = ['BaseSensor']
+__all__ = ['BaseSensor', 'FilterPipeline', 'apply_filters']
@@ -2,29 +2,110 @@
 Basis-Klasse für alle Sensoren
 """
 
+import sys
+import time
+import logging
+import threading
 from abc import ABC, abstractmethod
 from datetime import datetime
+from pathlib import Path
 from typing import Optional, Dict, Any
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.records import Sample
+from utils.metrics import metrics
+from .filters import FilterPipeline
+
+logger = logging.getLogger(__name__)
+
+_read_seconds = metrics.histogram(
+    'mgb_sensor_read_seconds', 'Dauer eines Hardware-Lesevorgangs', ('sensor',))
+_read_failures = metrics.counter(
+    'mgb_sensor_read_failures_total', 'Lesezyklen ohne gültigen Wert (nach allen Wiederholungen)', ('sensor',))
+
+
+class _PendingRead:
+    """
+    Laufender Hardware-Lesevorgang, auf den weitere Aufrufer warten
+    """
+    
+    __slots__ = ('done', 'sample')
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.sample: Optional[Sample] = None
+
 
 class BaseSensor(ABC):
     """
     Abstrakte Basisklasse für alle Sensoren
     """
     
-    def __init__(self, name: str, unit: str):
+    def __init__(self, name: str, unit: str,
+                 min_interval: float = 2.0,
+                 max_age: float = 5.0,
+                 retries: int = 2,
+                 retry_backoff: float = 0.5):
         """
         Initialisiert den Sensor
         
         Args:
             name: Name des Sensors
             unit: Einheit der Messwerte (z.B. "°C", "%", "ppm")
+            min_interval: Minimaler Abstand zwischen Hardware-Lesevorgängen in Sekunden
+            max_age: Maximales Alter eines zwischengespeicherten Werts in Sekunden
+            retries: Anzahl Wiederholungen bei fehlgeschlagenem Lesen (je bei einem späteren Aufruf)
+            retry_backoff: Mindestabstand vor der ersten Wiederholung in Sekunden
+                (verdoppelt sich, nie kürzer als min_interval)
         """
         self.name = name
         self.unit = unit
-        self.last_value: Optional[float] = None
-        self.last_read_time: Optional[datetime] = None
+        self.last_sample: Optional[Sample] = None
+        self.last_raw_value: Optional[float] = None
         self.is_available: bool = False
+        
+        # Optionale Aufbereitung der Rohwerte (Median, EMA, Ausreißer)
+        self.pipeline: Optional[FilterPipeline] = None
+        
+        # Zwischenspeicher und Zusammenfassen gleichzeitiger Lesevorgänge
+        self.min_interval = min_interval
+        self.max_age = max_age
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.consecutive_failures = 0
+        self._failed_attempts = 0
+        self._read_lock = threading.Lock()
+        self._pending: Optional[_PendingRead] = None
+        self._next_attempt: Optional[float] = None
+        self._read_seconds = _read_seconds.labels(name)
+        self._read_failures = _read_failures.labels(name)
+    
+    def configure(self, sensor_config: Dict[str, Any]):
+        """
+        Übernimmt die Leseparameter aus der Sensor-Konfiguration
+        
+        Args:
+            sensor_config: Abschnitt des Sensors aus config.yaml
+        """
+        self.min_interval = sensor_config.get('min_interval', self.min_interval)
+        self.max_age = sensor_config.get('max_age', self.max_age)
+        self.retries = sensor_config.get('retries', self.retries)
+        self.retry_backoff = sensor_config.get('retry_backoff', self.retry_backoff)
+        self.pipeline = FilterPipeline.from_config(sensor_config.get('filters'))
+    
+    @property
+    def last_value(self) -> Optional[float]:
+        """
+        Zuletzt gemessener Wert
+        """
+        return self.last_sample.value if self.last_sample else None
+    
+    @property
+    def last_read_time(self) -> Optional[datetime]:
+        """
+        Zeitpunkt der letzten Messung
+        """
+        return datetime.fromtimestamp(self.last_sample.timestamp) if self.last_sample else None
     
     @abstractmethod
     def read(self) -> Optional[float]:
@@ -46,6 +127,141 @@ class BaseSensor(ABC):
         """
         pass
     
+    def read_sample(self) -> Optional[Sample]:
+        """
+        Liest den aktuellen Wert, bereitet ihn über die Filter-Pipeline auf
+        und verpackt ihn als Sample
+        
+        Returns:
+            Sample oder None bei Fehler
+        """
+        value = self.read()
+        if value is None:
+            return None
+        
+        self.last_raw_value = value
+        if self.pipeline is not None:
+            value = self.pipeline.process(value)
+            if value is None:
+                return None
+        
+        sample = Sample(self.name, value, self.unit)
+        self.last_sample = sample
+        return sample
+    
+    def get_sample(self, max_age: Optional[float] = None) -> Optional[Sample]:
+        """
+        Liefert einen höchstens ``max_age`` Sekunden alten Messwert
+        
+        Gleichzeitige Aufrufer teilen sich einen Hardware-Lesevorgang, und
+        die Hardware wird nie öfter als alle ``min_interval`` Sekunden
+        gelesen. Innerhalb dieses Intervalls wird der letzte Wert geliefert,
+        auch wenn er älter als ``max_age`` ist. Ein Aufruf liest höchstens
+        einmal und wartet nicht: Wiederholungen nach einem Fehlschlag
+        übernehmen spätere Aufrufe (Abstand siehe retry_backoff).
+        
+        Args:
+            max_age: Maximales Alter in Sekunden (optional, sonst self.max_age)
+        
+        Returns:
+            Sample oder None, wenn der letzte Lesevorgang fehlgeschlagen ist
+            oder noch kein gültiger Wert vorliegt (letzter gültiger Wert: last_sample)
+        """
+        if max_age is None:
+            max_age = self.max_age
+        
+        with self._read_lock:
+            sample = self.last_sample
+            now = time.monotonic()
+            
+            if sample is not None and now - sample.monotonic <= max_age:
+                return sample
+            
+            pending = self._pending
+            if pending is None:
+                if self._next_attempt is not None and now < self._next_attempt:
+                    return None if self._failed_attempts else sample
+                
+                pending = self._pending = _PendingRead()
+                is_reader = True
+            else:
+                is_reader = False
+        
+        if not is_reader:
+            # Auf den laufenden Lesevorgang eines anderen Aufrufers warten
+            pending.done.wait()
+            return pending.sample
+        
+        try:
+            pending.sample = self._read_attempt()
+        finally:
+            with self._read_lock:
+                self._pending = None
+                self._next_attempt = now + self._retry_delay()
+            pending.done.set()
+        
+        return pending.sample
+    
+    def get_value(self, max_age: Optional[float] = None) -> Optional[float]:
+        """
+        Liefert den Wert eines höchstens ``max_age`` Sekunden alten Messwerts
+        
+        Args:
+            max_age: Maximales Alter in Sekunden (optional, sonst self.max_age)
+        
+        Returns:
+            Messwert oder None
+        """
+        sample = self.get_sample(max_age)
+        return sample.value if sample else None
+    
+    def _read_attempt(self) -> Optional[Sample]:
+        """
+        Ein Hardware-Lesevorgang; nach ``retries + 1`` Fehlschlägen in Folge
+        gilt der Lesezyklus als fehlgeschlagen
+        
+        Returns:
+            Neues Sample oder None bei Fehler
+        """
+        start = time.perf_counter()
+        try:
+            sample = self.read_sample()
+        except Exception as e:
+            logger.warning(f"Fehler beim Lesen von Sensor '{self.name}': {e}")
+            sample = None
+        self._read_seconds.observe(time.perf_counter() - start)
+        
+        if sample is not None:
+            self.is_available = True
+            self.consecutive_failures = 0
+            self._failed_attempts = 0
+            return sample
+        
+        self._failed_attempts += 1
+        if self._failed_attempts % (self.retries + 1) == 0:
+            self._read_failures.inc()
+            self.consecutive_failures += 1
+            self.is_available = False
+            logger.warning(
+                f"Sensor '{self.name}' nicht lesbar "
+                f"({self.retries + 1} Versuche, {self.consecutive_failures} Zyklen in Folge)"
+            )
+        return None
+    
+    def _retry_delay(self) -> float:
+        """
+        Abstand bis zum nächsten Hardware-Lesevorgang in Sekunden: min_interval,
+        innerhalb eines fehlschlagenden Lesezyklus ab max(retry_backoff,
+        min_interval) verdoppelt
+        """
+        if not self._failed_attempts:
+            return self.min_interval
+        retry = (self._failed_attempts - 1) % (self.retries + 1)
+        if retry == self.retries:
+            # Lesezyklus beendet, der nächste beginnt regulär
+            return self.min_interval
+        return max(self.retry_backoff, self.min_interval) * 2 ** retry
+    
     def get_status(self) -> Dict[str, Any]:
         """
         Gibt den Status des Sensors zurück
@@ -53,10 +269,11 @@ class BaseSensor(ABC):
         Returns:
             Dictionary mit Statusinformationen
         """
+        sample = self.last_sample
         return {
             'name': self.name,
             'unit': self.unit,
             'available': self.is_available,
-            'last_value': self.last_value,
-            'last_read_time': self.last_read_time.isoformat() if self.last_read_time else None
+            'last_value': sample.value if sample else None,
+            'last_read_time': sample.isoformat() if sample else None
         }
@@ -0,0 +1,331 @@
+"""
+Streaming-Filter zur Aufbereitung von Sensorwerten (Median, EMA, Ausreißer)
+"""
+
+import math
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+except ImportError:  # NumPy ist optional (nur für Replay/Backfill)
+    np = None
+
+
+# Korrekturfaktor, damit die MAD bei Normalverteilung der Standardabweichung entspricht
+MAD_SCALE = 1.4826
+
+
+class _SortedWindow:
+    """
+    Gleitendes Fenster, das zusätzlich sortiert vorgehalten wird
+    
+    Einfügen und Entfernen per Binärsuche (O(log w) Suche, bei den hier
+    üblichen Fenstergrößen < 50 ist das Verschieben im Array vernachlässigbar).
+    """
+    
+    __slots__ = ('window', '_fifo', '_sorted')
+    
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError("Fenstergröße muss mindestens 1 sein")
+        self.window = window
+        self._fifo = deque()
+        self._sorted: List[float] = []
+    
+    def push(self, value: float):
+        if len(self._fifo) == self.window:
+            oldest = self._fifo.popleft()
+            del self._sorted[bisect_left(self._sorted, oldest)]
+        self._fifo.append(value)
+        insort(self._sorted, value)
+    
+    def median(self) -> float:
+        return _sorted_median(self._sorted)
+    
+    def sorted(self) -> List[float]:
+        """
+        Werte des Fensters aufsteigend sortiert (nicht verändern)
+        """
+        return self._sorted
+    
+    def clear(self):
+        self._fifo.clear()
+        self._sorted.clear()
+
+
+def _sorted_median(values: List[float]) -> float:
+    """
+    Median einer sortierten Liste (gleiche Rundung wie numpy.median)
+    """
+    n = len(values)
+    mid = n // 2
+    if n % 2:
+        return values[mid]
+    return (values[mid - 1] + values[mid]) / 2
+
+
+def _kth_deviation(values: List[float], center: float, split: int, k: int) -> float:
+    """
+    k-kleinste (ab 0) Abweichung ``|v - center|`` einer sortierten Liste
+    
+    Links von ``split`` (Werte < center) wachsen die Abweichungen nach links,
+    ab ``split`` nach rechts: zwei sortierte Folgen, deren k-kleinstes
+    Element per Binärsuche über die Aufteilung gefunden wird (O(log w),
+    ohne die Abweichungen zu berechnen oder zu sortieren).
+    """
+    n_right = len(values) - split
+    low, high = max(0, k + 1 - n_right), min(k + 1, split)
+    while low < high:
+        # ``taken`` Abweichungen von links, k + 1 - taken von rechts
+        taken = (low + high) // 2
+        if center - values[split - 1 - taken] < values[split + k - taken] - center:
+            low = taken + 1
+        else:
+            high = taken
+    
+    deviation = center - values[split - low] if low else 0.0
+    if k + 1 - low:
+        deviation = max(deviation, values[split + k - low] - center)
+    return deviation
+
+
+class MedianFilter:
+    """
+    Gleitender Median über die letzten ``window`` Rohwerte
+    """
+    
+    def __init__(self, window: int = 5):
+        """
+        Args:
+            window: Fenstergröße (Anzahl Werte)
+        """
+        self._window = _SortedWindow(window)
+    
+    def process(self, value: float) -> float:
+        self._window.push(value)
+        return self._window.median()
+    
+    def reset(self):
+        self._window.clear()
+
+
+class EMAFilter:
+    """
+    Exponentiell gleitender Mittelwert
+    """
+    
+    def __init__(self, alpha: float = 0.3):
+        """
+        Args:
+            alpha: Glättungsfaktor (0 < alpha <= 1, kleiner = stärker geglättet)
+        """
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError("alpha muss im Bereich (0, 1] liegen")
+        self.alpha = alpha
+        self._value: Optional[float] = None
+    
+    def process(self, value: float) -> float:
+        if self._value is None:
+            self._value = value
+        else:
+            self._value = self.alpha * value + (1.0 - self.alpha) * self._value
+        return self._value
+    
+    def reset(self):
+        self._value = None
+
+
+class HampelFilter:
+    """
+    Ausreißerunterdrückung nach Hampel
+    
+    Weicht ein Wert um mehr als ``n_sigmas`` robuste Standardabweichungen
+    (skalierte MAD) vom gleitenden Median ab, wird er durch den Median ersetzt.
+    Median und MAD kommen per Binärsuche aus dem sortierten Fenster (O(log w)
+    je Wert, dazu das Verschieben beim Einfügen in die sortierte Liste).
+    """
+    
+    def __init__(self, window: int = 7, n_sigmas: float = 3.0, min_threshold: float = 0.0):
+        """
+        Args:
+            window: Fenstergröße (Anzahl Rohwerte inkl. aktuellem Wert)
+            n_sigmas: Schwelle in robusten Standardabweichungen
+            min_threshold: Mindestabweichung, ab der ein Wert als Ausreißer gilt
+        """
+        self.n_sigmas = n_sigmas
+        self.min_threshold = min_threshold
+        self._window = _SortedWindow(window)
+        self.rejected = 0
+    
+    def process(self, value: float) -> float:
+        self._window.push(value)
+        values = self._window.sorted()
+        median = _sorted_median(values)
+        split = bisect_left(values, median)
+        mid = len(values) // 2
+        mad = _kth_deviation(values, median, split, mid)
+        if not len(values) % 2:
+            mad = (_kth_deviation(values, median, split, mid - 1) + mad) / 2
+        threshold = max(self.n_sigmas * MAD_SCALE * mad, self.min_threshold)
+        
+        if abs(value - median) > threshold:
+            self.rejected += 1
+            return median
+        return value
+    
+    def reset(self):
+        self._window.clear()
+
+
+FILTER_TYPES = {
+    'median': MedianFilter,
+    'ema': EMAFilter,
+    'hampel': HampelFilter,
+}
+
+
+class FilterPipeline:
+    """
+    Hintereinandergeschaltete Streaming-Filter für einen Sensor
+    """
+    
+    def __init__(self, stages: Iterable[Any]):
+        """
+        Args:
+            stages: Filterstufen mit process()- und reset()-Methode
+        """
+        self.stages = list(stages)
+    
+    @classmethod
+    def from_config(cls, filters_config: Optional[List[Dict[str, Any]]]) -> Optional['FilterPipeline']:
+        """
+        Erstellt eine Pipeline aus dem ``filters``-Abschnitt eines Sensors
+        
+        Args:
+            filters_config: Liste von Filterdefinitionen ({type: ..., Parameter})
+        
+        Returns:
+            FilterPipeline oder None, wenn keine Filter konfiguriert sind
+        """
+        if not filters_config:
+            return None
+        
+        stages = []
+        for stage_config in filters_config:
+            params = dict(stage_config)
+            filter_type = params.pop('type')
+            if filter_type not in FILTER_TYPES:
+                raise ValueError(f"Unbekannter Filtertyp: {filter_type}")
+            stages.append(FILTER_TYPES[filter_type](**params))
+        return cls(stages)
+    
+    def process(self, value: float) -> Optional[float]:
+        """
+        Filtert einen Rohwert
+        
+        Args:
+            value: Rohwert des Sensors
+        
+        Returns:
+            Gefilterter Wert oder None bei ungültigem Rohwert
+        """
+        if value is None or not math.isfinite(value):
+            return None
+        for stage in self.stages:
+            value = stage.process(value)
+        return value
+    
+    def reset(self):
+        """
+        Setzt den Zustand aller Stufen zurück
+        """
+        for stage in self.stages:
+            stage.reset()
+
+
+def _rolling_windows(values: 'np.ndarray', window: int) -> Tuple[List['np.ndarray'], 'np.ndarray']:
+    """
+    Anlauf (wachsende Fenster) plus volle gleitende Fenster als 2D-Array
+    """
+    head = [values[:i + 1] for i in range(min(window - 1, len(values)))]
+    full = sliding_window_view(values, window) if len(values) >= window else values[:0].reshape(0, window)
+    return head, full
+
+
+def _median_array(values: 'np.ndarray', window: int) -> 'np.ndarray':
+    head, full = _rolling_windows(values, window)
+    result = np.empty(len(values))
+    for i, part in enumerate(head):
+        result[i] = np.median(part)
+    result[len(head):] = np.median(full, axis=1)
+    return result
+
+
+def _ema_array(values: 'np.ndarray', alpha: float) -> 'np.ndarray':
+    # Rekursiver Filter: sequentiell gerechnet, damit die Rundung exakt
+    # der Streaming-Variante entspricht
+    result = np.empty(len(values))
+    current = None
+    for i, value in enumerate(values.tolist()):
+        current = value if current is None else alpha * value + (1.0 - alpha) * current
+        result[i] = current
+    return result
+
+
+def _hampel_array(values: 'np.ndarray', window: int, n_sigmas: float,
+                  min_threshold: float) -> 'np.ndarray':
+    head, full = _rolling_windows(values, window)
+    medians = np.empty(len(values))
+    mads = np.empty(len(values))
+    for i, part in enumerate(head):
+        medians[i] = np.median(part)
+        mads[i] = np.median(np.abs(part - medians[i]))
+    if len(full):
+        full_medians = np.median(full, axis=1)
+        medians[len(head):] = full_medians
+        mads[len(head):] = np.median(np.abs(full - full_medians[:, None]), axis=1)
+    
+    thresholds = np.maximum(n_sigmas * MAD_SCALE * mads, min_threshold)
+    return np.where(np.abs(values - medians) > thresholds, medians, values)
+
+
+def apply_filters(values: Iterable[float],
+                  filters_config: Optional[List[Dict[str, Any]]]) -> List[float]:
+    """
+    Wendet die Filterkette auf einen Verlauf an (Replay/Backfill)
+    
+    Mit NumPy werden Median und Hampel vektorisiert berechnet, ohne NumPy
+    wird die Streaming-Pipeline verwendet. Beide liefern identische Werte.
+    
+    Args:
+        values: Rohwerte in chronologischer Reihenfolge (endlich, ohne None)
+        filters_config: ``filters``-Abschnitt des Sensors
+    
+    Returns:
+        Gefilterte Werte
+    """
+    values = [float(v) for v in values]
+    if not filters_config:
+        return values
+    
+    if np is None:
+        pipeline = FilterPipeline.from_config(filters_config)
+        return [pipeline.process(v) for v in values]
+    
+    data = np.asarray(values, dtype=float)
+    for stage_config in filters_config:
+        params = dict(stage_config)
+        filter_type = params.pop('type')
+        if filter_type == 'median':
+            data = _median_array(data, params.get('window', 5))
+        elif filter_type == 'ema':
+            data = _ema_array(data, params.get('alpha', 0.3))
+        elif filter_type == 'hampel':
+            data = _hampel_array(data, params.get('window', 7), params.get('n_sigmas', 3.0),
+                                 params.get('min_threshold', 0.0))
+        else:
+            raise ValueError(f"Unbekannter Filtertyp: {filter_type}")
+    return data.tolist()
@@ -5,5 +5,8 @@ Utility-Module
 from .logger import setup_logger
 from .data_logger import DataLogger
 from .wifi_manager import WiFiManager
+from .log_filter import RateLimitFilter
+from .records import Sample, ActuatorEvent, AlarmEvent
 
-__all__ = ['setup_logger', 'DataLogger', 'WiFiManager']
+__all__ = ['setup_logger', 'DataLogger', 'WiFiManager', 'RateLimitFilter',
+           'Sample', 'ActuatorEvent', 'AlarmEvent']
@@ -2,27 +2,380 @@
 Datenlogger für Sensordaten
 """
 
+import logging
+import math
+import os
+import re
 import sqlite3
-from datetime import datetime
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from heapq import heappop, heappush, merge
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
+
+from .records import Sample, ActuatorEvent, AlarmEvent
+from .metrics import metrics
+from .sample_archive import encode_block, iter_block, ms_isoformat, timestamp_ms
+
+logger = logging.getLogger(__name__)
+
+_write_seconds = metrics.histogram(
+    'mgb_db_write_seconds', 'Dauer von Schreibvorgängen in der Datenbank', ('operation',))
+_query_seconds = metrics.histogram(
+    'mgb_db_query_seconds', 'Dauer von Abfragen in der Datenbank', ('operation',))
+_rows_written = metrics.counter(
+    'mgb_db_rows_written_total', 'Geschriebene Datenbankzeilen', ('table',))
+_rows_archived = metrics.counter(
+    'mgb_db_archived_rows_total', 'Zu Archivblöcken versiegelte Messwerte')
+
+_write_samples = _write_seconds.labels('samples')
+_write_events = _write_seconds.labels('events')
+_write_archive = _write_seconds.labels('archive')
+_query_sensor_data = _query_seconds.labels('sensor_data')
+_query_alarms = _query_seconds.labels('alarms')
+_query_aggregate = _query_seconds.labels('aggregate')
+_query_events = _query_seconds.labels('events')
+_rows_sensor_data = _rows_written.labels('sensor_data')
+_rows_actuator_status = _rows_written.labels('actuator_status')
+_rows_alarms = _rows_written.labels('alarms')
+
+# Kammer für Zeilen ohne Angabe (Einzelbetrieb ohne 'chambers' in config.yaml)
+DEFAULT_CHAMBER = 'default'
+
+_INSERT_SAMPLE = 'INSERT INTO sensor_data (timestamp, sensor_name, value, unit, chamber) VALUES (?, ?, ?, ?, ?)'
+_INSERT_PARTITION_SAMPLE = (
+    'INSERT INTO sensor_data (id, timestamp, sensor_name, value, unit, chamber) VALUES (?, ?, ?, ?, ?, ?)'
+)
+_INSERT_ACTUATOR = 'INSERT INTO actuator_status (timestamp, actuator_name, state, chamber) VALUES (?, ?, ?, ?)'
+_INSERT_ALARM = 'INSERT INTO alarms (timestamp, alarm_type, message, chamber) VALUES (?, ?, ?, ?)'
+
+# Spalten der Ereignistabellen (Hauptdatenbank) für inkrementelle Übertragungen
+EVENT_COLUMNS = {
+    'actuator_status': ('id', 'timestamp', 'actuator_name', 'state', 'chamber'),
+    'alarms': ('id', 'timestamp', 'alarm_type', 'message', 'acknowledged', 'chamber'),
+}
+
+# Zeiträume für Partitionsdateien der Messwerte
+PARTITION_PERIODS = ('day', 'week', 'month', 'year')
+
+# Gleichzeitig angehängte Partitionen je Abfrage (SQLite erlaubt standardmäßig 10)
+_MAX_ATTACHED = 8
+
+# Schlüssel im Dateinamen je Zeitraum (z.B. mgb_mushroom_grow_box.2026-10.db)
+_PARTITION_KEYS = {
+    'day': re.compile(r'^\d{4}-\d{2}-\d{2}$'),
+    'week': re.compile(r'^\d{4}-W\d{2}$'),
+    'month': re.compile(r'^\d{4}-\d{2}$'),
+    'year': re.compile(r'^\d{4}$'),
+}
+
+_CREATE_PARTITION = '''
+    CREATE TABLE IF NOT EXISTS sensor_data (
+        id INTEGER PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        sensor_name TEXT NOT NULL,
+        value REAL NOT NULL,
+        unit TEXT NOT NULL,
+        chamber TEXT NOT NULL DEFAULT 'default'
+    )
+'''
+
+# Verlauf eines Sensors (Abfragen, aggregate, LTTB) ohne Durchlauf der ganzen Datei
+_CREATE_SAMPLE_INDEX = (
+    'CREATE INDEX IF NOT EXISTS idx_sensor_data_sensor_time ON sensor_data (sensor_name, timestamp)'
+)
+
+# Zeiträume der Archivblöcke (ein Block je Sensor, Kammer und Zeitraum)
+ARCHIVE_BLOCKS = ('hour', 'day')
+
+# Zeilen je Archivierungsstapel (eine kurze Transaktion)
+_SEAL_BATCH = 100000
+
+_CREATE_ARCHIVE = '''
+    CREATE TABLE IF NOT EXISTS sensor_archive (
+        id INTEGER PRIMARY KEY,
+        sensor_name TEXT NOT NULL,
+        chamber TEXT NOT NULL,
+        unit TEXT NOT NULL,
+        start_ts TEXT NOT NULL,
+        end_ts TEXT NOT NULL,
+        first_id INTEGER NOT NULL,
+        last_id INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        data BLOB NOT NULL
+    )
+'''
+_CREATE_ARCHIVE_INDEX = 'CREATE INDEX IF NOT EXISTS idx_sensor_archive_time ON sensor_archive (sensor_name, end_ts)'
+_INSERT_ARCHIVE = (
+    'INSERT INTO sensor_archive (sensor_name, chamber, unit, start_ts, end_ts, first_id, last_id, count, data) '
+    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)'
+)
+
+# Zeitraum und ID-Bereich einer Datei über Rohdaten und Archivblöcke
+_SAMPLE_RANGE = '''
+    SELECT MIN(low_ts), MAX(high_ts), MIN(low_id), MAX(high_id) FROM (
+        SELECT MIN(timestamp) AS low_ts, MAX(timestamp) AS high_ts, MIN(id) AS low_id, MAX(id) AS high_id
+        FROM sensor_data
+        UNION ALL
+        SELECT MIN(start_ts), MAX(end_ts), MIN(first_id), MAX(last_id) FROM sensor_archive
+    )
+'''
+
+# ID-Bereich und Archivblöcke einer Datei (ohne Zeitstempel, nutzt nur den Primärschlüssel)
+_SAMPLE_IDS = '''
+    SELECT MIN(low_id), MAX(high_id), MAX(archived) FROM (
+        SELECT MIN(id) AS low_id, MAX(id) AS high_id, 0 AS archived FROM sensor_data
+        UNION ALL
+        SELECT MIN(first_id), MAX(last_id), COUNT(*) > 0 FROM sensor_archive
+    )
+'''
+
+# Sekunden, die ein lesender DataLogger die bekannten Partitionen weiterverwendet
+_REFRESH_INTERVAL = 1.0
+
+# Kennzahlen für aggregate() (zusätzlich Perzentile wie 'p95' oder 'p99.9')
+AGGREGATE_FUNCS = ('min', 'max', 'avg', 'sum', 'stddev')
+_PERCENTILE = re.compile(r'^p(100|\d{1,2}(?:\.\d)?)$')
+
+# Intervall eines Messwerts: ganzzahlige Millisekunden seit 1970 (Ortszeit wie gespeichert) / Intervalllänge
+# (julianday rechnet intern in ganzen Millisekunden und ist günstiger als strftime('%s'))
+_BUCKET = 'CAST(round((julianday(timestamp) - 2440587.5) * 86400000) AS INTEGER) / ?'
+_EPOCH = datetime(1970, 1, 1)
+
+Timestamp = Union[datetime, str]
+
+
+def partition_key(timestamp: str, period: str) -> str:
+    """
+    Schlüssel der Partition, in die ein Messwert gehört
+    
+    Args:
+        timestamp: ISO-Zeitstempel des Messwerts
+        period: Zeitraum (siehe PARTITION_PERIODS)
+    """
+    if period == 'month':
+        return timestamp[:7]
+    if period == 'day':
+        return timestamp[:10]
+    if period == 'year':
+        return timestamp[:4]
+    year, week, _ = date.fromisoformat(timestamp[:10]).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def partition_bounds(key: str) -> Tuple[str, str]:
+    """
+    Zeitraum einer Partition als ISO-Zeitstempel [Beginn, Ende)
+    
+    Der Zeitraum ergibt sich aus der Form des Schlüssels, Partitionen
+    bleiben daher auch nach einer Änderung von ``partition`` lesbar.
+    """
+    if _PARTITION_KEYS['month'].match(key):
+        year, month = int(key[:4]), int(key[5:7])
+        start = datetime(year, month, 1)
+        end = datetime(year + month // 12, month % 12 + 1, 1)
+    elif _PARTITION_KEYS['day'].match(key):
+        start = datetime.fromisoformat(key)
+        end = start + timedelta(days=1)
+    elif _PARTITION_KEYS['week'].match(key):
+        start = datetime.fromisocalendar(int(key[:4]), int(key[6:8]), 1)
+        end = start + timedelta(weeks=1)
+    elif _PARTITION_KEYS['year'].match(key):
+        start = datetime(int(key), 1, 1)
+        end = datetime(int(key) + 1, 1, 1)
+    else:
+        raise ValueError(f"Ungültiger Partitionsschlüssel '{key}'")
+    return start.isoformat(), end.isoformat()
+
+
+def _isoformat(timestamp: Optional[Timestamp]) -> Optional[str]:
+    if timestamp is None or isinstance(timestamp, str):
+        return timestamp
+    return timestamp.isoformat()
+
+
+def _create_sample_tables(conn: sqlite3.Connection):
+    # Neue Dateien geben durch Archivierung frei gewordene Seiten schrittweise zurück
+    conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+    # WAL: Leser und Schreiber blockieren sich nicht gegenseitig (bleibt in der Datei gespeichert)
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute(_CREATE_PARTITION)
+    conn.execute(_CREATE_SAMPLE_INDEX)
+    conn.execute(_CREATE_ARCHIVE)
+    conn.execute(_CREATE_ARCHIVE_INDEX)
+
+
+class _ReadConnection:
+    """
+    Schreibgeschützte Verbindung für Abfragen (je Thread wiederverwendet)
+    
+    Partitionen bleiben angehängt, bis mehr als _MAX_ATTACHED benötigt
+    werden (die am längsten ungenutzten werden abgehängt); vorbereitete
+    Anweisungen bleiben im Cache der Verbindung.
+    """
+    
+    def __init__(self, db_path: Path, generation: int, mmap_size: int,
+                 cache_size_kb: int, cached_statements: int):
+        self.conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True,
+                                    cached_statements=cached_statements)
+        self.generation = generation
+        self.pid = os.getpid()
+        self._pragmas = (f'mmap_size = {int(mmap_size)}', f'cache_size = -{int(cache_size_kb)}')
+        self._attached: 'OrderedDict[Path, str]' = OrderedDict()
+        self._aliases = 0
+        self.conn.execute('PRAGMA query_only = ON')
+        self._configure('main')
+    
+    def _configure(self, schema: str):
+        for pragma in self._pragmas:
+            self.conn.execute(f'PRAGMA {schema}.{pragma}')
+    
+    def attach(self, paths: List[Optional[Path]]) -> List[str]:
+        """
+        Hängt Partitionen an (sofern nicht bereits angehängt)
+        
+        Args:
+            paths: Partitionen (None = Hauptdatenbank), höchstens _MAX_ATTACHED
+        
+        Returns:
+            Schemanamen der erreichbaren Datenquellen
+        """
+        schemas = []
+        for path in paths:
+            if path is None:
+                schemas.append('main')
+                continue
+            schema = self._attached.get(path)
+            if schema is None:
+                if len(self._attached) >= _MAX_ATTACHED:
+                    self._evict(paths)
+                self._aliases += 1
+                schema = f"p{self._aliases}"
+                try:
+                    self.conn.execute(f'ATTACH DATABASE ? AS {schema}', (f"file:{path}?mode=ro",))
+                except sqlite3.OperationalError:
+                    # Zwischenzeitlich gelöscht (Aufbewahrungsfrist)
+                    continue
+                self._configure(schema)
+                self._attached[path] = schema
+            else:
+                self._attached.move_to_end(path)
+            schemas.append(schema)
+        return schemas
+    
+    def _evict(self, keep: List[Optional[Path]]):
+        for path in list(self._attached):
+            if path not in keep:
+                self.conn.execute(f'DETACH DATABASE {self._attached.pop(path)}')
+                return
+    
+    def close(self):
+        self.conn.close()
 
 
 class DataLogger:
     """
     Speichert Sensordaten in einer SQLite-Datenbank
+    
+    Mit ``partition`` landen die Messwerte je Zeitraum in einer eigenen Datei
+    neben der Hauptdatenbank (``<name>.<Schlüssel>.db``, z.B.
+    ``mgb_mushroom_grow_box.2026-10.db``); Aktor-Status und Alarme bleiben in
+    der Hauptdatenbank. Abfragen hängen nur die Partitionen an (ATTACH), die
+    den angefragten Zeitraum überschneiden; alte Messwerte werden durch
+    Löschen ganzer Dateien entfernt (``drop_partitions``). Die Zeilen-IDs
+    vergibt der DataLogger fortlaufend über alle Partitionen, Messwerte aus
+    der Zeit vor der Partitionierung bleiben in der Hauptdatenbank lesbar.
+    
+    Abgeschlossene Zeiträume lassen sich zu komprimierten Archivblöcken
+    versiegeln (``seal_archive``, Tabelle ``sensor_archive`` derselben Datei);
+    Abfragen lesen Archivblöcke und Rohdaten gemeinsam.
     """
     
-    def __init__(self, db_path: str = "data/mgb_mushroom_grow_box.db"):
+    def __init__(self, db_path: str = "data/mgb_mushroom_grow_box.db",
+                 batch_size: int = 50, partition: Optional[str] = None,
+                 archive_block: str = 'day',
+                 read_mmap_mb: int = 32,
+                 read_cache_kb: int = 4096,
+                 read_cached_statements: int = 64,
+                 read_only: bool = False):
         """
         Initialisiert den DataLogger
         
         Args:
             db_path: Pfad zur Datenbank-Datei
+            batch_size: Anzahl gepufferter Ereignisse, ab der sofort geschrieben wird
+            partition: Zeitraum je Partitionsdatei (siehe PARTITION_PERIODS),
+                None oder 'none' für eine einzige Datei (Standard; 'month' über from_config)
+            archive_block: Zeitraum je Archivblock (siehe ARCHIVE_BLOCKS)
+            read_mmap_mb: Speicherabbildung je Datei für Abfragen in MB (0 = aus)
+            read_cache_kb: Seiten-Cache je Datei und lesender Verbindung in KiB
+            read_cached_statements: Vorbereitete Anweisungen je lesender Verbindung
+            read_only: Nur Abfragen über Dateien, die ein anderer Prozess schreibt
+                (z.B. der Web-Prozess); Partitionen werden vor Abfragen neu ermittelt
         """
+        if partition in (None, '', 'none'):
+            partition = None
+        elif partition not in PARTITION_PERIODS:
+            raise ValueError(f"Unbekannter Partitionszeitraum '{partition}'")
+        if archive_block not in ARCHIVE_BLOCKS:
+            raise ValueError(f"Unbekannter Archivzeitraum '{archive_block}'")
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(exist_ok=True)
-        self._initialize_db()
+        self.read_only = read_only
+        if not read_only:
+            self.db_path.parent.mkdir(exist_ok=True)
+        self.batch_size = batch_size
+        self.partition = partition
+        self.archive_block = archive_block
+        self._pending_actuator_events: List[Tuple[str, ActuatorEvent]] = []
+        self._pending_alarm_events: List[Tuple[str, AlarmEvent]] = []
+        self._pending_lock = threading.Lock()
+        # Partitionen: Schlüssel -> [kleinste ID, größte ID] (None, solange leer)
+        self._partitions: Dict[str, Optional[List[int]]] = {}
+        self._partition_lock = threading.Lock()
+        self._legacy: Optional[Tuple[str, str, int, int]] = None
+        self._next_id = 1
+        # Dateien mit Archivblöcken (None = Hauptdatenbank)
+        self._archived: set = set()
+        # Journal als vorgelagerter Schreibpfad der Messwerte (SampleJournal.start)
+        self.journal = None
+        # Lesende Verbindungen je Thread; neue Generation nach dem Löschen von Partitionen
+        self._readers = threading.local()
+        self._read_generation = 0
+        self._read_options = (read_mmap_mb * 1024 * 1024, read_cache_kb, read_cached_statements)
+        self._refreshed: Optional[float] = None
+        if read_only:
+            self._refresh_partitions()
+            row = self._sample_range(self.db_path)
+            if row[3] is not None:
+                self._legacy = row
+        else:
+            self._initialize_db()
+            self._load_partitions()
+    
+    @classmethod
+    def from_config(cls, config: dict, read_only: bool = False) -> 'DataLogger':
+        """
+        Erstellt den DataLogger aus dem Abschnitt 'database' der Konfiguration
+        
+        Args:
+            config: Gesamte Konfiguration
+            read_only: Nur lesender Zugriff (siehe DataLogger)
+        """
+        database_config = config.get('database', {})
+        return cls(
+            db_path=database_config.get('path', 'data/mgb_mushroom_grow_box.db'),
+            batch_size=database_config.get('batch_size', 50),
+            partition=database_config.get('partition', 'month'),
+            archive_block=(database_config.get('archive') or {}).get('block', 'day'),
+            read_mmap_mb=(database_config.get('read') or {}).get('mmap_size_mb', 32),
+            read_cache_kb=(database_config.get('read') or {}).get('cache_size_kb', 4096),
+            read_cached_statements=(database_config.get('read') or {}).get('cached_statements', 64),
+            read_only=read_only
+        )
     
     def _initialize_db(self):
         """
@@ -31,6 +384,11 @@ class DataLogger:
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
+            # Wirkt nur bei neuen Datenbanken (vor der ersten Tabelle)
+            cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            # WAL: Abfragen der Weboberfläche blockieren die Schreibvorgänge nicht
+            cursor.execute('PRAGMA journal_mode = WAL')
+            
             # Tabelle für Sensordaten
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS sensor_data (
@@ -38,7 +396,8 @@ class DataLogger:
                     timestamp TEXT NOT NULL,
                     sensor_name TEXT NOT NULL,
                     value REAL NOT NULL,
-                    unit TEXT NOT NULL
+                    unit TEXT NOT NULL,
+                    chamber TEXT NOT NULL DEFAULT 'default'
                 )
             ''')
             
@@ -48,7 +407,8 @@ class DataLogger:
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     timestamp TEXT NOT NULL,
                     actuator_name TEXT NOT NULL,
-                    state INTEGER NOT NULL
+                    state INTEGER NOT NULL,
+                    chamber TEXT NOT NULL DEFAULT 'default'
                 )
             ''')
             
@@ -59,12 +419,551 @@ class DataLogger:
                     timestamp TEXT NOT NULL,
                     alarm_type TEXT NOT NULL,
                     message TEXT NOT NULL,
-                    acknowledged INTEGER DEFAULT 0
+                    acknowledged INTEGER DEFAULT 0,
+                    chamber TEXT NOT NULL DEFAULT 'default'
                 )
             ''')
             
+            # Bestehende Datenbanken (vor dem Mehrkammerbetrieb) um die Kammer ergänzen
+            for table in ('sensor_data', 'actuator_status', 'alarms'):
+                columns = {row[1] for row in cursor.execute(f'PRAGMA table_info({table})')}
+                if 'chamber' not in columns:
+                    cursor.execute(
+                        f"ALTER TABLE {table} ADD COLUMN chamber TEXT NOT NULL DEFAULT '{DEFAULT_CHAMBER}'"
+                    )
+            
+            # Verlauf je Sensor (auch für Messwerte aus der Zeit vor der Partitionierung)
+            cursor.execute(_CREATE_SAMPLE_INDEX)
+            
+            # Teilindex für die Abfrage unquittierter Alarme
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_alarms_unacknowledged
+                ON alarms (timestamp) WHERE acknowledged = 0
+            ''')
+            
+            # Archivblöcke versiegelter Messwerte
+            cursor.execute(_CREATE_ARCHIVE)
+            cursor.execute(_CREATE_ARCHIVE_INDEX)
+            
             conn.commit()
     
+    def _partition_path(self, key: str) -> Path:
+        return self.db_path.with_name(f"{self.db_path.stem}.{key}{self.db_path.suffix}")
+    
+    def _partition_files(self) -> Dict[str, Path]:
+        """
+        Vorhandene Partitionsdateien je Schlüssel
+        """
+        prefix = f"{self.db_path.stem}."
+        files = {}
+        for path in self.db_path.parent.glob(f"{prefix}*{self.db_path.suffix}"):
+            key = path.name[len(prefix):-len(self.db_path.suffix)]
+            if any(pattern.match(key) for pattern in _PARTITION_KEYS.values()):
+                files[key] = path
+        return files
+    
+    def _load_partitions(self):
+        """
+        Ermittelt vorhandene Partitionen, Messwerte der Hauptdatenbank und die nächste freie ID
+        """
+        for key, path in self._partition_files().items():
+            with sqlite3.connect(path) as conn:
+                _create_sample_tables(conn)
+                _, _, low, high = conn.execute(_SAMPLE_RANGE).fetchone()
+                if conn.execute('SELECT EXISTS (SELECT 1 FROM sensor_archive)').fetchone()[0]:
+                    self._archived.add(path)
+            self._partitions[key] = [low, high] if high is not None else None
+        
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(_SAMPLE_RANGE).fetchone()
+            if conn.execute('SELECT EXISTS (SELECT 1 FROM sensor_archive)').fetchone()[0]:
+                self._archived.add(None)
+        if row[3] is not None:
+            self._legacy = row
+        
+        ids = [ids[1] for ids in self._partitions.values() if ids] + [row[3] or 0]
+        self._next_id = max(ids) + 1
+        
+        if self.partition is None and self._next_id - 1 > (row[3] or 0):
+            # Partitionierung abgeschaltet: IDs der Hauptdatenbank nach den Partitionen fortsetzen
+            with sqlite3.connect(self.db_path) as conn:
+                if not conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'sensor_data'",
+                                    (self._next_id - 1,)).rowcount:
+                    conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('sensor_data', ?)",
+                                 (self._next_id - 1,))
+                conn.commit()
+    
+    @staticmethod
+    def _sample_range(path: Path, query: str = _SAMPLE_RANGE) -> tuple:
+        """
+        Führt ``query`` schreibgeschützt auf einer Datei aus (ohne Schemaänderungen)
+        """
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            return conn.execute(query).fetchone()
+        finally:
+            conn.close()
+    
+    def _refresh_partitions(self):
+        """
+        Übernimmt Partitionen und Archivblöcke, die der schreibende Prozess
+        angelegt oder gelöscht hat (nur bei read_only, höchstens einmal je
+        _REFRESH_INTERVAL)
+        """
+        if not self.read_only or (self._refreshed is not None
+                                  and time.monotonic() - self._refreshed < _REFRESH_INTERVAL):
+            return
+        with self._partition_lock:
+            self._refreshed = time.monotonic()
+            files = self._partition_files()
+            dropped = [key for key in self._partitions if key not in files]
+            for key in dropped:
+                del self._partitions[key]
+                self._archived.discard(self._partition_path(key))
+            if dropped:
+                # Lesende Verbindungen geben gelöschte Dateien frei
+                self._read_generation += 1
+            
+            sources = [(key, path) for key, path in files.items()
+                       if key not in self._partitions or path not in self._archived]
+            if None not in self._archived:
+                sources.append((None, self.db_path))
+            for key, path in sources:
+                try:
+                    low, high, archived = self._sample_range(path, _SAMPLE_IDS)
+                except sqlite3.DatabaseError:
+                    # Gerade angelegt (Tabellen fehlen noch) oder gerade gelöscht
+                    continue
+                if archived:
+                    self._archived.add(path if key is not None else None)
+                if key is not None:
+                    self._partitions[key] = [low, high] if high is not None else None
+                    self._next_id = max(self._next_id, (high or 0) + 1)
+    
+    def database_files(self) -> List[Path]:
+        """
+        Dateien der Datenbank: Hauptdatenbank, dann Partitionen (älteste zuerst)
+        """
+        self._refresh_partitions()
+        return [self.db_path] + [self._partition_path(key) for key in sorted(self._partitions)]
+    
+    def partitions(self) -> List[Dict[str, Any]]:
+        """
+        Vorhandene Partitionen mit Zeitraum, Dateigröße und ID-Bereich
+        """
+        self._refresh_partitions()
+        result = []
+        for key in sorted(self._partitions):
+            start, end = partition_bounds(key)
+            ids = self._partitions.get(key)
+            path = self._partition_path(key)
+            result.append({
+                'key': key,
+                'path': str(path),
+                'start': start,
+                'end': end,
+                'size': path.stat().st_size if path.exists() else 0,
+                'min_id': ids[0] if ids else None,
+                'max_id': ids[1] if ids else None
+            })
+        return result
+    
+    def _write_sample_rows(self, rows: List[tuple]):
+        """
+        Schreibt Messwertzeilen (Zeitstempel, Sensor, Wert, Einheit, Kammer)
+        in die Hauptdatenbank oder die Partitionen ihres Zeitraums
+        """
+        if self.partition is None:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany(_INSERT_SAMPLE, rows)
+                conn.commit()
+            return
+        
+        groups: Dict[str, List[tuple]] = {}
+        for row in rows:
+            groups.setdefault(partition_key(row[0], self.partition), []).append(row)
+        
+        # Eine Transaktion je Partition (am Monatswechsel ggf. zwei)
+        with self._partition_lock:
+            for key, group in groups.items():
+                first = self._next_id
+                last = first + len(group) - 1
+                self._next_id = last + 1
+                with sqlite3.connect(self._partition_path(key)) as conn:
+                    if key not in self._partitions:
+                        _create_sample_tables(conn)
+                        logger.info(f"Neue Partition {key} für Messwerte angelegt")
+                    conn.executemany(
+                        _INSERT_PARTITION_SAMPLE,
+                        [(first + i, *row) for i, row in enumerate(group)]
+                    )
+                    conn.commit()
+                ids = self._partitions.get(key)
+                self._partitions[key] = [min(ids[0], first), last] if ids else [first, last]
+    
+    def drop_partitions(self, before: Timestamp) -> List[str]:
+        """
+        Löscht ganze Partitionsdateien, deren Zeitraum vor ``before`` endet
+        
+        Args:
+            before: Zeitpunkt (datetime oder ISO-Zeitstempel)
+        
+        Returns:
+            Schlüssel der gelöschten Partitionen
+        """
+        cutoff = _isoformat(before)
+        dropped = []
+        with self._partition_lock:
+            for key in sorted(self._partitions):
+                if partition_bounds(key)[1] > cutoff:
+                    break
+                path = self._partition_path(key)
+                for suffix in ('', '-wal', '-shm', '-journal'):
+                    try:
+                        os.remove(f"{path}{suffix}")
+                    except FileNotFoundError:
+                        pass
+                del self._partitions[key]
+                self._archived.discard(path)
+                dropped.append(key)
+            if dropped:
+                # Lesende Verbindungen geben gelöschte Dateien frei
+                self._read_generation += 1
+        if dropped:
+            logger.info(f"Partitionen gelöscht: {', '.join(dropped)}")
+        return dropped
+    
+    def apply_retention(self, days: float) -> List[str]:
+        """
+        Löscht Partitionen, die vollständig älter als ``days`` Tage sind
+        
+        Returns:
+            Schlüssel der gelöschten Partitionen
+        """
+        return self.drop_partitions(datetime.now() - timedelta(days=days))
+    
+    def _sources(self, start: Optional[str], end: Optional[str]) -> List[Tuple[str, Optional[Path]]]:
+        """
+        Datenquellen, die den Zeitraum überschneiden, jüngste zuerst
+        
+        Returns:
+            Liste (Ende des Zeitraums, Pfad der Partition bzw. None für die Hauptdatenbank)
+        """
+        self._refresh_partitions()
+        sources = []
+        for key in list(self._partitions):
+            low, high = partition_bounds(key)
+            if (end is None or low <= end) and (start is None or high > start):
+                sources.append((high, self._partition_path(key)))
+        if self.partition is None:
+            # Ohne Partitionierung wächst die Hauptdatenbank weiter
+            sources.append(('9999', None))
+        elif self._legacy is not None:
+            low, high = self._legacy[0], self._legacy[1]
+            if (end is None or low <= end) and (start is None or high >= start):
+                sources.append((high, None))
+        sources.sort(key=lambda source: source[0], reverse=True)
+        return sources
+    
+    def _query_sources(self, paths: List[Optional[Path]], columns: str, where: str,
+                       params: list, order: str, limit: int) -> List[tuple]:
+        """
+        Führt eine Abfrage über mehrere Datenquellen aus (UNION ALL)
+        
+        Args:
+            paths: Partitionen (None = Hauptdatenbank), höchstens _MAX_ATTACHED
+            columns: Spalten von sensor_data
+            where: Bedingung (ohne WHERE, leer für alle Zeilen)
+            params: Parameter der Bedingung
+            order: Sortierung des Ergebnisses
+            limit: Höchstzahl Zeilen
+        """
+        reader = self._reader()
+        schemas = reader.attach(paths)
+        if not schemas:
+            return []
+        query = self._union_query(schemas, 'sensor_data', columns, where)
+        return reader.conn.execute(
+            f'{query} ORDER BY {order} LIMIT ?', (*params * len(schemas), limit)
+        ).fetchall()
+    
+    def _reader(self) -> _ReadConnection:
+        """
+        Lesende Verbindung des aktuellen Threads (nach fork oder gelöschten Partitionen neu)
+        """
+        reader = getattr(self._readers, 'connection', None)
+        if reader is not None and reader.pid == os.getpid() and reader.generation == self._read_generation:
+            return reader
+        if reader is not None and reader.pid == os.getpid():
+            reader.close()
+        reader = self._open_reader()
+        self._readers.connection = reader
+        return reader
+    
+    def _open_reader(self) -> _ReadConnection:
+        return _ReadConnection(self.db_path, self._read_generation, *self._read_options)
+    
+    @staticmethod
+    def _union_query(schemas: List[str], table: str, columns: str, where: str) -> str:
+        condition = f' WHERE {where}' if where else ''
+        if len(schemas) == 1:
+            return f'SELECT {columns} FROM {schemas[0]}.{table}{condition}'
+        return 'SELECT * FROM ({})'.format(' UNION ALL '.join(
+            f'SELECT {columns} FROM {schema}.{table}{condition}' for schema in schemas
+        ))
+    
+    def _iter_archive(self, paths: List[Optional[Path]], where: str, params: list,
+                      order: str, reader: Optional[_ReadConnection] = None) -> Iterator[tuple]:
+        """
+        Liest Archivblöcke mehrerer Datenquellen schrittweise
+        (über ``reader`` oder die Verbindung des Threads)
+        
+        Yields:
+            Tupel (Sensor, Kammer, Einheit, Beginn, Ende, erste ID, Block)
+        """
+        paths = [path for path in paths if path in self._archived]
+        if not paths:
+            return
+        reader = reader or self._reader()
+        schemas = reader.attach(paths)
+        if not schemas:
+            return
+        query = self._union_query(
+            schemas, 'sensor_archive',
+            'sensor_name, chamber, unit, start_ts, end_ts, first_id, data', where
+        )
+        cursor = reader.conn.execute(f'{query} ORDER BY {order}', params * len(schemas))
+        try:
+            yield from cursor
+        finally:
+            # Anweisung sofort zurücksetzen (Verbindung wird weiterverwendet)
+            cursor.close()
+    
+    def _block_key(self, timestamp: str) -> str:
+        # Präfix des ISO-Zeitstempels: Stunde (2026-10-17T05) oder Tag (2026-10-17)
+        return timestamp[:13] if self.archive_block == 'hour' else timestamp[:10]
+    
+    def seal_archive(self, seal_after_hours: float = 48.0,
+                     stop: Optional[threading.Event] = None) -> int:
+        """
+        Versiegelt Messwerte aus abgeschlossenen Zeiträumen zu Archivblöcken
+        
+        Versiegelt werden ganze Stunden bzw. Tage (``archive_block``), die vor
+        ``seal_after_hours`` enden. Je Stapel werden die Blöcke eingefügt und
+        die Rohdaten in derselben kurzen Transaktion gelöscht; der Schreibpfad
+        wartet daher höchstens einen Stapel lang.
+        
+        Args:
+            seal_after_hours: Mindestalter der Messwerte in Stunden
+            stop: Event zum vorzeitigen Abbruch (nach dem laufenden Stapel)
+        
+        Returns:
+            Anzahl archivierter Messwerte
+        """
+        horizon = self._block_key((datetime.now() - timedelta(hours=seal_after_hours)).isoformat())
+        sealed = 0
+        for end, path in self._sources(None, horizon):
+            if stop is not None and stop.is_set():
+                break
+            sealed += self._seal_source(path, horizon, stop, complete=path is not None and end <= horizon)
+        if sealed:
+            logger.info(f"{sealed} Messwerte archiviert (vor {horizon})")
+        return sealed
+    
+    def _seal_source(self, path: Optional[Path], horizon: str,
+                     stop: Optional[threading.Event], complete: bool = False) -> int:
+        """
+        Versiegelt die Messwerte einer Datei, die vor ``horizon`` liegen
+        
+        Args:
+            path: Partition (None = Hauptdatenbank)
+            horizon: Beginn des ersten nicht zu versiegelnden Zeitraums
+            stop: Event zum vorzeitigen Abbruch
+            complete: Zeitraum der Partition liegt vollständig vor ``horizon``
+        """
+        try:
+            # mode=rw legt eine zwischenzeitlich gelöschte Partition nicht neu an
+            conn = sqlite3.connect(f"file:{path or self.db_path}?mode=rw", uri=True, timeout=30)
+        except sqlite3.OperationalError:
+            return 0
+        
+        sealed = last_id = 0
+        try:
+            while stop is None or not stop.is_set():
+                rows = conn.execute(
+                    'SELECT id, timestamp, sensor_name, value, unit, chamber FROM sensor_data '
+                    'WHERE id > ? ORDER BY id LIMIT ?', (last_id, _SEAL_BATCH)
+                ).fetchall()
+                count = 0
+                while count < len(rows) and rows[count][1] < horizon:
+                    count += 1
+                if count == _SEAL_BATCH:
+                    # Angebrochenen letzten Block dem nächsten Stapel überlassen,
+                    # damit je Sensor und Zeitraum möglichst ein Block entsteht
+                    key = self._block_key(rows[-1][1])
+                    boundary = count
+                    while boundary and self._block_key(rows[boundary - 1][1]) == key:
+                        boundary -= 1
+                    count = boundary or count
+                if not count:
+                    break
+                
+                batch = rows[:count]
+                self._archived.add(path)
+                with _write_archive.time(), conn:
+                    conn.executemany(_INSERT_ARCHIVE, self._encode_blocks(batch))
+                    conn.execute('DELETE FROM sensor_data WHERE id > ? AND id <= ?',
+                                 (last_id, batch[-1][0]))
+                sealed += count
+                _rows_archived.inc(count)
+                last_id = batch[-1][0]
+                if len(rows) < _SEAL_BATCH or (count < len(rows) and rows[count][1] >= horizon):
+                    break
+            
+            if sealed:
+                if complete:
+                    # Abgeschlossene Partition (keine Schreibzugriffe mehr): vollständig verdichten
+                    conn.execute('VACUUM')
+                else:
+                    # executescript führt das Pragma bis zum Ende aus (execute gibt nur eine Seite frei)
+                    conn.executescript('PRAGMA incremental_vacuum')
+                # Freigegebene Seiten in die Datei übernehmen und das WAL kürzen
+                conn.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchall()
+        finally:
+            conn.close()
+        return sealed
+    
+    def _encode_blocks(self, rows: List[tuple]) -> List[tuple]:
+        """
+        Gruppiert Zeilen (ID, Zeitstempel, Sensor, Wert, Einheit, Kammer) zu Archivblöcken
+        """
+        groups: Dict[tuple, List[tuple]] = {}
+        for row_id, timestamp, sensor_name, value, unit, chamber in rows:
+            groups.setdefault((self._block_key(timestamp), sensor_name, chamber, unit), []).append(
+                (row_id, timestamp_ms(timestamp), value)
+            )
+        
+        blocks = []
+        for (_, sensor_name, chamber, unit), samples in groups.items():
+            ids, stamps, values = zip(*samples)
+            blocks.append((
+                sensor_name, chamber, unit,
+                ms_isoformat(min(stamps)), ms_isoformat(max(stamps)),
+                ids[0], ids[-1], len(ids),
+                encode_block(ids, stamps, values)
+            ))
+        return blocks
+    
+    def get_samples_after(self, last_id: int, limit: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Messwerte mit einer ID größer ``last_id`` in aufsteigender Reihenfolge
+        (für inkrementelle Übertragungen, über alle Partitionen)
+        
+        Args:
+            last_id: Zuletzt verarbeitete ID
+            limit: Maximale Anzahl der Datensätze
+        """
+        self._refresh_partitions()
+        sources = []
+        for key, ids in list(self._partitions.items()):
+            if ids and ids[1] > last_id:
+                sources.append((ids[0], self._partition_path(key)))
+        if self.partition is None:
+            sources.append((0, None))
+        elif self._legacy is not None and self._legacy[3] > last_id:
+            sources.append((self._legacy[2], None))
+        if not sources:
+            return []
+        
+        # Älteste Partitionen zuerst; IDs der übrigen Partitionen begrenzen das Ergebnis
+        sources.sort(key=lambda source: source[0])
+        chunk, rest = sources[:_MAX_ATTACHED], sources[_MAX_ATTACHED:]
+        where, params = 'id > ?', [last_id]
+        if rest:
+            where += ' AND id < ?'
+            params.append(min(low for low, _ in rest))
+        
+        with _query_sensor_data.time():
+            paths = [path for _, path in chunk]
+            rows = self._query_sources(
+                paths, 'id, timestamp, sensor_name, value, unit, chamber', where, params, 'id', limit
+            )
+            rows = self._merge_archive_after(paths, rows, last_id, params[1] if rest else None, limit)
+        return [
+            {
+                'id': row[0],
+                'timestamp': row[1],
+                'sensor_name': row[2],
+                'value': row[3],
+                'unit': row[4],
+                'chamber': row[5]
+            }
+            for row in rows
+        ]
+    
+    def _merge_archive_after(self, paths: List[Optional[Path]], rows: List[tuple], last_id: int,
+                             cap: Optional[int], limit: int) -> List[tuple]:
+        """
+        Ergänzt Zeilen (ID, ...) um archivierte Messwerte mit ID > ``last_id`` (und < ``cap``)
+        """
+        where, params = 'last_id > ?', [last_id]
+        if cap is not None:
+            where += ' AND first_id < ?'
+            params.append(cap)
+        
+        for sensor_name, chamber, unit, _, _, first_id, data in self._iter_archive(
+                paths, where, params, 'first_id'):
+            if len(rows) >= limit and first_id > rows[limit - 1][0]:
+                break
+            found = 0
+            # IDs eines Blocks steigen: höchstens ``limit`` Treffer je Block nötig
+            for row_id, ms, value in iter_block(data):
+                if row_id <= last_id or (cap is not None and row_id >= cap):
+                    continue
+                rows.append((row_id, ms_isoformat(ms), sensor_name, value, unit, chamber))
+                found += 1
+                if found >= limit:
+                    break
+            rows.sort(key=itemgetter(0))
+            del rows[limit:]
+        return rows
+    
+    def last_sample_id(self) -> int:
+        """
+        Höchste vergebene ID eines Messwerts (0 ohne Messwerte)
+        """
+        if self.partition is None:
+            with sqlite3.connect(self.db_path) as conn:
+                newest = conn.execute('SELECT MAX(id) FROM sensor_data').fetchone()[0] or 0
+            return max(newest, self._next_id - 1)
+        return self._next_id - 1
+    
+    def get_events_after(self, table: str, last_id: int, limit: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Zeilen aus ``actuator_status`` oder ``alarms`` mit einer ID größer
+        ``last_id`` in aufsteigender Reihenfolge (für inkrementelle Übertragungen)
+        
+        Args:
+            table: Tabelle (Schlüssel von EVENT_COLUMNS)
+            last_id: Zuletzt verarbeitete ID
+            limit: Maximale Anzahl der Datensätze
+        """
+        columns = EVENT_COLUMNS[table]
+        with _query_events.time():
+            cursor = self._reader().conn.execute(
+                f"SELECT {', '.join(columns)} FROM {table} WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, limit)
+            )
+            return [dict(zip(columns, row)) for row in cursor]
+    
+    def last_event_id(self, table: str) -> int:
+        """
+        Höchste ID in ``actuator_status`` oder ``alarms`` (0 ohne Einträge)
+        """
+        if table not in EVENT_COLUMNS:
+            raise KeyError(table)
+        return self._reader().conn.execute(f'SELECT MAX(id) FROM {table}').fetchone()[0] or 0
+    
     def log_sensor_data(self, sensor_name: str, value: float, unit: str, 
                        timestamp: Optional[datetime] = None):
         """
@@ -79,16 +978,140 @@ class DataLogger:
         if timestamp is None:
             timestamp = datetime.now()
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                'INSERT INTO sensor_data (timestamp, sensor_name, value, unit) VALUES (?, ?, ?, ?)',
-                (timestamp.isoformat(), sensor_name, value, unit)
-            )
+        self._write_sample_rows([(timestamp.isoformat(), sensor_name, value, unit, DEFAULT_CHAMBER)])
+    
+    def log_sample(self, sample: Sample):
+        """
+        Speichert einen Messwert-Datensatz
+        
+        Args:
+            sample: Sample des Sensors
+        """
+        self.log_samples((sample,))
+    
+    def log_samples(self, samples: Iterable[Sample], chamber: str = DEFAULT_CHAMBER):
+        """
+        Speichert mehrere Messwerte in einer Transaktion
+        
+        Args:
+            samples: Samples der Sensoren
+            chamber: Kammer der Sensoren
+        """
+        self.log_chamber_samples(((chamber, samples),))
+    
+    def log_chamber_samples(self, batches: Iterable[Tuple[str, Iterable[Sample]]]):
+        """
+        Speichert die Messwerte mehrerer Kammern in einer gemeinsamen Transaktion
+        
+        Args:
+            batches: Paare (Kammer, Samples)
+        """
+        journal = self.journal
+        if journal is not None:
+            batches = [(chamber, tuple(samples)) for chamber, samples in batches]
+            if journal.append(batches):
+                return
+        
+        self.log_rows([
+            (sample.isoformat(), sample.sensor, sample.value, sample.unit, chamber)
+            for chamber, samples in batches
+            for sample in samples
+        ])
+    
+    def log_rows(self, rows: List[tuple]):
+        """
+        Speichert fertige Messwertzeilen (Zeitstempel, Sensor, Wert, Einheit, Kammer)
+        in einer Transaktion je Partition (auch für die Übernahme aus dem Journal)
+        """
+        if not rows:
+            return
+        
+        with _write_samples.time():
+            self._write_sample_rows(rows)
+        _rows_sensor_data.inc(len(rows))
+    
+    def queue_actuator_event(self, event: ActuatorEvent, chamber: str = DEFAULT_CHAMBER):
+        """
+        Puffert eine Zustandsänderung eines Aktors für das gebündelte Schreiben
+        
+        Args:
+            event: ActuatorEvent des Aktors
+            chamber: Kammer des Aktors
+        """
+        with self._pending_lock:
+            self._pending_actuator_events.append((chamber, event))
+            if len(self._pending_actuator_events) < self.batch_size:
+                return
+        self.flush()
+    
+    def queue_alarm_event(self, event: AlarmEvent, chamber: str = DEFAULT_CHAMBER):
+        """
+        Puffert einen Alarm für das gebündelte Schreiben
+        
+        Args:
+            event: AlarmEvent
+            chamber: Kammer, in der der Alarm ausgelöst wurde
+        """
+        with self._pending_lock:
+            self._pending_alarm_events.append((chamber, event))
+            if len(self._pending_alarm_events) < self.batch_size:
+                return
+        self.flush()
+    
+    def flush(self):
+        """
+        Schreibt alle gepufferten Ereignisse in einer Transaktion
+        """
+        with self._pending_lock:
+            actuator_events = self._pending_actuator_events
+            alarm_events = self._pending_alarm_events
+            self._pending_actuator_events = []
+            self._pending_alarm_events = []
+        
+        if not actuator_events and not alarm_events:
+            return
+        
+        with _write_events.time(), sqlite3.connect(self.db_path) as conn:
+            if actuator_events:
+                conn.executemany(
+                    _INSERT_ACTUATOR,
+                    [(event.isoformat(), event.actuator, int(event.state), chamber)
+                     for chamber, event in actuator_events]
+                )
+            if alarm_events:
+                conn.executemany(
+                    _INSERT_ALARM,
+                    [(event.isoformat(), event.alarm_type, event.message, chamber)
+                     for chamber, event in alarm_events]
+                )
             conn.commit()
+        _rows_actuator_status.inc(len(actuator_events))
+        _rows_alarms.inc(len(alarm_events))
+    
+    def pending_events(self) -> int:
+        """
+        Anzahl gepufferter, noch nicht geschriebener Ereignisse
+        """
+        return len(self._pending_actuator_events) + len(self._pending_alarm_events)
+    
+    def db_size(self) -> int:
+        """
+        Größe der Datenbank inkl. Write-Ahead-Log und Partitionen in Bytes
+        """
+        size = 0
+        paths = [self.db_path, Path(f"{self.db_path}-wal")]
+        for key in list(self._partitions):
+            path = self._partition_path(key)
+            paths.extend((path, Path(f"{path}-wal")))
+        for path in paths:
+            try:
+                size += os.path.getsize(path)
+            except OSError:
+                pass
+        return size
     
     def log_actuator_state(self, actuator_name: str, state: bool,
-                          timestamp: Optional[datetime] = None):
+                          timestamp: Optional[datetime] = None, chamber: str = DEFAULT_CHAMBER):
         """
         Speichert einen Aktor-Status
         
@@ -96,20 +1119,18 @@ class DataLogger:
             actuator_name: Name des Aktors
             state: Status (True=Ein, False=Aus)
             timestamp: Zeitstempel (optional, sonst aktuell)
+            chamber: Kammer des Aktors
         """
         if timestamp is None:
             timestamp = datetime.now()
         
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                'INSERT INTO actuator_status (timestamp, actuator_name, state) VALUES (?, ?, ?)',
-                (timestamp.isoformat(), actuator_name, int(state))
-            )
+            cursor.execute(_INSERT_ACTUATOR, (timestamp.isoformat(), actuator_name, int(state), chamber))
             conn.commit()
     
     def log_alarm(self, alarm_type: str, message: str,
-                 timestamp: Optional[datetime] = None):
+                 timestamp: Optional[datetime] = None, chamber: str = DEFAULT_CHAMBER):
         """
         Speichert einen Alarm
         
@@ -117,53 +1138,483 @@ class DataLogger:
             alarm_type: Typ des Alarms
             message: Alarm-Nachricht
             timestamp: Zeitstempel (optional, sonst aktuell)
+            chamber: Kammer, in der der Alarm ausgelöst wurde
         """
         if timestamp is None:
             timestamp = datetime.now()
         
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                'INSERT INTO alarms (timestamp, alarm_type, message) VALUES (?, ?, ?)',
-                (timestamp.isoformat(), alarm_type, message)
-            )
+            cursor.execute(_INSERT_ALARM, (timestamp.isoformat(), alarm_type, message, chamber))
             conn.commit()
     
     def get_sensor_data(self, sensor_name: Optional[str] = None, 
-                       limit: int = 100) -> List[Dict[str, Any]]:
+                       limit: int = 100, chamber: Optional[str] = None,
+                       start: Optional[Timestamp] = None,
+                       end: Optional[Timestamp] = None) -> List[Dict[str, Any]]:
         """
-        Liest Sensordaten aus der Datenbank
+        Liest Sensordaten aus der Datenbank (neueste zuerst, über alle Partitionen)
         
         Args:
             sensor_name: Name des Sensors (optional, sonst alle)
             limit: Maximale Anzahl der Datensätze
-            
+            chamber: Nur Messwerte dieser Kammer (optional, sonst alle)
+            start: Nur Messwerte ab diesem Zeitpunkt (optional)
+            end: Nur Messwerte bis zu diesem Zeitpunkt (optional)
+        
         Returns:
             Liste mit Sensordaten
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            if sensor_name:
-                cursor.execute(
-                    'SELECT timestamp, sensor_name, value, unit FROM sensor_data '
-                    'WHERE sensor_name = ? ORDER BY timestamp DESC LIMIT ?',
-                    (sensor_name, limit)
+        return [
+            {
+                'timestamp': row[0],
+                'sensor_name': row[1],
+                'value': row[2],
+                'unit': row[3]
+            }
+            for row in self.get_sensor_rows(sensor_name, limit, chamber, start, end)
+        ]
+    
+    def get_sensor_rows(self, sensor_name: Optional[str] = None,
+                        limit: int = 100, chamber: Optional[str] = None,
+                        start: Optional[Timestamp] = None,
+                        end: Optional[Timestamp] = None) -> List[Tuple[str, str, float, str]]:
+        """
+        Wie get_sensor_data, aber als Tupel (Zeitstempel, Sensor, Wert, Einheit)
+        direkt aus dem Cursor, ohne ein Dictionary je Zeile
+        """
+        start, end = _isoformat(start), _isoformat(end)
+        conditions, params = [], []
+        if sensor_name:
+            conditions.append('sensor_name = ?')
+            params.append(sensor_name)
+        if chamber:
+            conditions.append('chamber = ?')
+            params.append(chamber)
+        if start:
+            conditions.append('timestamp >= ?')
+            params.append(start)
+        if end:
+            conditions.append('timestamp <= ?')
+            params.append(end)
+        where = ' AND '.join(conditions)
+        
+        rows = []
+        with _query_sensor_data.time():
+            paths = [path for _, path in self._sources(start, end)]
+            # Jüngste Partitionen zuerst, bis ``limit`` Zeilen vorliegen
+            for offset in range(0, len(paths), _MAX_ATTACHED):
+                chunk = paths[offset:offset + _MAX_ATTACHED]
+                chunk_rows = self._query_sources(
+                    chunk, 'timestamp, sensor_name, value, unit',
+                    where, params, 'timestamp DESC', limit - len(rows)
+                )
+                rows.extend(self._merge_archive_newest(
+                    chunk, chunk_rows, sensor_name, chamber, start, end, limit - len(rows)
+                ))
+                if len(rows) >= limit:
+                    break
+        return rows
+    
+    def iter_sensor_data(self, sensor_name: str, chamber: Optional[str] = None,
+                         start: Optional[Timestamp] = None,
+                         end: Optional[Timestamp] = None) -> Iterator[Tuple[str, float]]:
+        """
+        Messwerte eines Sensors in zeitlicher Reihenfolge (älteste zuerst)
+        
+        Liest über eine eigene schreibgeschützte Verbindung direkt vom Cursor
+        (keine Zwischenlisten, auch über Millionen Zeilen); Archivblöcke
+        werden eingemischt.
+        
+        Args:
+            sensor_name: Name des Sensors
+            chamber: Nur Messwerte dieser Kammer (optional, sonst alle)
+            start: Nur Messwerte ab diesem Zeitpunkt (optional)
+            end: Nur Messwerte bis zu diesem Zeitpunkt (optional)
+        
+        Yields:
+            Tupel (Zeitstempel, Wert)
+        """
+        start, end = _isoformat(start), _isoformat(end)
+        conditions, params = ['sensor_name = ?'], [sensor_name]
+        if chamber:
+            conditions.append('chamber = ?')
+            params.append(chamber)
+        if start:
+            conditions.append('timestamp >= ?')
+            params.append(start)
+        if end:
+            conditions.append('timestamp <= ?')
+            params.append(end)
+        where = ' AND '.join(conditions)
+        
+        # Älteste Datenquellen zuerst
+        paths = [path for _, path in reversed(self._sources(start, end))]
+        reader = self._open_reader()
+        try:
+            for offset in range(0, len(paths), _MAX_ATTACHED):
+                chunk = paths[offset:offset + _MAX_ATTACHED]
+                schemas = reader.attach(chunk)
+                if not schemas:
+                    continue
+                query = self._union_query(schemas, 'sensor_data', 'timestamp, value', where)
+                rows = reader.conn.execute(f'{query} ORDER BY timestamp', params * len(schemas))
+                if any(path in self._archived for path in chunk):
+                    rows = merge(rows, self._iter_archive_ascending(reader, chunk, sensor_name, chamber, start, end),
+                                 key=itemgetter(0))
+                yield from rows
+        finally:
+            reader.close()
+    
+    def _iter_archive_ascending(self, reader: _ReadConnection, paths: List[Optional[Path]],
+                                sensor_name: str, chamber: Optional[str],
+                                start: Optional[str], end: Optional[str]) -> Iterator[Tuple[str, float]]:
+        """
+        Archivierte Messwerte (Zeitstempel, Wert) in zeitlicher Reihenfolge
+        """
+        where, params = self._archive_conditions(sensor_name, chamber, start, end)
+        pending: List[Tuple[str, float]] = []
+        for _, _, _, block_start, _, _, data in self._iter_archive(paths, where, params, 'start_ts', reader):
+            # Spätere Blöcke beginnen nicht vor ``block_start``
+            while pending and pending[0][0] < block_start:
+                yield heappop(pending)
+            for _, ms, value in iter_block(data):
+                timestamp = ms_isoformat(ms)
+                if (start and timestamp < start) or (end and timestamp > end):
+                    continue
+                heappush(pending, (timestamp, value))
+        while pending:
+            yield heappop(pending)
+    
+    def aggregate(self, sensor_name: str, start: Timestamp, end: Timestamp,
+                  bucket: Union[int, timedelta] = 3600,
+                  funcs: Iterable[str] = ('min', 'max', 'avg'),
+                  chamber: Optional[str] = None,
+                  gap: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Fasst die Messwerte eines Sensors je Zeitintervall zusammen (in SQLite)
+        
+        Intervalle beginnen bei Vielfachen von ``bucket`` in Ortszeit (Tage um
+        Mitternacht); Intervalle ohne Messwerte fehlen im Ergebnis. Perzentile
+        nach dem Verfahren des nächsten Rangs, ``stddev`` ist die
+        Standardabweichung der Grundgesamtheit.
+        
+        Args:
+            sensor_name: Name des Sensors
+            start: Beginn des Zeitraums
+            end: Ende des Zeitraums (einschließlich)
+            bucket: Intervalllänge in ganzen Sekunden oder als timedelta
+            funcs: Kennzahlen aus AGGREGATE_FUNCS oder Perzentile ('p50', 'p99.9')
+            chamber: Nur Messwerte dieser Kammer (optional, sonst alle)
+            gap: Abstände zwischen zwei Messwerten über dieser Dauer in Sekunden
+                als Lücken melden (optional)
+        
+        Returns:
+            Dictionary mit ``timestamps`` (Beginn der Intervalle), ``count``
+            (array 'q') und je Kennzahl einem array 'd'; mit ``gap`` zusätzlich
+            ``gaps`` als Liste (letzter Messwert vor, erster nach der Lücke)
+        """
+        if isinstance(bucket, timedelta):
+            bucket = bucket.total_seconds()
+        width = int(bucket)
+        if width < 1 or width != bucket:
+            raise ValueError(f"Ungültige Intervalllänge {bucket}")
+        funcs = list(funcs)
+        percentiles = {}
+        for func in funcs:
+            match = _PERCENTILE.match(func)
+            if match:
+                # Ganzzahlig in Promille
+                percentiles[func] = round(float(match.group(1)) * 10)
+            elif func not in AGGREGATE_FUNCS:
+                raise ValueError(f"Unbekannte Kennzahl '{func}'")
+        
+        start, end = _isoformat(start), _isoformat(end)
+        conditions, params = ['sensor_name = ?', 'timestamp >= ?', 'timestamp <= ?'], [sensor_name, start, end]
+        if chamber:
+            conditions.append('chamber = ?')
+            params.append(chamber)
+        where = ' AND '.join(conditions)
+        
+        rows, gaps = [], []
+        with _query_aggregate.time():
+            paths = [path for _, path in self._sources(start, end)]
+            staged = len(paths) > _MAX_ATTACHED or any(path in self._archived for path in paths)
+            reader = self._open_reader() if staged else self._reader()
+            try:
+                if staged:
+                    source, source_params = self._stage_samples(
+                        reader, paths, where, params, sensor_name, chamber, start, end
+                    ), []
+                else:
+                    schemas = reader.attach(paths)
+                    source = self._union_query(schemas, 'sensor_data', 'timestamp, value', where) if schemas else ''
+                    source_params = params * len(schemas)
+                if source:
+                    # Standardabweichung aus Summen um einen Wert nahe den Daten (vermeidet Auslöschung)
+                    shift = 0.0
+                    if 'stddev' in funcs:
+                        first = reader.conn.execute(f'{source} LIMIT 1', source_params).fetchone()
+                        shift = first[1] if first else 0.0
+                    rows = reader.conn.execute(
+                        self._bucket_query(source, funcs, percentiles), (width * 1000, shift, *source_params)
+                    ).fetchall()
+                    if gap is not None:
+                        gaps = reader.conn.execute(
+                            'SELECT previous, timestamp FROM ('
+                            ' SELECT timestamp, LAG(timestamp) OVER w AS previous,'
+                            ' (julianday(timestamp) - LAG(julianday(timestamp)) OVER w) * 86400 AS delta'
+                            f' FROM ({source}) WINDOW w AS (ORDER BY timestamp)'
+                            ') WHERE delta > ?', (*source_params, gap)
+                        ).fetchall()
+            finally:
+                if staged:
+                    reader.close()
+        
+        result: Dict[str, Any] = {
+            'timestamps': [(_EPOCH + timedelta(seconds=row[0] * width)).isoformat() for row in rows],
+            'count': array('q', (row[1] for row in rows))
+        }
+        for column, func in enumerate(funcs, 2):
+            values = (row[column] for row in rows)
+            if func == 'stddev':
+                values = (math.sqrt(max(variance, 0.0)) for variance in values)
+            result[func] = array('d', values)
+        if gap is not None:
+            result['gaps'] = gaps
+        return result
+    
+    @staticmethod
+    def _bucket_query(source: str, funcs: List[str], percentiles: Dict[str, int]) -> str:
+        """
+        Abfrage der Kennzahlen je Intervall
+        
+        Parameter: Intervalllänge in ms, Verschiebung für die Varianz, dann
+        die Parameter von ``source``. Perzentile (nächster Rang) sind der
+        kleinste Wert, dessen kumulierter Anteil im Intervall (CUME_DIST) den
+        Anteil erreicht; Anteile k/n und q/1000 werden beide exakt gerundet
+        dividiert, der Vergleich entspricht daher dem ganzzahligen Rang.
+        """
+        columns = ['COUNT(*)']
+        for func in funcs:
+            if func in percentiles:
+                columns.append(f'MIN(CASE WHEN share >= {percentiles[func]} / 1000.0 THEN value END)')
+            elif func == 'stddev':
+                # Varianz, Wurzel in Python (SQLite ohne Mathematikfunktionen)
+                columns.append('(SUM(shifted * shifted) - SUM(shifted) * SUM(shifted) / COUNT(*)) / COUNT(*)')
+            else:
+                columns.append(f'{func.upper()}(value)')
+        samples = f'SELECT {_BUCKET} AS bucket, value, value - ? AS shifted FROM ({source})'
+        if percentiles:
+            samples = (
+                'SELECT bucket, value, shifted, CUME_DIST() OVER (PARTITION BY bucket ORDER BY value) AS share'
+                f' FROM ({samples})'
+            )
+        return f"SELECT bucket, {', '.join(columns)} FROM ({samples}) GROUP BY bucket ORDER BY bucket"
+    
+    def _stage_samples(self, reader: _ReadConnection, paths: List[Optional[Path]], where: str,
+                       params: list, sensor_name: str, chamber: Optional[str],
+                       start: str, end: str) -> str:
+        """
+        Sammelt Messwerte aus mehr als _MAX_ATTACHED Datenquellen oder mit
+        Archivblöcken in einer temporären Tabelle der (eigenen) Verbindung
+        
+        Returns:
+            Abfrage der gesammelten Messwerte (timestamp, value)
+        """
+        conn = reader.conn
+        # Nur die temporäre Tabelle wird beschrieben, die Dateien bleiben schreibgeschützt (mode=ro)
+        conn.execute('PRAGMA query_only = OFF')
+        # Ohne offene Transaktion, sonst scheitert DETACH beim Wechsel der Partitionen
+        conn.isolation_level = None
+        conn.execute('CREATE TEMP TABLE aggregate_samples (timestamp TEXT NOT NULL, value REAL NOT NULL)')
+        for offset in range(0, len(paths), _MAX_ATTACHED):
+            chunk = paths[offset:offset + _MAX_ATTACHED]
+            schemas = reader.attach(chunk)
+            if schemas:
+                query = self._union_query(schemas, 'sensor_data', 'timestamp, value', where)
+                conn.execute(f'INSERT INTO aggregate_samples {query}', params * len(schemas))
+            conn.executemany('INSERT INTO aggregate_samples VALUES (?, ?)', self._iter_archive_ascending(
+                reader, chunk, sensor_name, chamber, start, end
+            ))
+        return 'SELECT timestamp, value FROM aggregate_samples'
+    
+    @staticmethod
+    def _archive_conditions(sensor_name: Optional[str], chamber: Optional[str],
+                            start: Optional[str], end: Optional[str]) -> Tuple[str, list]:
+        # Blöcke, die den Zeitraum überschneiden
+        conditions, params = [], []
+        if sensor_name:
+            conditions.append('sensor_name = ?')
+            params.append(sensor_name)
+        if chamber:
+            conditions.append('chamber = ?')
+            params.append(chamber)
+        if start:
+            conditions.append('end_ts >= ?')
+            params.append(start)
+        if end:
+            conditions.append('start_ts <= ?')
+            params.append(end)
+        return ' AND '.join(conditions), params
+    
+    def _merge_archive_newest(self, paths: List[Optional[Path]], rows: List[tuple],
+                              sensor_name: Optional[str], chamber: Optional[str],
+                              start: Optional[str], end: Optional[str], limit: int) -> List[tuple]:
+        """
+        Ergänzt Zeilen (Zeitstempel, Sensor, Wert, Einheit; neueste zuerst) um archivierte Messwerte
+        """
+        where, params = self._archive_conditions(sensor_name, chamber, start, end)
+        for name, _, unit, _, end_ts, _, data in self._iter_archive(paths, where, params, 'end_ts DESC'):
+            # Ältere Blöcke können die ``limit`` neuesten Zeilen nicht mehr ändern
+            if len(rows) >= limit and end_ts < rows[limit - 1][0]:
+                break
+            for _, ms, value in iter_block(data):
+                timestamp = ms_isoformat(ms)
+                if (start and timestamp < start) or (end and timestamp > end):
+                    continue
+                rows.append((timestamp, name, value, unit))
+            rows.sort(key=itemgetter(0), reverse=True)
+            del rows[limit:]
+        return rows
+    
+    def get_unacknowledged_alarms(self, limit: int = 100,
+                                  chamber: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Liest die neuesten unquittierten Alarme (über den Teilindex)
+        
+        Args:
+            limit: Maximale Anzahl der Datensätze
+            chamber: Nur Alarme dieser Kammer (optional, sonst alle)
+        
+        Returns:
+            Liste mit Alarmen
+        """
+        with _query_alarms.time():
+            conn = self._reader().conn
+            if chamber:
+                cursor = conn.execute(
+                    'SELECT id, timestamp, alarm_type, message, chamber FROM alarms '
+                    'WHERE acknowledged = 0 AND chamber = ? ORDER BY timestamp DESC LIMIT ?',
+                    (chamber, limit)
                 )
             else:
-                cursor.execute(
-                    'SELECT timestamp, sensor_name, value, unit FROM sensor_data '
-                    'ORDER BY timestamp DESC LIMIT ?',
+                cursor = conn.execute(
+                    'SELECT id, timestamp, alarm_type, message, chamber FROM alarms '
+                    'WHERE acknowledged = 0 ORDER BY timestamp DESC LIMIT ?',
                     (limit,)
                 )
-            
-            rows = cursor.fetchall()
             return [
                 {
-                    'timestamp': row[0],
-                    'sensor_name': row[1],
-                    'value': row[2],
-                    'unit': row[3]
+                    'id': row[0],
+                    'timestamp': row[1],
+                    'alarm_type': row[2],
+                    'message': row[3],
+                    'chamber': row[4]
                 }
-                for row in rows
+                for row in cursor
             ]
+    
+    def acknowledge_alarm(self, alarm_id: int, chamber: Optional[str] = None) -> bool:
+        """
+        Quittiert einen Alarm
+        
+        Args:
+            alarm_id: ID des Alarms
+            chamber: Nur quittieren, wenn der Alarm zu dieser Kammer gehört (optional)
+        
+        Returns:
+            True, wenn ein Alarm quittiert wurde
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            if chamber:
+                cursor = conn.execute(
+                    'UPDATE alarms SET acknowledged = 1 WHERE id = ? AND acknowledged = 0 AND chamber = ?',
+                    (alarm_id, chamber)
+                )
+            else:
+                cursor = conn.execute(
+                    'UPDATE alarms SET acknowledged = 1 WHERE id = ? AND acknowledged = 0',
+                    (alarm_id,)
+                )
+            conn.commit()
+            return cursor.rowcount > 0
+    
+    def for_chamber(self, chamber: str) -> 'ChamberLogger':
+        """
+        Liefert die Sicht einer Kammer auf diesen DataLogger
+        
+        Args:
+            chamber: Kennung der Kammer
+        """
+        return ChamberLogger(self, chamber)
+
+
+class ChamberLogger:
+    """
+    DataLogger einer Kammer im Mehrkammerbetrieb
+    
+    Schreibt über den gemeinsamen DataLogger (ein Puffer, eine Transaktion je
+    flush) und versieht alle Zeilen mit der Kennung der Kammer. Hat dieselbe
+    Schnittstelle wie DataLogger für Aktoren, Alarmauswertung und Weboberfläche.
+    """
+    
+    def __init__(self, data_logger: DataLogger, chamber: str):
+        """
+        Args:
+            data_logger: Gemeinsamer DataLogger
+            chamber: Kennung der Kammer
+        """
+        self.data_logger = data_logger
+        self.chamber = chamber
+        self.db_path = data_logger.db_path
+    
+    def log_sample(self, sample: Sample):
+        self.data_logger.log_samples((sample,), self.chamber)
+    
+    def log_samples(self, samples: Iterable[Sample]):
+        self.data_logger.log_samples(samples, self.chamber)
+    
+    def queue_actuator_event(self, event: ActuatorEvent):
+        self.data_logger.queue_actuator_event(event, self.chamber)
+    
+    def queue_alarm_event(self, event: AlarmEvent):
+        self.data_logger.queue_alarm_event(event, self.chamber)
+    
+    def flush(self):
+        self.data_logger.flush()
+    
+    def pending_events(self) -> int:
+        return self.data_logger.pending_events()
+    
+    def db_size(self) -> int:
+        return self.data_logger.db_size()
+    
+    def database_files(self) -> List[Path]:
+        return self.data_logger.database_files()
+    
+    def get_sensor_data(self, sensor_name: Optional[str] = None, limit: int = 100,
+                        start: Optional[Timestamp] = None,
+                        end: Optional[Timestamp] = None) -> List[Dict[str, Any]]:
+        return self.data_logger.get_sensor_data(sensor_name, limit, chamber=self.chamber, start=start, end=end)
+    
+    def get_sensor_rows(self, sensor_name: Optional[str] = None, limit: int = 100,
+                        start: Optional[Timestamp] = None,
+                        end: Optional[Timestamp] = None) -> List[Tuple[str, str, float, str]]:
+        return self.data_logger.get_sensor_rows(sensor_name, limit, chamber=self.chamber, start=start, end=end)
+    
+    def iter_sensor_data(self, sensor_name: str, start: Optional[Timestamp] = None,
+                         end: Optional[Timestamp] = None) -> Iterator[Tuple[str, float]]:
+        return self.data_logger.iter_sensor_data(sensor_name, chamber=self.chamber, start=start, end=end)
+    
+    def aggregate(self, sensor_name: str, start: Timestamp, end: Timestamp,
+                  bucket: Union[int, timedelta] = 3600,
+                  funcs: Iterable[str] = ('min', 'max', 'avg'),
+                  gap: Optional[float] = None) -> Dict[str, Any]:
+        return self.data_logger.aggregate(sensor_name, start, end, bucket, funcs, chamber=self.chamber, gap=gap)
+    
+    def get_unacknowledged_alarms(self, limit: int = 100) -> List[Dict[str, Any]]:
+        return self.data_logger.get_unacknowledged_alarms(limit, chamber=self.chamber)
+    
+    def acknowledge_alarm(self, alarm_id: int) -> bool:
+        return self.data_logger.acknowledge_alarm(alarm_id, chamber=self.chamber)
@@ -0,0 +1,261 @@
+"""
+Online-Sicherung der Datenbank über die Backup-API von SQLite
+
+Jede Datei (Hauptdatenbank und Partitionen) wird seitenweise in eine
+temporäre Kopie übertragen, während der Logger weiterschreibt, und
+anschließend als tar.gz ausgegeben (als Datenstrom für den Download oder
+als rotierte Datei unter ``data/backups``).
+"""
+
+import logging
+import os
+import sqlite3
+import tarfile
+import tempfile
+import threading
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_backup_seconds = metrics.histogram(
+    'mgb_backup_seconds', 'Dauer einer Datenbanksicherung (inkl. Komprimierung)')
+_backup_bytes = metrics.gauge(
+    'mgb_backup_last_bytes', 'Größe der letzten gespeicherten Sicherung in Bytes')
+
+# Lese- und Komprimierungsblock
+_CHUNK = 1 << 20
+
+# tar-Archive werden auf ganze Records (20 Blöcke) aufgefüllt
+_RECORD = tarfile.RECORDSIZE
+
+
+class DatabaseBackup:
+    """
+    Konsistente Sicherung aller Datenbankdateien ohne Unterbrechung des Loggers
+    
+    Die Quelle wird in einer Lesetransaktion festgehalten: im WAL-Modus
+    schreibt der Logger währenddessen weiter, und die Backup-API muss nicht
+    neu beginnen (ohne festen Stand startet sie bei jeder fremden Änderung
+    von vorn und wird bei laufendem Logger nie fertig). Zwischen zwei
+    Schritten zu ``pages`` Seiten wird ``pause`` Sekunden gewartet, damit die
+    SD-Karte für die Schreibvorgänge des Loggers frei bleibt.
+    
+    Jede Datei ist in sich konsistent; Partitionen werden nacheinander
+    gesichert. Noch nicht übernommene Einträge des Messwert-Journals sind
+    nicht enthalten.
+    """
+    
+    def __init__(self, data_logger, directory: str = 'data/backups', keep: int = 7,
+                 interval: float = 86400.0, pages: int = 256, pause: float = 0.01,
+                 compresslevel: int = 6):
+        """
+        Args:
+            data_logger: DataLogger, dessen Dateien gesichert werden
+            directory: Verzeichnis für gespeicherte Sicherungen (und temporäre Kopien)
+            keep: Anzahl aufbewahrter Sicherungen
+            interval: Sekunden zwischen zwei periodischen Sicherungen
+            pages: Seiten je Schritt der Backup-API
+            pause: Wartezeit in Sekunden zwischen zwei Schritten
+            compresslevel: gzip-Stufe (1 = schnell, 9 = klein)
+        """
+        self.data_logger = data_logger
+        self.name = data_logger.database_files()[0].stem
+        self.directory = Path(directory)
+        self.keep = keep
+        self.interval = interval
+        self.pages = pages
+        self.pause = pause
+        self.compresslevel = compresslevel
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @classmethod
+    def from_config(cls, backup_config: dict, data_logger) -> Optional['DatabaseBackup']:
+        """
+        Erstellt die periodische Sicherung aus ``database.backup``
+        
+        Returns:
+            DatabaseBackup oder None, wenn nicht aktiviert
+        """
+        if not backup_config or not backup_config.get('enabled', False):
+            return None
+        return cls(
+            data_logger,
+            directory=backup_config.get('directory', 'data/backups'),
+            keep=backup_config.get('keep', 7),
+            interval=backup_config.get('interval', 86400.0),
+            pages=backup_config.get('pages_per_step', 256),
+            pause=backup_config.get('pause', 0.01),
+            compresslevel=backup_config.get('compresslevel', 6)
+        )
+    
+    def archive_name(self, when: Optional[datetime] = None) -> str:
+        """
+        Dateiname einer Sicherung (z.B. mgb_mushroom_grow_box-20261019-030000.tar.gz)
+        """
+        stamp = (when or datetime.now()).strftime('%Y%m%d-%H%M%S')
+        return f"{self.name}-{stamp}.tar.gz"
+    
+    def stream(self) -> Iterator[bytes]:
+        """
+        Sichert alle Datenbankdateien als tar.gz-Datenstrom
+        
+        Die Dateien werden nacheinander kopiert und während des Lesens
+        komprimiert; je Datei liegt nur eine temporäre Kopie unter
+        ``directory``.
+        
+        Yields:
+            Komprimierte Blöcke
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, 31)
+        written = 0
+        for path in self.data_logger.database_files():
+            handle, snapshot = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.snapshot', dir=self.directory)
+            os.close(handle)
+            try:
+                if not self._snapshot(path, snapshot):
+                    continue
+                info = tarfile.TarInfo(path.name)
+                info.size = os.path.getsize(snapshot)
+                info.mtime = int(time.time())
+                info.mode = 0o644
+                header = info.tobuf(format=tarfile.GNU_FORMAT)
+                yield compressor.compress(header)
+                written += len(header)
+                with open(snapshot, 'rb') as f:
+                    while True:
+                        chunk = f.read(_CHUNK)
+                        if not chunk:
+                            break
+                        data = compressor.compress(chunk)
+                        if data:
+                            yield data
+                padding = -info.size % tarfile.BLOCKSIZE
+                yield compressor.compress(tarfile.NUL * padding)
+                written += info.size + padding
+            finally:
+                os.unlink(snapshot)
+        # Zwei leere Blöcke beenden das Archiv
+        end = 2 * tarfile.BLOCKSIZE
+        end += -(written + end) % _RECORD
+        yield compressor.compress(tarfile.NUL * end) + compressor.flush()
+    
+    def _snapshot(self, path: Path, target: str) -> bool:
+        """
+        Kopiert eine Datenbankdatei seitenweise nach ``target``
+        
+        Returns:
+            False, wenn die Datei nicht mehr existiert (z.B. Aufbewahrungsfrist)
+        """
+        try:
+            source = sqlite3.connect(f"file:{path}?mode=ro", uri=True, isolation_level=None)
+        except sqlite3.OperationalError:
+            return False
+        try:
+            # Lesetransaktion: fester Stand für alle Schritte
+            source.execute('BEGIN')
+            source.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+            destination = sqlite3.connect(target)
+            try:
+                source.backup(destination, pages=self.pages, progress=self._progress)
+            finally:
+                destination.close()
+            source.execute('COMMIT')
+        except sqlite3.OperationalError as e:
+            if path.exists():
+                raise
+            logger.debug(f"{path.name} während der Sicherung gelöscht: {e}")
+            return False
+        finally:
+            source.close()
+        return True
+    
+    def _progress(self, status: int, remaining: int, total: int):
+        if remaining and self.pause > 0:
+            time.sleep(self.pause)
+    
+    def create(self) -> Path:
+        """
+        Speichert eine Sicherung unter ``directory`` und entfernt alte Sicherungen
+        
+        Returns:
+            Pfad der Sicherung
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        target = self.directory / self.archive_name()
+        partial = target.with_name(target.name + '.part')
+        with _backup_seconds.time():
+            try:
+                with open(partial, 'wb') as f:
+                    for chunk in self.stream():
+                        f.write(chunk)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(partial, target)
+            except BaseException:
+                partial.unlink(missing_ok=True)
+                raise
+        size = target.stat().st_size
+        _backup_bytes.set(size)
+        logger.info(f"Sicherung {target.name} erstellt ({size / 1e6:.1f} MB)")
+        self._rotate()
+        return target
+    
+    def backups(self) -> List[Path]:
+        """
+        Gespeicherte Sicherungen, neueste zuerst
+        """
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob(f"{self.name}-*.tar.gz"), reverse=True)
+    
+    def _rotate(self):
+        for path in self.backups()[self.keep:]:
+            path.unlink(missing_ok=True)
+            logger.info(f"Alte Sicherung {path.name} entfernt")
+    
+    def start(self):
+        """
+        Startet die periodische Sicherung
+        """
+        if self._thread is not None:
+            return
+        # Reste einer abgebrochenen Sicherung (Stromausfall)
+        if self.directory.exists():
+            for path in [*self.directory.glob('.*.snapshot'), *self.directory.glob(f"{self.name}-*.part")]:
+                path.unlink(missing_ok=True)
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='mgb-backup', daemon=True)
+        self._thread.start()
+        logger.info(f"Datenbanksicherung gestartet (Intervall: {self.interval}s, {self.keep} Sicherungen)")
+    
+    def stop(self):
+        """
+        Beendet die periodische Sicherung (eine laufende Sicherung wird abgeschlossen)
+        """
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=60)
+        self._thread = None
+    
+    def _run(self):
+        # Erste Sicherung ein Intervall nach der letzten vorhandenen (bzw. kurz nach dem Start)
+        existing = self.backups()
+        delay = 60.0
+        if existing:
+            age = time.time() - existing[0].stat().st_mtime
+            delay = max(delay, self.interval - age)
+        while not self._stop_event.wait(delay):
+            delay = self.interval
+            try:
+                self.create()
+            except Exception as e:
+                logger.error(f"Datenbanksicherung fehlgeschlagen: {e}", exc_info=True)
@@ -0,0 +1,100 @@
+"""
+Ausdünnen von Messwertreihen für Diagramme (Largest-Triangle-Three-Buckets)
+
+LTTB teilt die Reihe in gleich große Abschnitte und wählt je Abschnitt den
+Punkt, der mit dem zuvor gewählten Punkt und dem Mittelwert des nächsten
+Abschnitts das größte Dreieck bildet. Spitzen und Einbrüche bleiben dadurch
+erhalten, Mittelwertbildung würde sie glätten.
+"""
+
+from itertools import chain, islice
+from typing import Iterable, List, Tuple
+
+Point = Tuple[float, float]
+
+
+def _bucket_start(index: int, count: int, points: int) -> int:
+    # Ganzzahlige Grenzen: erster und letzter Punkt bilden eigene Abschnitte
+    if index >= points:
+        return count
+    return (index - 1) * (count - 2) // (points - 2) + 1
+
+
+def _select(bucket: List[Point], previous: Point, following: List[Point]) -> Point:
+    """
+    Punkt des Abschnitts mit dem größten Dreieck (vorheriger Punkt, Punkt, Mittel des Folgeabschnitts)
+    """
+    avg_x = sum(point[0] for point in following) / len(following)
+    avg_y = sum(point[1] for point in following) / len(following)
+    prev_x, prev_y = previous
+    best, best_area = bucket[0], -1.0
+    for point in bucket:
+        # Doppelte Dreiecksfläche (Faktor 1/2 ändert die Auswahl nicht)
+        area = abs((prev_x - avg_x) * (point[1] - prev_y) - (prev_x - point[0]) * (avg_y - prev_y))
+        if area > best_area:
+            best, best_area = point, area
+    return best
+
+
+def lttb(samples: Iterable[Point], count: int, points: int) -> List[Point]:
+    """
+    Dünnt eine Reihe in einem Durchgang auf höchstens ``points`` Punkte aus
+    
+    Gepuffert werden nur der aktuelle und der folgende Abschnitt, der
+    Speicherbedarf hängt daher nicht von der Länge der Reihe ab. Liefert
+    ``samples`` mehr oder weniger als ``count`` Punkte (z.B. neue Messwerte
+    während der Abfrage), bleibt das Ergebnis gültig: überzählige Punkte
+    fallen in den letzten Abschnitt, der letzte Punkt wird immer übernommen.
+    
+    Args:
+        samples: Punkte (x, y) mit aufsteigendem x
+        count: Erwartete Anzahl Punkte (bestimmt die Abschnittsgrenzen)
+        points: Gewünschte Anzahl Punkte (mindestens 3)
+    
+    Returns:
+        Ausgewählte Punkte in der Reihenfolge von ``samples``
+    """
+    if points < 3:
+        raise ValueError("LTTB benötigt mindestens 3 Punkte")
+    samples = iter(samples)
+    head = list(islice(samples, points + 1))
+    if len(head) <= points:
+        return head
+    samples = chain(head, samples)
+    count = max(count, points + 1)
+    
+    result: List[Point] = []
+    # Abschnitte: 0 = erster Punkt, 1 .. points - 2 = ausgewählt, points - 1 = letzter Punkt
+    buckets: List[List[Point]] = []
+    bucket_index, boundary = -1, 0
+    for index, point in enumerate(samples):
+        while index >= boundary and bucket_index < points - 1:
+            bucket_index += 1
+            boundary = _bucket_start(bucket_index + 1, count, points)
+            buckets.append([])
+            if len(buckets) == 3:
+                # Folgeabschnitt vollständig: mittleren Abschnitt auswerten
+                done = buckets.pop(0)
+                if not result:
+                    result.append(done[0])
+                else:
+                    result.append(_select(done, result[-1], buckets[0]))
+        buckets[-1].append(point)
+    
+    # Restliche Abschnitte (vorzeitiges Ende oder letzter Abschnitt)
+    buckets = [bucket for bucket in buckets if bucket]
+    if not buckets:
+        return result
+    if not result:
+        result.append(buckets[0].pop(0))
+        buckets = [bucket for bucket in buckets if bucket]
+    last = buckets[-1].pop()
+    if len(buckets) > 1:
+        # Überzählige Punkte gehören zum vorletzten Abschnitt (höchstens ``points`` Punkte)
+        buckets[-2].extend(buckets.pop())
+    buckets = [bucket for bucket in buckets if bucket]
+    for i, bucket in enumerate(buckets):
+        following = buckets[i + 1] if i + 1 < len(buckets) else [last]
+        result.append(_select(bucket, result[-1], following))
+    result.append(last)
+    return result
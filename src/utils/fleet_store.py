@@ -0,0 +1,415 @@
+"""
+Datenbank des Flotten-Hubs: Messwerte vieler Boxen mit gebündeltem Schreiber
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_ingested_rows = metrics.counter(
+    'mgb_fleet_ingested_rows_total', 'Vom Hub neu gespeicherte Messwerte')
+_duplicate_rows = metrics.counter(
+    'mgb_fleet_duplicate_rows_total', 'Vom Hub verworfene, bereits gespeicherte Messwerte')
+_commit_seconds = metrics.histogram(
+    'mgb_fleet_commit_seconds', 'Dauer eines gebündelten Schreibvorgangs des Hubs')
+_queued_rows = metrics.gauge(
+    'mgb_fleet_queued_rows', 'Angenommene, noch nicht geschriebene Messwerte')
+
+# Zeile: (Box, ID in der Box, Zeitstempel, Kammer, Sensor, Wert, Einheit)
+Row = Tuple[str, int, str, str, str, float, str]
+
+_INSERT_SAMPLE = (
+    'INSERT OR IGNORE INTO fleet_samples '
+    '(box, source_id, timestamp, chamber, sensor_name, value, unit) VALUES (?, ?, ?, ?, ?, ?, ?)'
+)
+_UPSERT_BOX = '''
+    INSERT INTO fleet_boxes (box, last_seen, last_id, samples, remote_addr) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (box) DO UPDATE SET
+        last_seen = excluded.last_seen,
+        last_id = MAX(last_id, excluded.last_id),
+        samples = samples + excluded.samples,
+        remote_addr = excluded.remote_addr
+'''
+_UPSERT_LATEST = '''
+    INSERT INTO fleet_latest (box, chamber, sensor_name, timestamp, value, unit) VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (box, chamber, sensor_name) DO UPDATE SET
+        timestamp = excluded.timestamp,
+        value = excluded.value,
+        unit = excluded.unit
+    WHERE excluded.timestamp > fleet_latest.timestamp
+'''
+
+
+class HubBusy(Exception):
+    """
+    Die Schreibwarteschlange des Hubs ist voll (Box soll später erneut senden)
+    """
+    
+    def __init__(self, retry_after: float):
+        super().__init__(f"Hub ausgelastet, erneut versuchen in {retry_after:.0f} s")
+        self.retry_after = retry_after
+
+
+class _Batch:
+    """
+    Ein angenommener Upload bis zu seinem Commit
+    """
+    
+    __slots__ = ('box', 'rows', 'remote_addr', 'done', 'inserted', 'error')
+    
+    def __init__(self, box: str, rows: List[Row], remote_addr: str):
+        self.box = box
+        self.rows = rows
+        self.remote_addr = remote_addr
+        self.done = threading.Event()
+        self.inserted = 0
+        self.error: Optional[Exception] = None
+
+
+class HubStore:
+    """
+    Speichert die Messwerte aller Boxen in einer SQLite-Datenbank
+    
+    Uploads werden in eine begrenzte Warteschlange gestellt und von einem
+    Schreib-Thread gebündelt: alle innerhalb von ``flush_interval``
+    eingetroffenen Uploads (höchstens ``batch_size`` Zeilen) landen in einer
+    Transaktion. ``(box, source_id)`` ist eindeutig, wiederholte Uploads nach
+    einem Zeitüberschreitungsfehler werden daher ohne Duplikate übernommen.
+    Sind mehr als ``queue_limit`` Zeilen ausstehend, lehnt ``submit`` mit
+    ``HubBusy`` ab.
+    """
+    
+    def __init__(self, db_path: str = "data/fleet_hub.db",
+                 batch_size: int = 20000,
+                 flush_interval: float = 0.2,
+                 queue_limit: int = 100000,
+                 retry_after: float = 5.0):
+        """
+        Args:
+            db_path: Pfad zur Datenbank-Datei
+            batch_size: Zeilen, ab denen sofort geschrieben wird
+            flush_interval: Sekunden, die auf weitere Uploads gewartet wird
+            queue_limit: Ausstehende Zeilen, ab denen Uploads abgelehnt werden
+            retry_after: Mindestwartezeit in Sekunden für abgelehnte Boxen
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_limit = queue_limit
+        self.retry_after = retry_after
+        
+        self._queue: Deque[_Batch] = deque()
+        self._queued = 0
+        self._rows_per_second = 0.0
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._initialize_db()
+        
+        _queued_rows.set_function(lambda: self._queued)
+        self._thread = threading.Thread(target=self._run, name='mgb-fleet-writer', daemon=True)
+        self._thread.start()
+    
+    @classmethod
+    def from_config(cls, hub_config: dict) -> 'HubStore':
+        """
+        Erstellt die Hub-Datenbank aus dem Abschnitt 'fleet.hub' der Konfiguration
+        """
+        return cls(
+            db_path=hub_config.get('db_path', 'data/fleet_hub.db'),
+            batch_size=hub_config.get('batch_size', 20000),
+            flush_interval=hub_config.get('flush_interval', 0.2),
+            queue_limit=hub_config.get('queue_limit', 100000),
+            retry_after=hub_config.get('retry_after', 5.0)
+        )
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        # Lesende Anfragen blockieren den Schreib-Thread nicht
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+    
+    def _initialize_db(self):
+        """
+        Initialisiert die Datenbank-Tabellen
+        """
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            
+            # Messwerte aller Boxen, Schlüssel ist die Zeilen-ID in der Box
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS fleet_samples (
+                    box TEXT NOT NULL,
+                    source_id INTEGER NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    chamber TEXT NOT NULL,
+                    sensor_name TEXT NOT NULL,
+                    value REAL NOT NULL,
+                    unit TEXT NOT NULL,
+                    PRIMARY KEY (box, source_id)
+                ) WITHOUT ROWID
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_fleet_samples_sensor
+                ON fleet_samples (sensor_name, box, timestamp)
+            ''')
+            
+            # Stand je Box (letzter Upload, höchste übernommene ID)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS fleet_boxes (
+                    box TEXT PRIMARY KEY,
+                    last_seen REAL NOT NULL,
+                    last_id INTEGER NOT NULL,
+                    samples INTEGER NOT NULL,
+                    remote_addr TEXT
+                )
+            ''')
+            
+            # Letzter Messwert je Box, Kammer und Sensor (Flottenübersicht)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS fleet_latest (
+                    box TEXT NOT NULL,
+                    chamber TEXT NOT NULL,
+                    sensor_name TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    value REAL NOT NULL,
+                    unit TEXT NOT NULL,
+                    PRIMARY KEY (box, chamber, sensor_name)
+                ) WITHOUT ROWID
+            ''')
+            
+            conn.commit()
+    
+    def submit(self, box: str, rows: List[Row], remote_addr: str = '') -> _Batch:
+        """
+        Stellt einen Upload in die Schreibwarteschlange
+        
+        Args:
+            box: Kennung der Box
+            rows: Zeilen (siehe ``Row``)
+            remote_addr: Absenderadresse (für die Flottenübersicht)
+        
+        Returns:
+            Upload; ``done`` wird nach dem Commit gesetzt
+        
+        Raises:
+            HubBusy: Warteschlange voll
+        """
+        batch = _Batch(box, rows, remote_addr)
+        with self._cond:
+            if self._stopping:
+                raise HubBusy(self.retry_after)
+            if self._queued and self._queued + len(rows) > self.queue_limit:
+                raise HubBusy(self._retry_after())
+            self._queue.append(batch)
+            self._queued += len(rows)
+            self._cond.notify()
+        return batch
+    
+    def ingest(self, box: str, rows: List[Row], remote_addr: str = '',
+               timeout: Optional[float] = None) -> int:
+        """
+        Speichert einen Upload und wartet auf den Commit
+        
+        Returns:
+            Anzahl neu gespeicherter Zeilen
+        
+        Raises:
+            HubBusy: Warteschlange voll
+            TimeoutError: Commit nicht innerhalb von ``timeout``
+        """
+        batch = self.submit(box, rows, remote_addr)
+        if not batch.done.wait(timeout):
+            raise TimeoutError("Upload nicht rechtzeitig gespeichert")
+        if batch.error is not None:
+            raise batch.error
+        return batch.inserted
+    
+    def _retry_after(self) -> float:
+        # Wartezeit aus Rückstand und zuletzt gemessenem Durchsatz
+        if self._rows_per_second <= 0:
+            return self.retry_after
+        return max(self.retry_after, self._queued / self._rows_per_second)
+    
+    def pending(self) -> int:
+        """
+        Anzahl angenommener, noch nicht geschriebener Zeilen
+        """
+        return self._queued
+    
+    def _run(self):
+        conn = self._connect()
+        try:
+            while True:
+                with self._cond:
+                    while not self._queue and not self._stopping:
+                        self._cond.wait()
+                    if not self._queue:
+                        return
+                    # Gruppen-Commit: kurz auf weitere Uploads warten
+                    deadline = time.monotonic() + self.flush_interval
+                    while self._queued < self.batch_size and not self._stopping:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    batches, size = [], 0
+                    while self._queue and (not batches or size + len(self._queue[0].rows) <= self.batch_size):
+                        batch = self._queue.popleft()
+                        batches.append(batch)
+                        size += len(batch.rows)
+                
+                self._write(conn, batches, size)
+                with self._cond:
+                    self._queued -= size
+                for batch in batches:
+                    batch.done.set()
+        finally:
+            conn.close()
+    
+    def _write(self, conn: sqlite3.Connection, batches: List[_Batch], size: int):
+        """
+        Schreibt mehrere Uploads in einer Transaktion
+        """
+        start = time.perf_counter()
+        now = time.time()
+        try:
+            with _commit_seconds.time():
+                for batch in batches:
+                    before = conn.total_changes
+                    conn.executemany(_INSERT_SAMPLE, batch.rows)
+                    batch.inserted = conn.total_changes - before
+                
+                boxes: Dict[str, list] = {}
+                latest: Dict[tuple, Row] = {}
+                for batch in batches:
+                    entry = boxes.setdefault(batch.box, [now, 0, 0, batch.remote_addr])
+                    entry[1] = max([entry[1]] + [row[1] for row in batch.rows])
+                    entry[2] += batch.inserted
+                    for row in batch.rows:
+                        key = (row[0], row[3], row[4])
+                        current = latest.get(key)
+                        if current is None or row[2] > current[2]:
+                            latest[key] = row
+                
+                conn.executemany(_UPSERT_BOX, [(box, *entry) for box, entry in boxes.items()])
+                conn.executemany(_UPSERT_LATEST, [
+                    (row[0], row[3], row[4], row[2], row[5], row[6]) for row in latest.values()
+                ])
+                conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Uploads von {len(batches)} Boxen konnten nicht gespeichert werden: {e}")
+            for batch in batches:
+                batch.error = e
+            return
+        
+        elapsed = time.perf_counter() - start
+        if elapsed > 0:
+            self._rows_per_second = size / elapsed
+        inserted = sum(batch.inserted for batch in batches)
+        _ingested_rows.inc(inserted)
+        _duplicate_rows.inc(size - inserted)
+    
+    def boxes(self) -> List[Dict[str, Any]]:
+        """
+        Stand aller Boxen mit ihren letzten Messwerten
+        """
+        with self._connect() as conn:
+            boxes = {
+                row[0]: {
+                    'box': row[0],
+                    'last_seen': row[1],
+                    'last_id': row[2],
+                    'samples': row[3],
+                    'remote_addr': row[4],
+                    'latest': {}
+                }
+                for row in conn.execute(
+                    'SELECT box, last_seen, last_id, samples, remote_addr FROM fleet_boxes ORDER BY box'
+                )
+            }
+            for box, chamber, sensor_name, timestamp, value, unit in conn.execute(
+                    'SELECT box, chamber, sensor_name, timestamp, value, unit FROM fleet_latest'):
+                if box in boxes:
+                    boxes[box]['latest'].setdefault(chamber, {})[sensor_name] = {
+                        'timestamp': timestamp,
+                        'value': value,
+                        'unit': unit
+                    }
+        return list(boxes.values())
+    
+    def last_id(self, box: str) -> int:
+        """
+        Höchste übernommene Zeilen-ID einer Box (0, falls unbekannt)
+        """
+        with self._connect() as conn:
+            row = conn.execute('SELECT last_id FROM fleet_boxes WHERE box = ?', (box,)).fetchone()
+        return row[0] if row else 0
+    
+    def get_history(self, sensor_name: str, boxes: Optional[Sequence[str]] = None,
+                    chamber: Optional[str] = None, since: Optional[str] = None,
+                    until: Optional[str] = None, limit: int = 1000) -> Dict[str, Dict[str, list]]:
+        """
+        Verlauf eines Sensors über mehrere Boxen
+        
+        Args:
+            sensor_name: Name des Sensors
+            boxes: Nur diese Boxen (optional, sonst alle)
+            chamber: Nur diese Kammer (optional)
+            since: Ab diesem ISO-Zeitstempel (optional)
+            until: Bis zu diesem ISO-Zeitstempel (optional)
+            limit: Höchstens so viele (jüngste) Werte je Box
+        
+        Returns:
+            Dictionary {Box: {'timestamps': [...], 'values': [...]}}, aufsteigend sortiert
+        """
+        conditions, params = ['sensor_name = ?'], [sensor_name]
+        if boxes:
+            conditions.append(f"box IN ({', '.join('?' * len(boxes))})")
+            params.extend(boxes)
+        if chamber:
+            conditions.append('chamber = ?')
+            params.append(chamber)
+        if since:
+            conditions.append('timestamp >= ?')
+            params.append(since)
+        if until:
+            conditions.append('timestamp <= ?')
+            params.append(until)
+        
+        # Jüngste ``limit`` Werte je Box
+        query = f'''
+            SELECT box, timestamp, value FROM (
+                SELECT box, timestamp, value,
+                       ROW_NUMBER() OVER (PARTITION BY box ORDER BY timestamp DESC) AS n
+                FROM fleet_samples WHERE {' AND '.join(conditions)}
+            ) WHERE n <= ? ORDER BY box, timestamp
+        '''
+        history: Dict[str, Dict[str, list]] = {}
+        with self._connect() as conn:
+            for box, timestamp, value in conn.execute(query, (*params, limit)):
+                series = history.get(box)
+                if series is None:
+                    series = history[box] = {'timestamps': [], 'values': []}
+                series['timestamps'].append(timestamp)
+                series['values'].append(value)
+        return history
+    
+    def stop(self, timeout: float = 10.0):
+        """
+        Schreibt ausstehende Uploads und beendet den Schreib-Thread
+        """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        self._thread.join(timeout)
@@ -0,0 +1,299 @@
+"""
+Inkrementeller Upload der Messwerte an den Flotten-Hub
+"""
+
+import gzip
+import json
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .data_logger import DataLogger
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_uploaded_rows = metrics.counter(
+    'mgb_fleet_uploaded_rows_total', 'An den Hub übertragene Messwerte')
+_upload_failures = metrics.counter(
+    'mgb_fleet_upload_failures_total', 'Fehlgeschlagene Uploads an den Hub', ('reason',))
+_upload_seconds = metrics.histogram(
+    'mgb_fleet_upload_seconds', 'Dauer eines Uploads an den Hub (inkl. Commit)')
+
+# Kleinste Stapelgröße, auf die bei einem langsamen Hub reduziert wird
+_MIN_BATCH_SIZE = 100
+
+class _RetryLater(Exception):
+    """
+    Upload nicht möglich, erneuter Versuch nach ``delay`` Sekunden
+    """
+    
+    def __init__(self, message: str, delay: Optional[float] = None):
+        super().__init__(message)
+        self.delay = delay
+
+
+class FleetUploader:
+    """
+    Überträgt neue Zeilen aus ``sensor_data`` gebündelt an den Flotten-Hub
+    
+    Der Cursor (höchste vom Hub bestätigte Zeilen-ID) liegt in
+    ``cursor_path`` und wird erst nach der Bestätigung des Hubs
+    fortgeschrieben; ein abgebrochener Upload wird daher wiederholt, der Hub
+    verwirft doppelte Zeilen. Ohne Cursor-Datei wird der Stand beim Hub
+    erfragt.
+    
+    Gegendruck: Antwortet der Hub mit 503/429, wird ``Retry-After``
+    abgewartet; bei Zeitüberschreitung oder 413 wird der Stapel halbiert und
+    nach erfolgreichen Uploads wieder bis ``batch_size`` vergrößert. Andere
+    Fehler führen zu exponentiell wachsenden Wartezeiten (mit Zufallsanteil,
+    damit sich viele Boxen nicht synchronisieren). Liegt die Box zurück,
+    folgen volle Stapel ohne Wartezeit.
+    """
+    
+    def __init__(self, data_logger: DataLogger, url: str, box_id: str,
+                 cursor_path: str = "data/fleet_cursor.json",
+                 batch_size: int = 5000,
+                 interval: float = 60.0,
+                 timeout: float = 30.0,
+                 max_backoff: float = 600.0,
+                 token: str = '',
+                 compress_level: int = 6):
+        """
+        Args:
+            data_logger: DataLogger der Box (Messwerte aller Partitionen)
+            url: Basis-URL des Hubs (z.B. http://hub:5100)
+            box_id: Kennung der Box
+            cursor_path: Datei für den Upload-Cursor
+            batch_size: Höchstzahl Zeilen je Upload
+            interval: Sekunden zwischen Uploads, wenn die Box aufgeholt hat
+            timeout: Sekunden bis zum Abbruch eines Uploads
+            max_backoff: Höchste Wartezeit nach Fehlern in Sekunden
+            token: Zugangsschlüssel des Hubs (optional)
+            compress_level: gzip-Stufe (1 = schnell, 9 = klein)
+        """
+        self.data_logger = data_logger
+        self.url = url.rstrip('/')
+        self.box_id = box_id
+        self.cursor_path = Path(cursor_path)
+        self.batch_size = batch_size
+        self.interval = interval
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self.token = token
+        self.compress_level = compress_level
+        
+        self.cursor: Optional[int] = None
+        self._batch_limit = batch_size
+        self._failures = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        
+        metrics.gauge('mgb_fleet_upload_lag_rows', 'Noch nicht an den Hub übertragene Messwerte').set_function(
+            self.lag
+        )
+    
+    @classmethod
+    def from_config(cls, uploader_config: Dict[str, Any], data_logger: DataLogger) -> Optional['FleetUploader']:
+        """
+        Erstellt den Uploader aus ``fleet.uploader``
+        
+        Returns:
+            FleetUploader oder None, wenn nicht aktiviert
+        """
+        if not uploader_config or not uploader_config.get('enabled', False):
+            return None
+        return cls(
+            data_logger,
+            url=uploader_config['url'],
+            box_id=uploader_config.get('box_id') or socket.gethostname(),
+            cursor_path=uploader_config.get('cursor_path', 'data/fleet_cursor.json'),
+            batch_size=uploader_config.get('batch_size', 5000),
+            interval=uploader_config.get('interval', 60.0),
+            timeout=uploader_config.get('timeout', 30.0),
+            max_backoff=uploader_config.get('max_backoff', 600.0),
+            token=uploader_config.get('token', ''),
+            compress_level=uploader_config.get('compress_level', 6)
+        )
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+    
+    def start(self):
+        """
+        Startet den periodischen Upload
+        """
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='mgb-fleet-uploader', daemon=True)
+        self._thread.start()
+        logger.info(f"Flotten-Upload gestartet (Box: {self.box_id}, Hub: {self.url})")
+    
+    def stop(self):
+        """
+        Beendet den Upload (ein laufender Upload wird höchstens ``timeout`` abgewartet)
+        """
+        if not self.running:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=self.timeout + 1)
+        self._thread = None
+    
+    def _run(self):
+        delay = 0.0
+        while not self._stop_event.wait(delay):
+            limit = self._batch_limit
+            try:
+                sent = self.upload_once()
+                self._failures = 0
+                # Rückstand ohne Pause aufholen
+                delay = 0.0 if sent >= limit else self.interval
+            except _RetryLater as e:
+                self._failures += 1
+                delay = e.delay if e.delay is not None else self._backoff()
+                logger.warning(f"Flotten-Upload verschoben um {delay:.0f} s: {e}")
+            except Exception as e:
+                self._failures += 1
+                delay = self._backoff()
+                logger.error(f"Flotten-Upload fehlgeschlagen, nächster Versuch in {delay:.0f} s: {e}")
+    
+    def _backoff(self) -> float:
+        # Exponentiell ab dem Intervall, mit Zufallsanteil
+        delay = min(self.max_backoff, min(self.interval, 5.0) * 2 ** (self._failures - 1))
+        return delay * random.uniform(0.5, 1.0)
+    
+    def upload_once(self) -> int:
+        """
+        Überträgt den nächsten Stapel ab dem Cursor
+        
+        Returns:
+            Anzahl übertragener Zeilen (0, wenn nichts Neues vorliegt)
+        
+        Raises:
+            _RetryLater: Hub ausgelastet oder nicht erreichbar
+        """
+        if self.cursor is None:
+            self.cursor = self._load_cursor()
+        
+        rows = self.data_logger.get_samples_after(self.cursor, self._batch_limit)
+        if not rows:
+            return 0
+        
+        body = gzip.compress(
+            b''.join(json.dumps(row, separators=(',', ':')).encode('utf-8') + b'\n' for row in rows),
+            compresslevel=self.compress_level
+        )
+        result = self._post(body)
+        last_id = result.get('last_id') or rows[-1]['id']
+        self._save_cursor(last_id)
+        _uploaded_rows.inc(len(rows))
+        
+        # Nach Verkleinerung schrittweise wieder vergrößern
+        if self._batch_limit < self.batch_size:
+            self._batch_limit = min(self.batch_size, self._batch_limit * 2)
+        logger.debug(f"{len(rows)} Messwerte an den Hub übertragen (bis ID {last_id})")
+        return len(rows)
+    
+    def _request(self, path: str, data: Optional[bytes] = None,
+                 headers: Optional[Dict[str, str]] = None) -> urllib.request.Request:
+        request = urllib.request.Request(f"{self.url}{path}", data=data, headers=headers or {})
+        if self.token:
+            request.add_header('Authorization', f"Bearer {self.token}")
+        return request
+    
+    def _post(self, body: bytes) -> Dict[str, Any]:
+        """
+        Sendet einen Stapel und liefert die Antwort des Hubs
+        """
+        request = self._request(f"/api/fleet/ingest/{self.box_id}", body, {
+            'Content-Type': 'application/x-ndjson',
+            'Content-Encoding': 'gzip'
+        })
+        try:
+            with _upload_seconds.time(), urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            if e.code in (429, 503):
+                _upload_failures.labels('busy').inc()
+                raise _RetryLater(f"Hub ausgelastet (HTTP {e.code})", self._retry_after(e))
+            if e.code == 413:
+                _upload_failures.labels('too_large').inc()
+                self._shrink_batch()
+                raise _RetryLater("Stapel zu groß", 0.0)
+            _upload_failures.labels('http').inc()
+            raise RuntimeError(f"Hub antwortet mit HTTP {e.code}: {e.read()[:200]!r}")
+        except (socket.timeout, TimeoutError):
+            # Langsamer Hub: kleinere Stapel, damit der Commit in das Zeitlimit passt
+            _upload_failures.labels('timeout').inc()
+            self._shrink_batch()
+            raise _RetryLater("Zeitüberschreitung")
+        except urllib.error.URLError as e:
+            _upload_failures.labels('network').inc()
+            if isinstance(e.reason, (socket.timeout, TimeoutError)):
+                self._shrink_batch()
+            raise _RetryLater(f"Hub nicht erreichbar: {e.reason}")
+    
+    def _retry_after(self, error: urllib.error.HTTPError) -> Optional[float]:
+        try:
+            delay = float(error.headers.get('Retry-After', ''))
+        except ValueError:
+            return None
+        # Zufallsanteil, damit abgewiesene Boxen nicht gleichzeitig wiederkommen
+        return min(self.max_backoff, delay * random.uniform(1.0, 1.5))
+    
+    def _shrink_batch(self):
+        self._batch_limit = max(_MIN_BATCH_SIZE, self._batch_limit // 2)
+    
+    def _load_cursor(self) -> int:
+        """
+        Lädt den Cursor aus der Datei oder erfragt ihn beim Hub
+        """
+        try:
+            with open(self.cursor_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('box') == self.box_id:
+                return int(state['last_id'])
+            logger.warning(f"Cursor-Datei gehört zu Box '{state.get('box')}', frage den Hub")
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Cursor-Datei ungültig ({e}), frage den Hub")
+        
+        try:
+            with urllib.request.urlopen(self._request(f"/api/fleet/boxes/{self.box_id}/cursor"),
+                                        timeout=self.timeout) as response:
+                last_id = int(json.loads(response.read().decode('utf-8'))['last_id'])
+        except (urllib.error.URLError, OSError, ValueError, KeyError) as e:
+            raise _RetryLater(f"Cursor nicht ermittelbar: {e}")
+        logger.info(f"Flotten-Upload setzt beim Stand des Hubs fort (ID {last_id})")
+        return last_id
+    
+    def _save_cursor(self, last_id: int):
+        """
+        Schreibt den Cursor atomar (temporäre Datei, dann umbenennen)
+        """
+        self.cursor_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.cursor_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'box': self.box_id, 'last_id': last_id, 'updated': time.time()}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.cursor_path)
+        self.cursor = last_id
+    
+    def lag(self) -> int:
+        """
+        Anzahl noch nicht übertragener Zeilen (Abstand zur höchsten ID)
+        """
+        if self.cursor is None:
+            return 0
+        return max(0, self.data_logger.last_sample_id() - self.cursor)
@@ -0,0 +1,290 @@
+"""
+Ratenbegrenzender und deduplizierender Log-Filter für häufige Meldungen
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Any
+
+
+class _TokenBucket:
+    """
+    Einfacher Token-Bucket für die Ratenbegrenzung eines Loggers
+    """
+    
+    __slots__ = ('rate', 'burst', 'tokens', 'last_refill', 'dropped')
+    
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.last_refill = time.monotonic()
+        self.dropped = 0
+    
+    def consume(self, now: float) -> bool:
+        """
+        Entnimmt ein Token, falls vorhanden
+        
+        Args:
+            now: Aktueller monotoner Zeitpunkt
+        
+        Returns:
+            True wenn die Meldung durchgelassen werden darf
+        """
+        elapsed = now - self.last_refill
+        if elapsed > 0:
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.last_refill = now
+        
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        
+        self.dropped += 1
+        return False
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Fasst identische Meldungen zu periodischen Zusammenfassungen zusammen
+    und begrenzt die Meldungsrate je Logger per Token-Bucket.
+    
+    Eine Meldung, die innerhalb von ``dedup_interval`` Sekunden erneut
+    auftritt, wird unterdrückt. Sobald das Intervall abgelaufen ist, wird
+    die Anzahl der unterdrückten Meldungen ausgegeben: mit der nächsten
+    Wiederholung oder spätestens durch ``flush()`` (alle ``flush_interval``
+    Sekunden nach ``start()`` sowie beim Verdrängen aus dem LRU-Speicher).
+    Ebenso werden durch den Token-Bucket verworfene Meldungen gemeldet.
+    Meldungen ab ``exempt_level`` werden weder begrenzt noch dedupliziert.
+    """
+    
+    # Markierung, damit ein Record nicht mehrfach gezählt wird, wenn der
+    # Filter an Logger und Handler gleichzeitig hängt
+    _MARK = '_mgb_rate_checked'
+    
+    def __init__(self,
+                 dedup_interval: float = 300.0,
+                 rate: float = 1.0,
+                 burst: float = 20.0,
+                 logger_limits: Optional[Dict[str, Dict[str, float]]] = None,
+                 exempt_level: int = logging.ERROR,
+                 max_entries: int = 512,
+                 flush_interval: float = 60.0):
+        """
+        Initialisiert den Filter
+        
+        Args:
+            dedup_interval: Sekunden, in denen identische Meldungen unterdrückt werden
+            rate: Standard-Meldungsrate pro Sekunde je Logger
+            burst: Standard-Burstgröße je Logger
+            logger_limits: Abweichende Limits je Logger ({name: {rate, burst}})
+            exempt_level: Ab diesem Level gilt weder Ratenbegrenzung noch Deduplizierung
+            max_entries: Maximale Anzahl gemerkter Meldungen (LRU)
+            flush_interval: Sekunden zwischen zwei Prüfungen auf fällige Zusammenfassungen
+        """
+        super().__init__()
+        self.dedup_interval = dedup_interval
+        self.rate = rate
+        self.burst = burst
+        self.logger_limits = logger_limits or {}
+        self.exempt_level = exempt_level
+        self.max_entries = max_entries
+        self.flush_interval = flush_interval
+        
+        self._lock = threading.Lock()
+        # (logger, level, nachricht) -> [zeitpunkt der letzten ausgabe, unterdrückt]
+        self._seen: 'OrderedDict[Tuple[str, int, str], list]' = OrderedDict()
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @classmethod
+    def from_config(cls, rate_limit_config: Dict[str, Any]) -> Optional['RateLimitFilter']:
+        """
+        Erstellt den Filter aus dem Abschnitt ``logging.rate_limit`` der Konfiguration
+        
+        Args:
+            rate_limit_config: Konfigurationsabschnitt
+        
+        Returns:
+            Filter-Instanz oder None, wenn deaktiviert
+        """
+        if not rate_limit_config or not rate_limit_config.get('enabled', True):
+            return None
+        
+        return cls(
+            dedup_interval=rate_limit_config.get('dedup_interval', 300.0),
+            rate=rate_limit_config.get('rate', 1.0),
+            burst=rate_limit_config.get('burst', 20.0),
+            logger_limits=rate_limit_config.get('loggers') or {},
+            flush_interval=rate_limit_config.get('flush_interval', 60.0)
+        )
+    
+    def install(self, *loggers) -> None:
+        """
+        Hängt den Filter an Logger und deren Handler an
+        
+        Args:
+            loggers: Logger-Instanzen oder Logger-Namen
+        """
+        for item in loggers:
+            target = logging.getLogger(item) if isinstance(item, str) else item
+            if self not in target.filters:
+                target.addFilter(self)
+            for handler in target.handlers:
+                if self not in handler.filters:
+                    handler.addFilter(self)
+    
+    def install_configured(self, *loggers) -> None:
+        """
+        Hängt den Filter an die übergebenen sowie alle in ``logger_limits``
+        konfigurierten Logger an
+        
+        Args:
+            loggers: Zusätzliche Logger-Instanzen oder Logger-Namen
+        """
+        self.install(*loggers, *self.logger_limits.keys())
+    
+    def _get_bucket(self, name: str) -> _TokenBucket:
+        bucket = self._buckets.get(name)
+        if bucket is None:
+            limits = self.logger_limits.get(name, {})
+            bucket = _TokenBucket(
+                float(limits.get('rate', self.rate)),
+                float(limits.get('burst', self.burst))
+            )
+            self._buckets[name] = bucket
+        return bucket
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Entscheidet, ob ein Log-Record ausgegeben wird
+        
+        Args:
+            record: Log-Record
+        
+        Returns:
+            True wenn der Record ausgegeben werden soll
+        """
+        if getattr(record, self._MARK, False):
+            return True
+        if record.levelno >= self.exempt_level:
+            setattr(record, self._MARK, True)
+            return True
+        
+        now = time.monotonic()
+        try:
+            message = record.getMessage()
+        except Exception:
+            message = str(record.msg)
+        key = (record.name, record.levelno, message)
+        
+        evicted = None
+        with self._lock:
+            entry = self._seen.get(key)
+            suppressed = 0
+            
+            if entry is not None:
+                if now - entry[0] < self.dedup_interval:
+                    entry[1] += 1
+                    self._seen.move_to_end(key)
+                    return False
+                suppressed = entry[1]
+            
+            bucket = self._get_bucket(record.name)
+            if not bucket.consume(now):
+                return False
+            
+            dropped = bucket.dropped
+            bucket.dropped = 0
+            
+            if entry is None:
+                self._seen[key] = [now, 0]
+                if len(self._seen) > self.max_entries:
+                    evicted = self._seen.popitem(last=False)
+            else:
+                entry[0] = now
+                entry[1] = 0
+                self._seen.move_to_end(key)
+        
+        notes = []
+        if suppressed:
+            notes.append(f"{suppressed} mal wiederholt")
+        if dropped:
+            notes.append(f"{dropped} Meldungen durch Ratenbegrenzung verworfen")
+        if notes:
+            record.msg = f"{message} ({', '.join(notes)})"
+            record.args = None
+        
+        setattr(record, self._MARK, True)
+        # Zusammenfassung der verdrängten Meldung nicht verlieren
+        if evicted is not None and evicted[1][1]:
+            self._emit([self._summary(evicted[0], evicted[1][1])])
+        return True
+    
+    @staticmethod
+    def _summary(key: Tuple[str, int, str], suppressed: int) -> Tuple[str, int, str]:
+        name, level, message = key
+        return name, level, f"{message} ({suppressed} mal wiederholt)"
+    
+    def flush(self, force: bool = False) -> int:
+        """
+        Gibt fällige Zusammenfassungen aus, auch wenn die Meldung nicht mehr auftritt
+        
+        Args:
+            force: Auch Zusammenfassungen, deren Intervall noch nicht abgelaufen ist
+        
+        Returns:
+            Anzahl ausgegebener Zusammenfassungen
+        """
+        now = time.monotonic()
+        summaries = []
+        with self._lock:
+            for key, entry in self._seen.items():
+                if entry[1] and (force or now - entry[0] >= self.dedup_interval):
+                    summaries.append(self._summary(key, entry[1]))
+                    entry[0] = now
+                    entry[1] = 0
+            for name, bucket in self._buckets.items():
+                if bucket.dropped:
+                    summaries.append((name, logging.WARNING,
+                                      f"{bucket.dropped} Meldungen durch Ratenbegrenzung verworfen"))
+                    bucket.dropped = 0
+        self._emit(summaries)
+        return len(summaries)
+    
+    def _emit(self, summaries: List[Tuple[str, int, str]]):
+        """
+        Gibt Zusammenfassungen am jeweiligen Logger aus (ohne erneute Prüfung)
+        """
+        for name, level, message in summaries:
+            target = logging.getLogger(name)
+            record = target.makeRecord(name, level, __file__, 0, message, None, None)
+            setattr(record, self._MARK, True)
+            target.handle(record)
+    
+    def start(self):
+        """
+        Startet die periodische Ausgabe fälliger Zusammenfassungen
+        """
+        if self._thread is not None or self.flush_interval <= 0:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='mgb-log-filter', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """
+        Beendet die periodische Ausgabe und gibt alle offenen Zusammenfassungen aus
+        """
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush(force=True)
+    
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
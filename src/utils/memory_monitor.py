@@ -0,0 +1,255 @@
+"""
+Speicherdiagnose: tracemalloc-Snapshots, RSS, GC und Objektzählung im Verlauf
+"""
+
+import gc
+import logging
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, Optional, Any
+
+from .metrics import process_resident_memory
+
+logger = logging.getLogger(__name__)
+
+# Allokationen der Diagnose selbst ausblenden
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+def _format_statistic(stat) -> Dict[str, Any]:
+    frame = stat.traceback[0]
+    entry = {
+        'site': f"{frame.filename}:{frame.lineno}",
+        'size': stat.size,
+        'count': stat.count
+    }
+    if hasattr(stat, 'size_diff'):
+        entry['size_diff'] = stat.size_diff
+        entry['count_diff'] = stat.count_diff
+    return entry
+
+
+class MemoryMonitor:
+    """
+    Erfasst in festen Abständen den Speicherzustand des Prozesses
+    
+    Je Durchgang werden RSS, GC-Zähler, optional die häufigsten
+    Objekttypen und ein tracemalloc-Snapshot erfasst. Der Verlauf ist auf
+    ``history`` Einträge begrenzt, aufbewahrt werden nur der erste
+    (Referenz) und der letzte Snapshot. Übersteigt der RSS
+    ``rss_threshold_mb``, werden die größten Allokationsstellen und ihr
+    Zuwachs einmalig protokolliert, bis der Wert wieder unter die Schwelle
+    fällt.
+    """
+    
+    def __init__(self, interval: float = 300.0,
+                 top_n: int = 15,
+                 history: int = 48,
+                 rss_threshold_mb: Optional[float] = None,
+                 trace_frames: int = 1,
+                 object_counts: bool = True):
+        """
+        Initialisiert die Speicherdiagnose
+        
+        Args:
+            interval: Abstand der Durchgänge in Sekunden
+            top_n: Anzahl gemeldeter Allokationsstellen bzw. Objekttypen
+            history: Anzahl aufbewahrter Verlaufseinträge
+            rss_threshold_mb: RSS-Schwelle für die Protokollierung in MB (optional)
+            trace_frames: Von tracemalloc gespeicherte Stack-Tiefe
+            object_counts: Objekte je Typ zählen (durchläuft alle GC-Objekte)
+        """
+        self.interval = interval
+        self.top_n = top_n
+        self.rss_threshold_mb = rss_threshold_mb
+        self.trace_frames = trace_frames
+        self.object_counts = object_counts
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=history)
+        
+        self._probes: Dict[str, Callable[[], Any]] = {}
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._last_report: Optional[Dict[str, Any]] = None
+        self._above_threshold = False
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @classmethod
+    def from_config(cls, memory_config: Dict[str, Any]) -> Optional['MemoryMonitor']:
+        """
+        Erstellt die Speicherdiagnose aus ``diagnostics.memory``
+        
+        Returns:
+            MemoryMonitor oder None, wenn nicht aktiviert
+        """
+        if not memory_config or not memory_config.get('enabled', False):
+            return None
+        return cls(
+            interval=memory_config.get('interval', 300.0),
+            top_n=memory_config.get('top_n', 15),
+            history=memory_config.get('history', 48),
+            rss_threshold_mb=memory_config.get('rss_threshold_mb'),
+            trace_frames=memory_config.get('trace_frames', 1),
+            object_counts=memory_config.get('object_counts', True)
+        )
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+    
+    def add_probe(self, name: str, probe: Callable[[], Any]):
+        """
+        Registriert eine zusätzliche Größe für den Verlauf
+        (z.B. Anzahl Socket.IO-Sitzungen)
+        
+        Args:
+            name: Name der Größe
+            probe: Funktion ohne Argumente, die den aktuellen Wert liefert
+        """
+        self._probes[name] = probe
+    
+    def start(self):
+        """
+        Startet tracemalloc und die periodische Erfassung
+        """
+        if self._thread is not None:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='mgb-memory-monitor', daemon=True)
+        self._thread.start()
+        logger.info(f"Speicherdiagnose gestartet (Intervall: {self.interval}s)")
+    
+    def stop(self):
+        """
+        Beendet die Erfassung und tracemalloc
+        """
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        tracemalloc.stop()
+        with self._lock:
+            self._baseline = None
+            self._previous = None
+    
+    def _run(self):
+        while True:
+            try:
+                self.collect()
+            except Exception as e:
+                logger.error(f"Fehler in der Speicherdiagnose: {e}", exc_info=True)
+            if self._stop_event.wait(self.interval):
+                return
+    
+    def collect(self) -> Dict[str, Any]:
+        """
+        Führt einen Durchgang aus und gibt den Bericht zurück
+        """
+        start = time.perf_counter()
+        rss = process_resident_memory()
+        entry: Dict[str, Any] = {
+            'timestamp': datetime.now().isoformat(),
+            'rss_bytes': int(rss),
+            'gc_counts': list(gc.get_count()),
+            'gc_collections': [stats['collections'] for stats in gc.get_stats()],
+            'gc_uncollectable': sum(stats['uncollectable'] for stats in gc.get_stats())
+        }
+        
+        for name, probe in self._probes.items():
+            try:
+                entry[name] = probe()
+            except Exception as e:
+                entry[name] = None
+                logger.debug(f"Speicherdiagnose: '{name}' nicht ermittelbar: {e}")
+        
+        report: Dict[str, Any] = {'entry': entry}
+        
+        if self.object_counts:
+            types = Counter(type(obj).__name__ for obj in gc.get_objects())
+            entry['objects'] = sum(types.values())
+            entry['object_types'] = dict(types.most_common(self.top_n))
+        
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            entry['traced_bytes'] = current
+            entry['traced_peak_bytes'] = peak
+            
+            snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+            with self._lock:
+                previous = self._previous
+                baseline = self._baseline
+                if baseline is None:
+                    baseline = self._baseline = snapshot
+                self._previous = snapshot
+            
+            report['top_sites'] = [
+                _format_statistic(stat) for stat in snapshot.statistics('lineno')[:self.top_n]
+            ]
+            if previous is not None:
+                report['diff_previous'] = [
+                    _format_statistic(stat)
+                    for stat in snapshot.compare_to(previous, 'lineno')[:self.top_n]
+                ]
+            if baseline is not snapshot:
+                report['diff_baseline'] = [
+                    _format_statistic(stat)
+                    for stat in snapshot.compare_to(baseline, 'lineno')[:self.top_n]
+                ]
+        
+        entry['duration_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        with self._lock:
+            self.history.append(entry)
+            self._last_report = report
+        
+        self._check_threshold(rss, report)
+        return report
+    
+    def _check_threshold(self, rss: float, report: Dict[str, Any]):
+        if not self.rss_threshold_mb:
+            return
+        if rss < self.rss_threshold_mb * 1024 * 1024:
+            self._above_threshold = False
+            return
+        if self._above_threshold:
+            return
+        
+        self._above_threshold = True
+        lines = [f"RSS {rss / 1024 / 1024:.1f} MB über Schwelle {self.rss_threshold_mb} MB"]
+        for title, key in (('Größte Allokationsstellen', 'top_sites'),
+                           ('Zuwachs seit Start', 'diff_baseline')):
+            if report.get(key):
+                lines.append(f"{title}:")
+                lines.extend(
+                    f"  {stat['site']}: {stat['size'] / 1024:.1f} KiB"
+                    + (f" ({stat['size_diff'] / 1024:+.1f} KiB)" if 'size_diff' in stat else '')
+                    for stat in report[key][:5]
+                )
+        object_types = report['entry'].get('object_types')
+        if object_types:
+            lines.append("Objekte: " + ', '.join(f"{name}={count}" for name, count in list(object_types.items())[:5]))
+        logger.warning('\n'.join(lines))
+    
+    def get_report(self) -> Dict[str, Any]:
+        """
+        Gibt den letzten Bericht und den Verlauf zurück
+        """
+        with self._lock:
+            return {
+                'running': self.running,
+                'interval': self.interval,
+                'rss_threshold_mb': self.rss_threshold_mb,
+                'latest': self._last_report,
+                'history': list(self.history)
+            }
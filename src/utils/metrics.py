@@ -0,0 +1,414 @@
+"""
+Leichtgewichtige Laufzeitmetriken (Zähler, Messgrößen, Histogramme)
+im Prometheus-Textformat
+"""
+
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Content-Type des Prometheus-Textformats 0.0.4
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Standard-Buckets für Laufzeiten in Sekunden (Pi Zero: ms bis Sekunden)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Ab dieser Anzahl Shards werden die Shards beendeter Threads zusammengefasst
+_SHARD_COMPACT_THRESHOLD = 32
+
+
+class _ThreadShards:
+    """
+    Zählerfelder pro Thread
+    
+    Jeder Thread schreibt ausschließlich in sein eigenes ``array('d')``,
+    Schreibzugriffe brauchen daher keine Sperre. Nur beim ersten Zugriff
+    eines Threads und beim Auslesen wird kurz gesperrt. Shards beendeter
+    Threads werden in ``_retired`` aufsummiert, damit kurzlebige
+    Request-Threads den Speicher nicht wachsen lassen.
+    """
+    
+    __slots__ = ('_size', '_local', '_shards', '_retired', '_lock')
+    
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, array]] = []
+        self._retired = array('d', bytes(8 * size))
+        self._lock = threading.Lock()
+    
+    def get(self) -> array:
+        try:
+            return self._local.shard
+        except AttributeError:
+            pass
+        
+        shard = array('d', bytes(8 * self._size))
+        with self._lock:
+            if len(self._shards) >= _SHARD_COMPACT_THRESHOLD:
+                self._compact()
+            self._shards.append((threading.current_thread(), shard))
+        self._local.shard = shard
+        return shard
+    
+    def _compact(self):
+        # Aufruf nur mit gehaltenem Lock
+        alive = []
+        retired = self._retired
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+            else:
+                for i, value in enumerate(shard):
+                    retired[i] += value
+        self._shards = alive
+    
+    def totals(self) -> List[float]:
+        with self._lock:
+            self._compact()
+            totals = list(self._retired)
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            for i, value in enumerate(shard):
+                totals[i] += value
+        return totals
+
+
+class _Metric:
+    """
+    Basisklasse einer Metrik-Familie mit optionalen Labels
+    """
+    
+    type_name = 'untyped'
+    
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], '_Metric'] = {}
+        self._children_lock = threading.Lock()
+        self._labelvalues: Tuple[str, ...] = ()
+        self._is_child = False
+        self._default_child: Optional['_Metric'] = None
+    
+    def labels(self, *labelvalues) -> '_Metric':
+        """
+        Liefert die Metrik für eine Label-Kombination
+        
+        Für häufige Aufrufe sollte das Ergebnis zwischengespeichert werden.
+        """
+        key = tuple(str(value) for value in labelvalues)
+        child = self._children.get(key)
+        if child is not None:
+            return child
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name}: erwartet Labels {self.labelnames}, erhalten {key}")
+        with self._children_lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._new_child()
+                child._labelvalues = key
+                child._is_child = True
+                self._children[key] = child
+        return child
+    
+    def _new_child(self) -> '_Metric':
+        raise NotImplementedError
+    
+    def _default(self) -> '_Metric':
+        child = self._default_child
+        if child is None:
+            if self.labelnames:
+                raise ValueError(f"{self.name}: Labels erforderlich ({', '.join(self.labelnames)})")
+            child = self._default_child = self.labels()
+        return child
+    
+    def _samples(self) -> List[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        raise NotImplementedError
+    
+    def collect(self) -> List[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        """
+        Liefert alle Werte als (Name, Labels, Wert)
+        """
+        result = []
+        for child in list(self._children.values()):
+            labels = tuple(zip(self.labelnames, child._labelvalues))
+            for suffix, extra, value in child._samples():
+                result.append((self.name + suffix, labels + extra, value))
+        return result
+
+
+class Counter(_Metric):
+    """
+    Monoton steigender Zähler
+    """
+    
+    type_name = 'counter'
+    
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._shards: Optional[_ThreadShards] = None
+        self._function: Optional[Callable[[], float]] = None
+    
+    def _new_child(self) -> 'Counter':
+        child = Counter(self.name, self.help)
+        child._shards = _ThreadShards(1)
+        return child
+    
+    def inc(self, amount: float = 1.0):
+        """
+        Erhöht den Zähler
+        """
+        shards = self._shards
+        if shards is None:
+            shards = self._default()._shards
+        shards.get()[0] += amount
+    
+    def set_function(self, function: Callable[[], float]):
+        """
+        Liest den Zählerstand erst beim Auslesen aus einer externen Quelle
+        
+        Args:
+            function: Funktion ohne Argumente, die den monoton steigenden Stand liefert
+                (z.B. die CPU-Zeit des Prozesses)
+        """
+        target = self if self._is_child else self._default()
+        target._function = function
+    
+    @property
+    def value(self) -> float:
+        if not self._is_child:
+            return self._default().value
+        if self._function is not None:
+            return float(self._function())
+        return self._shards.totals()[0]
+    
+    def _samples(self):
+        try:
+            return [('', (), self.value)]
+        except Exception:
+            # Nicht ermittelbare Werte werden ausgelassen
+            return []
+
+
+class Gauge(_Metric):
+    """
+    Momentanwert, gesetzt oder beim Auslesen über eine Funktion ermittelt
+    """
+    
+    type_name = 'gauge'
+    
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+    
+    def _new_child(self) -> 'Gauge':
+        return Gauge(self.name, self.help)
+    
+    def set(self, value: float):
+        """
+        Setzt den Wert (einfache Zuweisung, ohne Sperre)
+        """
+        target = self if self._is_child else self._default()
+        target._value = float(value)
+    
+    def set_function(self, function: Callable[[], float]):
+        """
+        Ermittelt den Wert erst beim Auslesen (keine Kosten im laufenden Betrieb)
+        
+        Args:
+            function: Funktion ohne Argumente, die den aktuellen Wert liefert
+        """
+        target = self if self._is_child else self._default()
+        target._function = function
+    
+    @property
+    def value(self) -> float:
+        if not self._is_child:
+            return self._default().value
+        if self._function is not None:
+            return float(self._function())
+        return self._value
+    
+    def _samples(self):
+        try:
+            return [('', (), self.value)]
+        except Exception:
+            # Nicht ermittelbare Werte werden ausgelassen
+            return []
+
+
+class Histogram(_Metric):
+    """
+    Histogramm mit festen, vorab sortierten Bucket-Grenzen
+    
+    Eine Beobachtung kostet eine Binärsuche und zwei Additionen im
+    Thread-eigenen Feld.
+    """
+    
+    type_name = 'histogram'
+    
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+        self._shards: Optional[_ThreadShards] = None
+    
+    def _new_child(self) -> 'Histogram':
+        child = Histogram(self.name, self.help, buckets=self.buckets)
+        # Felder: ein Zähler je Bucket, +Inf, Summe
+        child._shards = _ThreadShards(len(self.buckets) + 2)
+        return child
+    
+    def observe(self, value: float):
+        """
+        Erfasst eine Beobachtung
+        """
+        shards = self._shards
+        if shards is None:
+            self._default().observe(value)
+            return
+        shard = shards.get()
+        shard[bisect_left(self.buckets, value)] += 1
+        shard[-1] += value
+    
+    def time(self) -> '_Timer':
+        """
+        Kontextmanager, der die Laufzeit des Blocks in Sekunden erfasst
+        """
+        return _Timer(self if self._shards is not None else self._default())
+    
+    def _samples(self):
+        totals = self._shards.totals()
+        samples = []
+        cumulative = 0.0
+        for bound, count in zip(self.buckets, totals):
+            cumulative += count
+            samples.append(('_bucket', (('le', _format_value(bound)),), cumulative))
+        cumulative += totals[len(self.buckets)]
+        samples.append(('_bucket', (('le', '+Inf'),), cumulative))
+        samples.append(('_sum', (), totals[-1]))
+        samples.append(('_count', (), cumulative))
+        return samples
+
+
+class _Timer:
+    __slots__ = ('_histogram', '_start')
+    
+    def __init__(self, histogram: Histogram):
+        self._histogram = histogram
+    
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback):
+        self._histogram.observe(time.perf_counter() - self._start)
+        return False
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if value == float('-inf'):
+        return '-Inf'
+    if value != value:
+        return 'NaN'
+    if value.is_integer() and abs(value) < 2 ** 53:
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricsRegistry:
+    """
+    Sammlung aller Metriken eines Prozesses
+    
+    ``counter()``, ``gauge()`` und ``histogram()`` liefern eine bereits
+    registrierte Metrik gleichen Namens zurück, sodass Module ihre Metriken
+    beim Import anlegen können.
+    """
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+    
+    def _register(self, cls, name: str, help_text: str, labelnames: Sequence[str], **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is not None:
+                if not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                    raise ValueError(f"Metrik '{name}' ist bereits anders registriert")
+                return metric
+            metric = cls(name, help_text, labelnames, **kwargs)
+            self._metrics[name] = metric
+            return metric
+    
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, help_text, labelnames)
+    
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, help_text, labelnames)
+    
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help_text, labelnames, buckets=buckets)
+    
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+    
+    def render(self, skip: Iterable[str] = ()) -> str:
+        """
+        Gibt alle Metriken im Prometheus-Textformat zurück
+        
+        Args:
+            skip: Namen von Metriken, die nicht ausgegeben werden (z.B. weil ein
+                anderer Prozess sie bereits liefert)
+        """
+        skip = set(skip)
+        with self._lock:
+            registered = sorted((metric for metric in self._metrics.values() if metric.name not in skip),
+                                key=lambda metric: metric.name)
+        
+        lines = []
+        for metric in registered:
+            lines.append(f"# HELP {metric.name} {_escape(metric.help)}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for name, labels, value in metric.collect():
+                if labels:
+                    label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in labels)
+                    lines.append(f"{name}{{{label_text}}} {_format_value(float(value))}")
+                else:
+                    lines.append(f"{name} {_format_value(float(value))}")
+        lines.append('')
+        return '\n'.join(lines)
+
+
+def process_resident_memory() -> float:
+    """
+    Belegter Arbeitsspeicher (RSS) des Prozesses in Bytes
+    """
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return float(int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE'))
+    except (OSError, ValueError, IndexError):
+        import resource
+        # Fallback: Spitzenwert (Linux: KiB)
+        return float(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024)
+
+
+# Prozessweite Instanz
+metrics = MetricsRegistry()
+
+metrics.gauge('process_resident_memory_bytes',
+              'Belegter Arbeitsspeicher (RSS) in Bytes').set_function(process_resident_memory)
+metrics.counter('process_cpu_seconds_total',
+                'Verbrauchte CPU-Zeit des Prozesses in Sekunden').set_function(time.process_time)
@@ -0,0 +1,269 @@
+"""
+Zeitlich begrenztes Profiling aller Threads im laufenden Betrieb
+"""
+
+import logging
+import marshal
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Schlüssel einer Funktion im pstats-Format: (Datei, Zeile, Name)
+_FuncKey = Tuple[str, int, str]
+
+
+class _SamplingSession:
+    """
+    Ein laufender Profiling-Durchgang
+    
+    Ein eigener Thread liest in festen Abständen die Stacks aller Threads
+    über ``sys._current_frames()`` und zählt identische Stacks. Die
+    profilierten Threads selbst werden dabei nicht verändert.
+    """
+    
+    def __init__(self, name: str, duration: float, interval: float):
+        self.name = name
+        self.duration = duration
+        self.interval = interval
+        self.started = time.time()
+        self.stacks: Counter = Counter()
+        self.ticks = 0
+        self.elapsed = 0.0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name='mgb-profiler', daemon=True)
+    
+    def _run(self):
+        start = time.monotonic()
+        deadline = start + self.duration
+        code_keys: Dict[Any, _FuncKey] = {}
+        
+        while not self.stopped.wait(self.interval):
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                thread_name = names.get(ident, str(ident))
+                if thread_name.startswith('mgb-profiler'):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    key = code_keys.get(code)
+                    if key is None:
+                        key = code_keys[code] = (code.co_filename, code.co_firstlineno, code.co_name)
+                    stack.append(key)
+                    frame = frame.f_back
+                stack.reverse()
+                self.stacks[(thread_name, tuple(stack))] += 1
+            self.ticks += 1
+        
+        self.elapsed = time.monotonic() - start
+    
+    @property
+    def sample_period(self) -> float:
+        """
+        Tatsächlicher mittlerer Abstand der Stichproben in Sekunden
+        """
+        return self.elapsed / self.ticks if self.ticks else self.interval
+    
+    def write_collapsed(self, path: Path):
+        """
+        Schreibt die Stacks im "collapsed"-Format (flamegraph.pl, speedscope)
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            for (thread_name, stack), count in self.stacks.most_common():
+                frames = [thread_name.replace(';', ':')]
+                frames.extend(
+                    f"{func} ({os.path.basename(filename)}:{line})".replace(';', ':')
+                    for filename, line, func in stack
+                )
+                f.write(f"{';'.join(frames)} {count}\n")
+    
+    def write_pstats(self, path: Path):
+        """
+        Schreibt die Stichproben als pstats-Datei (pstats.Stats, snakeviz)
+        
+        Zeiten sind aus den Stichproben hochgerechnet, ``ncalls`` enthält die
+        Anzahl der Stichproben, in denen die Funktion auf dem Stack lag.
+        """
+        period = self.sample_period
+        own: Counter = Counter()
+        total: Counter = Counter()
+        edges: Dict[_FuncKey, Counter] = {}
+        edge_own: Dict[_FuncKey, Counter] = {}
+        
+        for (_, stack), count in self.stacks.items():
+            if not stack:
+                continue
+            own[stack[-1]] += count
+            # Rekursive Aufrufe nur einmal je Stack zählen
+            for key in set(stack):
+                total[key] += count
+            for caller, callee in set(zip(stack, stack[1:])):
+                edges.setdefault(callee, Counter())[caller] += count
+            if len(stack) > 1:
+                edge_own.setdefault(stack[-1], Counter())[stack[-2]] += count
+        
+        stats = {}
+        for key, count in total.items():
+            callers = {
+                caller: (n, n, edge_own.get(key, {}).get(caller, 0) * period, n * period)
+                for caller, n in edges.get(key, {}).items()
+            }
+            stats[key] = (count, count, own[key] * period, count * period, callers)
+        
+        with open(path, 'wb') as f:
+            marshal.dump(stats, f)
+
+
+class Profiler:
+    """
+    Startet auf Anforderung einen zeitlich begrenzten Stichproben-Profiler
+    
+    Solange kein Durchgang läuft, existiert kein Profiler-Thread und es ist
+    kein Hook installiert, im Normalbetrieb entstehen daher keine Kosten.
+    Die Ergebnisse landen als ``.collapsed`` und ``.pstats`` in
+    ``output_dir``, ältere Dateien werden ab ``max_files`` Durchgängen
+    gelöscht.
+    """
+    
+    def __init__(self, output_dir: str = 'logs/profiles',
+                 interval: float = 0.01,
+                 max_duration: float = 300.0,
+                 max_files: int = 10):
+        """
+        Initialisiert den Profiler
+        
+        Args:
+            output_dir: Verzeichnis für die Ergebnisse
+            interval: Abstand der Stichproben in Sekunden
+            max_duration: Maximale Dauer eines Durchgangs in Sekunden
+            max_files: Anzahl aufbewahrter Durchgänge
+        """
+        self.output_dir = Path(output_dir)
+        self.interval = interval
+        self.max_duration = max_duration
+        self.max_files = max_files
+        self._session: Optional[_SamplingSession] = None
+        self._lock = threading.Lock()
+    
+    def configure(self, profiler_config: Dict[str, Any]):
+        """
+        Übernimmt die Einstellungen aus der Konfiguration
+        
+        Args:
+            profiler_config: Abschnitt ``diagnostics.profiler`` aus config.yaml
+        """
+        self.output_dir = Path(profiler_config.get('output_dir', self.output_dir))
+        self.interval = profiler_config.get('interval', self.interval)
+        self.max_duration = profiler_config.get('max_duration', self.max_duration)
+        self.max_files = profiler_config.get('max_files', self.max_files)
+    
+    @property
+    def active(self) -> bool:
+        return self._session is not None
+    
+    def start(self, duration: float = 30.0, interval: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Startet einen Durchgang im Hintergrund
+        
+        Args:
+            duration: Dauer in Sekunden (begrenzt auf max_duration)
+            interval: Abstand der Stichproben in Sekunden (optional)
+        
+        Returns:
+            Status des gestarteten Durchgangs
+        
+        Raises:
+            RuntimeError: Wenn bereits ein Durchgang läuft
+        """
+        duration = max(1.0, min(float(duration), self.max_duration))
+        interval = max(0.001, float(interval or self.interval))
+        
+        with self._lock:
+            if self._session is not None:
+                raise RuntimeError("Profiling läuft bereits")
+            name = f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            session = self._session = _SamplingSession(name, duration, interval)
+        
+        session.thread.start()
+        threading.Thread(target=self._finish, args=(session,),
+                         name='mgb-profiler-writer', daemon=True).start()
+        logger.info(f"Profiling gestartet: {name} ({duration:.0f} s, alle {interval * 1000:.0f} ms)")
+        return self.status()
+    
+    def stop(self):
+        """
+        Beendet den laufenden Durchgang vorzeitig (Ergebnisse werden geschrieben)
+        """
+        session = self._session
+        if session is not None:
+            session.stopped.set()
+    
+    def _finish(self, session: _SamplingSession):
+        session.thread.join()
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            session.write_collapsed(self.output_dir / f"{session.name}.collapsed")
+            session.write_pstats(self.output_dir / f"{session.name}.pstats")
+            logger.info(
+                f"Profiling beendet: {session.name} "
+                f"({session.ticks} Stichproben in {session.elapsed:.1f} s)"
+            )
+            self._prune()
+        except OSError as e:
+            logger.error(f"Profil konnte nicht geschrieben werden: {e}")
+        finally:
+            with self._lock:
+                self._session = None
+    
+    def _prune(self):
+        names = sorted({path.stem for path in self.output_dir.glob('profile_*')}, reverse=True)
+        for name in names[self.max_files:]:
+            for path in self.output_dir.glob(f"{name}.*"):
+                path.unlink(missing_ok=True)
+    
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        """
+        Listet die vorhandenen Ergebnisdateien (neueste zuerst)
+        """
+        if not self.output_dir.is_dir():
+            return []
+        files = []
+        for path in self.output_dir.glob('profile_*'):
+            stat = path.stat()
+            files.append({
+                'name': path.name,
+                'size': stat.st_size,
+                'created': datetime.fromtimestamp(stat.st_mtime).isoformat()
+            })
+        files.sort(key=lambda entry: entry['name'], reverse=True)
+        return files
+    
+    def status(self) -> Dict[str, Any]:
+        """
+        Gibt den Zustand des Profilers zurück
+        """
+        session = self._session
+        status = {'active': session is not None, 'files': self.list_profiles()}
+        if session is not None:
+            status.update({
+                'name': session.name,
+                'duration': session.duration,
+                'interval': session.interval,
+                'started': datetime.fromtimestamp(session.started).isoformat(),
+                'samples': session.ticks
+            })
+        return status
+
+
+# Prozessweite Instanz (SIGUSR1 in main.py und Weboberfläche)
+profiler = Profiler()
@@ -0,0 +1,220 @@
+"""
+Speicherschonender Verlaufspuffer der letzten Messwerte für die Diagramme
+"""
+
+import math
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Optional, Any, Tuple
+
+
+class SampleRingBuffer:
+    """
+    Ringpuffer fester Größe für (Zeitstempel, Wert)-Paare
+    
+    Zeitstempel und Werte liegen in zwei vorab allokierten ``array('d')``,
+    es entstehen keine Python-Objekte pro Messwert.
+    """
+    
+    __slots__ = ('capacity', '_timestamps', '_values', '_head', '_count')
+    
+    def __init__(self, capacity: int):
+        """
+        Initialisiert den Ringpuffer
+        
+        Args:
+            capacity: Maximale Anzahl gespeicherter Messwerte
+        """
+        if capacity <= 0:
+            raise ValueError("Kapazität muss größer als 0 sein")
+        
+        self.capacity = capacity
+        self._timestamps = array('d', bytes(8 * capacity))
+        self._values = array('d', bytes(8 * capacity))
+        self._head = 0  # Nächste Schreibposition
+        self._count = 0
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    @property
+    def nbytes(self) -> int:
+        """
+        Belegter Speicher der Datenarrays in Bytes
+        """
+        return (self._timestamps.itemsize + self._values.itemsize) * self.capacity
+    
+    def append(self, timestamp: float, value: float):
+        """
+        Fügt einen Messwert hinzu und überschreibt ggf. den ältesten
+        
+        Args:
+            timestamp: Unix-Zeitstempel in Sekunden
+            value: Messwert
+        """
+        head = self._head
+        self._timestamps[head] = timestamp
+        self._values[head] = value
+        head += 1
+        self._head = 0 if head == self.capacity else head
+        if self._count < self.capacity:
+            self._count += 1
+    
+    def latest(self) -> Optional[Tuple[float, float]]:
+        """
+        Gibt den neuesten Messwert zurück
+        
+        Returns:
+            (Zeitstempel, Wert) oder None, wenn leer
+        """
+        if not self._count:
+            return None
+        index = self._head - 1
+        return self._timestamps[index], self._values[index]
+    
+    def snapshot(self, since: Optional[float] = None,
+                 limit: Optional[int] = None) -> Tuple[array, array]:
+        """
+        Kopiert den Inhalt in chronologischer Reihenfolge
+        
+        Args:
+            since: Nur Werte nach diesem Zeitstempel (optional)
+            limit: Nur die neuesten N Werte (optional)
+        
+        Returns:
+            Tuple aus Zeitstempel- und Werte-Array
+        """
+        if self._count < self.capacity:
+            timestamps = self._timestamps[:self._count]
+            values = self._values[:self._count]
+        else:
+            head = self._head
+            timestamps = self._timestamps[head:] + self._timestamps[:head]
+            values = self._values[head:] + self._values[:head]
+        
+        start = 0
+        if since is not None:
+            start = bisect_right(timestamps, since)
+        if limit is not None and limit >= 0:
+            start = max(start, len(timestamps) - limit)
+        if start:
+            timestamps = timestamps[start:]
+            values = values[start:]
+        
+        return timestamps, values
+
+
+class RecentHistory:
+    """
+    Prozessweiter Verlaufsspeicher der letzten Stunden je Sensor
+    
+    Wird vom Monitoring-Loop beschrieben und liefert die Startdaten der
+    Diagramme ohne Datenbankzugriff.
+    """
+    
+    def __init__(self, window: float = 24 * 3600, interval: float = 60):
+        """
+        Initialisiert den Verlaufsspeicher
+        
+        Args:
+            window: Vorgehaltener Zeitraum in Sekunden
+            interval: Erwartetes Messintervall in Sekunden
+        """
+        self._lock = threading.Lock()
+        self._buffers: Dict[str, SampleRingBuffer] = {}
+        self.configure(window, interval)
+    
+    def configure(self, window: float, interval: float):
+        """
+        Legt Zeitraum und Messintervall fest und verwirft vorhandene Daten
+        
+        Args:
+            window: Vorgehaltener Zeitraum in Sekunden
+            interval: Erwartetes Messintervall in Sekunden
+        """
+        with self._lock:
+            self.window = window
+            self.interval = interval
+            self.capacity = max(1, int(math.ceil(window / max(interval, 1e-3))))
+            self._buffers = {}
+    
+    def append(self, sensor_name: str, value: float, timestamp: Optional[float] = None):
+        """
+        Speichert einen Messwert
+        
+        Args:
+            sensor_name: Name des Sensors
+            value: Messwert
+            timestamp: Unix-Zeitstempel (optional, sonst aktuell)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        
+        with self._lock:
+            buffer = self._buffers.get(sensor_name)
+            if buffer is None:
+                buffer = SampleRingBuffer(self.capacity)
+                self._buffers[sensor_name] = buffer
+            buffer.append(timestamp, value)
+    
+    def sensors(self) -> List[str]:
+        """
+        Gibt die Namen aller Sensoren mit Verlauf zurück
+        """
+        with self._lock:
+            return list(self._buffers)
+    
+    def get_series(self, sensor_name: str, since: Optional[float] = None,
+                   limit: Optional[int] = None) -> Dict[str, List[float]]:
+        """
+        Liest den Verlauf eines Sensors
+        
+        Args:
+            sensor_name: Name des Sensors
+            since: Nur Werte nach diesem Unix-Zeitstempel (optional)
+            limit: Nur die neuesten N Werte (optional)
+        
+        Returns:
+            Dictionary mit den Listen 'timestamps' und 'values'
+        """
+        with self._lock:
+            buffer = self._buffers.get(sensor_name)
+            if buffer is None:
+                return {'timestamps': [], 'values': []}
+            timestamps, values = buffer.snapshot(since, limit)
+        
+        return {'timestamps': timestamps.tolist(), 'values': values.tolist()}
+    
+    def get_all(self, since: Optional[float] = None,
+                limit: Optional[int] = None) -> Dict[str, Dict[str, List[float]]]:
+        """
+        Liest den Verlauf aller Sensoren
+        
+        Args:
+            since: Nur Werte nach diesem Unix-Zeitstempel (optional)
+            limit: Nur die neuesten N Werte je Sensor (optional)
+        
+        Returns:
+            Dictionary {Sensorname: Verlauf}
+        """
+        return {
+            name: self.get_series(name, since, limit)
+            for name in self.sensors()
+        }
+    
+    def memory_usage(self) -> Dict[str, Any]:
+        """
+        Gibt Informationen zum Speicherbedarf zurück
+        """
+        with self._lock:
+            return {
+                'capacity': self.capacity,
+                'sensors': len(self._buffers),
+                'bytes': sum(buffer.nbytes for buffer in self._buffers.values())
+            }
+
+
+# Prozessweite Instanz (Monitoring-Loop schreibt, Webserver liest)
+recent_history = RecentHistory()
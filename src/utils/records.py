@@ -0,0 +1,207 @@
+"""
+Kompakte, unveränderliche Datensätze für Messwerte, Aktor- und Alarmereignisse
+"""
+
+import json
+import math
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+
+# Vorab kodierte JSON-Präfixe je (Sensor, Einheit) bzw. Name
+_json_prefix_cache: Dict[Tuple[str, ...], str] = {}
+
+
+def _json_prefix(key: Tuple[str, ...], template: str) -> str:
+    prefix = _json_prefix_cache.get(key)
+    if prefix is None:
+        prefix = template.format(*(json.dumps(part, ensure_ascii=False) for part in key))
+        _json_prefix_cache[key] = prefix
+    return prefix
+
+
+class _Record:
+    """
+    Basisklasse für unveränderliche Datensätze mit ``__slots__``
+    """
+    
+    __slots__ = ()
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} ist unveränderlich")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} ist unveränderlich")
+    
+    def _fields(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__ if not name.startswith('_'))
+    
+    def __reduce__(self):
+        return type(self), self._fields()
+    
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._fields() == other._fields()
+    
+    def __hash__(self):
+        return hash(self._fields())
+    
+    def __repr__(self):
+        args = ', '.join(
+            f"{name}={getattr(self, name)!r}" for name in self.__slots__ if not name.startswith('_')
+        )
+        return f"{type(self).__name__}({args})"
+    
+    def isoformat(self) -> str:
+        """
+        Gibt den Zeitstempel als ISO-String zurück (wird zwischengespeichert)
+        """
+        iso = self._iso
+        if iso is None:
+            iso = datetime.fromtimestamp(self.timestamp).isoformat()
+            object.__setattr__(self, '_iso', iso)
+        return iso
+
+
+class Sample(_Record):
+    """
+    Einzelner Messwert eines Sensors
+    """
+    
+    __slots__ = ('sensor', 'value', 'unit', 'timestamp', 'monotonic', '_iso')
+    
+    def __init__(self, sensor: str, value: float, unit: str,
+                 timestamp: Optional[float] = None,
+                 monotonic: Optional[float] = None):
+        """
+        Args:
+            sensor: Name des Sensors
+            value: Messwert
+            unit: Einheit des Werts
+            timestamp: Unix-Zeitstempel (optional, sonst aktuell)
+            monotonic: Monotoner Zeitpunkt (optional, sonst aktuell)
+        """
+        set_ = object.__setattr__
+        set_(self, 'sensor', sensor)
+        set_(self, 'value', float(value))
+        set_(self, 'unit', unit)
+        set_(self, 'timestamp', time.time() if timestamp is None else timestamp)
+        set_(self, 'monotonic', time.monotonic() if monotonic is None else monotonic)
+        set_(self, '_iso', None)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Gibt den Messwert als Dictionary zurück
+        """
+        return {
+            'sensor': self.sensor,
+            'value': self.value,
+            'unit': self.unit,
+            'timestamp': self.timestamp
+        }
+    
+    def to_json(self) -> str:
+        """
+        Gibt den Messwert als JSON-String zurück (ohne json.dumps pro Aufruf)
+        """
+        prefix = _json_prefix(
+            (self.sensor, self.unit),
+            '{{"sensor":{0},"unit":{1},'
+        )
+        value = repr(self.value) if math.isfinite(self.value) else 'null'
+        return f'{prefix}"value":{value},"timestamp":{self.timestamp!r}}}'
+
+
+class ActuatorEvent(_Record):
+    """
+    Zustandsänderung eines Aktors
+    """
+    
+    __slots__ = ('actuator', 'state', 'timestamp', 'monotonic', '_iso')
+    
+    def __init__(self, actuator: str, state: bool,
+                 timestamp: Optional[float] = None,
+                 monotonic: Optional[float] = None):
+        """
+        Args:
+            actuator: Name des Aktors
+            state: Neuer Zustand (True=Ein, False=Aus)
+            timestamp: Unix-Zeitstempel (optional, sonst aktuell)
+            monotonic: Monotoner Zeitpunkt (optional, sonst aktuell)
+        """
+        set_ = object.__setattr__
+        set_(self, 'actuator', actuator)
+        set_(self, 'state', bool(state))
+        set_(self, 'timestamp', time.time() if timestamp is None else timestamp)
+        set_(self, 'monotonic', time.monotonic() if monotonic is None else monotonic)
+        set_(self, '_iso', None)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Gibt das Ereignis als Dictionary zurück
+        """
+        return {
+            'actuator': self.actuator,
+            'state': self.state,
+            'timestamp': self.timestamp
+        }
+    
+    def to_json(self) -> str:
+        """
+        Gibt das Ereignis als JSON-String zurück
+        """
+        prefix = _json_prefix((self.actuator,), '{{"actuator":{0},')
+        state = 'true' if self.state else 'false'
+        return f'{prefix}"state":{state},"timestamp":{self.timestamp!r}}}'
+
+
+class AlarmEvent(_Record):
+    """
+    Ausgelöster Alarm
+    """
+    
+    __slots__ = ('alarm_type', 'message', 'severity', 'value', 'timestamp', 'monotonic', '_iso')
+    
+    def __init__(self, alarm_type: str, message: str,
+                 severity: str = 'warning',
+                 value: Optional[float] = None,
+                 timestamp: Optional[float] = None,
+                 monotonic: Optional[float] = None):
+        """
+        Args:
+            alarm_type: Typ des Alarms (z.B. "temperature_critical_max")
+            message: Alarm-Nachricht
+            severity: Schweregrad ("warning" oder "critical")
+            value: Auslösender Messwert (optional)
+            timestamp: Unix-Zeitstempel (optional, sonst aktuell)
+            monotonic: Monotoner Zeitpunkt (optional, sonst aktuell)
+        """
+        set_ = object.__setattr__
+        set_(self, 'alarm_type', alarm_type)
+        set_(self, 'message', message)
+        set_(self, 'severity', severity)
+        set_(self, 'value', None if value is None else float(value))
+        set_(self, 'timestamp', time.time() if timestamp is None else timestamp)
+        set_(self, 'monotonic', time.monotonic() if monotonic is None else monotonic)
+        set_(self, '_iso', None)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Gibt den Alarm als Dictionary zurück
+        """
+        return {
+            'type': self.severity,
+            'alarm_type': self.alarm_type,
+            'title': self.alarm_type,
+            'message': self.message,
+            'value': self.value,
+            'timestamp': self.isoformat()
+        }
+    
+    def to_json(self) -> str:
+        """
+        Gibt den Alarm als JSON-String zurück
+        """
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(',', ':'))
@@ -0,0 +1,200 @@
+"""
+Empfängerseite der Replikation: je Box eine SQLite-Kopie der Tabellen
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_applied_rows = metrics.counter(
+    'mgb_replica_rows_total', 'Vom Empfänger übernommene Zeilen', ('table',))
+_commit_seconds = metrics.histogram(
+    'mgb_replica_commit_seconds', 'Dauer eines Stapels des Empfängers (eine Transaktion)')
+
+# Tabellen der Kopie mit ihren Spalten (IDs der Box als Primärschlüssel)
+REPLICA_TABLES = {
+    'sensor_data': ('id', 'timestamp', 'sensor_name', 'value', 'unit', 'chamber'),
+    'actuator_status': ('id', 'timestamp', 'actuator_name', 'state', 'chamber'),
+    'alarms': ('id', 'timestamp', 'alarm_type', 'message', 'acknowledged', 'chamber'),
+}
+
+_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS sensor_data (
+        id INTEGER PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        sensor_name TEXT NOT NULL,
+        value REAL NOT NULL,
+        unit TEXT NOT NULL,
+        chamber TEXT NOT NULL DEFAULT 'default'
+    );
+    CREATE TABLE IF NOT EXISTS actuator_status (
+        id INTEGER PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        actuator_name TEXT NOT NULL,
+        state INTEGER NOT NULL,
+        chamber TEXT NOT NULL DEFAULT 'default'
+    );
+    CREATE TABLE IF NOT EXISTS alarms (
+        id INTEGER PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        alarm_type TEXT NOT NULL,
+        message TEXT NOT NULL,
+        acknowledged INTEGER DEFAULT 0,
+        chamber TEXT NOT NULL DEFAULT 'default'
+    );
+    CREATE TABLE IF NOT EXISTS replication_cursors (
+        table_name TEXT PRIMARY KEY,
+        last_id INTEGER NOT NULL,
+        updated TEXT NOT NULL
+    );
+'''
+
+_UPSERT_CURSOR = '''
+    INSERT INTO replication_cursors (table_name, last_id, updated) VALUES (?, ?, ?)
+    ON CONFLICT (table_name) DO UPDATE SET
+        last_id = MAX(last_id, excluded.last_id),
+        updated = excluded.updated
+'''
+
+
+class ReplicaStore:
+    """
+    Speichert die replizierten Tabellen jeder Box in ``directory/<box>.db``
+    
+    Ein Stapel (Zeilen mehrerer Tabellen) wird zusammen mit den Cursorn in
+    einer Transaktion übernommen; die Antwort an die Box folgt erst nach dem
+    Commit. Zeilen gleicher ID werden überschrieben, wiederholte Stapel
+    nach einem Verbindungsabbruch sind daher unschädlich. Stapel derselben
+    Box werden nacheinander geschrieben, verschiedene Boxen parallel.
+    """
+    
+    def __init__(self, directory: str = "data/replicas"):
+        """
+        Args:
+            directory: Verzeichnis für die Kopien der Boxen
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._connections: Dict[str, sqlite3.Connection] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_config(cls, receiver_config: dict) -> 'ReplicaStore':
+        """
+        Erstellt den Speicher aus dem Abschnitt 'replication.receiver' der Konfiguration
+        """
+        return cls(directory=receiver_config.get('directory', 'data/replicas'))
+    
+    def path(self, box: str) -> Path:
+        return self.directory / f"{box}.db"
+    
+    def _box_lock(self, box: str) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(box, threading.Lock())
+    
+    def _connection(self, box: str) -> sqlite3.Connection:
+        """
+        Verbindung zur Kopie einer Box (nur unter der Sperre der Box verwenden)
+        """
+        conn = self._connections.get(box)
+        if conn is None:
+            conn = sqlite3.connect(self.path(box), check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(_SCHEMA)
+            self._connections[box] = conn
+        return conn
+    
+    def apply(self, box: str, batch: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Übernimmt einen Stapel und schreibt die Cursor fort
+        
+        Args:
+            box: Kennung der Box
+            batch: Je Tabelle ``(Spalten, Zeilen)``; Spalten enthalten ``id``
+        
+        Returns:
+            Cursor aller Tabellen nach dem Commit
+        
+        Raises:
+            ValueError: Unbekannte Tabelle, Spalte oder ungültige Zeilen
+        """
+        for table, (columns, _) in batch.items():
+            allowed = REPLICA_TABLES.get(table)
+            if allowed is None:
+                raise ValueError(f"Unbekannte Tabelle '{table}'")
+            if 'id' not in columns or not set(columns) <= set(allowed) or len(set(columns)) != len(columns):
+                raise ValueError(f"Ungültige Spalten für '{table}': {columns}")
+        
+        updated = datetime.now().isoformat()
+        with self._box_lock(box):
+            conn = self._connection(box)
+            try:
+                with _commit_seconds.time(), conn:
+                    for table, (columns, rows) in batch.items():
+                        if not rows:
+                            continue
+                        conn.executemany(
+                            f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+                            f"VALUES ({', '.join('?' * len(columns))})",
+                            rows
+                        )
+                        last_id = max(int(row[columns.index('id')]) for row in rows)
+                        conn.execute(_UPSERT_CURSOR, (table, last_id, updated))
+            except (sqlite3.IntegrityError, sqlite3.InterfaceError, TypeError) as e:
+                # Stapel verworfen (Rollback), z.B. fehlende Pflichtspalte
+                raise ValueError(f"Zeilen für die Kopie ungültig: {e}")
+            for table, (_, rows) in batch.items():
+                _applied_rows.labels(table).inc(len(rows))
+            return self._cursors(conn)
+    
+    @staticmethod
+    def _cursors(conn: sqlite3.Connection) -> Dict[str, int]:
+        cursors = dict.fromkeys(REPLICA_TABLES, 0)
+        cursors.update(conn.execute('SELECT table_name, last_id FROM replication_cursors'))
+        return cursors
+    
+    def cursors(self, box: str) -> Dict[str, int]:
+        """
+        Höchste übernommene ID je Tabelle (0 für unbekannte Boxen)
+        """
+        if not self.path(box).exists():
+            return dict.fromkeys(REPLICA_TABLES, 0)
+        with self._box_lock(box):
+            return self._cursors(self._connection(box))
+    
+    def boxes(self) -> List[Dict[str, Any]]:
+        """
+        Alle Boxen mit Cursorn, Zeitpunkt des letzten Stapels und Dateigröße
+        """
+        result = []
+        for path in sorted(self.directory.glob('*.db')):
+            box = path.stem
+            with self._box_lock(box):
+                conn = self._connection(box)
+                last = conn.execute('SELECT MAX(updated) FROM replication_cursors').fetchone()[0]
+                result.append({
+                    'box': box,
+                    'cursors': self._cursors(conn),
+                    'last_batch': last,
+                    'size': path.stat().st_size
+                })
+        return result
+    
+    def close(self):
+        """
+        Schließt die Verbindungen aller Boxen
+        """
+        for box in list(self._connections):
+            with self._box_lock(box):
+                conn = self._connections.pop(box, None)
+                if conn is not None:
+                    conn.close()
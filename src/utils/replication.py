@@ -0,0 +1,359 @@
+"""
+Fortlaufende Replikation der Datenbank an einen Empfänger (Änderungsstrom)
+
+Der Agent folgt ``sensor_data``, ``actuator_status`` und ``alarms`` über
+je einen Zeilen-ID-Cursor und überträgt neue Zeilen gebündelt und
+gzip-komprimiert an ``POST /api/replication/<box>`` (Empfänger:
+``src/replica.py``).
+"""
+
+import gzip
+import json
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .data_logger import DataLogger, EVENT_COLUMNS
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Replizierte Tabellen (Reihenfolge im Stapel: seltene Ereignisse zuerst)
+TABLES = ('alarms', 'actuator_status', 'sensor_data')
+
+SAMPLE_COLUMNS = ('id', 'timestamp', 'sensor_name', 'value', 'unit', 'chamber')
+
+_replicated_rows = metrics.counter(
+    'mgb_replication_rows_total', 'An den Empfänger replizierte Zeilen', ('table',))
+_replicated_bytes = metrics.counter(
+    'mgb_replication_bytes_total', 'Übertragene Bytes der Replikation (komprimiert)')
+_replication_failures = metrics.counter(
+    'mgb_replication_failures_total', 'Fehlgeschlagene Übertragungen der Replikation', ('reason',))
+_replication_seconds = metrics.histogram(
+    'mgb_replication_seconds', 'Dauer einer Übertragung an den Empfänger (inkl. Commit)')
+
+# Kleinste Stapelgröße, auf die bei einem langsamen Empfänger reduziert wird
+_MIN_BATCH_SIZE = 100
+
+
+class _RetryLater(Exception):
+    """
+    Übertragung nicht möglich, erneuter Versuch nach ``delay`` Sekunden
+    """
+    
+    def __init__(self, message: str, delay: Optional[float] = None):
+        super().__init__(message)
+        self.delay = delay
+
+
+class ReplicationAgent:
+    """
+    Repliziert neue Zeilen aller Tabellen an einen HTTP-Empfänger
+    
+    Je Tabelle gilt ein Cursor (höchste vom Empfänger bestätigte Zeilen-ID);
+    die Cursor liegen gemeinsam in ``cursor_path`` und werden erst nach der
+    Bestätigung fortgeschrieben. Ein abgebrochener Stapel wird wiederholt,
+    der Empfänger überschreibt Zeilen gleicher ID. Ohne Cursor-Datei wird
+    der Stand beim Empfänger erfragt.
+    
+    Nach einem Ausfall holt der Agent den Rückstand mit vollen Stapeln auf,
+    überträgt dabei aber höchstens ``max_rate`` Bytes je Sekunde (gemessen
+    an den komprimierten Stapeln), damit die Uplink-Verbindung der Box frei
+    bleibt. Gegendruck und Fehlerbehandlung wie beim Flotten-Upload:
+    ``Retry-After`` bei 503/429, halbe Stapel bei Zeitüberschreitung oder
+    413, sonst exponentiell wachsende Wartezeiten mit Zufallsanteil.
+    
+    Nur neue Zeilen werden repliziert; eine spätere Quittierung eines
+    bereits übertragenen Alarms erreicht den Empfänger nicht.
+    """
+    
+    def __init__(self, data_logger: DataLogger, url: str, box_id: str,
+                 cursor_path: str = "data/replication_cursor.json",
+                 batch_size: int = 5000,
+                 interval: float = 10.0,
+                 max_rate: float = 65536.0,
+                 timeout: float = 30.0,
+                 max_backoff: float = 600.0,
+                 token: str = '',
+                 compress_level: int = 6):
+        """
+        Args:
+            data_logger: DataLogger der Box
+            url: Basis-URL des Empfängers (z.B. http://backup:5200)
+            box_id: Kennung der Box
+            cursor_path: Datei für die Cursor aller Tabellen
+            batch_size: Höchstzahl Zeilen je Stapel (über alle Tabellen)
+            interval: Sekunden zwischen Übertragungen, wenn die Box aufgeholt hat
+            max_rate: Höchste mittlere Übertragungsrate in Bytes/s (0 = unbegrenzt)
+            timeout: Sekunden bis zum Abbruch einer Übertragung
+            max_backoff: Höchste Wartezeit nach Fehlern in Sekunden
+            token: Zugangsschlüssel des Empfängers (optional)
+            compress_level: gzip-Stufe (1 = schnell, 9 = klein)
+        """
+        self.data_logger = data_logger
+        self.url = url.rstrip('/')
+        self.box_id = box_id
+        self.cursor_path = Path(cursor_path)
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_rate = max_rate
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self.token = token
+        self.compress_level = compress_level
+        
+        self.cursors: Optional[Dict[str, int]] = None
+        self._batch_limit = batch_size
+        self._failures = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        
+        lag = metrics.gauge('mgb_replication_lag_rows', 'Noch nicht replizierte Zeilen', ('table',))
+        for table in TABLES:
+            lag.labels(table).set_function(lambda table=table: self.lag().get(table, 0))
+    
+    @classmethod
+    def from_config(cls, agent_config: Dict[str, Any], data_logger: DataLogger) -> Optional['ReplicationAgent']:
+        """
+        Erstellt den Agenten aus ``replication.agent``
+        
+        Returns:
+            ReplicationAgent oder None, wenn nicht aktiviert
+        """
+        if not agent_config or not agent_config.get('enabled', False):
+            return None
+        return cls(
+            data_logger,
+            url=agent_config['url'],
+            box_id=agent_config.get('box_id') or socket.gethostname(),
+            cursor_path=agent_config.get('cursor_path', 'data/replication_cursor.json'),
+            batch_size=agent_config.get('batch_size', 5000),
+            interval=agent_config.get('interval', 10.0),
+            max_rate=agent_config.get('max_rate', 65536.0),
+            timeout=agent_config.get('timeout', 30.0),
+            max_backoff=agent_config.get('max_backoff', 600.0),
+            token=agent_config.get('token', ''),
+            compress_level=agent_config.get('compress_level', 6)
+        )
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+    
+    def start(self):
+        """
+        Startet die fortlaufende Replikation
+        """
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='mgb-replication', daemon=True)
+        self._thread.start()
+        logger.info(f"Replikation gestartet (Box: {self.box_id}, Empfänger: {self.url})")
+    
+    def stop(self):
+        """
+        Beendet die Replikation (eine laufende Übertragung wird höchstens ``timeout`` abgewartet)
+        """
+        if not self.running:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=self.timeout + 1)
+        self._thread = None
+    
+    def _run(self):
+        delay = 0.0
+        while not self._stop_event.wait(delay):
+            limit = self._batch_limit
+            try:
+                begin = time.monotonic()
+                sent, size = self.replicate_once()
+                self._failures = 0
+                # Rückstand ohne Intervall aufholen, aber nicht schneller als max_rate
+                delay = self._pace(size, time.monotonic() - begin) if sent >= limit else self.interval
+            except _RetryLater as e:
+                self._failures += 1
+                delay = e.delay if e.delay is not None else self._backoff()
+                logger.warning(f"Replikation verschoben um {delay:.0f} s: {e}")
+            except Exception as e:
+                self._failures += 1
+                delay = self._backoff()
+                logger.error(f"Replikation fehlgeschlagen, nächster Versuch in {delay:.0f} s: {e}")
+    
+    def _pace(self, size: int, elapsed: float) -> float:
+        """
+        Wartezeit nach einem Stapel von ``size`` Bytes, damit im Mittel höchstens ``max_rate`` gilt
+        """
+        if self.max_rate <= 0:
+            return 0.0
+        return max(0.0, size / self.max_rate - elapsed)
+    
+    def _backoff(self) -> float:
+        # Exponentiell ab dem Intervall, mit Zufallsanteil
+        delay = min(self.max_backoff, min(self.interval, 5.0) * 2 ** (self._failures - 1))
+        return delay * random.uniform(0.5, 1.0)
+    
+    def _collect(self, cursors: Dict[str, int]) -> Dict[str, List[list]]:
+        """
+        Neue Zeilen je Tabelle ab den Cursorn, zusammen höchstens ``_batch_limit``
+        """
+        batch = {}
+        remaining = self._batch_limit
+        for table in TABLES:
+            if remaining <= 0:
+                break
+            if table == 'sensor_data':
+                rows = self.data_logger.get_samples_after(cursors[table], remaining)
+                columns = SAMPLE_COLUMNS
+            else:
+                rows = self.data_logger.get_events_after(table, cursors[table], remaining)
+                columns = EVENT_COLUMNS[table]
+            if rows:
+                batch[table] = [[row[column] for column in columns] for row in rows]
+                remaining -= len(rows)
+        return batch
+    
+    def replicate_once(self) -> tuple:
+        """
+        Überträgt den nächsten Stapel ab den Cursorn
+        
+        Returns:
+            Tupel (Anzahl Zeilen, komprimierte Bytes), (0, 0) ohne neue Zeilen
+        
+        Raises:
+            _RetryLater: Empfänger ausgelastet oder nicht erreichbar
+        """
+        if self.cursors is None:
+            self.cursors = self._load_cursors()
+        
+        batch = self._collect(self.cursors)
+        if not batch:
+            return 0, 0
+        
+        # Eine NDJSON-Zeile je Tabelle: Spaltennamen und Zeilen als Listen
+        body = gzip.compress(b''.join(
+            json.dumps({
+                'table': table,
+                'columns': SAMPLE_COLUMNS if table == 'sensor_data' else EVENT_COLUMNS[table],
+                'rows': rows
+            }, separators=(',', ':')).encode('utf-8') + b'\n'
+            for table, rows in batch.items()
+        ), compresslevel=self.compress_level)
+        self._post(body)
+        
+        cursors = dict(self.cursors)
+        for table, rows in batch.items():
+            cursors[table] = rows[-1][0]
+            _replicated_rows.labels(table).inc(len(rows))
+        self._save_cursors(cursors)
+        _replicated_bytes.inc(len(body))
+        
+        # Nach Verkleinerung schrittweise wieder vergrößern
+        if self._batch_limit < self.batch_size:
+            self._batch_limit = min(self.batch_size, self._batch_limit * 2)
+        count = sum(len(rows) for rows in batch.values())
+        logger.debug(f"{count} Zeilen repliziert ({len(body)} Bytes, Cursor {cursors})")
+        return count, len(body)
+    
+    def _request(self, path: str, data: Optional[bytes] = None,
+                 headers: Optional[Dict[str, str]] = None) -> urllib.request.Request:
+        request = urllib.request.Request(f"{self.url}{path}", data=data, headers=headers or {})
+        if self.token:
+            request.add_header('Authorization', f"Bearer {self.token}")
+        return request
+    
+    def _post(self, body: bytes) -> Dict[str, Any]:
+        """
+        Sendet einen Stapel und liefert die Antwort des Empfängers
+        """
+        request = self._request(f"/api/replication/{self.box_id}", body, {
+            'Content-Type': 'application/x-ndjson',
+            'Content-Encoding': 'gzip'
+        })
+        try:
+            with _replication_seconds.time(), urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            if e.code in (429, 503):
+                _replication_failures.labels('busy').inc()
+                raise _RetryLater(f"Empfänger ausgelastet (HTTP {e.code})", self._retry_after(e))
+            if e.code == 413:
+                _replication_failures.labels('too_large').inc()
+                self._shrink_batch()
+                raise _RetryLater("Stapel zu groß", 0.0)
+            _replication_failures.labels('http').inc()
+            raise RuntimeError(f"Empfänger antwortet mit HTTP {e.code}: {e.read()[:200]!r}")
+        except (socket.timeout, TimeoutError):
+            _replication_failures.labels('timeout').inc()
+            self._shrink_batch()
+            raise _RetryLater("Zeitüberschreitung")
+        except urllib.error.URLError as e:
+            _replication_failures.labels('network').inc()
+            if isinstance(e.reason, (socket.timeout, TimeoutError)):
+                self._shrink_batch()
+            raise _RetryLater(f"Empfänger nicht erreichbar: {e.reason}")
+    
+    def _retry_after(self, error: urllib.error.HTTPError) -> Optional[float]:
+        try:
+            delay = float(error.headers.get('Retry-After', ''))
+        except ValueError:
+            return None
+        return min(self.max_backoff, delay * random.uniform(1.0, 1.5))
+    
+    def _shrink_batch(self):
+        self._batch_limit = max(_MIN_BATCH_SIZE, self._batch_limit // 2)
+    
+    def _load_cursors(self) -> Dict[str, int]:
+        """
+        Lädt die Cursor aus der Datei oder erfragt sie beim Empfänger
+        """
+        try:
+            with open(self.cursor_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('box') == self.box_id:
+                return {table: int(state['cursors'].get(table, 0)) for table in TABLES}
+            logger.warning(f"Cursor-Datei gehört zu Box '{state.get('box')}', frage den Empfänger")
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Cursor-Datei ungültig ({e}), frage den Empfänger")
+        
+        try:
+            with urllib.request.urlopen(self._request(f"/api/replication/{self.box_id}/cursors"),
+                                        timeout=self.timeout) as response:
+                remote = json.loads(response.read().decode('utf-8'))['cursors']
+            cursors = {table: int(remote.get(table, 0)) for table in TABLES}
+        except (urllib.error.URLError, OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            raise _RetryLater(f"Cursor nicht ermittelbar: {e}")
+        logger.info(f"Replikation setzt beim Stand des Empfängers fort ({cursors})")
+        return cursors
+    
+    def _save_cursors(self, cursors: Dict[str, int]):
+        """
+        Schreibt die Cursor atomar (temporäre Datei, dann umbenennen)
+        """
+        self.cursor_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.cursor_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'box': self.box_id, 'cursors': cursors, 'updated': time.time()}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.cursor_path)
+        self.cursors = cursors
+    
+    def lag(self) -> Dict[str, int]:
+        """
+        Noch nicht replizierte Zeilen je Tabelle (Abstand zur höchsten ID)
+        """
+        if self.cursors is None:
+            return {}
+        newest = {table: self.data_logger.last_event_id(table) for table in EVENT_COLUMNS}
+        newest['sensor_data'] = self.data_logger.last_sample_id()
+        return {table: max(0, newest[table] - self.cursors[table]) for table in TABLES}
@@ -0,0 +1,273 @@
+"""
+Komprimierte Archivblöcke für Messwertreihen (Gorilla-Kodierung)
+
+Ein Block enthält die Messwerte eines Sensors (einer Kammer) aus einem
+Zeitraum als drei Spalten:
+
+- IDs und Zeitstempel (Millisekunden) als Differenz der Differenzen: bei
+  regelmäßigem Messintervall meist 1 Bit je Wert,
+- Werte als XOR mit dem Vorgänger: unveränderte Werte kosten 1 Bit, sonst
+  nur die signifikanten Bits innerhalb des zuletzt genutzten Fensters.
+
+Zeitstempel werden auf Millisekunden gerundet, Werte bleiben bitgenau.
+"""
+
+import logging
+import struct
+import threading
+from array import array
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Formatversion, Anzahl, erste ID, erster Zeitstempel (ms), erster Wert
+_HEADER = struct.Struct('<BIqqd')
+_VERSION = 1
+
+# Bereiche der Differenz-Kodierung: (Präfix, Bits für den Wert)
+_DOD_BUCKETS = (('10', 7), ('110', 9), ('1110', 12))
+_DOD_FALLBACK = ('1111', 64)
+
+_MASK64 = (1 << 64) - 1
+
+_pack_double = struct.Struct('<d').pack
+_unpack_double = struct.Struct('<d').unpack
+_pack_uint = struct.Struct('<Q').pack
+_unpack_uint = struct.Struct('<Q').unpack
+
+
+def _float_bits(value: float) -> int:
+    return _unpack_uint(_pack_double(value))[0]
+
+
+def _bits_float(bits: int) -> float:
+    return _unpack_double(_pack_uint(bits))[0]
+
+
+def timestamp_ms(timestamp: str) -> int:
+    """
+    ISO-Zeitstempel (lokale Zeit wie in sensor_data) in Millisekunden seit 1970
+    """
+    return round(datetime.fromisoformat(timestamp).timestamp() * 1000)
+
+
+def ms_isoformat(ms: int) -> str:
+    """
+    Millisekunden seit 1970 als ISO-Zeitstempel (lokale Zeit)
+    """
+    return datetime.fromtimestamp(ms / 1000).isoformat()
+
+
+def _encode_dod(bits: List[str], dod: int):
+    if dod == 0:
+        bits.append('0')
+        return
+    for prefix, width in _DOD_BUCKETS:
+        limit = 1 << (width - 1)
+        if -limit <= dod < limit:
+            bits.append(prefix)
+            bits.append(format(dod & ((1 << width) - 1), f'0{width}b'))
+            return
+    prefix, width = _DOD_FALLBACK
+    bits.append(prefix)
+    bits.append(format(dod & _MASK64, '064b'))
+
+
+def encode_block(ids: Sequence[int], timestamps: Sequence[int], values: Sequence[float]) -> bytes:
+    """
+    Kodiert eine Messwertreihe als Block
+    
+    Args:
+        ids: Zeilen-IDs (aufsteigend)
+        timestamps: Zeitstempel in Millisekunden
+        values: Messwerte
+    
+    Returns:
+        Block als Bytes
+    """
+    count = len(ids)
+    if count == 0 or count != len(timestamps) or count != len(values):
+        raise ValueError("Block benötigt gleich lange, nicht leere Spalten")
+    
+    header = _HEADER.pack(_VERSION, count, ids[0], timestamps[0], values[0])
+    bits: List[str] = []
+    id_delta = ts_delta = 0
+    previous_bits = _float_bits(values[0])
+    window_leading, window_trailing = -1, 0
+    
+    for i in range(1, count):
+        delta = ids[i] - ids[i - 1]
+        _encode_dod(bits, delta - id_delta)
+        id_delta = delta
+        
+        delta = timestamps[i] - timestamps[i - 1]
+        _encode_dod(bits, delta - ts_delta)
+        ts_delta = delta
+        
+        value_bits = _float_bits(values[i])
+        xor = value_bits ^ previous_bits
+        previous_bits = value_bits
+        if xor == 0:
+            bits.append('0')
+            continue
+        leading = min(64 - xor.bit_length(), 31)
+        trailing = (xor & -xor).bit_length() - 1
+        if window_leading >= 0 and leading >= window_leading and trailing >= window_trailing:
+            # Signifikante Bits passen in das bisherige Fenster
+            length = 64 - window_leading - window_trailing
+            bits.append('10')
+            bits.append(format(xor >> window_trailing, f'0{length}b'))
+        else:
+            length = 64 - leading - trailing
+            window_leading, window_trailing = leading, trailing
+            bits.append('11')
+            bits.append(format(leading, '05b'))
+            bits.append(format(length - 1, '06b'))
+            bits.append(format(xor >> trailing, f'0{length}b'))
+    
+    stream = ''.join(bits)
+    if not stream:
+        return header
+    padding = -len(stream) % 8
+    return header + int(stream + '0' * padding, 2).to_bytes((len(stream) + padding) // 8, 'big')
+
+
+def iter_block(data: bytes) -> Iterator[Tuple[int, int, float]]:
+    """
+    Dekodiert einen Block schrittweise
+    
+    Yields:
+        Tupel (ID, Zeitstempel in ms, Wert)
+    """
+    version, count, row_id, ms, value = _HEADER.unpack_from(data)
+    if version != _VERSION:
+        raise ValueError(f"Unbekannte Blockversion {version}")
+    yield row_id, ms, value
+    if count == 1:
+        return
+    
+    payload = data[_HEADER.size:]
+    stream = format(int.from_bytes(payload, 'big'), f'0{len(payload) * 8}b')
+    position = 0
+    
+    def read_dod() -> int:
+        nonlocal position
+        if stream[position] == '0':
+            position += 1
+            return 0
+        for prefix, width in _DOD_BUCKETS + (_DOD_FALLBACK,):
+            if stream.startswith(prefix, position):
+                position += len(prefix)
+                raw = int(stream[position:position + width], 2)
+                position += width
+                return raw - (1 << width) if raw >> (width - 1) else raw
+        raise ValueError("Ungültiger Block")
+    
+    id_delta = ts_delta = 0
+    value_bits = _float_bits(value)
+    window_leading, window_trailing = 0, 0
+    for _ in range(count - 1):
+        id_delta += read_dod()
+        row_id += id_delta
+        ts_delta += read_dod()
+        ms += ts_delta
+        
+        if stream[position] == '1':
+            if stream[position + 1] == '1':
+                window_leading = int(stream[position + 2:position + 7], 2)
+                length = int(stream[position + 7:position + 13], 2) + 1
+                window_trailing = 64 - window_leading - length
+                position += 13
+            else:
+                length = 64 - window_leading - window_trailing
+                position += 2
+            value_bits ^= int(stream[position:position + length], 2) << window_trailing
+            position += length
+            value = _bits_float(value_bits)
+        else:
+            position += 1
+        yield row_id, ms, value
+
+
+def decode_block(data: bytes) -> Dict[str, array]:
+    """
+    Dekodiert einen Block in Spalten
+    
+    Returns:
+        Dictionary mit ``ids`` (array 'q'), ``timestamps`` (ms, array 'q')
+        und ``values`` (array 'd')
+    """
+    ids, timestamps, values = array('q'), array('q'), array('d')
+    for row_id, ms, value in iter_block(data):
+        ids.append(row_id)
+        timestamps.append(ms)
+        values.append(value)
+    return {'ids': ids, 'timestamps': timestamps, 'values': values}
+
+
+class ArchiveSealer:
+    """
+    Versiegelt in festen Abständen abgeschlossene Zeiträume von sensor_data
+    zu Archivblöcken (eigener Thread, kurze Transaktionen)
+    """
+    
+    def __init__(self, data_logger, seal_after_hours: float = 48.0, interval: float = 3600.0):
+        """
+        Args:
+            data_logger: DataLogger, dessen Messwerte archiviert werden
+            seal_after_hours: Mindestalter der Messwerte in Stunden
+            interval: Sekunden zwischen zwei Durchgängen
+        """
+        self.data_logger = data_logger
+        self.seal_after_hours = seal_after_hours
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @classmethod
+    def from_config(cls, archive_config: dict, data_logger) -> Optional['ArchiveSealer']:
+        """
+        Erstellt den Archivierer aus ``database.archive``
+        
+        Returns:
+            ArchiveSealer oder None, wenn nicht aktiviert
+        """
+        if not archive_config or not archive_config.get('enabled', False):
+            return None
+        return cls(
+            data_logger,
+            seal_after_hours=archive_config.get('seal_after_hours', 48.0),
+            interval=archive_config.get('interval', 3600.0)
+        )
+    
+    def start(self):
+        """
+        Startet die periodische Archivierung
+        """
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='mgb-archive', daemon=True)
+        self._thread.start()
+        logger.info(f"Archivierung gestartet (ab {self.seal_after_hours} h, Intervall: {self.interval}s)")
+    
+    def stop(self):
+        """
+        Beendet die Archivierung nach dem laufenden Stapel
+        """
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=30)
+        self._thread = None
+    
+    def _run(self):
+        # Erster Durchgang kurz nach dem Start, danach alle ``interval`` Sekunden
+        delay = min(60.0, self.interval)
+        while not self._stop_event.wait(delay):
+            delay = self.interval
+            try:
+                self.data_logger.seal_archive(self.seal_after_hours, stop=self._stop_event)
+            except Exception as e:
+                logger.error(f"Archivierung fehlgeschlagen: {e}", exc_info=True)
@@ -0,0 +1,411 @@
+"""
+Journal für Messwerte: speicherabgebildete Ringdatei mit festen Datensätzen
+
+Messwerte landen zuerst im Journal (Kopie in die abgebildete Datei,
+``msync`` alle ``sync_interval`` Sekunden) und werden von einem
+Hintergrund-Thread gebündelt in die Datenbank übernommen. Nach einem
+Stromausfall wird das Journal bis zum letzten gültigen Datensatz
+nachgespielt; verloren gehen höchstens die Messwerte seit dem letzten
+``msync``.
+
+Aufbau der Datei:
+
+- zwei Kopfbereiche (abwechselnd geschrieben, der jüngste gültige zählt):
+  Geometrie, übernommene Position, Sensorverzeichnis (JSON), CRC32
+- ``capacity`` Datensätze zu 24 Bytes: Zeitstempel, Wert, Sensor-Nummer,
+  CRC32 über Laufnummer und Inhalt (veraltete Datensätze aus früheren
+  Umläufen sind damit ungültig)
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .metrics import metrics
+from .records import Sample
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b'MGBJ'
+_VERSION = 1
+
+# Kopf: Kennung, Version, Datensatzgröße, Kapazität, Kopfnummer, übernommene Laufnummer, Länge des Verzeichnisses
+_HEADER = struct.Struct('<4sHHIQQI')
+_CRC = struct.Struct('<I')
+_SLOT_SIZE = 8192
+_DATA_OFFSET = 2 * _SLOT_SIZE
+
+# Datensatz: Zeitstempel (Unix), Wert, Sensor-Nummer, reserviert, CRC32
+_PAYLOAD = struct.Struct('<ddHH')
+_RECORD = struct.Struct('<ddHHI')
+_SEQUENCE = struct.Struct('<Q')
+
+# Zeilen je Übernahme in die Datenbank (eine Transaktion je Partition)
+_COMPACT_BATCH = 10000
+
+_journal_records = metrics.counter(
+    'mgb_journal_records_total', 'In das Journal geschriebene Messwerte')
+_journal_overflows = metrics.counter(
+    'mgb_journal_overflows_total', 'Messwerte, die wegen eines vollen Journals direkt geschrieben wurden')
+_journal_compact_seconds = metrics.histogram(
+    'mgb_journal_compact_seconds', 'Dauer einer Übernahme aus dem Journal in die Datenbank')
+
+
+def _record_crc(sequence: int, payload: bytes) -> int:
+    return zlib.crc32(payload, zlib.crc32(_SEQUENCE.pack(sequence)))
+
+
+class SampleJournal:
+    """
+    Absturzsicherer Schreibpfad für Messwerte vor der Datenbank
+    
+    ``append`` ist eine Kopie in die abgebildete Datei (kein Commit, kein
+    Systemaufruf). Die Übernahme in SQLite ist mindestens einmalig: fällt der
+    Strom zwischen Commit und Fortschreiben des Kopfes aus, werden die
+    Messwerte dieser Übernahme beim Nachspielen erneut geschrieben.
+    """
+    
+    def __init__(self, path: str, sink: Callable[[List[tuple]], None],
+                 capacity: int = 65536,
+                 sync_interval: float = 1.0,
+                 compact_interval: float = 10.0):
+        """
+        Args:
+            path: Journaldatei
+            sink: Schreibt Messwertzeilen (Zeitstempel, Sensor, Wert, Einheit, Kammer)
+                in die Datenbank
+            capacity: Anzahl Datensätze (24 Bytes je Datensatz)
+            sync_interval: Sekunden zwischen zwei ``msync`` (höchster Datenverlust)
+            compact_interval: Sekunden zwischen zwei Übernahmen in die Datenbank
+        """
+        self.path = Path(path)
+        self.sink = sink
+        self.capacity = capacity
+        self.sync_interval = sync_interval
+        self.compact_interval = compact_interval
+        
+        self._map: Optional[mmap.mmap] = None
+        self._file = None
+        # Kapazität der vorhandenen Datei (bis zur Anpassung nach dem Nachspielen)
+        self._file_capacity = capacity
+        self._slot = 0
+        self._header_sequence = 0
+        self._head = 0
+        self._compacted = 0
+        self._sensors: List[Tuple[str, str, str]] = []
+        self._sensor_ids: Dict[Tuple[str, str, str], int] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._data_logger = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        
+        metrics.gauge('mgb_journal_pending_records', 'Noch nicht in die Datenbank übernommene Messwerte').set_function(
+            self.pending
+        )
+    
+    @classmethod
+    def from_config(cls, journal_config: dict, data_logger) -> Optional['SampleJournal']:
+        """
+        Erstellt das Journal aus ``database.journal``
+        
+        Returns:
+            SampleJournal oder None, wenn nicht aktiviert
+        """
+        if not journal_config or not journal_config.get('enabled', False):
+            return None
+        journal = cls(
+            journal_config.get('path', 'data/sample_journal.bin'),
+            data_logger.log_rows,
+            capacity=journal_config.get('capacity', 65536),
+            sync_interval=journal_config.get('sync_interval', 1.0),
+            compact_interval=journal_config.get('compact_interval', 10.0)
+        )
+        journal._data_logger = data_logger
+        return journal
+    
+    def pending(self) -> int:
+        """
+        Anzahl Messwerte im Journal, die noch nicht in der Datenbank sind
+        """
+        return self._head - self._compacted
+    
+    # --- Datei ----------------------------------------------------------
+    
+    def open(self) -> int:
+        """
+        Öffnet das Journal und ermittelt die nachzuspielenden Datensätze
+        
+        Returns:
+            Anzahl noch nicht übernommener Datensätze
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists() and self._map_file() and self._read_header():
+            self._head = self._scan(self._compacted)
+            if self._head > self._compacted:
+                logger.info(f"Journal: {self._head - self._compacted} Messwerte nachzuspielen")
+            return self._head - self._compacted
+        
+        if self.path.exists():
+            corrupt = self.path.with_name(f"{self.path.name}.corrupt")
+            os.replace(self.path, corrupt)
+            logger.warning(f"Journal ungültig, neu angelegt (alte Datei: {corrupt})")
+        self._create()
+        return 0
+    
+    def _map_file(self) -> bool:
+        self._close_map()
+        self._file = open(self.path, 'r+b')
+        size = os.fstat(self._file.fileno()).st_size
+        if size < _DATA_OFFSET:
+            self._file.close()
+            self._file = None
+            return False
+        self._map = mmap.mmap(self._file.fileno(), size)
+        return True
+    
+    def _create(self):
+        """
+        Legt die Journaldatei vorab in voller Größe an
+        """
+        self._close_map()
+        size = _DATA_OFFSET + self.capacity * _RECORD.size
+        with open(self.path, 'wb') as f:
+            try:
+                # Blöcke sofort belegen (keine Fragmentierung, kein ENOSPC beim Schreiben)
+                os.posix_fallocate(f.fileno(), 0, size)
+            except (AttributeError, OSError):
+                f.truncate(size)
+        self._map_file()
+        self._file_capacity = self.capacity
+        self._head = self._compacted = 0
+        self._header_sequence = 0
+        self._sensors, self._sensor_ids = [], {}
+        self._write_header()
+        self._write_header()
+    
+    def _read_header(self) -> bool:
+        """
+        Liest den jüngsten gültigen Kopfbereich
+        """
+        best = None
+        for slot in (0, 1):
+            offset = slot * _SLOT_SIZE
+            crc, = _CRC.unpack_from(self._map, offset)
+            magic, version, record_size, capacity, sequence, compacted, length = _HEADER.unpack_from(
+                self._map, offset + _CRC.size)
+            if magic != _MAGIC or version != _VERSION or record_size != _RECORD.size:
+                continue
+            if length > _SLOT_SIZE - _CRC.size - _HEADER.size:
+                continue
+            body = self._map[offset + _CRC.size:offset + _CRC.size + _HEADER.size + length]
+            if zlib.crc32(body) != crc:
+                continue
+            if len(self._map) != _DATA_OFFSET + capacity * _RECORD.size:
+                continue
+            if best is None or sequence > best[0]:
+                best = (sequence, slot, capacity, compacted, body[_HEADER.size:])
+        if best is None:
+            return False
+        
+        self._header_sequence, self._slot, capacity, self._compacted, directory = best
+        if capacity != self.capacity:
+            logger.info(f"Journal: Kapazität {capacity} statt {self.capacity}, wird nach dem Nachspielen angepasst")
+        self._file_capacity = capacity
+        self._sensors = [tuple(entry) for entry in json.loads(directory.decode('utf-8'))]
+        self._sensor_ids = {key: index for index, key in enumerate(self._sensors)}
+        return True
+    
+    def _write_header(self):
+        """
+        Schreibt den Kopf in den älteren Bereich und synchronisiert ihn (Aufrufer hält ggf. _lock)
+        """
+        directory = json.dumps(self._sensors, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        if len(directory) > _SLOT_SIZE - _CRC.size - _HEADER.size:
+            raise ValueError("Sensorverzeichnis des Journals zu groß")
+        self._header_sequence += 1
+        self._slot = 1 - self._slot
+        body = _HEADER.pack(_MAGIC, _VERSION, _RECORD.size, self._file_capacity,
+                            self._header_sequence, self._compacted, len(directory)) + directory
+        offset = self._slot * _SLOT_SIZE
+        self._map[offset:offset + _CRC.size + len(body)] = _CRC.pack(zlib.crc32(body)) + body
+        # Datensätze vor dem Kopf, der auf sie verweist
+        self._map.flush()
+        self._dirty = False
+    
+    def _record_offset(self, sequence: int) -> int:
+        return _DATA_OFFSET + (sequence % self._file_capacity) * _RECORD.size
+    
+    def _scan(self, sequence: int) -> int:
+        """
+        Sucht ab ``sequence`` das Ende der gültigen Datensätze
+        """
+        end = sequence + self._file_capacity
+        while sequence < end:
+            offset = self._record_offset(sequence)
+            timestamp, value, sensor_id, _, crc = _RECORD.unpack_from(self._map, offset)
+            if crc != _record_crc(sequence, self._map[offset:offset + _PAYLOAD.size]):
+                break
+            if sensor_id >= len(self._sensors):
+                break
+            sequence += 1
+        return sequence
+    
+    def _close_map(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    # --- Schreiben ------------------------------------------------------
+    
+    def append(self, batches: Iterable[Tuple[str, Iterable[Sample]]]) -> bool:
+        """
+        Schreibt die Messwerte mehrerer Kammern in das Journal
+        
+        Args:
+            batches: Paare (Kammer, Samples)
+        
+        Returns:
+            False, wenn das Journal voll oder geschlossen ist (nichts geschrieben)
+        """
+        batches = [(chamber, samples if isinstance(samples, (list, tuple)) else list(samples))
+                   for chamber, samples in batches]
+        count = sum(len(samples) for _, samples in batches)
+        with self._lock:
+            if self._map is None:
+                return False
+            if self._head + count - self._compacted > self._file_capacity:
+                _journal_overflows.inc(count)
+                return False
+            
+            sequence = self._head
+            for chamber, samples in batches:
+                for sample in samples:
+                    key = (sample.sensor, sample.unit, chamber)
+                    sensor_id = self._sensor_ids.get(key)
+                    if sensor_id is None:
+                        sensor_id = self._register(key)
+                    payload = _PAYLOAD.pack(sample.timestamp, sample.value, sensor_id, 0)
+                    _RECORD.pack_into(self._map, self._record_offset(sequence),
+                                      sample.timestamp, sample.value, sensor_id, 0,
+                                      _record_crc(sequence, payload))
+                    sequence += 1
+            self._head = sequence
+            self._dirty = True
+        _journal_records.inc(count)
+        return True
+    
+    def _register(self, key: Tuple[str, str, str]) -> int:
+        """
+        Nimmt einen Sensor in das Verzeichnis auf (sofort synchronisiert)
+        """
+        self._sensors.append(key)
+        self._sensor_ids[key] = len(self._sensors) - 1
+        self._write_header()
+        return len(self._sensors) - 1
+    
+    def sync(self):
+        """
+        Synchronisiert geschriebene Datensätze auf den Datenträger (msync)
+        """
+        with self._lock:
+            if self._map is not None and self._dirty:
+                self._map.flush()
+                self._dirty = False
+    
+    # --- Übernahme ------------------------------------------------------
+    
+    def compact(self) -> int:
+        """
+        Übernimmt alle Datensätze bis zur aktuellen Position in die Datenbank
+        
+        Returns:
+            Anzahl übernommener Messwerte
+        """
+        with self._compact_lock:
+            with self._lock:
+                if self._map is None:
+                    return 0
+                start, end = self._compacted, self._head
+                sensors = list(self._sensors)
+            if start == end:
+                return 0
+            
+            with _journal_compact_seconds.time():
+                for offset in range(start, end, _COMPACT_BATCH):
+                    rows = []
+                    for sequence in range(offset, min(end, offset + _COMPACT_BATCH)):
+                        timestamp, value, sensor_id, _, _ = _RECORD.unpack_from(
+                            self._map, self._record_offset(sequence))
+                        sensor, unit, chamber = sensors[sensor_id]
+                        rows.append((datetime.fromtimestamp(timestamp).isoformat(), sensor, value, unit, chamber))
+                    self.sink(rows)
+                    with self._lock:
+                        self._compacted = offset + len(rows)
+                        self._write_header()
+            return end - start
+    
+    # --- Lebenszyklus ---------------------------------------------------
+    
+    def start(self):
+        """
+        Spielt das Journal nach, leitet die Messwerte des DataLoggers um und
+        startet Synchronisation und Übernahme
+        """
+        if self._thread is not None:
+            return
+        if self.open():
+            replayed = self.compact()
+            logger.info(f"Journal: {replayed} Messwerte nachgespielt")
+        if self._file_capacity != self.capacity:
+            with self._lock:
+                self._create()
+        
+        if self._data_logger is not None:
+            self._data_logger.journal = self
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='mgb-journal', daemon=True)
+        self._thread.start()
+        logger.info(f"Journal gestartet ({self.path}, {self.capacity} Datensätze, "
+                    f"msync alle {self.sync_interval}s)")
+    
+    def stop(self):
+        """
+        Übernimmt die restlichen Messwerte und schließt das Journal
+        """
+        if self._thread is None:
+            return
+        if self._data_logger is not None:
+            self._data_logger.journal = None
+        self._stop_event.set()
+        self._thread.join(timeout=30)
+        self._thread = None
+        try:
+            self.compact()
+        finally:
+            with self._lock:
+                self._close_map()
+    
+    def _run(self):
+        next_compact = time.monotonic() + self.compact_interval
+        while not self._stop_event.wait(self.sync_interval):
+            try:
+                self.sync()
+                # Früher übernehmen, wenn das Journal halb voll ist
+                if time.monotonic() >= next_compact or self.pending() > self.capacity // 2:
+                    next_compact = time.monotonic() + self.compact_interval
+                    self.compact()
+            except Exception as e:
+                logger.error(f"Journal-Übernahme fehlgeschlagen: {e}", exc_info=True)
@@ -0,0 +1,150 @@
+"""
+Zeitgesteuerte Ausführung mit einem Thread und einem Heap von Fälligkeiten
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledCall:
+    """
+    Geplanter Aufruf, der über cancel() zurückgezogen werden kann
+    """
+    
+    __slots__ = ('deadline', 'seq', 'callback', 'cancelled')
+    
+    def __init__(self, deadline: float, seq: int, callback: Callable[[], None]):
+        self.deadline = deadline
+        self.seq = seq
+        self.callback = callback
+        self.cancelled = False
+    
+    def __lt__(self, other: 'ScheduledCall') -> bool:
+        return (self.deadline, self.seq) < (other.deadline, other.seq)
+    
+    def cancel(self):
+        """
+        Zieht den Aufruf zurück (wird beim Erreichen der Fälligkeit verworfen)
+        """
+        self.cancelled = True
+
+
+class DeadlineScheduler:
+    """
+    Führt Aufrufe zu monotonen Zeitpunkten aus
+    
+    Alle Fälligkeiten liegen in einem Heap, ein einziger Thread schläft bis
+    zur nächsten Fälligkeit. Ohne anstehende Aufrufe wartet er ohne Timeout,
+    im Leerlauf entsteht daher keine CPU-Last. Die Callbacks laufen im
+    Scheduler-Thread und müssen kurz bleiben.
+    """
+    
+    def __init__(self, name: str = 'mgb-scheduler'):
+        """
+        Initialisiert den Scheduler
+        
+        Args:
+            name: Name des Scheduler-Threads
+        """
+        self.name = name
+        self._heap: List[ScheduledCall] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+    
+    def start(self):
+        """
+        Startet den Scheduler-Thread (falls noch nicht gestartet)
+        """
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = 2.0):
+        """
+        Beendet den Scheduler-Thread, noch anstehende Aufrufe verfallen
+        
+        Args:
+            timeout: Maximale Wartezeit auf den Thread in Sekunden
+        """
+        with self._condition:
+            self._running = False
+            self._heap.clear()
+            self._condition.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+    
+    def call_at(self, deadline: float, callback: Callable[[], None]) -> ScheduledCall:
+        """
+        Plant einen Aufruf zu einem monotonen Zeitpunkt
+        
+        Args:
+            deadline: Zeitpunkt auf der time.monotonic()-Skala
+            callback: Aufzurufende Funktion ohne Argumente
+        
+        Returns:
+            ScheduledCall zum Zurückziehen
+        """
+        call = ScheduledCall(deadline, next(self._counter), callback)
+        with self._condition:
+            heapq.heappush(self._heap, call)
+            # Thread nur wecken, wenn sich die nächste Fälligkeit vorverlegt
+            if self._heap[0] is call:
+                self._condition.notify()
+        return call
+    
+    def call_later(self, delay: float, callback: Callable[[], None]) -> ScheduledCall:
+        """
+        Plant einen Aufruf nach einer Verzögerung
+        
+        Args:
+            delay: Verzögerung in Sekunden
+            callback: Aufzurufende Funktion ohne Argumente
+        
+        Returns:
+            ScheduledCall zum Zurückziehen
+        """
+        return self.call_at(time.monotonic() + max(0.0, delay), callback)
+    
+    def pending(self) -> int:
+        """
+        Anzahl anstehender (nicht zurückgezogener) Aufrufe
+        """
+        with self._condition:
+            return sum(1 for call in self._heap if not call.cancelled)
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if not self._running:
+                        return
+                    # Zurückgezogene Aufrufe an der Spitze verwerfen
+                    while self._heap and self._heap[0].cancelled:
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+                    delay = self._heap[0].deadline - time.monotonic()
+                    if delay <= 0:
+                        call = heapq.heappop(self._heap)
+                        break
+                    self._condition.wait(delay)
+            
+            if call.cancelled:
+                continue
+            try:
+                call.callback()
+            except Exception as e:
+                logger.error(f"Fehler in geplantem Aufruf: {e}", exc_info=True)
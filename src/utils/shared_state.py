@@ -0,0 +1,139 @@
+"""
+Gemeinsamer Zustand zwischen Prozessen über ``multiprocessing.shared_memory``
+
+Ein Schreiber (Monitoring-Loop) legt den jeweils aktuellen Zustand als JSON in
+einem Shared-Memory-Segment ab, Leser (Web-Prozess) lesen ihn ohne Sperren.
+Konsistenz über eine Sequenznummer nach dem Seqlock-Verfahren: ungerade
+während des Schreibens, Leser wiederholen, wenn sich die Nummer während des
+Kopierens geändert hat. Eine CRC32 über die Nutzdaten fängt zusätzlich
+umsortierte Speicherzugriffe ab (Python bietet keine Speicherbarrieren).
+"""
+
+import json
+import logging
+import struct
+import time
+import zlib
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Kopf: Sequenznummer, Länge der Nutzdaten, CRC32 der Nutzdaten
+_HEADER = struct.Struct('<QII')
+
+
+class SharedState:
+    """
+    Seqlock-geschütztes JSON-Dokument in einem Shared-Memory-Segment
+    """
+    
+    def __init__(self, memory: shared_memory.SharedMemory, owner: bool = False):
+        self._memory = memory
+        self._buffer = memory.buf
+        self._owner = owner
+        self.capacity = memory.size - _HEADER.size
+        # Schreiber: eigene Sequenznummer; Leser: zuletzt dekodierter Stand
+        self._sequence = 0
+        self._cached: Optional[Tuple[int, Dict[str, Any]]] = None
+    
+    @classmethod
+    def create(cls, size: int = 64 * 1024, name: Optional[str] = None) -> 'SharedState':
+        """
+        Legt ein neues Segment an (Schreiber)
+        
+        Args:
+            size: Größe in Bytes inkl. Kopf
+            name: Name des Segments (optional, sonst zufällig)
+        """
+        memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _HEADER.pack_into(memory.buf, 0, 0, 0, 0)
+        return cls(memory, owner=True)
+    
+    @classmethod
+    def attach(cls, name: str) -> 'SharedState':
+        """
+        Öffnet ein bestehendes Segment (Leser)
+        """
+        return cls(shared_memory.SharedMemory(name=name))
+    
+    @property
+    def name(self) -> str:
+        return self._memory.name
+    
+    def publish(self, state: Dict[str, Any]) -> int:
+        """
+        Schreibt einen neuen Zustand (nur ein Schreiber gleichzeitig)
+        
+        Returns:
+            Neue Version (gerade Sequenznummer)
+        
+        Raises:
+            ValueError: Wenn der Zustand nicht in das Segment passt
+        """
+        payload = json.dumps(state, separators=(',', ':')).encode('utf-8')
+        if len(payload) > self.capacity:
+            raise ValueError(f"Zustand zu groß ({len(payload)} > {self.capacity} Bytes)")
+        
+        buffer = self._buffer
+        sequence = self._sequence + 1
+        struct.pack_into('<Q', buffer, 0, sequence)  # ungerade: wird geschrieben
+        buffer[_HEADER.size:_HEADER.size + len(payload)] = payload
+        struct.pack_into('<II', buffer, 8, len(payload), zlib.crc32(payload))
+        sequence += 1
+        struct.pack_into('<Q', buffer, 0, sequence)
+        self._sequence = sequence
+        return sequence
+    
+    def version(self) -> int:
+        """
+        Aktuelle Sequenznummer (ungerade während eines Schreibvorgangs)
+        """
+        return struct.unpack_from('<Q', self._buffer, 0)[0]
+    
+    def read(self, retries: int = 100) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """
+        Liest den aktuellen Zustand
+        
+        Unveränderte Versionen werden nicht erneut dekodiert.
+        
+        Returns:
+            (Version, Zustand) oder None, wenn noch nichts geschrieben wurde
+            oder kein konsistenter Stand gelesen werden konnte
+        """
+        buffer = self._buffer
+        for attempt in range(retries):
+            sequence, length, checksum = _HEADER.unpack_from(buffer, 0)
+            if sequence == 0:
+                return None
+            if self._cached is not None and self._cached[0] == sequence:
+                return self._cached
+            if sequence & 1 or length > self.capacity:
+                self._backoff(attempt)
+                continue
+            payload = bytes(buffer[_HEADER.size:_HEADER.size + length])
+            if struct.unpack_from('<Q', buffer, 0)[0] != sequence or zlib.crc32(payload) != checksum:
+                self._backoff(attempt)
+                continue
+            self._cached = (sequence, json.loads(payload))
+            return self._cached
+        
+        logger.warning("Gemeinsamer Zustand konnte nicht konsistent gelesen werden")
+        return None
+    
+    @staticmethod
+    def _backoff(attempt: int):
+        # Schreiber kurz arbeiten lassen (Schreiben dauert Mikrosekunden)
+        time.sleep(0 if attempt < 10 else 0.001)
+    
+    def close(self):
+        """
+        Gibt das Segment frei (der Besitzer löscht es zusätzlich)
+        """
+        self._buffer = None
+        self._memory.close()
+        if self._owner:
+            try:
+                self._memory.unlink()
+            except FileNotFoundError:
+                pass
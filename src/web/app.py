@@ -2,37 +2,57 @@
 Flask-Webserver für die MGB - Mushroom Grow Box
 """
 
-from flask import Flask, render_template, jsonify, request
-from flask_socketio import SocketIO, emit
+from flask import Flask, Response, render_template, jsonify, request, g, send_from_directory
+from flask_socketio import SocketIO, emit, join_room, leave_room
 import yaml
+import json
 from pathlib import Path
 import logging
 import sys
+import time
+from datetime import datetime, timedelta
+from functools import wraps
 
 # Pfad für Imports hinzufügen
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # WiFi-Setup und Übersetzungen importieren
 from web.wifi_setup import wifi_bp, init_wifi_manager
+from web.diagnostics import diagnostics_bp, init_diagnostics, request_token, token_matches
+from web.chambers import chambers_bp, chamber_room
+from web.server import WebServer, socketio_options
 from utils.wifi_manager import WiFiManager
 from utils.translations import get_translations, get_available_languages
+from utils.log_filter import RateLimitFilter
+from utils.recent_history import recent_history
+from utils.metrics import metrics, CONTENT_TYPE
+from utils.data_logger import DEFAULT_CHAMBER
+from utils.downsample import lttb
+from utils.db_backup import DatabaseBackup
 
 # Logger einrichten
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Konfiguration laden (vor Socket.IO, der Servermodus bestimmt async_mode)
+config_path = Path(__file__).parent.parent.parent / 'config' / 'config.yaml'
+with open(config_path, 'r', encoding='utf-8') as f:
+    config = yaml.safe_load(f)
+
 # Flask-App initialisieren
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'mgb_mushroom_grow_box_secret_key_2025'
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio = SocketIO(app, cors_allowed_origins="*", **socketio_options(config['web']))
 
 # WiFi-Blueprint registrieren
 app.register_blueprint(wifi_bp)
+app.register_blueprint(diagnostics_bp)
+app.register_blueprint(chambers_bp)
 
-# Konfiguration laden
-config_path = Path(__file__).parent.parent.parent / 'config' / 'config.yaml'
-with open(config_path, 'r', encoding='utf-8') as f:
-    config = yaml.safe_load(f)
+# Mehrkammerbetrieb: Updates nur an den Socket.IO-Raum der jeweiligen Kammer
+chamber_ids = [str(chamber_id) for chamber_id in (config.get('chambers') or {})] or [DEFAULT_CHAMBER]
+main_chamber = chamber_ids[0]
+chamber_rooms = len(chamber_ids) > 1
 
 # WiFi-Manager initialisieren
 wifi_manager = WiFiManager(
@@ -41,6 +61,157 @@ wifi_manager = WiFiManager(
 )
 init_wifi_manager(wifi_manager)
 
+# Diagnose-Endpunkte (Zugriff nur mit diagnostics.token)
+init_diagnostics(config.get('diagnostics', {}))
+
+# Laufzeitmetriken der Weboberfläche
+http_request_seconds = metrics.histogram(
+    'mgb_http_request_seconds', 'Bearbeitungsdauer von HTTP-Anfragen', ('method', 'route'))
+http_requests = metrics.counter(
+    'mgb_http_requests_total', 'Bearbeitete HTTP-Anfragen', ('method', 'route', 'status'))
+socketio_emit_seconds = metrics.histogram(
+    'mgb_socketio_emit_seconds', 'Dauer eines Socket.IO-Broadcasts an alle Clients', ('event',))
+socketio_connections = metrics.counter('mgb_socketio_connections_total', 'Aufgebaute Socket.IO-Verbindungen')
+socketio_disconnections = metrics.counter('mgb_socketio_disconnections_total', 'Getrennte Socket.IO-Verbindungen')
+metrics.gauge('mgb_socketio_clients', 'Verbundene Socket.IO-Clients').set_function(
+    lambda: socketio_connections.value - socketio_disconnections.value
+)
+emit_sensor_update_seconds = socketio_emit_seconds.labels('sensor_update')
+emit_alarm_seconds = socketio_emit_seconds.labels('alarm')
+
+
+@app.before_request
+def _start_request_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def _observe_request(response):
+    start = g.pop('request_start', None)
+    if start is not None:
+        # Route-Muster statt URL, damit die Anzahl der Label-Werte begrenzt bleibt
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        http_request_seconds.labels(request.method, route).observe(time.perf_counter() - start)
+        http_requests.labels(request.method, route, response.status_code).inc()
+    return response
+
+
+# Aktor-Befehlsschicht (wird von main.py gesetzt)
+actuator_controller = None
+
+
+def init_actuator_controller(controller):
+    """
+    Initialisiert die Aktor-Befehlsschicht für die Weboberfläche
+    
+    Args:
+        controller: ActuatorController Instanz
+    """
+    global actuator_controller
+    actuator_controller = controller
+
+
+# Alarmauswertung und DataLogger (werden von main.py gesetzt)
+alarm_engine = None
+data_logger = None
+
+
+def init_alarm_engine(engine):
+    """
+    Initialisiert die Alarmauswertung für die Weboberfläche
+    
+    Args:
+        engine: AlarmEngine Instanz
+    """
+    global alarm_engine, data_logger
+    alarm_engine = engine
+    data_logger = engine.data_logger
+
+
+# Abfragen auf Messwerten und Datenbankdateien (Verlauf, Sicherung; wird von
+# main.py gesetzt, im Web-Prozess eine eigene schreibgeschützte Instanz)
+sample_reader = None
+
+
+def init_sample_reader(reader):
+    """
+    Initialisiert den lesenden Zugriff auf die Messwerte
+    
+    Args:
+        reader: DataLogger oder ChamberLogger Instanz
+    """
+    global sample_reader
+    sample_reader = reader
+
+
+# Benachrichtigung nach gespeicherten Einstellungen (wird von main.py gesetzt)
+settings_listener = None
+
+
+def init_settings_listener(listener):
+    """
+    Initialisiert den Callback, der neue Einstellungen in die Regelung übernimmt
+    
+    Args:
+        listener: Funktion ohne Argumente, aufgerufen nach dem Speichern von config.yaml
+    """
+    global settings_listener
+    settings_listener = listener
+
+
+# Metriken des Hauptprozesses (nur im Web-Prozess gesetzt, siehe web/process.py)
+remote_metrics = None
+
+
+def init_remote_metrics(source):
+    """
+    Initialisiert die Quelle für die Metriken des Hauptprozesses
+    
+    Args:
+        source: Funktion, die die Metriken im Prometheus-Textformat liefert
+    """
+    global remote_metrics
+    remote_metrics = source
+
+
+# Webserver (wird von main.py gesetzt; leitet Broadcasts in dessen Event-Loop)
+web_server = None
+
+
+def init_web_server(server):
+    """
+    Initialisiert den Webserver, über den Broadcasts aus anderen Threads laufen
+    
+    Args:
+        server: WebServer Instanz
+    """
+    global web_server
+    web_server = server
+
+
+def _broadcast(event, payload, histogram, room=None):
+    with histogram.time():
+        socketio.emit(event, payload, to=room)
+
+
+def _dispatch_broadcast(event, payload, histogram, chamber=None):
+    # Im Mehrkammerbetrieb nur an die Clients der Kammer
+    room = chamber_room(chamber) if chamber_rooms and chamber is not None else None
+    # Aufrufe aus dem Monitoring-Loop im Kontext des Webservers ausführen
+    if web_server is not None:
+        web_server.call_soon(_broadcast, event, payload, histogram, room)
+    else:
+        _broadcast(event, payload, histogram, room)
+
+
+@app.errorhandler(TimeoutError)
+def handle_timeout(error):
+    """
+    Hauptprozess antwortet nicht (Web-Prozess, siehe web/process.py)
+    """
+    logger.warning(f"Zeitüberschreitung: {error}")
+    return jsonify({'status': 'error', 'message': str(error)}), 504
+
 
 @app.route('/')
 def index():
@@ -55,7 +226,8 @@ def settings():
     """
     Einstellungsseite
     """
-    return render_template('settings.html')
+    backup_token = (config.get('database', {}).get('backup') or {}).get('token')
+    return render_template('settings.html', backup_protected=bool(backup_token))
 
 
 @app.route('/api/status')
@@ -91,7 +263,7 @@ def get_status():
             'fan': {'active': False, 'available': True, 'speed': 0}
         },
         'mode': 'automatic',
-        'alarms': []
+        'alarms': alarm_engine.active_alarms() if alarm_engine else []
     }
     return jsonify(status)
 
@@ -203,27 +375,80 @@ def update_settings():
         with open(config_path, 'w', encoding='utf-8') as f:
             yaml.dump(config, f, default_flow_style=False, allow_unicode=True)
         
+        if settings_listener is not None:
+            settings_listener()
+        
         logger.info("Einstellungen erfolgreich gespeichert")
         return jsonify({'status': 'success', 'message': 'Einstellungen gespeichert'})
-        
+    
     except Exception as e:
         logger.error(f"Fehler beim Speichern der Einstellungen: {e}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 
+# Höchstzahl Punkte je ausgedünntem Verlauf (points=)
+MAX_HISTORY_POINTS = 5000
+
+
 @app.route('/api/history/<sensor_name>')
 def get_history(sensor_name):
     """
     API-Endpunkt für historische Daten eines Sensors
+    
+    Zeitraum über ``start``/``end`` (ISO-Zeitstempel) oder die letzten
+    ``hours`` Stunden (Standard: 24). Mit ``points`` wird der ganze Zeitraum
+    per LTTB auf höchstens so viele Punkte ausgedünnt (ein Durchgang über
+    den Cursor, Spitzen bleiben erhalten), sonst die neuesten ``limit``
+    Messwerte. Format wie ``/api/chart/bootstrap`` (Unix-Zeit in Sekunden).
     """
-    # TODO: Echte Daten aus der Datenbank holen
-    limit = request.args.get('limit', default=100, type=int)
+    if not sample_reader:
+        return jsonify({'status': 'error', 'message': 'DataLogger nicht initialisiert'}), 503
+    
+    try:
+        end = datetime.fromisoformat(request.args['end']) if 'end' in request.args else datetime.now()
+        if 'start' in request.args:
+            start = datetime.fromisoformat(request.args['start'])
+        else:
+            start = end - timedelta(hours=request.args.get('hours', default=24.0, type=float))
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'Ungültiger Zeitstempel'}), 400
+    points = request.args.get('points', default=None, type=int)
     
-    history = {
+    if points is None:
+        limit = request.args.get('limit', default=100, type=int)
+        rows = sample_reader.get_sensor_rows(sensor_name, limit, start=start, end=end)
+        samples = [(datetime.fromisoformat(row[0]).timestamp(), row[2]) for row in reversed(rows)]
+        count = len(samples)
+    else:
+        if not 3 <= points <= MAX_HISTORY_POINTS:
+            return jsonify({'status': 'error',
+                            'message': f'points muss zwischen 3 und {MAX_HISTORY_POINTS} liegen'}), 400
+        # Anzahl vorab (bestimmt die Abschnitte), dann ein Durchgang über die Messwerte
+        span = max(1, int((end - start).total_seconds()) + 1)
+        count = sum(sample_reader.aggregate(sensor_name, start, end, bucket=span, funcs=())['count'])
+        samples = lttb(
+            ((datetime.fromisoformat(timestamp).timestamp(), value)
+             for timestamp, value in sample_reader.iter_sensor_data(sensor_name, start=start, end=end)),
+            count, points
+        )
+    
+    return jsonify({
         'sensor_name': sensor_name,
-        'data': []  # TODO: Daten aus DataLogger
-    }
-    return jsonify(history)
+        'count': count,
+        'timestamps': [timestamp for timestamp, _ in samples],
+        'values': [value for _, value in samples]
+    })
+
+
+@app.route('/api/chart/bootstrap')
+def get_chart_bootstrap():
+    """
+    API-Endpunkt für die Startdaten der Diagramme (aus dem Arbeitsspeicher)
+    """
+    limit = request.args.get('limit', default=None, type=int)
+    since = request.args.get('since', default=None, type=float)
+    
+    return jsonify(recent_history.get_all(since=since, limit=limit))
 
 
 @app.route('/api/actuator/<actuator_name>/<action>', methods=['POST'])
@@ -234,16 +459,139 @@ def control_actuator(actuator_name, action):
     if action not in ['on', 'off']:
         return jsonify({'status': 'error', 'message': 'Ungültige Aktion'}), 400
     
-    # TODO: Aktor steuern
+    if not actuator_controller:
+        return jsonify({'status': 'error', 'message': 'Aktorsteuerung nicht initialisiert'}), 503
+    
+    if actuator_name not in actuator_controller.actuators:
+        return jsonify({'status': 'error', 'message': 'Unbekannter Aktor'}), 404
+    
     logger.info(f"Aktor {actuator_name} wird {action} geschaltet")
+    applied = actuator_controller.set_state(actuator_name, action == 'on')
     
     return jsonify({
         'status': 'success',
         'actuator': actuator_name,
-        'action': action
+        'action': action,
+        'pending': not applied
     })
 
 
+@app.route('/api/alarms')
+def get_alarms():
+    """
+    API-Endpunkt für unquittierte Alarme
+    """
+    if not data_logger:
+        return jsonify({'status': 'error', 'message': 'DataLogger nicht initialisiert'}), 503
+    
+    limit = request.args.get('limit', default=100, type=int)
+    return jsonify({
+        'active': alarm_engine.active_alarms(),
+        'unacknowledged': data_logger.get_unacknowledged_alarms(limit)
+    })
+
+
+@app.route('/api/alarms/<int:alarm_id>/acknowledge', methods=['POST'])
+def acknowledge_alarm(alarm_id):
+    """
+    API-Endpunkt zum Quittieren eines Alarms
+    """
+    if not data_logger:
+        return jsonify({'status': 'error', 'message': 'DataLogger nicht initialisiert'}), 503
+    
+    if not data_logger.acknowledge_alarm(alarm_id):
+        return jsonify({'status': 'error', 'message': 'Alarm nicht gefunden'}), 404
+    
+    return jsonify({'status': 'success', 'id': alarm_id})
+
+
+def require_backup_token(view):
+    """
+    Schützt die Sicherungen mit ``database.backup.token`` (leer: frei zugänglich)
+    
+    Neben den Headern von require_token wird der Schlüssel auch als
+    ``?token=`` angenommen, damit der Browser über einen Link herunterladen kann.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token = (config.get('database', {}).get('backup') or {}).get('token')
+        if token:
+            supplied = request_token() or request.args.get('token', '')
+            if not token_matches(supplied, token):
+                logger.warning(f"Zugriff auf Datenbanksicherung abgelehnt ({request.remote_addr})")
+                return jsonify({'status': 'error', 'message': 'Nicht autorisiert'}), 401
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def _database_backup() -> DatabaseBackup:
+    # Download und Liste auch ohne periodische Sicherung (database.backup.enabled)
+    backup_config = config.get('database', {}).get('backup') or {}
+    return DatabaseBackup.from_config(dict(backup_config, enabled=True), sample_reader)
+
+
+@app.route('/api/backup')
+@require_backup_token
+def list_backups():
+    """
+    API-Endpunkt für die gespeicherten Datenbanksicherungen
+    """
+    if not sample_reader:
+        return jsonify({'status': 'error', 'message': 'DataLogger nicht initialisiert'}), 503
+    
+    return jsonify({'backups': [
+        {'name': path.name, 'size': path.stat().st_size, 'created': path.stat().st_mtime}
+        for path in _database_backup().backups()
+    ]})
+
+
+@app.route('/api/backup/download')
+@require_backup_token
+def download_backup():
+    """
+    API-Endpunkt: aktuelle Sicherung aller Datenbankdateien als tar.gz
+    
+    Wird während des Kopierens gestreamt, der Logger schreibt weiter.
+    """
+    if not sample_reader:
+        return jsonify({'status': 'error', 'message': 'DataLogger nicht initialisiert'}), 503
+    
+    backup = _database_backup()
+    logger.info(f"Datenbanksicherung zum Download angefordert ({request.remote_addr})")
+    return Response(backup.stream(), mimetype='application/gzip', headers={
+        'Content-Disposition': f'attachment; filename="{backup.archive_name()}"'
+    })
+
+
+@app.route('/api/backup/<name>')
+@require_backup_token
+def download_stored_backup(name):
+    """
+    API-Endpunkt: gespeicherte Sicherung herunterladen
+    """
+    if not sample_reader:
+        return jsonify({'status': 'error', 'message': 'DataLogger nicht initialisiert'}), 503
+    
+    backup = _database_backup()
+    if name not in {path.name for path in backup.backups()}:
+        return jsonify({'status': 'error', 'message': 'Sicherung nicht gefunden'}), 404
+    return send_from_directory(backup.directory.resolve(), name, as_attachment=True)
+
+
+@app.route('/metrics')
+def get_metrics():
+    """
+    Laufzeitmetriken im Prometheus-Textformat
+    """
+    if remote_metrics is None:
+        return Response(metrics.render(), content_type=CONTENT_TYPE)
+    
+    # Web-Prozess: Metriken des Hauptprozesses, ergänzt um die eigenen
+    text = remote_metrics()
+    names = {line.split(' ', 3)[2] for line in text.splitlines() if line.startswith('# TYPE ')}
+    return Response(text + metrics.render(skip=names), content_type=CONTENT_TYPE)
+
+
 @app.route('/api/translations/<lang>')
 def get_translations_endpoint(lang):
     """
@@ -270,8 +618,27 @@ def handle_connect():
     """
     WebSocket-Verbindung hergestellt
     """
+    socketio_connections.inc()
+    chamber = request.args.get('chamber') or main_chamber
+    if chamber_rooms and chamber in chamber_ids:
+        join_room(chamber_room(chamber))
     logger.info('Client verbunden')
-    emit('connection_response', {'status': 'connected'})
+    emit('connection_response', {'status': 'connected', 'chamber': chamber, 'chambers': chamber_ids})
+
+
+@socketio.on('join_chamber')
+def handle_join_chamber(data):
+    """
+    Client wechselt die angezeigte Kammer
+    """
+    chamber = (data or {}).get('chamber')
+    if chamber not in chamber_ids:
+        emit('chamber_joined', {'status': 'error', 'message': 'Unbekannte Kammer'})
+        return
+    for other in chamber_ids:
+        leave_room(chamber_room(other))
+    join_room(chamber_room(chamber))
+    emit('chamber_joined', {'status': 'success', 'chamber': chamber})
 
 
 @socketio.on('disconnect')
@@ -279,34 +646,51 @@ def handle_disconnect():
     """
     WebSocket-Verbindung getrennt
     """
+    socketio_disconnections.inc()
     logger.info('Client getrennt')
 
 
-def emit_sensor_update(sensor_data):
+def socketio_session_count() -> int:
+    """
+    Anzahl der vom Socket.IO-Server gehaltenen Sitzungen (Speicherdiagnose)
+    """
+    server = getattr(socketio, 'server', None)
+    return len(server.environ) if server is not None else 0
+
+
+def emit_samples(samples, chamber=None):
     """
-    Sendet Sensor-Updates an alle verbundenen Clients
+    Sendet neue Messwerte als vorab kodiertes JSON an alle verbundenen Clients
     
     Args:
-        sensor_data: Dictionary mit Sensordaten
+        samples: Liste von Sample-Datensätzen
+        chamber: Kammer der Messwerte (optional; im Mehrkammerbetrieb nur an deren Raum)
     """
-    socketio.emit('sensor_update', sensor_data)
+    prefix = '{"chamber":' + json.dumps(chamber) + ',"samples":[' if chamber is not None else '{"samples":['
+    payload = prefix + ','.join(sample.to_json() for sample in samples) + ']}'
+    _dispatch_broadcast('sensor_update', payload, emit_sensor_update_seconds, chamber)
 
 
-def emit_alarm(alarm_data):
+def emit_alarm(alarm_data, chamber=None):
     """
     Sendet Alarm an alle verbundenen Clients
     
     Args:
         alarm_data: Dictionary mit Alarm-Informationen
+        chamber: Kammer des Alarms (optional; im Mehrkammerbetrieb nur an deren Raum)
     """
-    socketio.emit('alarm', alarm_data)
+    if chamber is not None:
+        alarm_data = dict(alarm_data, chamber=chamber)
+    _dispatch_broadcast('alarm', alarm_data, emit_alarm_seconds, chamber)
 
 
 if __name__ == '__main__':
-    # Server starten
-    host = config['web']['host']
-    port = config['web']['port']
-    debug = config['web']['debug']
+    # Häufige Meldungen zusammenfassen und begrenzen
+    log_filter = RateLimitFilter.from_config(config.get('logging', {}).get('rate_limit', {}))
+    if log_filter:
+        log_filter.install_configured(logger, logging.getLogger())
     
-    logger.info(f"Starte Webserver auf {host}:{port}")
-    socketio.run(app, host=host, port=port, debug=debug, allow_unsafe_werkzeug=True)
+    # Server starten
+    server = WebServer.from_config(app, socketio, config['web'])
+    init_web_server(server)
+    server.serve_forever()
@@ -0,0 +1,143 @@
+"""
+Kammerbezogene API-Endpunkte für den Mehrkammerbetrieb
+"""
+
+from flask import Blueprint, request, jsonify
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Blueprint für Kammer-Endpunkte
+chambers_bp = Blueprint('chambers', __name__, url_prefix='/api/chambers')
+
+# Kammern nach Kennung (werden von main.py gesetzt)
+chambers = {}
+
+
+def init_chambers(chamber_map):
+    """
+    Initialisiert die Kammern für die Weboberfläche
+    
+    Args:
+        chamber_map: Dictionary {Kennung: Chamber}
+    """
+    global chambers
+    chambers = chamber_map
+
+
+def chamber_room(chamber_id: str) -> str:
+    """
+    Name des Socket.IO-Raums einer Kammer
+    """
+    return f"chamber:{chamber_id}"
+
+
+def _get_chamber(chamber_id):
+    """
+    Liefert die Kammer oder eine Fehlerantwort
+    """
+    if not chambers:
+        return None, (jsonify({'status': 'error', 'message': 'Kammern nicht initialisiert'}), 503)
+    chamber = chambers.get(chamber_id)
+    if chamber is None:
+        return None, (jsonify({'status': 'error', 'message': 'Unbekannte Kammer'}), 404)
+    return chamber, None
+
+
+@chambers_bp.route('')
+def list_chambers():
+    """
+    Alle Kammern mit ihren Sensoren und Aktoren
+    """
+    return jsonify([
+        {
+            'id': chamber.id,
+            'name': chamber.name,
+            'sensors': sorted(chamber.config.get('sensors', {})),
+            'actuators': sorted(chamber.actuator_controller.actuators)
+        }
+        for chamber in chambers.values()
+    ])
+
+
+@chambers_bp.route('/<chamber_id>/status')
+def get_chamber_status(chamber_id):
+    """
+    Aktueller Zustand einer Kammer (letzte Messwerte, Aktoren, aktive Alarme)
+    """
+    chamber, error = _get_chamber(chamber_id)
+    if error:
+        return error
+    return jsonify(chamber.get_status())
+
+
+@chambers_bp.route('/<chamber_id>/chart/bootstrap')
+def get_chamber_chart_bootstrap(chamber_id):
+    """
+    Startdaten der Diagramme einer Kammer (aus dem Arbeitsspeicher)
+    """
+    chamber, error = _get_chamber(chamber_id)
+    if error:
+        return error
+    
+    limit = request.args.get('limit', default=None, type=int)
+    since = request.args.get('since', default=None, type=float)
+    return jsonify(chamber.history.get_all(since=since, limit=limit))
+
+
+@chambers_bp.route('/<chamber_id>/actuator/<actuator_name>/<action>', methods=['POST'])
+def control_chamber_actuator(chamber_id, actuator_name, action):
+    """
+    Manuelle Steuerung eines Aktors einer Kammer
+    """
+    chamber, error = _get_chamber(chamber_id)
+    if error:
+        return error
+    
+    if action not in ['on', 'off']:
+        return jsonify({'status': 'error', 'message': 'Ungültige Aktion'}), 400
+    
+    if actuator_name not in chamber.actuator_controller.actuators:
+        return jsonify({'status': 'error', 'message': 'Unbekannter Aktor'}), 404
+    
+    logger.info(f"Aktor {actuator_name} in Kammer {chamber_id} wird {action} geschaltet")
+    applied = chamber.actuator_controller.set_state(actuator_name, action == 'on')
+    
+    return jsonify({
+        'status': 'success',
+        'chamber': chamber_id,
+        'actuator': actuator_name,
+        'action': action,
+        'pending': not applied
+    })
+
+
+@chambers_bp.route('/<chamber_id>/alarms')
+def get_chamber_alarms(chamber_id):
+    """
+    Aktive und unquittierte Alarme einer Kammer
+    """
+    chamber, error = _get_chamber(chamber_id)
+    if error:
+        return error
+    
+    limit = request.args.get('limit', default=100, type=int)
+    return jsonify({
+        'active': chamber.alarm_engine.active_alarms(),
+        'unacknowledged': chamber.data_logger.get_unacknowledged_alarms(limit)
+    })
+
+
+@chambers_bp.route('/<chamber_id>/alarms/<int:alarm_id>/acknowledge', methods=['POST'])
+def acknowledge_chamber_alarm(chamber_id, alarm_id):
+    """
+    Quittiert einen Alarm einer Kammer
+    """
+    chamber, error = _get_chamber(chamber_id)
+    if error:
+        return error
+    
+    if not chamber.data_logger.acknowledge_alarm(alarm_id):
+        return jsonify({'status': 'error', 'message': 'Alarm nicht gefunden'}), 404
+    
+    return jsonify({'status': 'success', 'chamber': chamber_id, 'id': alarm_id})
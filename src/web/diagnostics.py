@@ -0,0 +1,158 @@
+"""
+Diagnose-Schnittstelle (Profiling, Speicher) für den laufenden Betrieb
+"""
+
+from flask import Blueprint, request, jsonify, send_from_directory
+from functools import wraps
+import hmac
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.profiler import profiler
+
+logger = logging.getLogger(__name__)
+
+# Blueprint für Diagnose-Endpunkte
+diagnostics_bp = Blueprint('diagnostics', __name__, url_prefix='/api/diagnostics')
+
+# Abschnitt 'diagnostics' der Konfiguration
+diagnostics_config = {}
+
+# Speicherdiagnose (wird von main.py gesetzt, falls aktiviert)
+memory_monitor = None
+
+
+def init_diagnostics(config: dict):
+    """
+    Initialisiert die Diagnose-Endpunkte
+    
+    Args:
+        config: Abschnitt 'diagnostics' aus config.yaml
+    """
+    global diagnostics_config
+    diagnostics_config = config or {}
+
+
+def init_memory_monitor(monitor):
+    """
+    Initialisiert die Speicherdiagnose für die Diagnose-Endpunkte
+    
+    Args:
+        monitor: MemoryMonitor Instanz
+    """
+    global memory_monitor
+    memory_monitor = monitor
+
+
+def request_token() -> str:
+    """
+    Schlüssel der Anfrage (Header ``X-MGB-Token`` oder ``Authorization: Bearer <token>``)
+    """
+    supplied = request.headers.get('X-MGB-Token', '')
+    if not supplied:
+        authorization = request.headers.get('Authorization', '')
+        if authorization.startswith('Bearer '):
+            supplied = authorization[len('Bearer '):].strip()
+    return supplied
+
+
+def token_matches(supplied: str, token) -> bool:
+    """
+    Vergleicht zwei Schlüssel in konstanter Zeit
+    """
+    return hmac.compare_digest(supplied.encode('utf-8'), str(token).encode('utf-8'))
+
+
+def require_token(view):
+    """
+    Erlaubt den Zugriff nur mit dem Schlüssel aus ``diagnostics.token``
+    (Header ``X-MGB-Token`` oder ``Authorization: Bearer <token>``)
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token = diagnostics_config.get('token')
+        if not token:
+            return jsonify({'status': 'error', 'message': 'Diagnose deaktiviert (diagnostics.token nicht gesetzt)'}), 403
+        
+        if not token_matches(request_token(), token):
+            logger.warning(f"Diagnose-Zugriff abgelehnt ({request.remote_addr})")
+            return jsonify({'status': 'error', 'message': 'Nicht autorisiert'}), 401
+        
+        return view(*args, **kwargs)
+    return wrapper
+
+
+@diagnostics_bp.route('/profile', methods=['GET'])
+@require_token
+def profile_status():
+    """
+    Gibt den Zustand des Profilers und die vorhandenen Ergebnisse zurück
+    """
+    return jsonify(profiler.status())
+
+
+@diagnostics_bp.route('/profile', methods=['POST'])
+@require_token
+def start_profile():
+    """
+    Startet einen zeitlich begrenzten Profiling-Durchgang
+    """
+    data = request.get_json(silent=True) or {}
+    profiler_config = diagnostics_config.get('profiler', {})
+    
+    try:
+        status = profiler.start(
+            duration=data.get('duration', profiler_config.get('default_duration', 30)),
+            interval=data.get('interval')
+        )
+    except RuntimeError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 409
+    except (TypeError, ValueError):
+        return jsonify({'status': 'error', 'message': 'Ungültige Dauer oder ungültiges Intervall'}), 400
+    
+    return jsonify(status), 202
+
+
+@diagnostics_bp.route('/profile', methods=['DELETE'])
+@require_token
+def stop_profile():
+    """
+    Beendet den laufenden Durchgang vorzeitig
+    """
+    profiler.stop()
+    return jsonify({'status': 'success'})
+
+
+@diagnostics_bp.route('/profile/<path:filename>', methods=['GET'])
+@require_token
+def download_profile(filename):
+    """
+    Lädt eine Ergebnisdatei herunter
+    """
+    if not filename.startswith('profile_'):
+        return jsonify({'status': 'error', 'message': 'Datei nicht gefunden'}), 404
+    return send_from_directory(profiler.output_dir.resolve(), filename, as_attachment=True)
+
+
+@diagnostics_bp.route('/memory', methods=['GET'])
+@require_token
+def memory_report():
+    """
+    Gibt den letzten Speicherbericht und den Verlauf zurück
+    """
+    if not memory_monitor:
+        return jsonify({'status': 'error', 'message': 'Speicherdiagnose nicht aktiviert'}), 503
+    return jsonify(memory_monitor.get_report())
+
+
+@diagnostics_bp.route('/memory/snapshot', methods=['POST'])
+@require_token
+def memory_snapshot():
+    """
+    Erfasst sofort einen Speicherbericht (inkl. Vergleich zum letzten Snapshot)
+    """
+    if not memory_monitor:
+        return jsonify({'status': 'error', 'message': 'Speicherdiagnose nicht aktiviert'}), 503
+    return jsonify(memory_monitor.collect())
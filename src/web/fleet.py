@@ -0,0 +1,227 @@
+"""
+API-Endpunkte des Flotten-Hubs: Upload vieler Boxen, Flottenübersicht, Verlauf
+"""
+
+from flask import Blueprint, request, jsonify
+from functools import wraps
+import hmac
+import json
+import logging
+import math
+import re
+import sys
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.fleet_store import HubBusy
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Blueprint für Flotten-Endpunkte
+fleet_bp = Blueprint('fleet', __name__, url_prefix='/api/fleet')
+
+# Hub-Datenbank und Abschnitt 'fleet.hub' (werden von hub.py gesetzt)
+hub_store = None
+hub_config = {}
+
+# Kennungen der Boxen: Buchstaben, Ziffern, '.', '_', '-'
+_BOX_ID = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+_rejected_uploads = metrics.counter(
+    'mgb_fleet_rejected_uploads_total', 'Abgelehnte Uploads', ('reason',))
+
+
+def init_hub(store, config: dict):
+    """
+    Initialisiert die Flotten-Endpunkte
+    
+    Args:
+        store: HubStore Instanz
+        config: Abschnitt 'fleet.hub' aus config.yaml
+    """
+    global hub_store, hub_config
+    hub_store = store
+    hub_config = config or {}
+
+
+def require_fleet_token(view):
+    """
+    Prüft den Schlüssel aus ``fleet.hub.token`` (leer = ohne Prüfung)
+    (Header ``X-MGB-Token`` oder ``Authorization: Bearer <token>``)
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token = hub_config.get('token')
+        if token:
+            supplied = request.headers.get('X-MGB-Token', '')
+            if not supplied:
+                authorization = request.headers.get('Authorization', '')
+                if authorization.startswith('Bearer '):
+                    supplied = authorization[len('Bearer '):].strip()
+            if not hmac.compare_digest(supplied.encode('utf-8'), str(token).encode('utf-8')):
+                logger.warning(f"Flotten-Zugriff abgelehnt ({request.remote_addr})")
+                _rejected_uploads.labels('unauthorized').inc()
+                return jsonify({'status': 'error', 'message': 'Nicht autorisiert'}), 401
+        
+        if hub_store is None:
+            return jsonify({'status': 'error', 'message': 'Hub nicht initialisiert'}), 503
+        return view(*args, **kwargs)
+    return wrapper
+
+
+class _UploadTooLarge(ValueError):
+    """
+    Upload größer als ``max_upload_bytes`` (Box soll kleinere Stapel senden)
+    """
+
+
+def _read_body(max_bytes: int) -> bytes:
+    """
+    Liest den (ggf. gzip-komprimierten) Anfragekörper, höchstens ``max_bytes`` entpackt
+    
+    Raises:
+        ValueError: Körper ungültig
+        _UploadTooLarge: Körper zu groß
+    """
+    body = request.get_data(cache=False)
+    encoding = request.headers.get('Content-Encoding', '').lower()
+    if encoding in ('', 'identity'):
+        if len(body) > max_bytes:
+            raise _UploadTooLarge("Upload zu groß")
+        return body
+    if encoding != 'gzip':
+        raise ValueError(f"Nicht unterstützte Kodierung '{encoding}'")
+    
+    # Begrenzt entpacken (Schutz vor Kompressionsbomben)
+    decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+    try:
+        data = decompressor.decompress(body, max_bytes)
+    except zlib.error as e:
+        raise ValueError(f"Ungültige gzip-Daten: {e}")
+    if decompressor.unconsumed_tail:
+        raise _UploadTooLarge("Upload zu groß")
+    return data
+
+
+def _parse_rows(box: str, data: bytes) -> list:
+    """
+    Wandelt NDJSON-Zeilen in Zeilen der Hub-Datenbank um
+    
+    Je Zeile: ``{"id", "timestamp", "sensor_name", "value", "unit", "chamber"}``
+    
+    Raises:
+        ValueError: Zeile ungültig
+    """
+    rows = []
+    for number, line in enumerate(data.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            sample = json.loads(line)
+            value = float(sample['value'])
+            if not math.isfinite(value):
+                raise ValueError("Wert nicht endlich")
+            rows.append((
+                box,
+                int(sample['id']),
+                str(sample['timestamp']),
+                str(sample.get('chamber', 'default')),
+                str(sample['sensor_name']),
+                value,
+                str(sample.get('unit', ''))
+            ))
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Zeile {number} ungültig: {e}")
+    return rows
+
+
+@fleet_bp.route('/ingest/<box>', methods=['POST'])
+@require_fleet_token
+def ingest(box):
+    """
+    Nimmt einen Upload einer Box entgegen (NDJSON, optional gzip)
+    
+    Antwortet erst nach dem Commit; ``last_id`` ist die höchste ID des
+    Uploads und dient der Box als neuer Cursor. Ist der Hub ausgelastet,
+    folgt 503 mit ``Retry-After``.
+    """
+    if not _BOX_ID.match(box):
+        _rejected_uploads.labels('invalid').inc()
+        return jsonify({'status': 'error', 'message': 'Ungültige Box-Kennung'}), 400
+    
+    try:
+        rows = _parse_rows(box, _read_body(hub_config.get('max_upload_bytes', 16 * 1024 * 1024)))
+    except _UploadTooLarge as e:
+        _rejected_uploads.labels('too_large').inc()
+        return jsonify({'status': 'error', 'message': str(e)}), 413
+    except ValueError as e:
+        _rejected_uploads.labels('invalid').inc()
+        logger.warning(f"Upload von {box} abgelehnt: {e}")
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    
+    if not rows:
+        return jsonify({'status': 'success', 'accepted': 0, 'inserted': 0, 'last_id': None})
+    
+    try:
+        inserted = hub_store.ingest(box, rows, request.remote_addr or '',
+                                    timeout=hub_config.get('commit_timeout', 30.0))
+    except HubBusy as e:
+        _rejected_uploads.labels('busy').inc()
+        response = jsonify({'status': 'error', 'message': str(e)})
+        response.headers['Retry-After'] = str(math.ceil(e.retry_after))
+        return response, 503
+    except TimeoutError as e:
+        # Wird noch geschrieben; die Wiederholung ist dank (box, id) unschädlich
+        _rejected_uploads.labels('timeout').inc()
+        response = jsonify({'status': 'error', 'message': str(e)})
+        response.headers['Retry-After'] = str(math.ceil(hub_store.retry_after))
+        return response, 503
+    
+    return jsonify({
+        'status': 'success',
+        'accepted': len(rows),
+        'inserted': inserted,
+        'last_id': max(row[1] for row in rows)
+    })
+
+
+@fleet_bp.route('/boxes')
+@require_fleet_token
+def list_boxes():
+    """
+    Alle Boxen mit letztem Upload, Cursor und letzten Messwerten
+    """
+    return jsonify(hub_store.boxes())
+
+
+@fleet_bp.route('/boxes/<box>/cursor')
+@require_fleet_token
+def get_cursor(box):
+    """
+    Höchste übernommene Zeilen-ID einer Box (Wiederaufsetzen ohne lokalen Cursor)
+    """
+    return jsonify({'box': box, 'last_id': hub_store.last_id(box)})
+
+
+@fleet_bp.route('/history/<sensor_name>')
+@require_fleet_token
+def get_fleet_history(sensor_name):
+    """
+    Verlauf eines Sensors über alle (oder ausgewählte) Boxen
+    
+    Parameter: ``box`` (mehrfach), ``chamber``, ``since``/``until`` (ISO),
+    ``limit`` (je Box)
+    """
+    limit = min(request.args.get('limit', default=1000, type=int),
+                hub_config.get('max_history_points', 10000))
+    history = hub_store.get_history(
+        sensor_name,
+        boxes=request.args.getlist('box') or None,
+        chamber=request.args.get('chamber'),
+        since=request.args.get('since'),
+        until=request.args.get('until'),
+        limit=limit
+    )
+    return jsonify({'sensor': sensor_name, 'boxes': history})
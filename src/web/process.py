@@ -0,0 +1,576 @@
+"""
+Weboberfläche als eigener Prozess
+
+Der Monitoring-Loop schreibt den aktuellen Zustand (Messwerte, Alarme, Aktoren
+aller Kammern und die letzten Ereignisse) in ein Shared-Memory-Segment
+(``SharedState``), der Web-Prozess liest ihn ohne Sperren. Befehle (Aktoren
+schalten, Alarme quittieren, Einstellungen übernehmen) gehen mit der Kennung
+der Kammer über eine Warteschlange an den Hauptprozess zurück. Last auf der Weboberfläche konkurriert so nicht mehr mit
+Sensorabfrage und PID-Regelung um den GIL.
+"""
+
+import itertools
+import logging
+import multiprocessing
+import queue
+import signal
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.shared_state import SharedState
+from utils.metrics import metrics, process_resident_memory
+
+logger = logging.getLogger(__name__)
+
+_restarts = metrics.counter('mgb_web_process_restarts_total', 'Neustarts des Web-Prozesses')
+_commands = metrics.counter('mgb_web_process_commands_total', 'Vom Web-Prozess empfangene Befehle', ('command',))
+
+
+class WebProcess:
+    """
+    Startet und überwacht den Web-Prozess (Seite des Hauptprozesses)
+    """
+    
+    def __init__(self, web_config: dict, chambers: Optional[Dict[str, Any]] = None,
+                 on_settings: Optional[Callable[[], None]] = None, state_size: int = 64 * 1024, state_interval: float = 1.0,
+                 poll_interval: float = 0.25, command_timeout: float = 2.0,
+                 events: int = 64):
+        """
+        Args:
+            web_config: Abschnitt 'web' aus config.yaml (für den Webserver im Kindprozess)
+            chambers: Kammern nach Kennung; die erste ist die Hauptkammer der Weboberfläche
+            on_settings: Wird aufgerufen, nachdem die Weboberfläche Einstellungen gespeichert hat
+            state_size: Größe des Shared-Memory-Segments in Bytes
+            state_interval: Sekunden zwischen zwei Aktualisierungen ohne neue Messwerte
+            poll_interval: Sekunden, in denen der Web-Prozess auf neue Ereignisse prüft
+            command_timeout: Wartezeit des Web-Prozesses auf Antworten in Sekunden
+            events: Anzahl der im Zustand vorgehaltenen Ereignisse
+        """
+        self.web_config = web_config
+        self.chambers = chambers or {}
+        self.chamber = next(iter(self.chambers), None)
+        self.on_settings = on_settings
+        self.state_size = state_size
+        self.state_interval = state_interval
+        self.poll_interval = poll_interval
+        self.command_timeout = command_timeout
+        self.shutdown_timeout = web_config.get('server', {}).get('shutdown_timeout', 5) + 2
+        
+        self._context = multiprocessing.get_context('spawn')
+        self._state: Optional[SharedState] = None
+        self._process = None
+        self._commands = None
+        self._replies = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        
+        # Zustand, der bei jeder Veröffentlichung geschrieben wird
+        self._lock = threading.Lock()
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        # Alarme getrennt halten, damit viele Messwerte sie nicht verdrängen
+        self._events = {'samples': deque(maxlen=events), 'alarm': deque(maxlen=16)}
+        self._sequence = 0
+        self._last_publish = 0.0
+        
+        self._handlers: Dict[str, Callable[..., Any]] = {
+            'actuator': self._set_actuator,
+            'unacknowledged_alarms': self._unacknowledged_alarms,
+            'acknowledge_alarm': self._acknowledge_alarm,
+            'settings': self._settings,
+            'history': self._history,
+            'metrics': metrics.render
+        }
+    
+    @classmethod
+    def from_config(cls, web_config: dict, **kwargs) -> Optional['WebProcess']:
+        """
+        Erstellt den Web-Prozess aus ``web.process``, falls aktiviert
+        
+        Returns:
+            WebProcess oder None, wenn die Weboberfläche im Hauptprozess läuft
+        """
+        process_config = web_config.get('process', {})
+        if not process_config.get('enabled', False):
+            return None
+        return cls(
+            web_config,
+            state_size=process_config.get('state_size', 64 * 1024),
+            state_interval=process_config.get('state_interval', 1.0),
+            poll_interval=process_config.get('poll_interval', 0.25),
+            command_timeout=process_config.get('command_timeout', 2.0),
+            **kwargs
+        )
+    
+    def start(self):
+        """
+        Legt das Segment an, startet den Web-Prozess und den Befehls-Thread
+        """
+        self._state = SharedState.create(self.state_size)
+        self.publish_state()
+        self._spawn()
+        self._thread = threading.Thread(target=self._run, name='mgb-web-commands', daemon=True)
+        self._thread.start()
+    
+    def _spawn(self):
+        # Neue Warteschlangen je Start: ein abgestürzter Prozess kann sie beschädigt hinterlassen
+        self._commands = self._context.Queue()
+        self._replies = self._context.Queue()
+        self._process = self._context.Process(
+            target=run_web_process,
+            args=(self._state.name, self._commands, self._replies, self.poll_interval, self.command_timeout),
+            name='mgb-web',
+            daemon=True
+        )
+        self._process.start()
+        logger.info(f"Web-Prozess gestartet (PID {self._process.pid})")
+    
+    def publish_samples(self, samples, chamber: Optional[str] = None):
+        """
+        Veröffentlicht neue Messwerte (Ersatz für emit_samples)
+        
+        Args:
+            samples: Liste von Sample-Datensätzen
+            chamber: Kammer der Messwerte (optional)
+        """
+        payload = [sample.to_dict() for sample in samples]
+        with self._lock:
+            if chamber is None or chamber == self.chamber:
+                for entry in payload:
+                    self._latest[entry['sensor']] = entry
+            self._append_event('samples', payload, chamber)
+        self.publish_state()
+    
+    def publish_alarm(self, event, chamber: Optional[str] = None):
+        """
+        Veröffentlicht einen neuen Alarm (Ersatz für emit_alarm)
+        
+        Args:
+            event: AlarmEvent
+            chamber: Kammer des Alarms (optional)
+        """
+        with self._lock:
+            self._append_event('alarm', event.to_dict(), chamber)
+        self.publish_state()
+    
+    def _append_event(self, kind: str, payload: Any, chamber: Optional[str]):
+        self._sequence += 1
+        self._events[kind].append([self._sequence, kind, payload, chamber])
+    
+    def _event_list(self) -> List[list]:
+        return sorted(itertools.chain(*self._events.values()), key=lambda event: event[0])
+    
+    def publish_state(self):
+        """
+        Schreibt den aktuellen Zustand in das Shared-Memory-Segment
+        """
+        if self._state is None:
+            return
+        
+        chambers = {}
+        for chamber_id, chamber in self.chambers.items():
+            status = chamber.get_status()
+            status['configured'] = sorted(chamber.config.get('sensors', {}))
+            chambers[chamber_id] = status
+        main = chambers.get(self.chamber, {})
+        with self._lock:
+            state = {
+                'updated': time.time(),
+                'latest': self._latest,
+                'alarms': main.get('alarms', []),
+                'actuators': main.get('actuators', {}),
+                'chambers': chambers,
+                'events': self._event_list()
+            }
+            while True:
+                try:
+                    self._state.publish(state)
+                    break
+                except ValueError:
+                    if not self._events['samples']:
+                        raise
+                    # Älteste Messwerte opfern, statt den Zustand gar nicht zu schreiben
+                    self._events['samples'].popleft()
+                    state['events'] = self._event_list()
+            self._last_publish = time.monotonic()
+    
+    def _run(self):
+        """
+        Befehle des Web-Prozesses ausführen, Zustand auffrischen, Prozess überwachen
+        """
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                message = self._commands.get(timeout=self.state_interval)
+            except queue.Empty:
+                message = None
+            except (EOFError, OSError):
+                message = None
+                self._stop.wait(self.state_interval)
+            
+            if message is not None:
+                self._execute(*message)
+            
+            if time.monotonic() - self._last_publish >= self.state_interval:
+                try:
+                    self.publish_state()
+                except Exception as e:
+                    logger.error(f"Fehler beim Schreiben des gemeinsamen Zustands: {e}")
+            
+            if not self._stop.is_set() and not self._process.is_alive():
+                logger.error(f"Web-Prozess beendet (Exit-Code {self._process.exitcode}), "
+                             f"Neustart in {backoff:.0f}s")
+                if self._stop.wait(backoff):
+                    break
+                backoff = min(backoff * 2, 60.0)
+                _restarts.inc()
+                self._spawn()
+            elif message is not None:
+                backoff = 1.0
+    
+    def _execute(self, request_id: int, command: str, args: tuple):
+        _commands.labels(command).inc()
+        handler = self._handlers.get(command)
+        try:
+            if handler is None:
+                raise ValueError(f"Unbekannter Befehl: {command}")
+            reply = (request_id, True, handler(*args))
+        except Exception as e:
+            logger.error(f"Fehler bei Befehl '{command}' aus dem Web-Prozess: {e}")
+            reply = (request_id, False, f"{type(e).__name__}: {e}")
+        self._replies.put(reply)
+        
+        # Geänderten Zustand (z.B. Aktor) sofort sichtbar machen
+        if command in ('actuator', 'acknowledge_alarm', 'settings'):
+            self._last_publish = 0.0
+    
+    def _chamber(self, chamber_id: Optional[str]):
+        """
+        Kammer eines Befehls (ohne Kennung die Hauptkammer)
+        """
+        chamber = self.chambers.get(self.chamber if chamber_id is None else chamber_id)
+        if chamber is None:
+            raise KeyError(f"Unbekannte Kammer: {chamber_id}")
+        return chamber
+    
+    def _set_actuator(self, name: str, state: bool, chamber: Optional[str] = None) -> bool:
+        return self._chamber(chamber).actuator_controller.set_state(name, state)
+    
+    def _unacknowledged_alarms(self, limit: int, chamber: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self._chamber(chamber).data_logger.get_unacknowledged_alarms(limit)
+    
+    def _acknowledge_alarm(self, alarm_id: int, chamber: Optional[str] = None) -> bool:
+        return self._chamber(chamber).data_logger.acknowledge_alarm(alarm_id)
+    
+    def _settings(self):
+        if self.on_settings is not None:
+            self.on_settings()
+    
+    def _history(self, chamber: Optional[str] = None, since: Optional[float] = None,
+                 limit: Optional[int] = None) -> Dict[str, Any]:
+        if not self.chambers:
+            return {}
+        return self._chamber(chamber).history.get_all(since=since, limit=limit)
+    
+    def stop(self):
+        """
+        Beendet den Web-Prozess (SIGTERM, danach SIGKILL) und gibt das Segment frei
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.state_interval + 1)
+        if self._process is not None and self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout=self.shutdown_timeout)
+            if self._process.is_alive():
+                logger.warning("Web-Prozess reagiert nicht - beende hart")
+                self._process.kill()
+                self._process.join(timeout=1)
+        if self._state is not None:
+            self._state.close()
+            self._state = None
+        logger.info("Web-Prozess beendet")
+
+
+class RemoteControl:
+    """
+    Zugriff des Web-Prozesses auf den Hauptprozess
+    
+    Stellt die von app.py genutzten Methoden von ActuatorController, AlarmEngine
+    und DataLogger bereit (wird über init_actuator_controller/init_alarm_engine
+    gesetzt): gelesen wird aus dem gemeinsamen Zustand, geschrieben per Befehl.
+    """
+    
+    def __init__(self, state: SharedState, commands, replies, timeout: float = 2.0):
+        self._state = state
+        self._commands = commands
+        self._replies = replies
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, list] = {}
+        self._pending_lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read_replies, name='mgb-web-replies', daemon=True)
+        self._reader.start()
+    
+    @property
+    def data_logger(self) -> 'RemoteControl':
+        return self
+    
+    def state(self) -> Dict[str, Any]:
+        """
+        Aktueller Zustand aus dem Shared-Memory-Segment (leer, falls nicht lesbar)
+        """
+        result = self._state.read()
+        return result[1] if result is not None else {}
+    
+    def call(self, command: str, *args, timeout: Optional[float] = None) -> Any:
+        """
+        Führt einen Befehl im Hauptprozess aus und wartet auf die Antwort
+        
+        Raises:
+            TimeoutError: Keine Antwort innerhalb von timeout Sekunden
+            RuntimeError: Befehl ist im Hauptprozess fehlgeschlagen
+        """
+        request_id = next(self._ids)
+        slot = [threading.Event(), None, None]
+        with self._pending_lock:
+            self._pending[request_id] = slot
+        try:
+            self._commands.put((request_id, command, args))
+            if not slot[0].wait(self.timeout if timeout is None else timeout):
+                raise TimeoutError(f"Keine Antwort des Hauptprozesses auf '{command}'")
+        finally:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+        
+        if not slot[1]:
+            raise RuntimeError(slot[2])
+        return slot[2]
+    
+    def _read_replies(self):
+        while True:
+            try:
+                request_id, ok, result = self._replies.get()
+            except (EOFError, OSError):
+                return
+            with self._pending_lock:
+                slot = self._pending.get(request_id)
+            if slot is None:
+                continue  # Antwort nach Zeitüberschreitung
+            slot[1], slot[2] = ok, result
+            slot[0].set()
+    
+    # Schnittstelle von ActuatorController
+    
+    @property
+    def actuators(self) -> Dict[str, Dict[str, Any]]:
+        return self.state().get('actuators', {})
+    
+    def set_state(self, name: str, state: bool) -> bool:
+        return self.call('actuator', name, state)
+    
+    # Schnittstelle von AlarmEngine
+    
+    def active_alarms(self) -> List[Dict[str, Any]]:
+        return self.state().get('alarms', [])
+    
+    # Schnittstelle von DataLogger
+    
+    def get_unacknowledged_alarms(self, limit: int = 100) -> List[Dict[str, Any]]:
+        return self.call('unacknowledged_alarms', limit)
+    
+    def acknowledge_alarm(self, alarm_id: int) -> bool:
+        return self.call('acknowledge_alarm', alarm_id)
+
+
+class RemoteChamber:
+    """
+    Kammer im Web-Prozess (für die Endpunkte aus web/chambers.py)
+    
+    Stellt wie RemoteControl die genutzten Methoden von Chamber,
+    ActuatorController, AlarmEngine, DataLogger und RecentHistory bereit;
+    Befehle tragen die Kennung der Kammer.
+    """
+    
+    def __init__(self, remote: RemoteControl, chamber_id: str):
+        self.remote = remote
+        self.id = chamber_id
+    
+    def _status(self) -> Dict[str, Any]:
+        return self.remote.state().get('chambers', {}).get(self.id, {})
+    
+    @property
+    def name(self) -> str:
+        return self._status().get('name', self.id)
+    
+    @property
+    def config(self) -> Dict[str, Any]:
+        return {'sensors': {name: {} for name in self._status().get('configured', [])}}
+    
+    @property
+    def actuator_controller(self) -> 'RemoteChamber':
+        return self
+    
+    @property
+    def alarm_engine(self) -> 'RemoteChamber':
+        return self
+    
+    @property
+    def data_logger(self) -> 'RemoteChamber':
+        return self
+    
+    @property
+    def history(self) -> 'RemoteChamber':
+        return self
+    
+    def get_status(self) -> Dict[str, Any]:
+        status = dict(self._status())
+        status.pop('configured', None)
+        return status
+    
+    # Schnittstelle von ActuatorController
+    
+    @property
+    def actuators(self) -> Dict[str, Dict[str, Any]]:
+        return self._status().get('actuators', {})
+    
+    def set_state(self, name: str, state: bool) -> bool:
+        return self.remote.call('actuator', name, state, self.id)
+    
+    # Schnittstelle von AlarmEngine
+    
+    def active_alarms(self) -> List[Dict[str, Any]]:
+        return self._status().get('alarms', [])
+    
+    # Schnittstelle von DataLogger
+    
+    def get_unacknowledged_alarms(self, limit: int = 100) -> List[Dict[str, Any]]:
+        return self.remote.call('unacknowledged_alarms', limit, self.id)
+    
+    def acknowledge_alarm(self, alarm_id: int) -> bool:
+        return self.remote.call('acknowledge_alarm', alarm_id, self.id)
+    
+    # Schnittstelle von RecentHistory
+    
+    def get_all(self, since: Optional[float] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+        return self.remote.call('history', self.id, since, limit)
+
+
+def _poll_events(remote: RemoteControl, interval: float, stop: threading.Event):
+    """
+    Leitet neue Ereignisse aus dem gemeinsamen Zustand an die Socket.IO-Clients weiter
+    """
+    from utils.records import Sample
+    from utils.recent_history import recent_history
+    from web.app import emit_samples, emit_alarm, main_chamber
+    
+    last_sequence = None
+    while not stop.wait(interval):
+        try:
+            events = remote.state().get('events', [])
+            if last_sequence is None:
+                # Beim Start nur neue Ereignisse senden (Verlauf kommt per 'history')
+                last_sequence = events[-1][0] if events else 0
+                continue
+            
+            for sequence, kind, payload, chamber in events:
+                if sequence <= last_sequence:
+                    continue
+                if kind == 'samples':
+                    samples = [Sample(entry['sensor'], entry['value'], entry['unit'], entry['timestamp'])
+                               for entry in payload]
+                    if chamber is None or chamber == main_chamber:
+                        for sample in samples:
+                            recent_history.append(sample.sensor, sample.value, sample.timestamp)
+                    emit_samples(samples, chamber)
+                elif kind == 'alarm':
+                    emit_alarm(payload, chamber)
+                last_sequence = sequence
+        except Exception as e:
+            logger.error(f"Fehler beim Weiterleiten der Ereignisse: {e}", exc_info=True)
+
+
+def run_web_process(state_name: str, commands, replies, poll_interval: float = 0.25,
+                    command_timeout: float = 2.0):
+    """
+    Einstiegspunkt des Web-Prozesses
+    
+    Args:
+        state_name: Name des Shared-Memory-Segments
+        commands: Warteschlange für Befehle an den Hauptprozess
+        replies: Warteschlange für Antworten des Hauptprozesses
+        poll_interval: Sekunden zwischen zwei Prüfungen auf neue Ereignisse
+        command_timeout: Wartezeit auf Antworten in Sekunden
+    """
+    # Beenden steuert der Hauptprozess (SIGTERM); Strg+C trifft die ganze Prozessgruppe
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    
+    from web.app import (app, socketio, config, main_chamber, init_actuator_controller, init_alarm_engine,
+                         init_sample_reader, init_settings_listener, init_remote_metrics, init_web_server)
+    from web.chambers import init_chambers
+    from web.server import WebServer
+    from utils.data_logger import DataLogger, DEFAULT_CHAMBER
+    from utils.log_filter import RateLimitFilter
+    from utils.recent_history import recent_history
+    
+    log_filter = RateLimitFilter.from_config(config.get('logging', {}).get('rate_limit', {}))
+    if log_filter:
+        log_filter.install_configured(logger, logging.getLogger())
+        log_filter.start()
+    
+    metrics.gauge('mgb_web_process_resident_memory_bytes',
+                  'Belegter Arbeitsspeicher (RSS) des Web-Prozesses in Bytes').set_function(process_resident_memory)
+    
+    measurement_config = config['measurement']
+    recent_history.configure(
+        window=measurement_config.get('history_hours', 24) * 3600,
+        interval=measurement_config['interval']
+    )
+    
+    remote = RemoteControl(SharedState.attach(state_name), commands, replies, timeout=command_timeout)
+    init_actuator_controller(remote)
+    init_alarm_engine(remote)
+    init_settings_listener(lambda: remote.call('settings'))
+    init_remote_metrics(lambda: remote.call('metrics'))
+    # Kammern stehen seit der ersten Veröffentlichung vor dem Start im Zustand
+    init_chambers({chamber_id: RemoteChamber(remote, chamber_id)
+                   for chamber_id in remote.state().get('chambers', {})})
+    
+    # Verlauf liest die Datenbankdateien direkt (eigene Verbindungen, keine Befehle)
+    try:
+        reader = DataLogger.from_config(config, read_only=True)
+        init_sample_reader(reader if main_chamber == DEFAULT_CHAMBER else reader.for_chamber(main_chamber))
+    except sqlite3.Error as e:
+        logger.warning(f"Datenbank für Abfragen nicht lesbar, Verlauf nicht verfügbar: {e}")
+    
+    # Verlauf für die Diagramme einmalig übernehmen, danach über die Ereignisse fortschreiben
+    try:
+        history = remote.call('history', timeout=max(command_timeout, 10.0))
+        for name, series in history.items():
+            for timestamp, value in zip(series['timestamps'], series['values']):
+                recent_history.append(name, value, timestamp)
+    except (TimeoutError, RuntimeError) as e:
+        logger.warning(f"Verlauf konnte nicht übernommen werden: {e}")
+    
+    server = WebServer.from_config(app, socketio, config['web'])
+    init_web_server(server)
+    
+    def handle_sigterm(signum, frame):
+        # stop() wartet auf den Server, der in diesem Thread läuft
+        threading.Thread(target=server.stop, name='mgb-web-stop', daemon=True).start()
+    
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    
+    stop = threading.Event()
+    poller = threading.Thread(target=_poll_events, args=(remote, poll_interval, stop),
+                              name='mgb-web-events', daemon=True)
+    poller.start()
+    try:
+        server.serve_forever()
+    finally:
+        stop.set()
@@ -0,0 +1,137 @@
+"""
+API-Endpunkte des Replikationsempfängers: Stapel der Boxen, Cursor, Übersicht
+"""
+
+from flask import Blueprint, request, jsonify
+from functools import wraps
+import hmac
+import json
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.metrics import metrics
+from web.fleet import _BOX_ID, _UploadTooLarge, _read_body
+
+logger = logging.getLogger(__name__)
+
+# Blueprint für Replikations-Endpunkte
+replication_bp = Blueprint('replication', __name__, url_prefix='/api/replication')
+
+# Kopien der Boxen und Abschnitt 'replication.receiver' (werden von replica.py gesetzt)
+replica_store = None
+receiver_config = {}
+
+_rejected_batches = metrics.counter(
+    'mgb_replica_rejected_batches_total', 'Abgelehnte Stapel der Replikation', ('reason',))
+
+
+def init_receiver(store, config: dict):
+    """
+    Initialisiert die Replikations-Endpunkte
+    
+    Args:
+        store: ReplicaStore Instanz
+        config: Abschnitt 'replication.receiver' aus config.yaml
+    """
+    global replica_store, receiver_config
+    replica_store = store
+    receiver_config = config or {}
+
+
+def require_replication_token(view):
+    """
+    Prüft den Schlüssel aus ``replication.receiver.token`` (leer = ohne Prüfung)
+    (Header ``Authorization: Bearer <token>``)
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token = receiver_config.get('token')
+        if token:
+            authorization = request.headers.get('Authorization', '')
+            supplied = authorization[len('Bearer '):].strip() if authorization.startswith('Bearer ') else ''
+            if not hmac.compare_digest(supplied.encode('utf-8'), str(token).encode('utf-8')):
+                logger.warning(f"Replikationszugriff abgelehnt ({request.remote_addr})")
+                _rejected_batches.labels('unauthorized').inc()
+                return jsonify({'status': 'error', 'message': 'Nicht autorisiert'}), 401
+        
+        if replica_store is None:
+            return jsonify({'status': 'error', 'message': 'Empfänger nicht initialisiert'}), 503
+        if 'box' in kwargs and not _BOX_ID.match(kwargs['box']):
+            _rejected_batches.labels('invalid').inc()
+            return jsonify({'status': 'error', 'message': 'Ungültige Box-Kennung'}), 400
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def _parse_batch(data: bytes) -> dict:
+    """
+    Wandelt NDJSON-Zeilen in einen Stapel je Tabelle um
+    
+    Je Zeile: ``{"table", "columns": [...], "rows": [[...], ...]}``
+    
+    Raises:
+        ValueError: Zeile ungültig
+    """
+    batch = {}
+    for number, line in enumerate(data.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            part = json.loads(line)
+            columns = [str(column) for column in part['columns']]
+            rows = [tuple(row) for row in part['rows']]
+            if any(len(row) != len(columns) for row in rows):
+                raise ValueError("Spaltenzahl passt nicht")
+            table = str(part['table'])
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Zeile {number} ungültig: {e}")
+        if table in batch:
+            raise ValueError(f"Tabelle '{table}' mehrfach im Stapel")
+        batch[table] = (columns, rows)
+    return batch
+
+
+@replication_bp.route('/<box>', methods=['POST'])
+@require_replication_token
+def receive(box):
+    """
+    Übernimmt einen Stapel einer Box (NDJSON, optional gzip)
+    
+    Antwortet erst nach dem Commit mit den Cursorn aller Tabellen.
+    """
+    try:
+        batch = _parse_batch(_read_body(receiver_config.get('max_upload_bytes', 16 * 1024 * 1024)))
+        cursors = replica_store.apply(box, batch)
+    except _UploadTooLarge as e:
+        _rejected_batches.labels('too_large').inc()
+        return jsonify({'status': 'error', 'message': str(e)}), 413
+    except ValueError as e:
+        _rejected_batches.labels('invalid').inc()
+        logger.warning(f"Stapel von {box} abgelehnt: {e}")
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    
+    return jsonify({
+        'status': 'success',
+        'accepted': {table: len(rows) for table, (_, rows) in batch.items()},
+        'cursors': cursors
+    })
+
+
+@replication_bp.route('/<box>/cursors')
+@require_replication_token
+def get_cursors(box):
+    """
+    Höchste übernommene ID je Tabelle (Wiederaufsetzen ohne lokale Cursor-Datei)
+    """
+    return jsonify({'box': box, 'cursors': replica_store.cursors(box)})
+
+
+@replication_bp.route('/')
+@require_replication_token
+def list_boxes():
+    """
+    Alle Boxen mit Cursorn, letztem Stapel und Größe der Kopie
+    """
+    return jsonify(replica_store.boxes())
@@ -0,0 +1,437 @@
+"""
+Webserver für Flask/Socket.IO im Dauerbetrieb
+
+Ersetzt den Werkzeug-Entwicklungsserver aus ``socketio.run``. Modi
+(``web.server.mode``):
+
+- ``gevent``: Verbindungen und WebSockets laufen als Greenlets (kein Thread je
+  Client), normale HTTP-Anfragen in einem begrenzten Thread-Pool, damit
+  blockierende Aufrufe (SQLite, WLAN-Scan) die WebSockets nicht anhalten
+- ``threading``: Werkzeug-Server mit begrenztem Thread-Pool und
+  Verbindungslimit (Rückfall ohne gevent; jeder WebSocket belegt einen Worker)
+- ``development``: bisheriges ``socketio.run`` (Debugger, Reloader)
+- ``auto``: ``gevent``, falls installiert, sonst ``threading``
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+MODES = ('auto', 'gevent', 'threading', 'development')
+
+# Gepufferte Antwortgröße, bis zu der eine Antwort in einem Schritt aus dem
+# Thread-Pool zurückgegeben wird (größere Antworten werden stückweise gelesen)
+_BUFFER_LIMIT = 64 * 1024
+
+_REJECT_RESPONSE = (b'HTTP/1.1 503 Service Unavailable\r\n'
+                    b'Content-Length: 0\r\nConnection: close\r\nRetry-After: 1\r\n\r\n')
+
+web_connections = metrics.gauge('mgb_web_connections', 'Offene HTTP-/WebSocket-Verbindungen')
+web_rejected_connections = metrics.counter(
+    'mgb_web_rejected_connections_total', 'Wegen voller Verbindungsgrenze abgewiesene Verbindungen')
+
+
+def resolve_mode(web_config: dict) -> str:
+    """
+    Ermittelt den Servermodus aus dem Abschnitt 'web' der Konfiguration
+    
+    Returns:
+        'gevent', 'threading' oder 'development'
+    """
+    server_config = web_config.get('server', {})
+    mode = server_config.get('mode', 'auto')
+    if mode not in MODES:
+        logger.warning(f"Unbekannter Servermodus '{mode}', verwende 'auto'")
+        mode = 'auto'
+    if mode in ('auto', 'gevent'):
+        try:
+            import gevent  # noqa: F401
+            return 'gevent'
+        except ImportError:
+            if mode == 'gevent':
+                logger.warning("gevent nicht installiert, verwende Servermodus 'threading'")
+            return 'threading'
+    return mode
+
+
+def socketio_options(web_config: dict) -> dict:
+    """
+    Optionen für ``SocketIO(...)`` passend zum Servermodus
+    
+    Args:
+        web_config: Abschnitt 'web' der Konfiguration
+    """
+    server_config = web_config.get('server', {})
+    return {
+        'async_mode': 'gevent' if resolve_mode(web_config) == 'gevent' else 'threading',
+        'ping_interval': server_config.get('ping_interval', 25),
+        'ping_timeout': server_config.get('ping_timeout', 20)
+    }
+
+
+def _bounded_server_class():
+    # Werkzeug erst im Modus 'threading' importieren
+    from werkzeug.serving import BaseWSGIServer
+    
+    class BoundedWSGIServer(BaseWSGIServer):
+        """
+        Werkzeug-Server mit festem Thread-Pool und Verbindungsgrenze
+        
+        Angenommene Verbindungen werden an den Pool übergeben; wartende
+        Verbindungen zählen zur Grenze. Ist sie erreicht, wird mit 503
+        geantwortet statt einen weiteren Thread zu starten.
+        """
+        
+        multithread = True
+        
+        def __init__(self, host, port, app, handler, workers: int,
+                     max_connections: int, backlog: int):
+            self.request_queue_size = backlog
+            super().__init__(host, port, app, handler)
+            self.max_connections = max_connections
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='mgb-web')
+            self._connections = set()
+            self._idle = threading.Condition()
+        
+        def active_connections(self) -> int:
+            return len(self._connections)
+        
+        def process_request(self, request, client_address):
+            with self._idle:
+                accepted = len(self._connections) < self.max_connections
+                if accepted:
+                    self._connections.add(request)
+            if not accepted:
+                web_rejected_connections.inc()
+                try:
+                    request.sendall(_REJECT_RESPONSE)
+                except OSError:
+                    pass
+                self.shutdown_request(request)
+                return
+            self._executor.submit(self._process, request, client_address)
+        
+        def _process(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+                with self._idle:
+                    self._connections.discard(request)
+                    self._idle.notify_all()
+        
+        def drain(self, timeout: float):
+            """
+            Wartet, bis laufende Verbindungen beendet sind, und trennt die übrigen
+            """
+            deadline = time.monotonic() + timeout
+            with self._idle:
+                while self._connections:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._idle.wait(remaining)
+                remaining_connections = list(self._connections)
+            for connection in remaining_connections:
+                try:
+                    connection.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+            self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    return BoundedWSGIServer
+
+
+class WebServer:
+    """
+    Betreibt die Flask-App samt Socket.IO im konfigurierten Modus
+    
+    ``serve_forever`` blockiert (eigener Thread in main.py), ``stop`` beendet
+    den Server geordnet: keine neuen Verbindungen, Socket.IO-Clients trennen,
+    laufende Anfragen bis ``shutdown_timeout`` abwarten.
+    """
+    
+    def __init__(self, app, socketio, host: str = '0.0.0.0', port: int = 5000,
+                 mode: str = 'threading', workers: int = 8, max_connections: int = 200,
+                 keepalive_timeout: float = 15.0, shutdown_timeout: float = 5.0,
+                 backlog: int = 64, debug: bool = False):
+        """
+        Args:
+            app: Flask-App
+            socketio: SocketIO-Instanz der App (None für reine HTTP-Apps, z. B. den Flotten-Hub)
+            host: Adresse
+            port: Port
+            mode: 'gevent', 'threading' oder 'development'
+            workers: Threads für HTTP-Anfragen
+            max_connections: Gleichzeitig offene Verbindungen (inkl. WebSockets)
+            keepalive_timeout: Sekunden, nach denen eine ruhende Verbindung geschlossen wird
+            shutdown_timeout: Sekunden, die laufende Anfragen beim Beenden erhalten
+            backlog: Länge der Warteschlange für neue Verbindungen
+            debug: Flask-Debugmodus (nur Modus 'development')
+        """
+        self.app = app
+        self.socketio = socketio
+        self.host = host
+        self.port = port
+        self.mode = mode
+        self.workers = workers
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self.shutdown_timeout = shutdown_timeout
+        self.backlog = backlog
+        self.debug = debug
+        
+        self._server = None
+        self._pool = None
+        self._hub = None
+        self._wakeup = None
+        self._pending = deque()
+        self._stop_timeout = shutdown_timeout
+        self._stopping = threading.Event()
+        self._stopped = threading.Event()
+        
+        web_connections.set_function(self.active_connections)
+    
+    @classmethod
+    def from_config(cls, app, socketio, web_config: dict) -> 'WebServer':
+        """
+        Erstellt den Server aus dem Abschnitt 'web' der Konfiguration
+        
+        Der Modus richtet sich nach ``socketio`` (``async_mode`` wird beim
+        Import der App aus derselben Konfiguration gewählt).
+        """
+        server_config = web_config.get('server', {})
+        if socketio is None:
+            mode = 'threading'
+        elif server_config.get('mode') == 'development':
+            mode = 'development'
+        else:
+            mode = 'gevent' if socketio.server.eio.async_mode == 'gevent' else 'threading'
+        return cls(
+            app, socketio,
+            host=web_config.get('host', '0.0.0.0'),
+            port=web_config.get('port', 5000),
+            mode=mode,
+            workers=server_config.get('workers', 8),
+            max_connections=server_config.get('max_connections', 200),
+            keepalive_timeout=server_config.get('keepalive_timeout', 15),
+            shutdown_timeout=server_config.get('shutdown_timeout', 5),
+            backlog=server_config.get('backlog', 64),
+            debug=web_config.get('debug', False)
+        )
+    
+    def active_connections(self) -> int:
+        """
+        Anzahl offener Verbindungen
+        """
+        if self._server is None or self.mode == 'development':
+            return 0
+        if self.mode == 'gevent':
+            return len(self._server.pool)
+        return self._server.active_connections()
+    
+    def serve_forever(self):
+        """
+        Startet den Server und blockiert bis ``stop``
+        """
+        logger.info(f"Starte Webserver auf {self.host}:{self.port} (Modus: {self.mode})")
+        try:
+            if self.mode == 'gevent':
+                self._serve_gevent()
+            elif self.mode == 'threading':
+                self._serve_threading()
+            else:
+                self.socketio.run(self.app, host=self.host, port=self.port, debug=self.debug,
+                                  allow_unsafe_werkzeug=True)
+        finally:
+            self._stopped.set()
+            logger.info("Webserver beendet")
+    
+    def call_soon(self, func: Callable, *args):
+        """
+        Führt ``func`` im Kontext des Servers aus (threadsicher)
+        
+        Im Modus 'gevent' dürfen Socket.IO-Aufrufe nur im Thread des
+        Event-Loops erfolgen; Aufrufe aus dem Monitoring-Loop werden deshalb
+        hierüber weitergereicht. In den anderen Modi wird direkt aufgerufen.
+        """
+        if self._wakeup is None:
+            func(*args)
+            return
+        self._pending.append((func, args))
+        self._wakeup.send()
+    
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Beendet den Server geordnet (mehrfacher Aufruf ist unschädlich)
+        
+        Args:
+            timeout: Sekunden für laufende Anfragen (Standard: shutdown_timeout)
+        """
+        if self._server is None or self._stopping.is_set():
+            return
+        self._stopping.set()
+        timeout = self.shutdown_timeout if timeout is None else timeout
+        logger.info(f"Beende Webserver ({self.active_connections()} offene Verbindungen)")
+        
+        if self.mode == 'gevent':
+            self.call_soon(self._stop_gevent, timeout)
+        else:
+            # Beendet serve_forever, das Abwarten übernimmt _serve_threading
+            self._stop_timeout = timeout
+            self._server.shutdown()
+        
+        if not self._stopped.wait(timeout + 2.0):
+            logger.warning("Webserver hat sich nicht rechtzeitig beendet")
+    
+    def _disconnect_clients(self):
+        # Nicht eio.disconnect(): wartet je Client auf dessen Sende-Warteschlange
+        if self.socketio is None:
+            return
+        try:
+            for client in list(self.socketio.server.eio.sockets.values()):
+                client.close(wait=False)
+        except Exception as e:
+            logger.warning(f"Socket.IO-Clients konnten nicht getrennt werden: {e}")
+    
+    # ------------------------------------------------------------------
+    # Modus 'threading'
+    # ------------------------------------------------------------------
+    
+    def _serve_threading(self):
+        from werkzeug.serving import WSGIRequestHandler
+        
+        keepalive_timeout = self.keepalive_timeout
+        
+        class KeepAliveRequestHandler(WSGIRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def handle_one_request(self):
+                # Ruhende Keep-Alive-Verbindungen belegen einen Worker, daher
+                # Zeitlimit beim Warten auf die nächste Anfrage
+                self.connection.settimeout(keepalive_timeout)
+                super().handle_one_request()
+            
+            def parse_request(self):
+                # Anfragezeile gelesen: ohne Zeitlimit weiter (WebSockets
+                # übernehmen den Socket)
+                self.connection.settimeout(None)
+                return super().parse_request()
+        
+        self._server = _bounded_server_class()(
+            self.host, self.port, self.app, KeepAliveRequestHandler,
+            workers=self.workers, max_connections=self.max_connections, backlog=self.backlog
+        )
+        try:
+            self._server.serve_forever()
+        finally:
+            self._disconnect_clients()
+            self._server.drain(self._stop_timeout)
+            self._server.server_close()
+    
+    # ------------------------------------------------------------------
+    # Modus 'gevent'
+    # ------------------------------------------------------------------
+    
+    def _serve_gevent(self):
+        import gevent
+        from gevent import pywsgi
+        from gevent.pool import Pool
+        from gevent.threadpool import ThreadPool
+        
+        keepalive_timeout = self.keepalive_timeout
+        
+        class KeepAliveHandler(pywsgi.WSGIHandler):
+            def read_requestline(self):
+                # Ruhende Verbindungen nach keepalive_timeout schließen; nur beim
+                # Warten auf die nächste Anfrage (WebSockets übernehmen den Socket)
+                self.socket.settimeout(keepalive_timeout)
+                try:
+                    return super().read_requestline()
+                finally:
+                    self.socket.settimeout(None)
+        
+        self._hub = gevent.get_hub()
+        self._pool = ThreadPool(self.workers)
+        self._wakeup = self._hub.loop.async_()
+        self._wakeup.start(self._run_pending)
+        
+        # Normale HTTP-Anfragen im Thread-Pool, Socket.IO bleibt im Event-Loop
+        middleware = self.app.wsgi_app
+        middleware.wsgi_app = self._offload(middleware.wsgi_app)
+        
+        self._server = pywsgi.WSGIServer(
+            (self.host, self.port), self.app, backlog=self.backlog,
+            spawn=Pool(self.max_connections), handler_class=KeepAliveHandler, log=None
+        )
+        try:
+            self._server.serve_forever()
+        finally:
+            middleware.wsgi_app = middleware.wsgi_app.__wrapped__
+            self._wakeup.stop()
+            self._wakeup = None
+            self._pool.kill()
+    
+    def _run_pending(self):
+        import gevent
+        
+        while self._pending:
+            func, args = self._pending.popleft()
+            gevent.spawn(func, *args)
+    
+    def _stop_gevent(self, timeout: float):
+        self._disconnect_clients()
+        self._server.stop(timeout=timeout)
+    
+    def _offload(self, wsgi_app):
+        pool = self._pool
+        
+        def run(environ, start_response):
+            # Kleine Antworten vollständig im Worker erzeugen (ein Wechsel)
+            result = wsgi_app(environ, start_response)
+            chunks, size = [], 0
+            iterator = iter(result)
+            for chunk in iterator:
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= _BUFFER_LIMIT:
+                    return chunks, iterator, result
+            close = getattr(result, 'close', None)
+            if close is not None:
+                close()
+            return chunks, None, None
+        
+        def stream(chunks, iterator, result):
+            try:
+                yield from chunks
+                while True:
+                    chunk = pool.apply(next, (iterator, None))
+                    if chunk is None:
+                        break
+                    yield chunk
+            finally:
+                close = getattr(result, 'close', None)
+                if close is not None:
+                    pool.apply(close)
+        
+        def offloaded(environ, start_response):
+            chunks, iterator, result = pool.apply(run, (environ, start_response))
+            if iterator is None:
+                return chunks
+            return stream(chunks, iterator, result)
+        
+        offloaded.__wrapped__ = wsgi_app
+        return offloaded
@@ -1,5 +1,6 @@
-// WebSocket-Verbindung
-const socket = io();
+// WebSocket-Verbindung (Mehrkammerbetrieb: Kammer über ?chamber=<id>)
+const chamberId = new URLSearchParams(window.location.search).get('chamber') || '';
+const socket = io({query: {chamber: chamberId}});
 
 // Globale Variablen
 let tempChart, humidityChart, co2Chart;
@@ -9,6 +10,7 @@ const maxDataPoints = 50;
 document.addEventListener('DOMContentLoaded', function() {
     console.log('Seite geladen, initialisiere...');
     initCharts();
+    loadChartHistory();
     loadInitialData();
     
     // Regelmäßige Aktualisierung
@@ -67,6 +69,35 @@ async function loadInitialData() {
     }
 }
 
+// Diagramme mit dem Verlauf aus dem Arbeitsspeicher des Servers füllen
+async function loadChartHistory() {
+    try {
+        const url = chamberId
+            ? `/api/chambers/${encodeURIComponent(chamberId)}/chart/bootstrap?limit=${maxDataPoints}`
+            : `/api/chart/bootstrap?limit=${maxDataPoints}`;
+        const response = await fetch(url);
+        const history = await response.json();
+        const sensorIds = {
+            'temperature': 'temp',
+            'humidity': 'humidity',
+            'co2': 'co2'
+        };
+        
+        for (const [sensorName, series] of Object.entries(history)) {
+            const chart = getChart(sensorIds[sensorName]);
+            if (!chart) continue;
+            
+            chart.data.labels = series.timestamps.map(
+                ts => new Date(ts * 1000).toLocaleTimeString('de-DE')
+            );
+            chart.data.datasets[0].data = series.values.slice();
+            chart.update('none');
+        }
+    } catch (error) {
+        console.error('Fehler beim Laden des Verlaufs:', error);
+    }
+}
+
 // Status aktualisieren
 async function updateStatus() {
     try {
@@ -120,6 +151,28 @@ function updateSensor(sensorId, sensorData) {
     }
 }
 
+// Live-Messwerte aus dem WebSocket anzeigen (vorab kodiertes JSON, siehe emit_samples)
+function updateSensorDisplay(data) {
+    const payload = typeof data === 'string' ? JSON.parse(data) : data;
+    const sensorIds = {
+        'temperature': 'temp',
+        'humidity': 'humidity',
+        'co2': 'co2'
+    };
+    
+    (payload.samples || []).forEach(sample => {
+        const sensorId = sensorIds[sample.sensor];
+        if (!sensorId) return;
+        
+        // Nicht endliche Werte (NaN, ±Inf) kommen als null an: Anzeige leeren, Lücke im Diagramm
+        const valueElement = document.getElementById(`${sensorId}-value`);
+        if (valueElement) {
+            valueElement.textContent = sample.value === null ? '--' : sample.value.toFixed(1);
+        }
+        updateChart(sensorId, sample.value);
+    });
+}
+
 // Einzelnen Aktor aktualisieren
 function updateActuator(actuatorId, actuatorData) {
     const statusElement = document.getElementById(`${actuatorId}-status`);
@@ -265,15 +318,19 @@ function initCharts() {
     });
 }
 
-// Diagramm aktualisieren
-function updateChart(sensorId, value) {
+// Diagramm zu einer Sensor-ID
+function getChart(sensorId) {
     const charts = {
         'temp': tempChart,
         'humidity': humidityChart,
         'co2': co2Chart
     };
-    
-    const chart = charts[sensorId];
+    return charts[sensorId];
+}
+
+// Diagramm aktualisieren
+function updateChart(sensorId, value) {
+    const chart = getChart(sensorId);
     if (!chart) return;
     
     const now = new Date().toLocaleTimeString('de-DE');
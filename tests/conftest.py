@@ -0,0 +1,68 @@
+"""
+Gemeinsame Einstellungen der Tests: ``src`` als Importpfad wie in main.py
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+
+class ManualScheduler:
+    """
+    DeadlineScheduler mit manuell fortgeschriebener Zeit (``advance``)
+    """
+    
+    def __init__(self):
+        self.now = 1000.0
+        self.calls = []
+    
+    def monotonic(self) -> float:
+        return self.now
+    
+    def start(self):
+        pass
+    
+    def call_at(self, deadline, callback):
+        from utils.scheduler import ScheduledCall
+        call = ScheduledCall(deadline, len(self.calls), callback)
+        self.calls.append(call)
+        return call
+    
+    def call_later(self, delay, callback):
+        return self.call_at(self.now + max(0.0, delay), callback)
+    
+    def pending(self) -> list:
+        return sorted(call for call in self.calls if not call.cancelled and call.deadline >= self.now)
+    
+    def advance(self, seconds: float):
+        """
+        Schreibt die Zeit fort und führt fällige Aufrufe in Reihenfolge aus
+        """
+        end = self.now + seconds
+        while True:
+            due = [call for call in self.calls if not call.cancelled and call.deadline <= end]
+            if not due:
+                break
+            call = min(due)
+            call.cancelled = True
+            self.now = max(self.now, call.deadline)
+            call.callback()
+        self.now = end
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Manueller Scheduler; time.monotonic der Steuerungsmodule folgt seiner Zeit
+    """
+    import controllers.actuator_controller
+    import controllers.output_scheduler
+    scheduler = ManualScheduler()
+    fake_time = SimpleNamespace(monotonic=scheduler.monotonic)
+    monkeypatch.setattr(controllers.actuator_controller, 'time', fake_time)
+    monkeypatch.setattr(controllers.output_scheduler, 'time', fake_time)
+    return scheduler
@@ -0,0 +1,133 @@
+"""
+Laufzeitschutz der Aktoren: Mindestlaufzeit, Abkühlzeit, Maximallaufzeit, Fehlschläge
+"""
+
+from actuators.base_actuator import BaseActuator
+from controllers.actuator_controller import GuardedActuator
+
+
+class StubActuator(BaseActuator):
+    """
+    Aktor, dessen Schaltbefehle über ``fail_off``/``fail_on`` fehlschlagen
+    """
+    
+    def __init__(self):
+        super().__init__('pump', 'pump')
+        self.fail_on = 0
+        self.fail_off = 0
+        self.writes = []
+    
+    def initialize(self) -> bool:
+        return True
+    
+    def _write(self, state: bool, failures: str) -> bool:
+        if getattr(self, failures):
+            setattr(self, failures, getattr(self, failures) - 1)
+            return False
+        self.writes.append(state)
+        self._record_state(state)
+        return True
+    
+    def turn_on(self) -> bool:
+        return self._write(True, 'fail_on')
+    
+    def turn_off(self) -> bool:
+        return self._write(False, 'fail_off')
+
+
+def _guarded(clock, **limits):
+    actuator = StubActuator()
+    return actuator, GuardedActuator(actuator, clock, retry_backoff=1.0, retry_max=8.0, **limits)
+
+
+def test_off_waits_for_min_runtime(clock):
+    actuator, guarded = _guarded(clock, min_runtime=5)
+    assert guarded.request(True)
+    clock.advance(2)
+    assert not guarded.request(False)
+    assert actuator.is_active and guarded.pending
+    
+    clock.advance(2.9)
+    assert actuator.is_active
+    clock.advance(0.1)
+    assert not actuator.is_active and not guarded.pending
+
+
+def test_on_waits_for_cooldown(clock):
+    actuator, guarded = _guarded(clock, cooldown=300)
+    guarded.request(True)
+    guarded.request(False)
+    clock.advance(100)
+    assert not guarded.request(True)
+    
+    clock.advance(199)
+    assert not actuator.is_active
+    clock.advance(1)
+    assert actuator.is_active
+
+
+def test_newer_request_replaces_deferred_one(clock):
+    actuator, guarded = _guarded(clock, min_runtime=5)
+    guarded.request(True)
+    guarded.request(False)
+    assert guarded.request(True)
+    clock.advance(10)
+    assert actuator.writes == [True]
+
+
+def test_max_runtime_switches_off(clock):
+    actuator, guarded = _guarded(clock, max_runtime=60)
+    guarded.request(True)
+    clock.advance(30)
+    guarded.request(True)  # Wiederholter Befehl verlängert die Laufzeit nicht
+    clock.advance(29.9)
+    assert actuator.is_active
+    clock.advance(0.1)
+    assert not actuator.is_active
+    assert guarded.get_status()['desired'] is False
+
+
+def test_max_runtime_is_kept_while_off_is_deferred(clock):
+    actuator, guarded = _guarded(clock, min_runtime=30, max_runtime=20)
+    guarded.request(True)
+    guarded.request(False)
+    clock.advance(20)
+    assert not actuator.is_active
+
+
+def test_failed_off_at_max_runtime_is_retried(clock):
+    actuator, guarded = _guarded(clock, max_runtime=60)
+    guarded.request(True)
+    actuator.fail_off = 3
+    clock.advance(60)
+    assert actuator.is_active and guarded.pending
+    
+    # Wiederholungen nach 1, 2 und 4 Sekunden
+    clock.advance(1)
+    clock.advance(2)
+    assert actuator.is_active
+    clock.advance(4)
+    assert not actuator.is_active and not guarded.pending
+    assert guarded.failures == 3
+
+
+def test_failed_off_keeps_max_runtime_guard(clock):
+    actuator, guarded = _guarded(clock, max_runtime=60)
+    guarded.request(True)
+    actuator.fail_off = 100
+    assert not guarded.request(False)
+    assert guarded.get_status()['desired'] is False
+    
+    clock.advance(600)
+    assert guarded.pending
+    actuator.fail_off = 0
+    clock.advance(8)
+    assert not actuator.is_active
+
+
+def test_failed_on_is_retried(clock):
+    actuator, guarded = _guarded(clock)
+    actuator.fail_on = 1
+    assert not guarded.request(True)
+    clock.advance(1)
+    assert actuator.is_active and not guarded.pending
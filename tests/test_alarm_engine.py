@@ -0,0 +1,78 @@
+"""
+Alarmauswertung: Verzögerung, Hysterese und ein Alarm je Grenzverletzung
+"""
+
+import pytest
+
+from controllers.alarm_engine import AlarmEngine
+from utils.data_logger import DataLogger
+from utils.records import Sample
+
+CONFIG = {
+    'sensors': {'temperature': {'max_value': 28.0}},
+    'alarms': {'temperature_critical_max': 35.0, 'hold_off': 30, 'hysteresis': {'temperature': 0.5}}
+}
+
+
+@pytest.fixture
+def engine(tmp_path):
+    broadcasts = []
+    engine = AlarmEngine(CONFIG, DataLogger(str(tmp_path / 'mgb.db')), on_alarm=broadcasts.append)
+    engine.broadcasts = broadcasts
+    return engine
+
+
+def _feed(engine: AlarmEngine, *points) -> list:
+    """
+    Wertet (Sekunde, Wert)-Paare aus und liefert die neu ausgelösten Alarmtypen
+    """
+    raised = []
+    for second, value in points:
+        sample = Sample('temperature', value, '°C', timestamp=1700000000.0 + second, monotonic=1000.0 + second)
+        raised.extend(event.alarm_type for event in engine.evaluate(sample))
+    return raised
+
+
+def _rows(engine: AlarmEngine) -> list:
+    engine.data_logger.flush()
+    return [row['alarm_type'] for row in engine.data_logger.get_unacknowledged_alarms()]
+
+
+def test_hold_off(engine):
+    assert _feed(engine, (0, 29.0), (10, 29.0), (29, 29.0)) == []
+    assert _feed(engine, (30, 29.0)) == ['temperature_max']
+    assert [alarm['alarm_type'] for alarm in engine.active_alarms()] == ['temperature_max']
+
+
+def test_hold_off_restarts_after_interruption(engine):
+    assert _feed(engine, (0, 29.0), (20, 27.0), (25, 29.0), (54, 29.0)) == []
+    assert _feed(engine, (55, 29.0)) == ['temperature_max']
+
+
+def test_hysteresis_clears_alarm(engine):
+    _feed(engine, (0, 29.0), (30, 29.0))
+    # Unter der Grenze, aber innerhalb der Hysterese: bleibt aktiv
+    _feed(engine, (40, 27.8))
+    assert len(engine.active_alarms()) == 1
+    _feed(engine, (50, 27.5))
+    assert engine.active_alarms() == []
+    
+    # Erneute Verletzung muss wieder hold_off anstehen
+    assert _feed(engine, (60, 29.0), (89, 29.0)) == []
+    assert _feed(engine, (90, 29.0)) == ['temperature_max']
+
+
+def test_one_row_and_broadcast_while_active(engine):
+    _feed(engine, *[(second, 29.0) for second in range(0, 600, 10)])
+    assert len(engine.broadcasts) == 1
+    assert _rows(engine) == ['temperature_max']
+    
+    # Kritische Grenze ist ein eigener Alarm (kritische zuerst)
+    _feed(engine, (600, 36.0), (630, 36.0), (640, 36.0))
+    assert [event.alarm_type for event in engine.broadcasts] == ['temperature_max', 'temperature_critical_max']
+    assert [alarm['alarm_type'] for alarm in engine.active_alarms()] == ['temperature_critical_max', 'temperature_max']
+    
+    # Nach dem Aufheben zählt eine neue Verletzung wieder
+    _feed(engine, (700, 27.0), (710, 29.0), (740, 29.0))
+    assert len(engine.broadcasts) == 3
+    assert sorted(_rows(engine)) == ['temperature_critical_max', 'temperature_max', 'temperature_max']
@@ -0,0 +1,68 @@
+"""
+Tests: Versiegeln von Messwerten zu Archivblöcken (DataLogger.seal_archive)
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+import utils.data_logger as data_logger_module
+from utils.data_logger import DataLogger
+
+
+@pytest.fixture
+def statements(monkeypatch):
+    """
+    Alle SQL-Anweisungen neuer Verbindungen (über set_trace_callback)
+    """
+    executed = []
+    connect = sqlite3.connect
+    
+    def traced_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        conn.set_trace_callback(executed.append)
+        return conn
+    
+    monkeypatch.setattr(sqlite3, 'connect', traced_connect)
+    return executed
+
+
+def _log_hourly_rows(logger: DataLogger, start: datetime, count: int):
+    logger.log_rows([
+        ((start + timedelta(seconds=i)).isoformat(), 'temperature', 20.0 + i % 10, '°C', 'default')
+        for i in range(count)
+    ])
+
+
+@pytest.mark.parametrize('partition', ['month', None])
+def test_live_file_is_not_vacuumed(tmp_path, monkeypatch, statements, partition):
+    # Volle Stapel, die über eine Blockgrenze (Stunde) reichen
+    monkeypatch.setattr(data_logger_module, '_SEAL_BATCH', 5000)
+    now = datetime.now()
+    start = now.replace(minute=0, second=0, microsecond=0) - timedelta(hours=3)
+    if partition and start.month != now.month:
+        pytest.skip("Erste Stunden des Monats: keine versiegelbaren Messwerte der laufenden Partition")
+    
+    logger = DataLogger(str(tmp_path / 'test.db'), partition=partition, archive_block='hour')
+    _log_hourly_rows(logger, start, 3 * 3600)
+    del statements[:]
+    
+    sealed = logger.seal_archive(seal_after_hours=1)
+    
+    assert sealed > data_logger_module._SEAL_BATCH
+    assert not any(statement.strip().upper() == 'VACUUM' for statement in statements)
+    assert any('incremental_vacuum' in statement for statement in statements)
+
+
+def test_completed_partition_is_vacuumed(tmp_path, monkeypatch, statements):
+    monkeypatch.setattr(data_logger_module, '_SEAL_BATCH', 500)
+    logger = DataLogger(str(tmp_path / 'test.db'), partition='month', archive_block='hour')
+    _log_hourly_rows(logger, datetime(2025, 1, 10), 3000)
+    del statements[:]
+    
+    assert logger.seal_archive(seal_after_hours=1) == 3000
+    assert any(statement.strip().upper() == 'VACUUM' for statement in statements)
+    
+    values = [row['value'] for row in logger.get_samples_after(0, 5000)]
+    assert values == [20.0 + i % 10 for i in range(3000)]
@@ -0,0 +1,77 @@
+"""
+Streaming-Filter: Hampel über das sortierte Fenster, Replay identisch zur Pipeline
+"""
+
+import random
+from pathlib import Path
+
+import pytest
+import yaml
+
+from controllers.chamber import Chamber
+from sensors.base_sensor import BaseSensor
+from sensors.filters import FilterPipeline, HampelFilter, MAD_SCALE, _sorted_median, apply_filters
+from utils.data_logger import DataLogger
+from utils.scheduler import DeadlineScheduler
+
+CONFIGS = [
+    [{'type': 'hampel', 'window': 7, 'n_sigmas': 3.0, 'min_threshold': 0.5}, {'type': 'ema', 'alpha': 0.5}],
+    [{'type': 'hampel', 'window': 6, 'n_sigmas': 2.0}, {'type': 'median', 'window': 3}],
+    [{'type': 'median', 'window': 4}, {'type': 'hampel', 'window': 15}],
+]
+
+
+def _series(seed: int, count: int = 2000) -> list:
+    """
+    Rauschen mit Ausreißern und quantisierten Werten (viele gleiche Abweichungen)
+    """
+    rng = random.Random(seed)
+    values = []
+    for i in range(count):
+        value = round(22.0 + rng.gauss(0, 0.3), 1)
+        if rng.random() < 0.03:
+            value += rng.choice((-1, 1)) * rng.uniform(3, 30)
+        values.append(value)
+    return values
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('window', [1, 2, 5, 8])
+def test_hampel_matches_sorted_deviations(seed, window):
+    hampel = HampelFilter(window=window, n_sigmas=2.0)
+    history = []
+    for value in _series(seed, 500):
+        history = (history + [value])[-window:]
+        median = _sorted_median(sorted(history))
+        mad = _sorted_median(sorted(abs(v - median) for v in history))
+        expected = median if abs(value - median) > 2.0 * MAD_SCALE * mad else value
+        assert hampel.process(value) == expected
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('filters_config', CONFIGS)
+def test_vectorized_matches_streaming(seed, filters_config):
+    pytest.importorskip('numpy')
+    values = _series(seed)
+    pipeline = FilterPipeline.from_config(filters_config)
+    assert apply_filters(values, filters_config) == [pipeline.process(value) for value in values]
+
+
+class _FakeSensor(BaseSensor):
+    def initialize(self) -> bool:
+        return True
+    
+    def read(self):
+        return 22.0
+
+
+def test_chamber_configures_sensors(tmp_path):
+    with open(Path(__file__).parent.parent / 'config' / 'config.yaml', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    sensor = _FakeSensor('temperature', '°C', min_interval=0.0, max_age=0.0)
+    scheduler = DeadlineScheduler()
+    Chamber('default', config, DataLogger(str(tmp_path / 'mgb.db')), scheduler, sensors={'temperature': sensor})
+    
+    assert sensor.min_interval == config['sensors']['temperature']['min_interval']
+    assert sensor.max_age == config['sensors']['temperature']['max_age']
+    assert [type(stage).__name__ for stage in sensor.pipeline.stages] == ['HampelFilter', 'EMAFilter']
@@ -0,0 +1,113 @@
+"""
+Log-Filter: Deduplizierung, Token-Bucket und Zusammenfassungen
+"""
+
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+import utils.log_filter
+from utils.log_filter import RateLimitFilter
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+    
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def now(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(utils.log_filter, 'time', SimpleNamespace(monotonic=lambda: clock[0]))
+    return clock
+
+
+def _logger(log_filter: RateLimitFilter, name: str = 'test.log_filter'):
+    target = logging.getLogger(name)
+    target.handlers = []
+    target.filters = []
+    target.propagate = False
+    target.setLevel(logging.DEBUG)
+    handler = _ListHandler()
+    target.addHandler(handler)
+    log_filter.install(target)
+    return target, handler
+
+
+def _messages(handler: _ListHandler) -> list:
+    return [record.getMessage() for record in handler.records]
+
+
+def test_repeats_are_summarized_with_next_occurrence(now):
+    log, handler = _logger(RateLimitFilter(dedup_interval=60))
+    for _ in range(5):
+        log.warning("Sensor %s nicht erreichbar", 'co2')
+    assert _messages(handler) == ["Sensor co2 nicht erreichbar"]
+    
+    now[0] += 61
+    log.warning("Sensor %s nicht erreichbar", 'co2')
+    assert _messages(handler)[1:] == ["Sensor co2 nicht erreichbar (4 mal wiederholt)"]
+
+
+def test_flush_summarizes_storm_that_stopped(now):
+    log_filter = RateLimitFilter(dedup_interval=60)
+    log, handler = _logger(log_filter)
+    for _ in range(5):
+        log.warning("Sensor nicht erreichbar")
+    
+    now[0] += 30
+    assert log_filter.flush() == 0
+    now[0] += 31
+    assert log_filter.flush() == 1
+    assert _messages(handler)[1:] == ["Sensor nicht erreichbar (4 mal wiederholt)"]
+    assert handler.records[1].levelno == logging.WARNING
+    
+    # Bereits gemeldet: keine zweite Zusammenfassung
+    now[0] += 61
+    assert log_filter.flush() == 0
+
+
+def test_stop_flushes_pending_summaries(now):
+    log_filter = RateLimitFilter(dedup_interval=60)
+    log, handler = _logger(log_filter)
+    log.warning("Sensor nicht erreichbar")
+    log.warning("Sensor nicht erreichbar")
+    log_filter.stop()
+    assert _messages(handler) == ["Sensor nicht erreichbar", "Sensor nicht erreichbar (1 mal wiederholt)"]
+
+
+def test_token_bucket_limits_rate_and_reports_drops(now):
+    log_filter = RateLimitFilter(rate=1.0, burst=3)
+    log, handler = _logger(log_filter)
+    for i in range(10):
+        log.info("Meldung %d", i)
+    assert _messages(handler) == ["Meldung 0", "Meldung 1", "Meldung 2"]
+    
+    now[0] += 1
+    log.info("Meldung 10")
+    assert _messages(handler)[3:] == ["Meldung 10 (7 Meldungen durch Ratenbegrenzung verworfen)"]
+    
+    log.info("Meldung 11")
+    assert log_filter.flush() == 1
+    assert _messages(handler)[4:] == ["1 Meldungen durch Ratenbegrenzung verworfen"]
+
+
+def test_errors_are_neither_limited_nor_deduplicated(now):
+    log, handler = _logger(RateLimitFilter(rate=1.0, burst=1))
+    for _ in range(5):
+        log.error("Schreiben fehlgeschlagen")
+    assert len(handler.records) == 5
+
+
+def test_evicted_entry_is_summarized(now):
+    log, handler = _logger(RateLimitFilter(max_entries=2))
+    log.warning("a")
+    log.warning("a")
+    log.warning("b")
+    log.warning("c")
+    assert _messages(handler) == ["a", "b", "a (1 mal wiederholt)", "c"]
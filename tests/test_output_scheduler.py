@@ -0,0 +1,114 @@
+"""
+Zeitproportionale Ausgänge: Schaltzeitpunkte, min_pulse und Anbindung an die PID-Regler
+"""
+
+import time
+from pathlib import Path
+
+import yaml
+
+from actuators.relay_actuator import RelayActuator
+from controllers.actuator_controller import GuardedActuator
+from controllers.chamber import Chamber
+from controllers.output_scheduler import OutputScheduler
+from sensors.base_sensor import BaseSensor
+from utils.data_logger import DataLogger
+from utils.records import Sample
+from utils.scheduler import DeadlineScheduler
+
+
+class RecordingRelay(RelayActuator):
+    """
+    Simuliertes Relais, das jeden Schaltvorgang mit Zeitpunkt festhält
+    """
+    
+    def __init__(self, clock):
+        super().__init__('heater', 'heater', pin=27)
+        self.clock = clock
+        self.switches = []
+        self.initialize()
+    
+    def _write(self, state: bool) -> bool:
+        self.switches.append((self.clock(), state))
+        return super()._write(state)
+
+
+def _output(clock, duty: float, cycle_length: float = 60.0, min_pulse: float = 2.0):
+    relay = RecordingRelay(clock.monotonic)
+    outputs = OutputScheduler(clock)
+    outputs.add(GuardedActuator(relay, clock), {'cycle_length': cycle_length, 'min_pulse': min_pulse})
+    outputs.set_output('heater', duty)
+    return relay, outputs
+
+
+def test_on_and_off_deadlines(clock):
+    start = clock.now
+    relay, outputs = _output(clock, 25.0)
+    clock.advance(130)
+    assert relay.switches == [(start, True), (start + 15, False), (start + 60, True),
+                              (start + 75, False), (start + 120, True)]
+    
+    # Neue Stellgröße gilt ab dem nächsten Zyklus
+    outputs.set_output('heater', 50.0)
+    clock.advance(60)
+    assert relay.switches[5:] == [(start + 135, False), (start + 180, True)]
+    clock.advance(30)
+    assert relay.switches[7:] == [(start + 210, False)]
+
+
+def test_min_pulse_rounds_to_off_and_full_cycle(clock):
+    relay, outputs = _output(clock, 100 * 1.5 / 60)
+    output = outputs.outputs['heater']
+    assert output.on_time() == 0.0
+    clock.advance(180)
+    assert relay.switches == []
+    
+    outputs.set_output('heater', 100 * 58.5 / 60)
+    assert output.on_time() == 60.0
+    clock.advance(180)
+    assert [state for _, state in relay.switches] == [True]
+    
+    outputs.set_output('heater', 100 * 3 / 60)
+    assert output.on_time() == 3.0
+
+
+def test_deadlines_on_scheduler_thread():
+    scheduler = DeadlineScheduler()
+    relay = RecordingRelay(time.monotonic)
+    outputs = OutputScheduler(scheduler)
+    outputs.add(GuardedActuator(relay, scheduler), {'cycle_length': 0.2, 'min_pulse': 0.01})
+    try:
+        start = time.monotonic()
+        outputs.set_output('heater', 25.0)
+        time.sleep(0.42)
+    finally:
+        outputs.stop()
+        scheduler.stop()
+    
+    assert [state for _, state in relay.switches] == [True, False, True, False, True]
+    for (at, _), offset in zip(relay.switches, (0.0, 0.05, 0.2, 0.25, 0.4)):
+        assert start + offset <= at + 0.001
+    assert outputs.get_status()['heater']['max_latency_ms'] < 50
+
+
+class _FakeSensor(BaseSensor):
+    def initialize(self) -> bool:
+        return True
+    
+    def read(self):
+        return 18.0
+
+
+def test_pid_output_reaches_actuator(clock, tmp_path):
+    with open(Path(__file__).parent.parent / 'config' / 'config.yaml', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    relay = RecordingRelay(clock.monotonic)
+    sensor = _FakeSensor('temperature', '°C', min_interval=0.0, max_age=0.0)
+    chamber = Chamber('default', config, DataLogger(str(tmp_path / 'mgb.db')), clock,
+                      sensors={'temperature': sensor}, actuators={'heater': relay})
+    
+    chamber.process([Sample('temperature', 18.0, '°C')])
+    output = chamber.output_scheduler.outputs['heater']
+    assert output.duty > 0
+    assert relay.is_active
+    assert chamber.actuator_controller.get_status()['heater']['desired'] is True
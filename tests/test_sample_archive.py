@@ -0,0 +1,64 @@
+"""
+Tests: Gorilla-Kodierung der Archivblöcke (bitgenauer Hin- und Rückweg)
+"""
+
+import math
+import random
+import struct
+
+import pytest
+
+from utils.sample_archive import decode_block, encode_block, iter_block
+
+
+def _bits(value: float) -> bytes:
+    return struct.pack('<d', value)
+
+
+def _round_trip(ids, stamps, values):
+    data = encode_block(ids, stamps, values)
+    decoded = list(iter_block(data))
+    assert [row[0] for row in decoded] == list(ids)
+    assert [row[1] for row in decoded] == list(stamps)
+    # Bitgenau: NaN, -0.0 und +0.0 unterscheiden sich nur im Bitmuster
+    assert [_bits(row[2]) for row in decoded] == [_bits(value) for value in values]
+    
+    columns = decode_block(data)
+    assert list(columns['ids']) == list(ids)
+    assert list(columns['timestamps']) == list(stamps)
+    assert [_bits(value) for value in columns['values']] == [_bits(value) for value in values]
+
+
+def test_special_values():
+    values = [0.0, -0.0, 0.0, math.nan, math.nan, math.inf, -math.inf, -0.0, 1e-310, 22.5]
+    ids = list(range(1, len(values) + 1))
+    stamps = [1_760_000_000_000 + 1000 * i for i in range(len(values))]
+    _round_trip(ids, stamps, values)
+
+
+def test_repeated_values():
+    values = [21.5] * 500 + [21.6] * 3 + [21.5] * 500
+    ids = list(range(10, 10 + len(values)))
+    stamps = [1_760_000_000_000 + 1000 * i for i in range(len(values))]
+    _round_trip(ids, stamps, values)
+    # Unveränderte Werte kosten ein Bit: deutlich kleiner als 8 Bytes je Wert
+    assert len(encode_block(ids, stamps, values)) < len(values)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_irregular_timestamps_and_ids(seed):
+    rng = random.Random(seed)
+    ids, stamps, values = [], [], []
+    row_id, ms = rng.randrange(1, 10 ** 9), 1_760_000_000_000
+    for _ in range(2000):
+        # Lücken aller Kodierungsbereiche (bis zur 64-Bit-Ausweichkodierung)
+        row_id += rng.choice((1, 1, 1, 3, 200, 5000, 10 ** 7))
+        ms += rng.choice((1000, 1000, 999, 1001, 0, 30_000, 3_600_000, 86_400_000 * 40))
+        ids.append(row_id)
+        stamps.append(ms)
+        values.append(rng.choice((rng.uniform(-50, 150), values[-1] if values else 0.0, math.nan, -0.0)))
+    _round_trip(ids, stamps, values)
+
+
+def test_single_value():
+    _round_trip([7], [1_760_000_000_000], [-0.0])
@@ -0,0 +1,131 @@
+"""
+Journal für Messwerte: Nachspielen nach Absturz, Umläufe, Kopfbereiche, Überlauf
+"""
+
+import os
+from datetime import datetime
+
+from utils.data_logger import DataLogger
+from utils.records import Sample
+from utils.sample_journal import SampleJournal, _DATA_OFFSET, _RECORD, _SLOT_SIZE
+
+
+def _samples(start: int, count: int) -> list:
+    return [Sample('temperature', 20.0 + i, '°C', 1700000000.0 + i) for i in range(start, start + count)]
+
+
+def _rows(samples: list, chamber: str = 'default') -> list:
+    return [(datetime.fromtimestamp(sample.timestamp).isoformat(), sample.sensor, sample.value, sample.unit, chamber)
+            for sample in samples]
+
+
+def _crash(journal: SampleJournal):
+    # Wie ein Absturz: weder Übernahme noch stop(), nur die Abbildung schließen
+    journal.sync()
+    journal._close_map()
+
+
+def test_replay_after_crash(tmp_path):
+    path = tmp_path / 'journal.bin'
+    journal = SampleJournal(str(path), [].extend, capacity=16)
+    journal.open()
+    samples = _samples(0, 5)
+    assert journal.append([('default', samples[:3]), ('b', samples[3:])])
+    _crash(journal)
+    
+    rows = []
+    journal = SampleJournal(str(path), rows.extend, capacity=16)
+    journal.start()
+    assert rows == _rows(samples[:3]) + _rows(samples[3:], 'b')
+    assert journal.pending() == 0
+    journal.stop()
+    
+    # Übernommenes wird kein zweites Mal nachgespielt
+    journal = SampleJournal(str(path), rows.extend, capacity=16)
+    assert journal.open() == 0
+    journal._close_map()
+
+
+def test_records_of_earlier_wrap_are_rejected(tmp_path):
+    path = tmp_path / 'journal.bin'
+    rows = []
+    journal = SampleJournal(str(path), rows.extend, capacity=4)
+    journal.open()
+    journal.append([('default', _samples(0, 4))])
+    assert journal.compact() == 4
+    # Zweiter Umlauf überschreibt nur die ersten beiden Plätze
+    journal.append([('default', _samples(4, 2))])
+    _crash(journal)
+    
+    # Plätze 2 und 3 tragen noch gültige Datensätze mit den Laufnummern 2 und 3
+    rows = []
+    journal = SampleJournal(str(path), rows.extend, capacity=4)
+    assert journal.open() == 2
+    journal.compact()
+    assert rows == _rows(_samples(4, 2))
+    journal._close_map()
+
+
+def test_torn_header_falls_back_to_other_slot(tmp_path):
+    path = tmp_path / 'journal.bin'
+    journal = SampleJournal(str(path), [].extend, capacity=16)
+    journal.open()
+    journal.append([('default', _samples(0, 3))])
+    journal.compact()
+    slot = journal._slot
+    journal.append([('default', _samples(3, 2))])
+    _crash(journal)
+    
+    # Abgebrochenes Schreiben des jüngsten Kopfes
+    with open(path, 'r+b') as f:
+        f.seek(slot * _SLOT_SIZE + 20)
+        f.write(b'\xff' * 16)
+    
+    # Der ältere Kopf kennt die Übernahme nicht: mindestens einmal, nichts verloren
+    rows = []
+    journal = SampleJournal(str(path), rows.extend, capacity=16)
+    assert journal.open() == 5
+    journal.compact()
+    assert rows == _rows(_samples(0, 5))
+    journal._close_map()
+
+
+def test_full_journal_falls_back_to_direct_write(tmp_path):
+    data_logger = DataLogger(str(tmp_path / 'mgb.db'))
+    journal = SampleJournal(str(tmp_path / 'journal.bin'), data_logger.log_rows, capacity=4)
+    journal.open()
+    data_logger.journal = journal
+    
+    data_logger.log_samples(_samples(0, 3))
+    assert journal.pending() == 3
+    assert data_logger.get_sensor_data('temperature') == []
+    
+    data_logger.log_samples(_samples(3, 2))
+    assert journal.pending() == 3
+    assert [row['value'] for row in data_logger.get_sensor_data('temperature')] == [24.0, 23.0]
+    
+    journal.compact()
+    assert len(data_logger.get_sensor_data('temperature')) == 5
+    journal._close_map()
+
+
+def test_capacity_change_on_restart(tmp_path):
+    path = tmp_path / 'journal.bin'
+    journal = SampleJournal(str(path), [].extend, capacity=4)
+    journal.open()
+    journal.append([('default', _samples(0, 3))])
+    _crash(journal)
+    
+    # Nachspielen mit der alten Geometrie, danach in neuer Größe anlegen
+    rows = []
+    journal = SampleJournal(str(path), rows.extend, capacity=8)
+    journal.start()
+    assert rows == _rows(_samples(0, 3))
+    assert os.path.getsize(path) == _DATA_OFFSET + 8 * _RECORD.size
+    assert journal.append([('default', _samples(3, 8))])
+    journal.stop()
+    assert rows == _rows(_samples(0, 11))
+    
+    journal = SampleJournal(str(path), rows.extend, capacity=8)
+    assert journal.open() == 0
+    journal._close_map()
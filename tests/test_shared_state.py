@@ -0,0 +1,112 @@
+"""
+Gemeinsamer Zustand und Befehle zwischen Haupt- und Web-Prozess
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+import pytest
+
+import web.process
+from utils.shared_state import SharedState
+from web.process import RemoteControl, WebProcess
+
+
+def _read_until(name: str, last: int, results):
+    """
+    Leser im Kindprozess: prüft jeden gelesenen Stand auf Vollständigkeit
+    """
+    state = SharedState.attach(name)
+    results.put(state.read()[1]['n'])
+    seen, torn, previous = 0, 0, -1
+    deadline = time.monotonic() + 10
+    while previous < last and time.monotonic() < deadline:
+        result = state.read()
+        if result is None:
+            continue
+        n = result[1]['n']
+        if result[1]['payload'] != 'x' * (n % 1000) or n < previous:
+            torn += 1
+        if n != previous:
+            seen += 1
+        previous = n
+    state.close()
+    results.put((previous, seen, torn))
+
+
+def test_publish_and_read_across_processes():
+    context = multiprocessing.get_context('spawn')
+    state = SharedState.create(4096)
+    results = context.Queue()
+    try:
+        state.publish({'n': 0, 'payload': ''})
+        reader = context.Process(target=_read_until, args=(state.name, 5000, results), daemon=True)
+        reader.start()
+        assert results.get(timeout=15) == 0
+        for n in range(1, 5001):
+            state.publish({'n': n, 'payload': 'x' * (n % 1000)})
+            if n % 100 == 0:
+                time.sleep(0.001)
+        last, seen, torn = results.get(timeout=15)
+        reader.join(timeout=5)
+    finally:
+        state.close()
+    
+    assert last == 5000
+    assert seen > 1
+    assert torn == 0
+
+
+def test_call_times_out_and_ignores_late_reply():
+    state = SharedState.create(4096)
+    commands, replies = queue.Queue(), queue.Queue()
+    control = RemoteControl(state, commands, replies, timeout=0.05)
+    try:
+        with pytest.raises(TimeoutError):
+            control.call('history')
+        request_id, command, args = commands.get_nowait()
+        assert command == 'history'
+        replies.put((request_id, True, {}))  # Zu spät: wird verworfen
+        
+        def answer():
+            request_id, command, args = commands.get(timeout=5)
+            replies.put((request_id, command == 'actuator', args))
+        
+        threading.Thread(target=answer, daemon=True).start()
+        assert control.call('actuator', 'pump', True, timeout=5) == ('pump', True)
+        
+        threading.Thread(target=answer, daemon=True).start()
+        with pytest.raises(RuntimeError):
+            control.call('settings', timeout=5)
+    finally:
+        state.close()
+
+
+def _call_and_die(state_name, commands, replies, poll_interval, command_timeout):
+    """
+    Ersatz für run_web_process: ein Befehl mit Antwort, danach Absturz
+    """
+    remote = RemoteControl(SharedState.attach(state_name), commands, replies, timeout=command_timeout)
+    remote.call('echo', os.getpid(), remote.call('history'), sorted(remote.state()))
+    os._exit(1)
+
+
+def test_web_process_is_restarted_after_crash(monkeypatch):
+    monkeypatch.setattr(web.process, 'run_web_process', _call_and_die)
+    process = WebProcess({}, state_interval=0.05, command_timeout=5.0)
+    calls = []
+    process._handlers['echo'] = lambda *args: calls.append(args)
+    process.start()
+    try:
+        deadline = time.monotonic() + 20
+        while len(calls) < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        process.stop()
+    
+    assert len(calls) >= 2
+    assert calls[0][0] != calls[1][0]
+    assert calls[0][1:] == ({}, ['actuators', 'alarms', 'chambers', 'events', 'latest', 'updated'])
@@ -0,0 +1,169 @@
+"""
+Endpunkte der Weboberfläche im Web-Prozess (RemoteControl statt DataLogger)
+"""
+
+import io
+import queue
+import tarfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+import yaml
+
+import utils.data_logger as data_logger_module
+from utils.data_logger import DataLogger
+from utils.shared_state import SharedState
+from web.process import RemoteControl
+
+web_app = pytest.importorskip('web.app')
+
+
+@pytest.fixture
+def remote(monkeypatch):
+    """
+    Zugriff wie im Web-Prozess: Alarme und DataLogger über RemoteControl
+    """
+    state = SharedState.create(4096)
+    control = RemoteControl(state, queue.Queue(), queue.Queue(), timeout=0.1)
+    monkeypatch.setattr(web_app, 'alarm_engine', None)
+    monkeypatch.setattr(web_app, 'data_logger', None)
+    monkeypatch.setattr(web_app, 'sample_reader', None)
+    web_app.init_alarm_engine(control)
+    yield control
+    state.close()
+
+
+@pytest.fixture
+def client():
+    return web_app.app.test_client()
+
+
+def _rows(start: datetime, count: int) -> list:
+    return [((start + timedelta(seconds=i)).isoformat(), 'temperature', 20.0 + i, '°C', 'default')
+            for i in range(count)]
+
+
+def test_history_without_reader_is_unavailable(remote, client):
+    response = client.get('/api/history/temperature')
+    assert response.status_code == 503
+
+
+def test_history_reads_partitions_of_other_process(remote, client, tmp_path, monkeypatch):
+    monkeypatch.setattr(data_logger_module, '_REFRESH_INTERVAL', 0.0)
+    writer = DataLogger(str(tmp_path / 'mgb.db'), partition='month')
+    now = datetime.now().replace(microsecond=0)
+    writer.log_rows(_rows(now - timedelta(minutes=10), 60))
+    web_app.init_sample_reader(DataLogger(str(tmp_path / 'mgb.db'), partition='month', read_only=True))
+    
+    response = client.get('/api/history/temperature?hours=1&limit=1000')
+    assert response.status_code == 200
+    assert response.get_json()['count'] == 60
+    
+    # Partition, die der Schreiber nach dem Start des Lesers anlegt
+    writer.log_rows(_rows(datetime(2025, 1, 10), 30))
+    response = client.get('/api/history/temperature?start=2025-01-10T00:00:00&end=2025-01-11T00:00:00'
+                          '&limit=1000')
+    assert response.status_code == 200
+    assert response.get_json()['values'] == [20.0 + i for i in range(30)]
+    
+    response = client.get('/api/history/temperature?start=2025-01-10T00:00:00&end=2025-01-11T00:00:00'
+                          '&points=10')
+    assert response.get_json()['count'] == 30
+
+
+@pytest.fixture
+def token(monkeypatch, tmp_path):
+    monkeypatch.setitem(web_app.config, 'database', {'backup': {'directory': str(tmp_path / 'backups'),
+                                                                'token': 'geheim'}})
+    return {'X-MGB-Token': 'geheim'}
+
+
+def test_backup_without_reader_is_unavailable(remote, client, token):
+    for url in ('/api/backup', '/api/backup/download', '/api/backup/mgb.tar.gz'):
+        assert client.get(url, headers=token).status_code == 503
+
+
+def test_backup_reads_files_of_other_process(remote, client, token, tmp_path):
+    writer = DataLogger(str(tmp_path / 'mgb.db'), partition='month')
+    writer.log_rows(_rows(datetime(2025, 1, 10), 30))
+    web_app.init_sample_reader(DataLogger(str(tmp_path / 'mgb.db'), partition='month', read_only=True))
+    
+    assert client.get('/api/backup', headers=token).get_json() == {'backups': []}
+    response = client.get('/api/backup/download', headers=token)
+    assert response.status_code == 200
+    with tarfile.open(fileobj=io.BytesIO(response.data), mode='r:gz') as archive:
+        assert sorted(archive.getnames()) == ['mgb.2025-01.db', 'mgb.db']
+
+
+def test_backup_token(remote, client, token, tmp_path, monkeypatch):
+    web_app.init_sample_reader(DataLogger(str(tmp_path / 'mgb.db')))
+    assert client.get('/api/backup').status_code == 401
+    assert client.get('/api/backup', headers={'X-MGB-Token': 'falsch'}).status_code == 401
+    assert client.get('/api/backup', headers={'Authorization': 'Bearer geheim'}).status_code == 200
+    # Download-Link im Browser
+    assert client.get('/api/backup/download?token=geheim').status_code == 200
+    
+    # Ohne Schlüssel frei zugänglich (unabhängig von diagnostics.token)
+    monkeypatch.setitem(web_app.config['database']['backup'], 'token', '')
+    assert client.get('/api/backup').status_code == 200
+    assert b'/api/backup/download' in client.get('/settings').data
+
+
+@pytest.fixture
+def chambers(clock, tmp_path, monkeypatch):
+    """
+    Zwei Kammern hinter einem WebProcess, Befehle über RemoteControl wie im Web-Prozess
+    """
+    import web.chambers
+    from controllers.chamber import Chamber, chamber_configs
+    from web.process import RemoteChamber, WebProcess
+    
+    with open(Path(__file__).parent.parent / 'config' / 'config.yaml', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    config['chambers'] = {'a': {'name': 'Kammer A'}, 'b': {'name': 'Kammer B'}}
+    data_logger = DataLogger(str(tmp_path / 'mgb.db'))
+    local = {chamber_id: Chamber(chamber_id, chamber_config, data_logger, clock)
+             for chamber_id, chamber_config in chamber_configs(config).items()}
+    
+    process = WebProcess({}, chambers=local)
+    process._state = SharedState.create(64 * 1024)
+    process._commands, process._replies = queue.Queue(), queue.Queue()
+    process.publish_state()
+    
+    def execute():
+        for message in iter(process._commands.get, None):
+            process._execute(*message)
+    
+    worker = threading.Thread(target=execute, daemon=True)
+    worker.start()
+    control = RemoteControl(process._state, process._commands, process._replies, timeout=2.0)
+    monkeypatch.setattr(web.chambers, 'chambers', {})
+    web.chambers.init_chambers({chamber_id: RemoteChamber(control, chamber_id)
+                                for chamber_id in control.state()['chambers']})
+    yield process, local
+    process._commands.put(None)
+    worker.join()
+    process._state.close()
+
+
+def test_chamber_routes_in_web_process(chambers, client):
+    process, local = chambers
+    assert [entry['id'] for entry in client.get('/api/chambers').get_json()] == ['a', 'b']
+    
+    response = client.post('/api/chambers/b/actuator/fan/on')
+    assert response.get_json()['pending'] is False
+    assert local['b'].actuator_controller.actuators['fan'].actuator.is_active
+    assert not local['a'].actuator_controller.actuators['fan'].actuator.is_active
+    
+    process.publish_state()
+    status = client.get('/api/chambers/b/status').get_json()
+    assert status['name'] == 'Kammer B'
+    assert status['actuators']['fan']['active'] is True
+    
+    local['b'].history.append('temperature', 23.5, 1000.0)
+    history = client.get('/api/chambers/b/chart/bootstrap').get_json()
+    assert history['temperature']['values'] == [23.5]
+    assert client.get('/api/chambers/a/chart/bootstrap').get_json() == {}
+    assert client.get('/api/chambers/b/alarms').get_json() == {'active': [], 'unacknowledged': []}